@@ -0,0 +1,144 @@
+"""
+Benchmark: per-worker memory when reading a PDF normally vs memory-mapped.
+
+Starts several worker processes that each open the same PDF with
+MenuParser's worker initializer and extract text from every page, then
+reports each worker's resident memory split into private (RssAnon) and
+file-backed, shareable (RssFile) pages. Linux only (reads /proc).
+
+Usage:
+    python -m benchmarks.bench_mmap_rss [--pdf PATH] [--workers 4] [--size-mb 45]
+
+Without --pdf a synthetic scanned-style menu of roughly --size-mb is written
+to a temporary directory.
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict
+
+from src.core import menu_parser
+
+
+def _read_rss() -> Dict[str, int]:
+    """Read resident memory counters (kB) for the current process."""
+    counters = {}
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "RssAnon:", "RssFile:")):
+                name, value = line.split(":", 1)
+                counters[name] = int(value.split()[0])
+    return counters
+
+
+def _worker(pdf_path: str, use_mmap: bool, results) -> None:
+    """Open the PDF, extract every page and record memory usage."""
+    menu_parser._init_extraction_worker(pdf_path, use_mmap)
+    page_count = len(menu_parser._worker_reader.pages)
+    menu_parser._extract_page_range(1, page_count)
+    results.put(_read_rss())
+
+
+def build_synthetic_pdf(path: Path, size_mb: int, pages: int = 20) -> None:
+    """
+    Write a PDF of roughly size_mb made of incompressible page images.
+
+    Args:
+        path: Output file
+        size_mb: Approximate file size in MB
+        pages: Number of pages
+    """
+    import os
+
+    image_size = size_mb * 1024 * 1024 // pages
+    side = int(image_size ** 0.5)
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+
+    for index in range(pages):
+        pixels = zlib.compress(os.urandom(side * side), 0)
+        objects.append(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+            b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n"
+            % (side, side, len(pixels)) + pixels + b"\nendstream"
+        )
+        image_id = len(objects)
+        content = b"q 612 0 0 792 0 0 cm /Im1 Do Q BT /F1 12 Tf 72 72 Td (Page %d) Tj ET" % (index + 1)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << "
+            b"/Font << /F1 3 0 R >> /XObject << /Im1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (image_id, content_id)
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(objects) + 1, xref_offset)
+        )
+
+
+def run(pdf_path: str, workers: int, use_mmap: bool) -> Dict[str, float]:
+    """Run workers concurrently and return mean per-worker counters in MB."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(pdf_path, use_mmap, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return {
+        name: sum(sample[name] for sample in samples) / len(samples) / 1024
+        for name in ("VmRSS", "RssAnon", "RssFile")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", help="PDF to read (default: synthetic menu)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--size-mb", type=int, default=45)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = str(Path(tmp_dir) / "synthetic_menu.pdf")
+            build_synthetic_pdf(Path(pdf_path), args.size_mb)
+
+        size_mb = Path(pdf_path).stat().st_size / (1024 * 1024)
+        print(f"PDF: {pdf_path} ({size_mb:.1f} MB), {args.workers} workers")
+        print(f"{'mode':<8}{'RSS MB':>10}{'private MB':>12}{'shared MB':>11}")
+        for label, use_mmap in (("read", False), ("mmap", True)):
+            stats = run(pdf_path, args.workers, use_mmap)
+            print(
+                f"{label:<8}{stats['VmRSS']:>10.1f}{stats['RssAnon']:>12.1f}"
+                f"{stats['RssFile']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
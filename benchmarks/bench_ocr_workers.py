@@ -0,0 +1,93 @@
+"""
+Benchmark: OCR throughput (pages/sec) against the number of OCR workers.
+
+Renders the PDF once (or draws synthetic menu pages), then OCRs every page
+with PDFProcessor's OCR stage for each worker count and reports wall time
+and pages per second. Requires Tesseract; --pdf also requires poppler.
+
+Usage:
+    python -m benchmarks.bench_ocr_workers [--pdf PATH] [--pages 20] [--workers 1 2 4 8]
+        [--engine auto|tesserocr|pytesseract]
+"""
+
+import argparse
+import os
+import time
+from typing import Dict
+
+from PIL import Image, ImageDraw, ImageFont
+
+from src.processors.pdf_processor import PDFProcessor
+
+# Letter page at 150 DPI, the default OCR resolution
+PAGE_SIZE = (1275, 1650)
+
+DISHES = [
+    "Grilled salmon, lemon butter, seasonal vegetables",
+    "Mushroom risotto with parmesan and truffle oil",
+    "Chicken tikka masala, basmati rice, naan",
+    "Caesar salad, anchovies, croutons, egg dressing",
+    "Pad thai with peanuts, tofu and bean sprouts",
+    "Beef burger, cheddar, brioche bun, fries",
+]
+
+
+def build_synthetic_pages(pages: int) -> Dict[int, Image.Image]:
+    """
+    Draw menu-like pages of text, as a scanner would deliver them.
+
+    Args:
+        pages: Number of pages
+
+    Returns:
+        Dictionary mapping page_number -> grayscale page image
+    """
+    try:
+        font = ImageFont.load_default(size=28)
+    except TypeError:  # Pillow < 10.1 has a single fixed-size default font
+        font = ImageFont.load_default()
+
+    images = {}
+    for page_num in range(1, pages + 1):
+        image = Image.new("L", PAGE_SIZE, color=255)
+        draw = ImageDraw.Draw(image)
+        draw.text((100, 80), f"MENU - PAGE {page_num}", fill=0, font=font)
+        for line in range(40):
+            dish = DISHES[(page_num + line) % len(DISHES)]
+            draw.text((100, 160 + line * 36), f"{dish} .... {8 + line % 20}.50", fill=0, font=font)
+        images[page_num] = image
+    return images
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", help="Scanned PDF to OCR (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=20, help="Synthetic page count")
+    parser.add_argument(
+        "--workers", type=int, nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    parser.add_argument("--engine", default="auto", help="OCR engine (see ocr.engine)")
+    args = parser.parse_args()
+
+    if args.pdf:
+        processor = PDFProcessor(args.pdf)
+        images = dict(enumerate(processor.convert_to_images(dpi=processor.ocr_dpi), start=1))
+    else:
+        processor = PDFProcessor(b"%PDF-1.4\n")  # Never parsed; pages are drawn directly
+        images = build_synthetic_pages(args.pages)
+
+    processor.ocr_engine_name = args.engine
+    print(f"{len(images)} pages, {os.cpu_count()} CPUs, engine: {processor._get_ocr_engine().name}")
+    print(f"{'workers':<9}{'seconds':>9}{'pages/sec':>11}{'errors':>8}")
+    for workers in args.workers:
+        processor.ocr_workers = workers
+        start = time.perf_counter()
+        pages = processor._ocr_images(images)
+        elapsed = time.perf_counter() - start
+        errors = sum(page["method"] == "ocr_error" for page in pages.values())
+        print(f"{workers:<9}{elapsed:>9.2f}{len(images) / elapsed:>11.2f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: per-page render + preprocess time, PNG/RGB vs grayscale PGM.
+
+Compares the old rasterization path (poppler encodes PNG, PIL decodes it and
+converts RGB to grayscale during preprocessing) with PDFProcessor's current
+one (poppler writes 8-bit grayscale PGM to stdout, parsed in memory). Each
+page is rendered individually so the timing is per page. Requires poppler.
+
+Usage:
+    python -m benchmarks.bench_render_grayscale [--pdf PATH] [--pages 10] [--dpi 150] [--repeat 3]
+
+Without --pdf a synthetic menu of --pages pages is written to a temporary
+directory.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from pdf2image import convert_from_path
+from PIL import Image
+
+from benchmarks.bench_mmap_rss import build_synthetic_pdf
+from src.processors.pdf_processor import PDFProcessor
+
+
+def time_pages(render: Callable[[int], Image.Image], pages: int, repeat: int) -> List[float]:
+    """
+    Time render + preprocess for every page, keeping the best of `repeat` runs.
+
+    Args:
+        render: Function rendering one 1-based page
+        pages: Number of pages
+        repeat: Runs per page
+
+    Returns:
+        Best time in milliseconds for each page
+    """
+    timings = []
+    for page_num in range(1, pages + 1):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            PDFProcessor._preprocess_image(render(page_num))
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", help="PDF to render (default: synthetic menu)")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = str(Path(tmp_dir) / "synthetic_menu.pdf")
+            build_synthetic_pdf(Path(pdf_path), size_mb=args.pages, pages=args.pages)
+
+        processor = PDFProcessor(pdf_path)
+        pages = min(args.pages, processor._get_menu_parser().get_page_count())
+
+        def render_png(page_num: int) -> Image.Image:
+            return convert_from_path(
+                pdf_path, dpi=args.dpi, fmt="png", first_page=page_num, last_page=page_num
+            )[0]
+
+        def render_gray(page_num: int) -> Image.Image:
+            return processor._render(args.dpi, first_page=page_num, last_page=page_num)[0]
+
+        print(f"PDF: {pdf_path}, {pages} pages at {args.dpi} DPI (best of {args.repeat})")
+        print(f"{'path':<14}{'mean ms':>9}{'median ms':>11}{'max ms':>9}")
+        for label, render in (("png + RGB", render_png), ("pgm grayscale", render_gray)):
+            timings = time_pages(render, pages, args.repeat)
+            print(
+                f"{label:<14}{statistics.mean(timings):>9.1f}"
+                f"{statistics.median(timings):>11.1f}{max(timings):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: cost of handing page images to OCR worker processes.
+
+Sends every page to a process pool and has the worker read all of its
+pixels (counting ink, standing in for OCR), once with the page image
+pickled through the pool's pipe and once through shared memory
+(SharedImagePool). Reports wall time per page and the bytes pickled per
+page. Pages are synthetic menu pages, scaled up with --scale (2 for 300 DPI).
+
+Usage:
+    python -m benchmarks.bench_shared_memory [--pages 20] [--workers 4] [--scale 1]
+"""
+
+import argparse
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.bench_ocr_workers import build_synthetic_pages
+from src.utils.shared_images import SharedImagePool, SharedImageRef, attach_image
+
+
+def count_ink(image: Image.Image) -> int:
+    """Worker task for pickled pages."""
+    return int(np.count_nonzero(np.asarray(image) < 128))
+
+
+def count_shared_ink(ref: SharedImageRef) -> int:
+    """Worker task for pages in shared memory."""
+    block, pixels = attach_image(ref)
+    try:
+        return int(np.count_nonzero(pixels < 128))
+    finally:
+        pixels = None
+        block.close()
+
+
+def run_pickled(executor: ProcessPoolExecutor, images: Dict[int, Image.Image]) -> int:
+    """Send pages by pickling them."""
+    return sum(executor.map(count_ink, images.values()))
+
+
+def run_shared(executor: ProcessPoolExecutor, images: Dict[int, Image.Image]) -> int:
+    """Send pages through shared memory, releasing each block when its page is done."""
+    with SharedImagePool() as shared:
+        refs = [shared.put(image) for image in images.values()]
+        futures = [executor.submit(count_shared_ink, ref) for ref in refs]
+        total = 0
+        for ref, future in zip(refs, futures):
+            total += future.result()
+            shared.release(ref)
+        return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=20, help="Synthetic page count")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--scale", type=int, default=1, help="Page size multiplier")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per mode (best is reported)")
+    args = parser.parse_args()
+
+    images = {
+        page_num: image.resize((image.width * args.scale, image.height * args.scale))
+        for page_num, image in build_synthetic_pages(args.pages).items()
+    }
+    first = next(iter(images.values()))
+    with SharedImagePool() as shared:
+        ref_bytes = len(pickle.dumps(shared.put(first)))
+    modes: Dict[str, Callable] = {"pickle": run_pickled, "shared": run_shared}
+    pickled_bytes = {"pickle": len(pickle.dumps(first)), "shared": ref_bytes}
+
+    print(f"{args.pages} pages of {first.width}x{first.height}, {args.workers} workers")
+    print(f"{'mode':<8}{'ms/page':>10}{'pickled bytes/page':>20}")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Start the workers before timing
+        list(executor.map(count_ink, [Image.new("L", (1, 1))] * args.workers))
+        expected = run_pickled(executor, images)
+        for mode, run in modes.items():
+            timings = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                assert run(executor, images) == expected
+                timings.append(time.perf_counter() - start)
+            print(f"{mode:<8}{1000 * min(timings) / args.pages:>10.2f}{pickled_bytes[mode]:>20,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: share of page pixels sent to Tesseract with text region detection.
+
+Preprocesses each page, detects its text regions and reports the detection
+time and the OCR'd pixels as a share of the rendered page, with and without
+region detection (margin cropping alone). Synthetic pages get a photo and
+a decorative border, as many menus have. --pdf requires poppler.
+
+Usage:
+    python -m benchmarks.bench_text_regions [--pdf PATH] [--pages 5]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from benchmarks.bench_ocr_workers import build_synthetic_pages
+from src.processors.pdf_processor import PDFProcessor
+from src.processors.preprocessing import preprocess_page
+from src.processors.text_regions import detect_text_regions, region_pixels
+
+
+def decorate(image: Image.Image, seed: int) -> Image.Image:
+    """Add a dish photo and a decorative border to a synthetic menu page."""
+    rng = np.random.default_rng(seed)
+    pixels = np.array(image)
+    pixels[1100:1500, 900:1200] = rng.integers(0, 160, (400, 300))
+    decorated = Image.fromarray(pixels)
+    ImageDraw.Draw(decorated).rectangle((30, 30, image.width - 30, image.height - 30), outline=0, width=6)
+    return decorated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", help="Scanned PDF (default: synthetic menu pages)")
+    parser.add_argument("--pages", type=int, default=5, help="Synthetic page count")
+    args = parser.parse_args()
+
+    if args.pdf:
+        processor = PDFProcessor(args.pdf)
+        images: Dict[int, Image.Image] = dict(
+            enumerate(processor.convert_to_images(dpi=processor.ocr_dpi), start=1)
+        )
+    else:
+        images = {
+            page_num: decorate(image, page_num)
+            for page_num, image in build_synthetic_pages(args.pages).items()
+        }
+
+    cropped_share, region_share, detect_ms = [], [], []
+    print(f"{'page':<6}{'regions':>8}{'cropped %':>11}{'regions %':>11}{'detect ms':>11}")
+    for page_num, image in images.items():
+        page_pixels = image.width * image.height
+        processed = preprocess_page(image)
+
+        start = time.perf_counter()
+        regions = detect_text_regions(processed)
+        detect_ms.append((time.perf_counter() - start) * 1000)
+
+        cropped_share.append(100 * processed.width * processed.height / page_pixels)
+        region_share.append(100 * region_pixels(regions) / page_pixels)
+        print(
+            f"{page_num:<6}{len(regions):>8}{cropped_share[-1]:>11.1f}"
+            f"{region_share[-1]:>11.1f}{detect_ms[-1]:>11.1f}"
+        )
+
+    print(
+        f"{'mean':<6}{'':>8}{statistics.mean(cropped_share):>11.1f}"
+        f"{statistics.mean(region_share):>11.1f}{statistics.mean(detect_ms):>11.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
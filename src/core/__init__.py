@@ -3,6 +3,6 @@ Core business logic modules for SAVVI application.
 """
 
 from src.core.menu_parser import MenuParser
+from src.core.pdf_source import PDFSource
 
-__all__ = ["MenuParser"]
-
+__all__ = ["MenuParser", "PDFSource"]
@@ -5,17 +5,309 @@ This module provides functionality to extract text from restaurant menu PDFs,
 handling both native text-based PDFs and preserving document structure.
 """
 
+import io
 import logging
+import math
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple, Union
+import PyPDF2
 from PyPDF2 import PdfReader
 from PyPDF2.errors import PdfReadError
+from PyPDF2.generic import ArrayObject, DictionaryObject
 
+from src.core.pdf_source import PDFInput, PDFSource
 from src.utils.logger import get_logger
-from src.utils.validators import validate_pdf_file
+from src.utils.config import get_config
+from src.utils.extraction_cache import ExtractionCache, get_configured_extraction_cache
+from src.utils.validators import validate_pdf_file, validate_pdf_data
 
 logger = get_logger(__name__)
 
+# Number of chunks handed to each worker, so uneven pages balance out
+CHUNKS_PER_WORKER = 4
+
+# Extraction cache parameters for native text extraction
+TEXT_CACHE_PARAMS = {"stage": "text", "extractor": f"PyPDF2 {PyPDF2.__version__}"}
+
+# Page kinds reported by MenuParser.classify_pages()
+PAGE_TEXT = "text"
+PAGE_IMAGE = "image"
+PAGE_EMPTY = "empty"
+PAGE_UNKNOWN = "unknown"
+
+# Pages of these kinds have no extractable text worth reading
+TEXTLESS_PAGE_KINDS = (PAGE_IMAGE, PAGE_EMPTY)
+
+# Content streams at least this long (bytes) on a page with fonts hold real text,
+# even when the page also carries a full-page scan
+MIN_TEXT_CONTENT_BYTES = 64
+
+# Relative aspect-ratio difference tolerated for an image to count as full-page
+FULL_PAGE_ASPECT_TOLERANCE = 0.1
+
+# Size assumed for pages whose MediaBox cannot be read (US Letter, in points)
+LETTER_PAGE_SIZE = (612.0, 792.0)
+
+# Nesting depth of Form XObjects inspected for fonts and images
+MAX_XOBJECT_DEPTH = 3
+
+
+def resolve_page_selection(
+    page_count: int,
+    pages: Optional[Iterable[int]] = None,
+    first_page: Optional[int] = None,
+    last_page: Optional[int] = None,
+) -> List[int]:
+    """
+    Turn a page selection into a sorted list of page numbers.
+    
+    ``pages`` takes precedence; otherwise ``first_page``/``last_page`` bound an
+    inclusive range (each defaulting to the first/last page of the document).
+    
+    Args:
+        page_count: Number of pages in the document
+        pages: Explicit 1-based page numbers
+        first_page: First page of an inclusive range
+        last_page: Last page of an inclusive range
+        
+    Returns:
+        Sorted, de-duplicated list of 1-based page numbers
+        
+    Raises:
+        ValueError: If any requested page is outside the document
+    """
+    if pages is not None:
+        selected = sorted(set(pages))
+    else:
+        first = 1 if first_page is None else first_page
+        last = page_count if last_page is None else last_page
+        if first > last:
+            raise ValueError(f"first_page ({first}) is after last_page ({last})")
+        selected = list(range(first, last + 1))
+    
+    invalid = [page_num for page_num in selected if not 1 <= page_num <= page_count]
+    if invalid:
+        raise ValueError(
+            f"Pages out of range (document has {page_count} pages): "
+            f"{', '.join(str(page_num) for page_num in invalid)}"
+        )
+    return selected
+
+
+def group_page_runs(pages: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Group sorted page numbers into contiguous inclusive (first, last) runs.
+    
+    Args:
+        pages: Sorted page numbers
+        
+    Returns:
+        List of (first_page, last_page) tuples, e.g. [1, 2, 3, 7] -> [(1, 3), (7, 7)]
+    """
+    runs: List[List[int]] = []
+    for page_num in pages:
+        if runs and runs[-1][1] == page_num - 1:
+            runs[-1][1] = page_num
+        else:
+            runs.append([page_num, page_num])
+    return [(first, last) for first, last in runs]
+
+
+# PdfReader owned by a text extraction worker process
+_worker_reader: Optional[PdfReader] = None
+
+
+@contextmanager
+def _release_resolved_objects(reader: PdfReader) -> Iterator[None]:
+    """
+    Evict the PyPDF2 objects resolved inside the block from the reader's cache.
+    
+    Content streams, fonts and image XObjects resolved for one page are
+    dropped afterwards, so memory does not grow with the number of pages read.
+    
+    Args:
+        reader: PdfReader whose object cache is trimmed
+    """
+    resolved = getattr(reader, "resolved_objects", None)
+    resolved_before = set(resolved) if isinstance(resolved, dict) else None
+    try:
+        yield
+    finally:
+        if resolved_before is not None:
+            for key in set(resolved) - resolved_before:
+                del resolved[key]
+
+
+def _extract_page(reader: PdfReader, page_num: int) -> Tuple[str, bool]:
+    """
+    Extract text from one page and release the PyPDF2 objects it resolved.
+    
+    Args:
+        reader: PdfReader to extract from
+        page_num: 1-based page number
+        
+    Returns:
+        Tuple of (text, failed); failed pages return ""
+    """
+    with _release_resolved_objects(reader):
+        try:
+            page_text = reader.pages[page_num - 1].extract_text()
+            logger.debug(f"Page {page_num}: {len(page_text)} characters")
+            return page_text, False
+        except Exception as e:
+            logger.error(f"Error extracting text from page {page_num}: {e}", exc_info=True)
+            return "", True  # Empty string for failed pages
+
+
+def _scan_resources(resources: Any, depth: int = 0) -> Tuple[bool, List[Tuple[float, float]]]:
+    """
+    Look for fonts and image XObjects in a resource dictionary.
+    
+    Form XObjects are followed (up to MAX_XOBJECT_DEPTH) since they carry
+    their own resources. Stream data is never decoded.
+    
+    Args:
+        resources: Page or form /Resources dictionary
+        depth: Current Form XObject nesting depth
+        
+    Returns:
+        Tuple of (has_fonts, [(width, height), ...] of image XObjects)
+    """
+    if not isinstance(resources, DictionaryObject):
+        return False, []
+    
+    fonts = resources.get("/Font")
+    has_fonts = isinstance(fonts, DictionaryObject) and len(fonts) > 0
+    images: List[Tuple[float, float]] = []
+    
+    xobjects = resources.get("/XObject")
+    if isinstance(xobjects, DictionaryObject):
+        for name in xobjects:
+            xobject = xobjects[name]  # Resolves indirect references
+            if not isinstance(xobject, DictionaryObject):
+                continue
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image":
+                images.append((float(xobject.get("/Width", 0)), float(xobject.get("/Height", 0))))
+            elif subtype == "/Form" and depth < MAX_XOBJECT_DEPTH:
+                form_fonts, form_images = _scan_resources(xobject.get("/Resources"), depth + 1)
+                has_fonts = has_fonts or form_fonts
+                images.extend(form_images)
+    
+    return has_fonts, images
+
+
+def _content_length(page: DictionaryObject) -> int:
+    """
+    Get the total encoded length of a page's content streams, without decoding them.
+    
+    Args:
+        page: PyPDF2 page object
+        
+    Returns:
+        Total size in bytes of the page's (still encoded) content streams
+    """
+    contents = page.get("/Contents")
+    if contents is None:
+        return 0
+    contents = contents.get_object()
+    streams = contents if isinstance(contents, ArrayObject) else [contents]
+    # PyPDF2 drops /Length once a stream is parsed; its raw data is kept in _data
+    return sum(len(getattr(stream.get_object(), "_data", b"")) for stream in streams)
+
+
+def _is_full_page(image_size: Tuple[float, float], page_size: Tuple[float, float]) -> bool:
+    """Check whether an image's aspect ratio matches the page (either orientation)."""
+    image_width, image_height = image_size
+    page_width, page_height = page_size
+    if min(image_width, image_height, page_width, page_height) <= 0:
+        return False
+    
+    image_ratio = image_width / image_height
+    for ratio in (page_width / page_height, page_height / page_width):
+        if abs(image_ratio - ratio) <= FULL_PAGE_ASPECT_TOLERANCE * ratio:
+            return True
+    return False
+
+
+def _classify_page(reader: PdfReader, page_num: int) -> str:
+    """
+    Classify a page from its structure: fonts, content stream size and images.
+    
+    A page that uses fonts and has a non-trivial content stream is "text";
+    one dominated by a full-page image (or with images but no fonts) is
+    "image"; a page with neither is "empty". Pages whose structure cannot be
+    read are "unknown".
+    
+    Args:
+        reader: PdfReader holding the page
+        page_num: 1-based page number
+        
+    Returns:
+        One of PAGE_TEXT, PAGE_IMAGE, PAGE_EMPTY, PAGE_UNKNOWN
+    """
+    with _release_resolved_objects(reader):
+        try:
+            page = reader.pages[page_num - 1]
+            if not isinstance(page, DictionaryObject):
+                return PAGE_UNKNOWN
+            
+            has_fonts, images = _scan_resources(page.get("/Resources"))
+            content_bytes = _content_length(page)
+            page_size = (float(page.mediabox.width), float(page.mediabox.height))
+        except Exception as e:
+            logger.debug(f"Could not classify page {page_num}: {e}")
+            return PAGE_UNKNOWN
+    
+    if has_fonts and content_bytes >= MIN_TEXT_CONTENT_BYTES:
+        return PAGE_TEXT
+    if any(_is_full_page(image_size, page_size) for image_size in images):
+        return PAGE_IMAGE
+    if has_fonts and content_bytes > 0:
+        return PAGE_TEXT
+    return PAGE_IMAGE if images else PAGE_EMPTY
+
+
+def _init_extraction_worker(pdf_input: Union[str, bytes], use_mmap: bool = False) -> None:
+    """
+    Open the worker's own PdfReader once, when the worker process starts.
+    
+    Args:
+        pdf_input: Path to the PDF file, or the PDF bytes for in-memory sources
+        use_mmap: Memory-map the file so all workers share its page-cache pages
+    """
+    global _worker_reader
+    if isinstance(pdf_input, str):
+        if use_mmap:
+            _worker_reader = PdfReader(PDFSource(pdf_input, use_mmap=True).open())
+        else:
+            _worker_reader = PdfReader(pdf_input)
+    else:
+        _worker_reader = PdfReader(io.BytesIO(pdf_input))
+
+
+def _extract_page_range(start: int, stop: int) -> List[Tuple[int, str, bool]]:
+    """
+    Extract text from a contiguous page range in a worker process.
+    
+    Each worker uses its own PdfReader (see _init_extraction_worker), so no
+    PyPDF2 state is shared or pickled between processes.
+    
+    Args:
+        start: First page number (1-based)
+        stop: Last page number (inclusive)
+        
+    Returns:
+        List of (page_number, text, failed) tuples in page order
+    """
+    return [
+        (page_num, *_extract_page(_worker_reader, page_num))
+        for page_num in range(start, stop + 1)
+    ]
+
 
 class MenuParser:
     """
@@ -23,38 +315,81 @@ class MenuParser:
     
     This class handles:
     - Text extraction from native PDFs
-    - Multi-page document processing
+    - Multi-page document processing (optionally across a process pool)
     - Section structure preservation
     - Metadata extraction
     - Error handling for corrupted PDFs
     """
     
-    def __init__(self, pdf_path: str):
+    def __init__(
+        self,
+        pdf_path: PDFInput,
+        config: Optional[Any] = None,
+        extraction_cache: Optional[ExtractionCache] = None,
+    ):
         """
-        Initialize MenuParser with a PDF file path.
+        Initialize MenuParser with a PDF file path or in-memory PDF.
         
         Args:
-            pdf_path: Path to the PDF file to parse
+            pdf_path: Path to the PDF file to parse, or the PDF itself as bytes,
+                memoryview or a seekable binary stream. Paths are memory-mapped
+                when ``text_extraction.use_mmap`` is enabled.
+            config: Optional Config instance (uses get_config() if not provided)
+            extraction_cache: Persistent cache checked before extracting and
+                updated with newly extracted pages (default: the cache the
+                configuration enables, if any)
             
         Raises:
             FileNotFoundError: If PDF file doesn't exist
             ValueError: If PDF file is invalid or cannot be read
+            TypeError: If pdf_path is not a supported input type
         """
-        self.pdf_path = Path(pdf_path)
+        self.config = config or get_config()
+        pdf_settings = self.config.get_pdf_settings()
+        
+        if isinstance(pdf_path, PDFSource):
+            self.source = pdf_path
+        else:
+            self.source = PDFSource(pdf_path, use_mmap=pdf_settings.get("use_mmap", False))
+        self.pdf_path: Optional[Path] = self.source.path
         
-        # Validate PDF file
-        is_valid, error_msg = validate_pdf_file(str(self.pdf_path))
+        # Validate PDF file (or buffer, without touching the filesystem)
+        if self.source.is_path:
+            is_valid, error_msg = validate_pdf_file(str(self.pdf_path))
+        else:
+            is_valid, error_msg = validate_pdf_data(self.source.raw)
         if not is_valid:
             logger.error(f"Invalid PDF file: {error_msg}")
             raise ValueError(f"Invalid PDF file: {error_msg}")
         
-        if not self.pdf_path.exists():
+        if self.source.is_path and not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         self._reader: Optional[PdfReader] = None
         self._metadata: Optional[Dict[str, Any]] = None
         
-        logger.info(f"Initialized MenuParser for: {self.pdf_path}")
+        # Parallel extraction settings (workers == 0 means one per CPU core)
+        self.workers = pdf_settings.get("text_workers", 1) or os.cpu_count() or 1
+        self.min_pages_per_worker = max(1, pdf_settings.get("text_min_pages_per_worker", 8))
+        
+        # Skip extraction on pages whose structure shows they hold no text
+        self.skip_textless_pages = pdf_settings.get("skip_textless_pages", True)
+        self._page_kinds: Dict[int, str] = {}
+        
+        # Per-page text cache, filled lazily so each page is extracted at most once
+        self._page_texts: Dict[int, str] = {}
+        self._failed_pages: Set[int] = set()
+        self._extraction_counts: Dict[int, int] = {}
+        self._cache_hits = 0
+        
+        # Persistent cache shared across runs (None when disabled)
+        if extraction_cache is None:
+            extraction_cache = get_configured_extraction_cache(pdf_settings)
+        self.extraction_cache = extraction_cache
+        self._persisted_loaded = False
+        self._unsaved_pages: Set[int] = set()
+        
+        logger.info(f"Initialized MenuParser for: {self.source}")
     
     def _get_reader(self) -> PdfReader:
         """
@@ -68,8 +403,11 @@ class MenuParser:
         """
         if self._reader is None:
             try:
-                logger.debug(f"Opening PDF file: {self.pdf_path}")
-                self._reader = PdfReader(str(self.pdf_path))
+                logger.debug(f"Opening PDF file: {self.source}")
+                if self.source.is_path and not self.source.use_mmap:
+                    self._reader = PdfReader(str(self.pdf_path))
+                else:
+                    self._reader = PdfReader(self.source.open())
                 logger.info(f"Successfully opened PDF with {len(self._reader.pages)} pages")
             except PdfReadError as e:
                 logger.error(f"Failed to read PDF: {e}")
@@ -80,78 +418,347 @@ class MenuParser:
         
         return self._reader
     
-    def extract_text(self) -> str:
+    def _get_page_text(self, page_num: int, cache: bool = True) -> str:
         """
-        Extract all text from the PDF.
+        Get the text of a single page, extracting it on first access.
         
-        Handles multi-page PDFs and preserves section structure by marking
-        page breaks. Returns full text with page breaks indicated.
+        Failed pages are cached as empty strings and remembered in
+        ``_failed_pages`` so callers can still mark them as extraction errors.
+        PyPDF2 objects resolved while extracting the page are released
+        afterwards (see _extract_page).
         
+        Args:
+            page_num: 1-based page number
+            cache: Whether to keep the extracted text in the per-page cache
+            
         Returns:
-            Full extracted text with page breaks marked as "\\n--- Page N ---\\n"
+            Extracted page text ("" if extraction failed)
             
         Raises:
             ValueError: If PDF cannot be read or is corrupted
         """
+        self._load_persisted_pages()
+        if page_num in self._page_texts:
+            self._cache_hits += 1
+            return self._page_texts[page_num]
+        
+        if self._is_textless(page_num):
+            if cache:
+                self._page_texts[page_num] = ""
+            return ""
+        
         reader = self._get_reader()
+        self._extraction_counts[page_num] = self._extraction_counts.get(page_num, 0) + 1
+        
+        page_text, failed = _extract_page(reader, page_num)
+        if failed:
+            self._failed_pages.add(page_num)
+        
+        if cache:
+            self._page_texts[page_num] = page_text
+            if not failed:
+                self._unsaved_pages.add(page_num)
+        return page_text
+    
+    def _load_persisted_pages(self) -> None:
+        """Fill the page cache from the persistent extraction cache (once)."""
+        if self._persisted_loaded or self.extraction_cache is None:
+            return
+        self._persisted_loaded = True
+        
+        try:
+            cached_pages = self.extraction_cache.get_pages(self.source.sha256(), TEXT_CACHE_PARAMS)
+        except Exception as e:
+            logger.warning(f"Could not read extraction cache: {e}")
+            return
+        
+        for page_num, page in cached_pages.items():
+            self._page_texts.setdefault(page_num, page["text"])
+        if cached_pages:
+            logger.info(f"Loaded {len(cached_pages)} pages from extraction cache")
+    
+    def _save_persisted_pages(self) -> None:
+        """Write newly extracted pages to the persistent extraction cache."""
+        if self.extraction_cache is None or not self._unsaved_pages:
+            return
+        
+        pages = {
+            page_num: {"text": self._page_texts[page_num], "method": "text"}
+            for page_num in self._unsaved_pages
+        }
+        try:
+            self.extraction_cache.put_pages(
+                self.source.sha256(), TEXT_CACHE_PARAMS, pages, page_count=self.get_page_count()
+            )
+            self._unsaved_pages.clear()
+        except Exception as e:
+            logger.warning(f"Could not write extraction cache: {e}")
+    
+    def iter_pages(
+        self,
+        start: int = 1,
+        stop: Optional[int] = None,
+        cache: bool = True,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily yield page text, one page at a time.
+        
+        Each page is parsed only when the consumer asks for it, so downstream
+        processing can start on page 1 before later pages are read. Pages that
+        are already cached are yielded without re-extraction. Newly extracted
+        pages are written to the persistent extraction cache (if any) once the
+        iterator is exhausted.
+        
+        Args:
+            start: First page number to yield (1-based, default: 1)
+            stop: Last page number to yield, inclusive (default: last page)
+            cache: Keep yielded text in the per-page cache. Pass False to keep
+                memory flat when streaming very large documents.
+            
+        Yields:
+            Tuples of (page_number, text)
+            
+        Raises:
+            ValueError: If the page range is invalid or the PDF cannot be read
+        """
+        page_count = self.get_page_count()
+        if stop is None or stop > page_count:
+            stop = page_count
+        if start < 1:
+            raise ValueError(f"Page numbers start at 1. Found: {start}")
+        
+        logger.debug(f"Streaming text from pages {start}-{stop}")
+        
+        return self._iter_selected(range(start, stop + 1), cache=cache)
+    
+    def _iter_selected(self, pages: Iterable[int], cache: bool = True) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (page_number, text) for the given pages, extracting lazily.
+        
+        Args:
+            pages: Page numbers to yield, in order
+            cache: Keep yielded text in the per-page cache
+            
+        Yields:
+            Tuples of (page_number, text)
+        """
+        for page_num in pages:
+            yield page_num, self._get_page_text(page_num, cache=cache)
+        
+        self._save_persisted_pages()
+    
+    def _prefetch_parallel(self, pages: List[int]) -> None:
+        """
+        Fill the page cache for the given pages using a process pool.
+        
+        Uncached pages are split into contiguous chunks, each extracted by a
+        worker with its own PdfReader. Does nothing when parallel extraction
+        is disabled or the selection is too small to benefit from it. Falls
+        back to serial extraction (on demand) if the pool cannot be used.
+        
+        Args:
+            pages: Sorted 1-based page numbers
+        """
+        self._load_persisted_pages()
+        missing = [p for p in pages if p not in self._page_texts and not self._is_textless(p)]
+        workers = min(self.workers, len(missing) // self.min_pages_per_worker)
+        if workers < 2:
+            return
+        
+        chunk_size = max(
+            self.min_pages_per_worker,
+            math.ceil(len(missing) / (workers * CHUNKS_PER_WORKER)),
+        )
+        
+        # Split missing pages into contiguous (start, stop) runs of at most chunk_size
+        chunks = []
+        for page_num in missing:
+            if chunks and chunks[-1][1] == page_num - 1 and page_num - chunks[-1][0] < chunk_size:
+                chunks[-1][1] = page_num
+            else:
+                chunks.append([page_num, page_num])
+        
+        logger.info(
+            f"Extracting {len(missing)} pages with {workers} workers "
+            f"({len(chunks)} chunks)"
+        )
+        
+        # Workers open the file themselves; in-memory PDFs are sent once per worker
+        pdf_input = str(self.pdf_path) if self.source.is_path else self.source.read_bytes()
+        
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_extraction_worker,
+                initargs=(pdf_input, self.source.use_mmap),
+            ) as executor:
+                futures = [
+                    executor.submit(_extract_page_range, first, last)
+                    for first, last in chunks
+                ]
+                for future in futures:
+                    for page_num, page_text, failed in future.result():
+                        self._extraction_counts[page_num] = self._extraction_counts.get(page_num, 0) + 1
+                        if failed:
+                            self._failed_pages.add(page_num)
+                        else:
+                            self._unsaved_pages.add(page_num)
+                        self._page_texts[page_num] = page_text
+        except Exception as e:
+            logger.warning(f"Parallel text extraction failed, continuing serially: {e}")
+    
+    def extract_text(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+    ) -> str:
+        """
+        Extract all text from the PDF, or from a selection of pages.
+        
+        Handles multi-page PDFs and preserves section structure by marking
+        page breaks. Returns full text with page breaks indicated. Only the
+        selected pages are read.
+        
+        Args:
+            pages: Explicit 1-based page numbers to extract
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+        
+        Returns:
+            Full extracted text with page breaks marked as "\\n--- Page N ---\\n"
+            
+        Raises:
+            ValueError: If PDF cannot be read or is corrupted, or pages are out of range
+        """
+        selected = resolve_page_selection(self.get_page_count(), pages, first_page, last_page)
         full_text = []
         
-        logger.debug(f"Extracting text from {len(reader.pages)} pages")
+        logger.debug(f"Extracting text from {len(selected)} pages")
+        self._prefetch_parallel(selected)
         
-        for page_num, page in enumerate(reader.pages, start=1):
-            try:
-                page_text = page.extract_text()
-                
-                if page_text.strip():
-                    # Mark page breaks for structure preservation
-                    if page_num > 1:
-                        full_text.append(f"\n--- Page {page_num} ---\n")
-                    full_text.append(page_text)
-                    logger.debug(f"Extracted {len(page_text)} characters from page {page_num}")
-                else:
-                    logger.warning(f"Page {page_num} appears to be empty or image-based")
-                    if page_num > 1:
-                        full_text.append(f"\n--- Page {page_num} (no text) ---\n")
-            except Exception as e:
-                logger.error(f"Error extracting text from page {page_num}: {e}", exc_info=True)
+        for page_num, page_text in self._iter_selected(selected):
+            if page_num in self._failed_pages:
                 # Continue with other pages even if one fails
                 full_text.append(f"\n--- Page {page_num} (extraction error) ---\n")
+            elif page_text.strip():
+                # Mark page breaks for structure preservation
+                if page_num > 1:
+                    full_text.append(f"\n--- Page {page_num} ---\n")
+                full_text.append(page_text)
+            else:
+                logger.warning(f"Page {page_num} appears to be empty or image-based")
+                if page_num > 1:
+                    full_text.append(f"\n--- Page {page_num} (no text) ---\n")
         
         result = "".join(full_text)
         logger.info(f"Extracted {len(result)} total characters from PDF")
         
         return result
     
-    def extract_by_page(self) -> Dict[int, str]:
+    def extract_by_page(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+    ) -> Dict[int, str]:
         """
         Extract text from each page separately.
         
         Returns a dictionary mapping page numbers to their text content.
-        Useful for layout analysis and page-by-page processing.
+        Useful for layout analysis and page-by-page processing. Large documents
+        are split across a process pool when ``text_extraction.workers`` > 1.
+        
+        Args:
+            pages: Explicit 1-based page numbers to extract
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
         
         Returns:
             Dictionary mapping page_number (int) -> text (str)
             
         Raises:
-            ValueError: If PDF cannot be read or is corrupted
+            ValueError: If PDF cannot be read or is corrupted, or pages are out of range
         """
-        reader = self._get_reader()
-        page_texts = {}
+        selected = resolve_page_selection(self.get_page_count(), pages, first_page, last_page)
         
-        logger.debug(f"Extracting text by page from {len(reader.pages)} pages")
+        logger.debug(f"Extracting text by page from {len(selected)} pages")
+        self._prefetch_parallel(selected)
         
-        for page_num, page in enumerate(reader.pages, start=1):
-            try:
-                page_text = page.extract_text()
-                page_texts[page_num] = page_text
-                logger.debug(f"Page {page_num}: {len(page_text)} characters")
-            except Exception as e:
-                logger.error(f"Error extracting text from page {page_num}: {e}", exc_info=True)
-                page_texts[page_num] = ""  # Empty string for failed pages
+        page_texts = dict(self._iter_selected(selected))
         
         logger.info(f"Extracted text from {len(page_texts)} pages")
         return page_texts
     
+    def classify_page(self, page_num: int) -> str:
+        """
+        Classify one page as text, image (scanned), empty or unknown.
+        
+        Only the page's resource dictionary and content stream lengths are
+        read; no text is extracted and no stream is decoded. Results are cached.
+        
+        Args:
+            page_num: 1-based page number
+            
+        Returns:
+            One of "text", "image", "empty" or "unknown"
+            
+        Raises:
+            ValueError: If PDF cannot be read or is corrupted
+        """
+        if page_num not in self._page_kinds:
+            self._page_kinds[page_num] = _classify_page(self._get_reader(), page_num)
+        return self._page_kinds[page_num]
+    
+    def classify_pages(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+    ) -> Dict[int, str]:
+        """
+        Classify pages structurally (see classify_page()).
+        
+        Args:
+            pages: Explicit 1-based page numbers to classify
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            
+        Returns:
+            Dictionary mapping page_number -> page kind
+            
+        Raises:
+            ValueError: If PDF cannot be read or is corrupted, or pages are out of range
+        """
+        selected = resolve_page_selection(self.get_page_count(), pages, first_page, last_page)
+        kinds = {page_num: self.classify_page(page_num) for page_num in selected}
+        logger.debug(
+            f"Classified {len(kinds)} pages: "
+            f"{sum(kind == PAGE_TEXT for kind in kinds.values())} text, "
+            f"{sum(kind == PAGE_IMAGE for kind in kinds.values())} image"
+        )
+        return kinds
+    
+    def _is_textless(self, page_num: int) -> bool:
+        """Whether extraction can be skipped because the page structurally has no text."""
+        return self.skip_textless_pages and self.classify_page(page_num) in TEXTLESS_PAGE_KINDS
+    
+    def get_extraction_stats(self) -> Dict[str, Any]:
+        """
+        Get counters for the per-page text cache.
+        
+        Returns:
+            Dictionary containing:
+            - pages_extracted: Total number of PyPDF2 ``extract_text()`` calls
+            - cache_hits: Number of page reads served from the cache
+            - extraction_counts: Mapping page_number -> number of extractions
+        """
+        return {
+            "pages_extracted": sum(self._extraction_counts.values()),
+            "cache_hits": self._cache_hits,
+            "extraction_counts": dict(self._extraction_counts),
+        }
+    
     def extract_metadata(self) -> Dict[str, Any]:
         """
         Extract PDF metadata and document information.
@@ -184,7 +791,7 @@ class MenuParser:
             "creation_date": str(metadata.get("/CreationDate", "")) if metadata and "/CreationDate" in metadata else "",
             "modification_date": str(metadata.get("/ModDate", "")) if metadata and "/ModDate" in metadata else "",
             "page_count": len(reader.pages),
-            "file_size": self.pdf_path.stat().st_size,
+            "file_size": self.source.size,
         }
         
         self._metadata = result
@@ -205,22 +812,67 @@ class MenuParser:
         reader = self._get_reader()
         return len(reader.pages)
     
+    def get_page_sizes(self, pages: Optional[Iterable[int]] = None) -> Dict[int, Tuple[float, float]]:
+        """
+        Get the size of pages in PDF points (1/72 inch), without rendering them.
+        
+        Pages are measured as displayed, so /Rotate 90 swaps width and height.
+        A page whose size cannot be read counts as US Letter.
+        
+        Args:
+            pages: 1-based page numbers (default: every page)
+            
+        Returns:
+            Dictionary mapping page_number -> (width, height)
+            
+        Raises:
+            ValueError: If PDF cannot be read or is corrupted
+        """
+        reader = self._get_reader()
+        if pages is None:
+            pages = range(1, len(reader.pages) + 1)
+        
+        sizes = {}
+        for page_num in pages:
+            try:
+                page = reader.pages[page_num - 1]
+                width, height = float(page.mediabox.width), float(page.mediabox.height)
+                if int(page.get("/Rotate", 0) or 0) % 180:
+                    width, height = height, width
+                sizes[page_num] = (abs(width), abs(height))
+            except Exception as e:
+                logger.debug(f"Could not read the size of page {page_num}: {e}")
+                sizes[page_num] = LETTER_PAGE_SIZE
+        return sizes
+    
+    def save_to(self, destination: str) -> Path:
+        """
+        Write the PDF to disk (e.g. to keep an in-memory upload).
+        
+        Args:
+            destination: File path to write
+            
+        Returns:
+            Path of the written file
+        """
+        return self.source.save_to(destination)
+    
     def is_text_based(self) -> bool:
         """
         Determine if the PDF is text-based (vs. image-based/scanned).
         
         Checks if the PDF contains extractable text by examining the first page.
         If the first page has substantial text (>50 characters), considers it text-based.
+        The first page's text is cached, so later full extractions reuse it.
         
         Returns:
             True if PDF appears to be text-based, False if likely scanned/image-based
         """
         try:
-            reader = self._get_reader()
-            if len(reader.pages) == 0:
+            if self.get_page_count() == 0:
                 return False
             
-            first_page_text = reader.pages[0].extract_text()
+            first_page_text = self._get_page_text(1)
             text_length = len(first_page_text.strip())
             
             is_text = text_length > 50
@@ -0,0 +1,281 @@
+"""
+PDF input source abstraction.
+
+This module lets MenuParser and PDFProcessor work on a PDF given as a
+filesystem path, an in-memory buffer (bytes, bytearray, memoryview) or a
+seekable binary stream, without writing uploads to disk first. Files can also
+be memory-mapped, so processes reading the same PDF share page-cache pages
+instead of each holding a private copy.
+"""
+
+import hashlib
+import io
+import mmap
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Chunk size used when hashing files and streams
+HASH_CHUNK_SIZE = 1024 * 1024
+
+PDFInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO, "PDFSource"]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable stream over a memoryview.
+
+    Unlike io.BytesIO, wrapping a buffer does not copy it; only the slices
+    that PyPDF2 actually reads are materialised.
+    """
+
+    def __init__(self, buffer: memoryview):
+        super().__init__()
+        self._buffer = buffer
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        end = min(self._position + len(target), len(self._buffer))
+        size = max(0, end - self._position)
+        target[:size] = self._buffer[self._position:end]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._buffer) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class PDFSource:
+    """
+    Uniform access to a PDF held on disk, in memory or in a stream.
+
+    Paths are never read here; buffers and streams are never written to
+    disk unless save_to() is called.
+    """
+
+    def __init__(self, source: PDFInput, use_mmap: bool = False):
+        """
+        Initialize PDFSource.
+
+        Args:
+            source: Filesystem path, bytes-like object, seekable binary stream,
+                or an existing PDFSource (whose input is shared)
+            use_mmap: Memory-map path sources when they are opened instead of
+                reading them into process memory (ignored for buffers/streams)
+
+        Raises:
+            TypeError: If source is not a supported input type
+        """
+        self.path: Optional[Path] = None
+        self.use_mmap = False
+        self._buffer: Optional[memoryview] = None
+        self._stream: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._sha256: Optional[str] = None
+
+        if isinstance(source, PDFSource):
+            self.path = source.path
+            self.use_mmap = source.use_mmap
+            self._buffer = source._buffer
+            self._stream = source._stream
+            self._mmap = source._mmap
+            self._sha256 = source._sha256
+        elif isinstance(source, (str, Path)):
+            self.path = Path(source)
+            self.use_mmap = use_mmap
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._buffer = memoryview(source).cast("B")
+        elif hasattr(source, "read") and hasattr(source, "seek"):
+            self._stream = source
+        else:
+            raise TypeError(
+                "PDF source must be a path, bytes, memoryview or seekable binary stream. "
+                f"Found: {type(source).__name__}"
+            )
+
+    @property
+    def is_path(self) -> bool:
+        """Whether the PDF is a file on disk."""
+        return self.path is not None
+
+    @property
+    def raw(self) -> Union[Path, memoryview, BinaryIO]:
+        """The underlying path, buffer or stream (for validation)."""
+        if self.path is not None:
+            return self.path
+        if self._buffer is not None:
+            return self._buffer
+        return self._stream
+
+    @property
+    def doc_id(self) -> str:
+        """
+        Cheap identifier of the document contents, for in-memory caches.
+        
+        Files are identified by resolved path, modification time and size
+        (no reading); buffers and streams by their SHA-256.
+        """
+        if self.path is not None:
+            stat = self.path.stat()
+            return f"{self.path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+        return self.sha256()
+
+    @property
+    def size(self) -> int:
+        """Size of the PDF in bytes."""
+        if self.path is not None:
+            return self.path.stat().st_size
+        if self._buffer is not None:
+            return len(self._buffer)
+
+        position = self._stream.tell()
+        try:
+            return self._stream.seek(0, io.SEEK_END)
+        finally:
+            self._stream.seek(position)
+
+    def _map_file(self) -> memoryview:
+        """
+        Memory-map the PDF file (read-only), once per source.
+
+        Returns:
+            memoryview over the mapped file
+        """
+        if self._mmap is None:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            logger.debug(f"Memory-mapped PDF file: {self.path} ({len(self._mmap)} bytes)")
+        return memoryview(self._mmap)
+
+    def open(self) -> BinaryIO:
+        """
+        Open a binary stream suitable for PdfReader.
+
+        Returns:
+            A new file object for paths (a BufferReader over a shared mapping
+            in mmap mode), a zero-copy BufferReader for buffers, or the
+            caller's stream rewound to the start
+        """
+        if self.path is not None:
+            if self.use_mmap:
+                return BufferReader(self._map_file())
+            return open(self.path, "rb")
+        if self._buffer is not None:
+            return BufferReader(self._buffer)
+
+        self._stream.seek(0)
+        return self._stream
+
+    def read_bytes(self) -> bytes:
+        """
+        Get the full PDF contents as bytes.
+
+        Returns:
+            PDF bytes (the original object when the source was already bytes)
+        """
+        if self.path is not None:
+            return self.path.read_bytes()
+        if self._buffer is not None:
+            if isinstance(self._buffer.obj, bytes) and len(self._buffer) == len(self._buffer.obj):
+                return self._buffer.obj
+            return self._buffer.tobytes()
+
+        position = self._stream.tell()
+        try:
+            self._stream.seek(0)
+            return self._stream.read()
+        finally:
+            self._stream.seek(position)
+
+    def sha256(self) -> str:
+        """
+        Compute the SHA-256 of the PDF bytes (cached after the first call).
+
+        Files and streams are hashed in chunks without loading them whole.
+
+        Returns:
+            Hex digest identifying the document contents
+        """
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            if self._buffer is not None:
+                digest.update(self._buffer)
+            elif self.path is not None and self.use_mmap:
+                digest.update(self._map_file())
+            else:
+                stream = open(self.path, "rb") if self.path is not None else self._stream
+                position = stream.tell()
+                try:
+                    stream.seek(0)
+                    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                finally:
+                    if self.path is not None:
+                        stream.close()
+                    else:
+                        stream.seek(position)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def close(self) -> None:
+        """
+        Release the file mapping, if any.
+
+        The mapping stays open while readers still reference it and is then
+        released by garbage collection.
+        """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                logger.debug(f"File mapping still in use: {self.path}")
+                return
+            self._mmap = None
+
+    def save_to(self, destination: Union[str, Path]) -> Path:
+        """
+        Write the PDF to disk.
+
+        This is the only place in-memory PDFs touch the filesystem.
+
+        Args:
+            destination: File path to write
+
+        Returns:
+            Path of the written file
+        """
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(self.read_bytes())
+        logger.info(f"Saved PDF to: {destination}")
+        return destination
+
+    def __str__(self) -> str:
+        if self.path is not None:
+            return str(self.path)
+        kind = "in-memory" if self._buffer is not None else "stream"
+        return f"<{kind} PDF, {self.size} bytes>"
@@ -2,7 +2,16 @@
 Data processing modules for SAVVI application.
 """
 
+from src.processors.image_processor import ImageMenuProcessor, create_menu_processor
+from src.processors.ocr_engine import OCREngine, create_ocr_engine
+from src.processors.ocr_result import OCRResult
 from src.processors.pdf_processor import PDFProcessor
 
-__all__ = ["PDFProcessor"]
-
+__all__ = [
+    "ImageMenuProcessor",
+    "create_menu_processor",
+    "OCREngine",
+    "create_ocr_engine",
+    "OCRResult",
+    "PDFProcessor",
+]
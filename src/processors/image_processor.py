@@ -0,0 +1,376 @@
+"""
+Image processing module for photographed menus.
+
+Menus sent as phone photos (JPEG, PNG, WebP or TIFF) are OCR'd directly,
+through the same preprocessing and OCR stages as rendered PDF pages; they
+are never wrapped into a PDF and rasterized back out. The photo is decoded
+lazily and only at the resolution OCR needs: JPEGs are decoded in draft mode,
+which lets libjpeg scale by 1/2, 1/4 or 1/8 while decoding, so a 12 MP photo
+never exists in memory at full size.
+
+create_menu_processor() picks PDFProcessor or ImageMenuProcessor for an
+upload by its magic bytes.
+"""
+
+import io
+import math
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+import pytesseract
+from PIL import Image, ImageOps
+
+from src.core.pdf_source import BufferReader, PDFInput
+from src.processors.ocr_engine import OCREngine
+from src.processors.ocr_result import OCRResult
+from src.processors.pdf_processor import METHOD_OCR, OCR_TIMEOUT, PDFProcessor
+from src.processors.preprocessing import preprocess_page
+from src.processors.recognition import LazyOCREngine, recognize_page, tesseract_not_found_error
+from src.utils.config import PDFProcessingConfig, get_config
+from src.utils.logger import get_logger
+from src.utils.validators import PDF_MAGIC, detect_image_format, validate_file_path, validate_image_data, validate_image_file
+
+logger = get_logger(__name__)
+
+ImageInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+# A photographed menu is taken to be a US Letter page: its long side spans
+# this many inches, which turns ocr.dpi into a target size in pixels
+PAGE_LONG_SIDE_INCHES = 11.0
+
+# Fallbacks for settings missing from get_pdf_settings() (see PDFProcessor)
+_PROCESSING_DEFAULTS = PDFProcessingConfig()
+
+# Bytes read to identify an upload (the WebP signature ends at byte 12)
+MAGIC_HEADER_SIZE = 16
+
+
+def target_size(size: tuple, dpi: int) -> tuple:
+    """
+    Get the size a photo is decoded at for OCR at a DPI.
+
+    Photos are only ever scaled down; one already smaller than the target
+    keeps its size.
+
+    Args:
+        size: (width, height) of the photo
+        dpi: OCR resolution
+
+    Returns:
+        (width, height) whose long side is the page's long side at dpi
+    """
+    width, height = size
+    scale = min(1.0, dpi * PAGE_LONG_SIDE_INCHES / max(width, height, 1))
+    return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+
+def effective_dpi(size: tuple) -> int:
+    """
+    Get the resolution a decoded photo has as a page.
+
+    Photos are never scaled up and JPEG draft decoding can overshoot the
+    target size, so this can be below or above the requested OCR DPI.
+
+    Args:
+        size: (width, height) of the decoded photo
+
+    Returns:
+        Pixels per inch along the page's long side
+    """
+    return max(1, round(max(size) / PAGE_LONG_SIDE_INCHES))
+
+
+def decode_photo(stream: BinaryIO, dpi: int) -> Image.Image:
+    """
+    Decode a menu photo as a grayscale page at roughly the OCR resolution.
+
+    JPEGs are decoded in draft mode at the smallest libjpeg scale that is
+    still at least the target size; other formats are decoded in full and
+    then reduced by a whole factor. EXIF orientation is applied, so photos
+    taken in portrait come out upright.
+
+    Args:
+        stream: Open binary stream positioned at the start of the image
+        dpi: OCR resolution
+
+    Returns:
+        Grayscale ("L") PIL Image, at least the target size unless the photo
+        is smaller
+    """
+    with Image.open(stream) as photo:
+        wanted = target_size(photo.size, dpi)
+        photo.draft("L", wanted)
+        photo.load()
+
+        # reduce() only takes 8-bit modes: palette, bilevel and 16-bit photos
+        # are converted to grayscale first
+        image = photo if photo.mode in ("L", "RGB") else photo.convert("L")
+        factor = min(image.width // wanted[0], image.height // wanted[1])
+        image = image.reduce(factor) if factor > 1 else image.copy()
+    image = ImageOps.exif_transpose(image)
+    return image if image.mode == "L" else image.convert("L")
+
+
+class ImageMenuProcessor:
+    """
+    OCR a menu photo.
+    
+    This class handles:
+    - Validation of the photo by its magic bytes
+    - Lazy, reduced-resolution decoding (see decode_photo())
+    - Image preprocessing and OCR, with the settings PDFProcessor uses
+    
+    Results have the shape of one PDFProcessor page, numbered 1.
+    """
+    
+    def __init__(self, image_path: ImageInput, config: Optional[Any] = None):
+        """
+        Initialize ImageMenuProcessor with a photo path or in-memory photo.
+        
+        Args:
+            image_path: Path to the photo, or the photo itself as bytes,
+                memoryview or a seekable binary stream
+            config: Optional Config instance (uses get_config() if not provided)
+        
+        Raises:
+            ValueError: If the photo is invalid or not a supported format
+            TypeError: If image_path is not a supported input type
+        """
+        self.config = config or get_config()
+        
+        pdf_settings = self.config.get_pdf_settings()
+        
+        self.image_path: Optional[Path] = None
+        self._buffer: Optional[memoryview] = None
+        self._stream: Optional[BinaryIO] = None
+        max_file_size_mb = pdf_settings.get("max_file_size_mb", _PROCESSING_DEFAULTS.max_file_size_mb)
+        if isinstance(image_path, (str, Path)):
+            self.image_path = Path(image_path)
+            is_valid, error_msg = validate_image_file(str(self.image_path), max_file_size_mb)
+        elif isinstance(image_path, (bytes, bytearray, memoryview)):
+            self._buffer = memoryview(image_path).cast("B")
+            is_valid, error_msg = validate_image_data(self._buffer, max_file_size_mb)
+        elif hasattr(image_path, "read") and hasattr(image_path, "seek"):
+            self._stream = image_path
+            is_valid, error_msg = validate_image_data(image_path, max_file_size_mb)
+        else:
+            raise TypeError(
+                "Image source must be a path, bytes, memoryview or seekable binary stream. "
+                f"Found: {type(image_path).__name__}"
+            )
+        if not is_valid:
+            raise ValueError(error_msg)
+        
+        stream = self._open()
+        try:
+            self.image_format = detect_image_format(stream.read(MAGIC_HEADER_SIZE))
+        finally:
+            if stream is not self._stream:
+                stream.close()
+        
+        self.ocr_enabled = pdf_settings.get("ocr_enabled", _PROCESSING_DEFAULTS.ocr.enabled)
+        self.tesseract_path = pdf_settings.get("tesseract_path")
+        self.ocr_language = pdf_settings.get("ocr_language", _PROCESSING_DEFAULTS.ocr.language)
+        self.ocr_dpi = pdf_settings.get("ocr_dpi", _PROCESSING_DEFAULTS.ocr.dpi)
+        self.preprocessing: Optional[Dict[str, Any]] = pdf_settings.get("ocr_preprocessing")
+        self.text_regions: Optional[Dict[str, Any]] = pdf_settings.get("ocr_regions")
+        
+        # Photos are single pages; only the rotation retry of language detection applies
+        self.language_detection: Optional[Dict[str, Any]] = pdf_settings.get("ocr_language_detection")
+        
+        self.ocr_engine_name = pdf_settings.get("ocr_engine", _PROCESSING_DEFAULTS.ocr.engine)
+        self.tessdata_path = pdf_settings.get("ocr_tessdata_path")
+        self._ocr_engine = LazyOCREngine(self.ocr_engine_name, self.tesseract_path, self.tessdata_path)
+        
+        if self.tesseract_path:
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
+        
+        logger.info(f"Initialized ImageMenuProcessor for: {self}")
+    
+    def _open(self) -> BinaryIO:
+        """Open the photo for decoding (a zero-copy reader for buffers)."""
+        if self.image_path is not None:
+            return open(self.image_path, "rb")
+        if self._buffer is not None:
+            return io.BufferedReader(BufferReader(self._buffer))
+        self._stream.seek(0)
+        return self._stream
+    
+    def load_image(self, dpi: Optional[int] = None) -> Image.Image:
+        """
+        Decode the photo as a grayscale page for OCR.
+        
+        Args:
+            dpi: OCR resolution (default: ``ocr.dpi``)
+        
+        Returns:
+            Grayscale ("L") PIL Image (see decode_photo())
+        
+        Raises:
+            ValueError: If the photo cannot be decoded
+        """
+        dpi = dpi or self.ocr_dpi
+        stream = self._open()
+        try:
+            image = decode_photo(stream, dpi)
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.error(f"Error decoding {self.image_format} image: {e}")
+            raise ValueError(f"Cannot read {self.image_format} image: {e}") from e
+        finally:
+            if stream is not self._stream:
+                stream.close()
+        logger.debug(f"Decoded {self.image_format} image at {image.width}x{image.height} for {dpi} DPI")
+        return image
+    
+    def _get_ocr_engine(self) -> OCREngine:
+        """Get or create the OCR engine."""
+        return self._ocr_engine.get(self.ocr_language)
+    
+    def recognize(self, dpi: Optional[int] = None, timeout: int = OCR_TIMEOUT) -> OCRResult:
+        """
+        Preprocess and OCR the photo, keeping every word's details.
+        
+        Args:
+            dpi: OCR resolution (default: ``ocr.dpi``)
+            timeout: Maximum seconds to wait for OCR (default: 30)
+        
+        Returns:
+            OCRResult with boxes in pixels of the preprocessed image
+        
+        Raises:
+            ValueError: If the photo cannot be decoded
+            RuntimeError: If OCR is disabled, Tesseract is not available or OCR fails
+        """
+        if not self.ocr_enabled:
+            raise RuntimeError("OCR is disabled in configuration")
+        
+        return self._recognize_image(self.load_image(dpi), timeout)
+    
+    def _recognize_image(self, image: Image.Image, timeout: int) -> OCRResult:
+        """Preprocess and OCR a decoded photo (see recognize())."""
+        try:
+            processed_image = preprocess_page(image, self.preprocessing)
+            result = recognize_page(
+                self._get_ocr_engine(), processed_image, self.text_regions, timeout, self.language_detection
+            )
+        except pytesseract.TesseractNotFoundError:
+            raise tesseract_not_found_error(self.tesseract_path) from None
+        except Exception as e:
+            logger.error(f"OCR error: {e}", exc_info=True)
+            raise RuntimeError(f"OCR processing failed: {e}") from e
+        
+        logger.debug(f"OCR extracted {len(result)} words")
+        return result
+    
+    def process_pages(self) -> Dict[int, Dict[str, Any]]:
+        """
+        OCR the photo as page 1, like PDFProcessor.process_pages().
+        
+        Returns:
+            Dictionary mapping 1 -> {"text", "method", "confidence", "dpi",
+            "words"} with method "ocr"; dpi is the resolution the photo was
+            decoded at (see effective_dpi())
+        
+        Raises:
+            ValueError: If the photo cannot be decoded
+            RuntimeError: If OCR is disabled, Tesseract is not available or OCR fails
+        """
+        if not self.ocr_enabled:
+            raise RuntimeError("OCR is disabled in configuration")
+        
+        image = self.load_image()
+        result = self._recognize_image(image, OCR_TIMEOUT)
+        return {
+            1: {
+                "text": result.text,
+                "method": METHOD_OCR,
+                "confidence": result.mean_confidence,
+                "dpi": effective_dpi(image.size),
+                "words": result,
+            }
+        }
+    
+    def process(self) -> str:
+        """
+        OCR the photo.
+        
+        Returns:
+            Extracted text
+        
+        Raises:
+            ValueError: If the photo cannot be decoded
+            RuntimeError: If OCR is disabled, Tesseract is not available or OCR fails
+        """
+        text = self.recognize().text
+        logger.info(f"OCR extracted {len(text)} characters from {self}")
+        return text
+    
+    def close(self) -> None:
+        """Release the OCR engine."""
+        self._ocr_engine.close()
+    
+    def __str__(self) -> str:
+        if self.image_path is not None:
+            return str(self.image_path)
+        return f"<in-memory {self.image_format} image>"
+
+
+def create_menu_processor(
+    source: Union[PDFInput, ImageInput], config: Optional[Any] = None
+) -> Union[PDFProcessor, ImageMenuProcessor]:
+    """
+    Create the processor for an uploaded menu: PDFProcessor for PDFs,
+    ImageMenuProcessor for photos.
+
+    The kind of upload is told from its magic bytes, not its extension, and
+    must be listed in ``pdf_processing.supported_formats``.
+
+    Args:
+        source: Path, bytes, memoryview or seekable binary stream
+        config: Optional Config instance (uses get_config() if not provided)
+
+    Returns:
+        A processor for the upload
+
+    Raises:
+        ValueError: If the path does not exist or can't be read, or the
+            upload is neither a PDF nor a supported image, or its format is
+            not enabled
+    """
+    config = config or get_config()
+    supported_formats = config.get_pdf_settings().get("supported_formats", _PROCESSING_DEFAULTS.supported_formats)
+
+    if isinstance(source, (str, Path)):
+        is_valid, error_msg = validate_file_path(str(source))
+        if not is_valid:
+            raise ValueError(error_msg)
+        try:
+            with open(source, "rb") as f:
+                header = f.read(1024)
+        except OSError as e:
+            raise ValueError(f"Cannot read menu file: {source} - {e}") from e
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        header = bytes(memoryview(source).cast("B")[:1024])
+    elif hasattr(source, "read") and hasattr(source, "seek"):
+        position = source.tell()
+        try:
+            source.seek(0)
+            header = source.read(1024)
+        finally:
+            source.seek(position)
+    else:
+        # A PDFSource (or an unsupported type, which PDFProcessor rejects)
+        return PDFProcessor(source, config)
+
+    if PDF_MAGIC in header:
+        kind = "pdf"
+    elif detect_image_format(header) is not None:
+        kind = "image"
+    else:
+        raise ValueError("Menu must be a PDF or a JPEG, PNG, WebP or TIFF image")
+
+    if kind not in supported_formats:
+        raise ValueError(f"Menu format '{kind}' is not enabled in pdf_processing.supported_formats")
+    if kind == "pdf":
+        return PDFProcessor(source, config)
+    return ImageMenuProcessor(source, config)
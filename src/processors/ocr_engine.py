@@ -0,0 +1,361 @@
+"""
+OCR engines used by PDFProcessor.
+
+Two implementations share one small interface:
+- TesserocrEngine keeps long-lived libtesseract handles (via tesserocr), so
+  the language model is loaded once per thread and each page costs only the
+  recognition itself.
+- PytesseractEngine runs the tesseract command once per page (a new process,
+  a temporary image file and a model load every time). It needs nothing
+  beyond the tesseract binary and is the fallback.
+
+Both also offer coroutines (arecognize(), arecognize_regions()) for use in
+an event loop: PytesseractEngine runs tesseract as an asyncio subprocess
+that is killed if the caller is cancelled; TesserocrEngine runs in the
+loop's default executor.
+"""
+
+import asyncio
+import io
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pytesseract
+from PIL import Image
+
+from src.processors.ocr_result import OCRResult, parse_tsv
+from src.utils.async_subprocess import run_process
+from src.utils.logger import get_logger
+
+try:
+    import tesserocr
+except ImportError:  # Optional dependency; PytesseractEngine is used instead
+    tesserocr = None
+
+logger = get_logger(__name__)
+
+# Engine names accepted by create_ocr_engine() (ocr.engine in savvi_config.yaml)
+ENGINE_AUTO = "auto"
+ENGINE_TESSEROCR = "tesserocr"
+ENGINE_PYTESSERACT = "pytesseract"
+ENGINES = (ENGINE_AUTO, ENGINE_TESSEROCR, ENGINE_PYTESSERACT)
+
+
+class OCREngine(ABC):
+    """
+    Base class for OCR engines.
+
+    Subclasses implement recognize() and detect_orientation(). Engines are
+    safe to call from several threads at once.
+    """
+
+    name = ""
+
+    def __init__(self, language: str = "eng"):
+        """
+        Initialize OCREngine.
+
+        Args:
+            language: Tesseract language code(s), e.g. "eng" or "eng+fra"
+        """
+        self.language = language
+
+    @abstractmethod
+    def recognize(self, image: Image.Image, timeout: Optional[float] = None) -> OCRResult:
+        """
+        Recognize the words in an image.
+
+        Args:
+            image: Preprocessed page image
+            timeout: Maximum seconds to spend on the image, where supported
+
+        Returns:
+            OCRResult with every word's text, box and confidence
+        """
+
+    def recognize_regions(
+        self,
+        image: Image.Image,
+        regions: Sequence[Tuple[int, int, int, int]],
+        timeout: Optional[float] = None,
+    ) -> OCRResult:
+        """
+        Recognize only some regions of an image.
+
+        Args:
+            image: Preprocessed page image
+            regions: (left, top, right, bottom) boxes to OCR, in reading order
+            timeout: Maximum seconds to spend on each region, where supported
+
+        Returns:
+            OCRResult for all regions, with boxes in image coordinates
+        """
+        return OCRResult.concat([
+            (self.recognize(image.crop(region), timeout), region[0], region[1])
+            for region in regions
+        ])
+
+    async def arecognize(self, image: Image.Image, timeout: Optional[float] = None) -> OCRResult:
+        """
+        Recognize the words in an image without blocking the event loop.
+
+        The default runs recognize() in the loop's default executor; a
+        cancelled call stops waiting but the recognition itself runs to
+        completion.
+
+        Args:
+            image: Preprocessed page image
+            timeout: Maximum seconds to spend on the image, where supported
+
+        Returns:
+            OCRResult with every word's text, box and confidence
+        """
+        return await asyncio.to_thread(self.recognize, image, timeout)
+
+    async def arecognize_regions(
+        self,
+        image: Image.Image,
+        regions: Sequence[Tuple[int, int, int, int]],
+        timeout: Optional[float] = None,
+    ) -> OCRResult:
+        """
+        Recognize only some regions of an image without blocking the event loop.
+
+        Args:
+            image: Preprocessed page image
+            regions: (left, top, right, bottom) boxes to OCR, in reading order
+            timeout: Maximum seconds to spend on each region, where supported
+
+        Returns:
+            OCRResult for all regions, with boxes in image coordinates
+        """
+        parts = []
+        for region in regions:
+            parts.append((await self.arecognize(image.crop(region), timeout), region[0], region[1]))
+        return OCRResult.concat(parts)
+
+    @abstractmethod
+    def detect_orientation(self, image: Image.Image, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Detect which way up a page is and which script it is written in (OSD).
+
+        Needs Tesseract's osd.traineddata; a low-resolution page is enough.
+
+        Args:
+            image: Page image
+            timeout: Maximum seconds to spend on the image, where supported
+
+        Returns:
+            Dictionary with "rotate" (clockwise degrees that make the page
+            upright), "orientation_conf", "script" (e.g. "Latin", "Han") and
+            "script_conf"
+        """
+
+    def image_to_string(self, image: Image.Image, timeout: Optional[float] = None) -> str:
+        """
+        Recognize the text in an image.
+
+        Args:
+            image: Preprocessed page image
+            timeout: Maximum seconds to spend on the image, where supported
+
+        Returns:
+            Recognized text
+        """
+        return self.recognize(image, timeout).text
+
+    def close(self) -> None:
+        """Release engine resources."""
+
+
+class PytesseractEngine(OCREngine):
+    """OCR by running the tesseract command for every image."""
+
+    name = ENGINE_PYTESSERACT
+
+    def __init__(self, language: str = "eng", tesseract_cmd: Optional[str] = None):
+        """
+        Initialize PytesseractEngine.
+
+        Args:
+            language: Tesseract language code(s)
+            tesseract_cmd: Path to the tesseract binary (default: found on PATH)
+        """
+        super().__init__(language)
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def recognize(self, image: Image.Image, timeout: Optional[float] = None) -> OCRResult:
+        data = pytesseract.image_to_data(
+            image, lang=self.language, timeout=timeout or 0, output_type=pytesseract.Output.DICT
+        )
+        return OCRResult.from_data(data)
+
+    def detect_orientation(self, image: Image.Image, timeout: Optional[float] = None) -> Dict[str, Any]:
+        osd = pytesseract.image_to_osd(image, timeout=timeout or 0, output_type=pytesseract.Output.DICT)
+        return {key: osd[key] for key in ("rotate", "orientation_conf", "script", "script_conf")}
+
+    async def arecognize(self, image: Image.Image, timeout: Optional[float] = None) -> OCRResult:
+        """
+        Run tesseract as an asyncio subprocess, feeding the image on stdin.
+
+        The tesseract process is killed if the call is cancelled or times out.
+
+        Raises:
+            pytesseract.TesseractNotFoundError: If the tesseract binary is missing
+            pytesseract.TesseractError: If tesseract fails
+            RuntimeError: If tesseract runs longer than timeout
+        """
+        if image.mode not in ("1", "L", "RGB"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PPM")  # Uncompressed PBM/PGM/PPM: no encode cost
+        args = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", self.language, "tsv"]
+        try:
+            returncode, stdout, stderr = await run_process(args, buffer.getvalue(), timeout or None)
+        except FileNotFoundError:
+            raise pytesseract.TesseractNotFoundError() from None
+        except asyncio.TimeoutError:
+            raise RuntimeError("Tesseract process timeout") from None
+        if returncode != 0:
+            raise pytesseract.TesseractError(returncode, stderr.decode("utf-8", "replace").strip())
+        return OCRResult.from_data(parse_tsv(stdout.decode("utf-8", "replace")))
+
+
+class TesserocrEngine(OCREngine):
+    """
+    OCR through libtesseract, with one persistent API handle per thread.
+
+    A Tesseract API handle is not thread-safe, so each calling thread gets its
+    own, created (and its model loaded) on first use. Per-call timeouts are
+    not supported by tesserocr and are ignored.
+    """
+
+    name = ENGINE_TESSEROCR
+
+    def __init__(self, language: str = "eng", tessdata_path: Optional[str] = None):
+        """
+        Initialize TesserocrEngine and load the model for the calling thread.
+
+        Args:
+            language: Tesseract language code(s)
+            tessdata_path: Directory containing the .traineddata files
+                (default: tesserocr's built-in path or TESSDATA_PREFIX)
+
+        Raises:
+            RuntimeError: If tesserocr is not installed or the model can't be loaded
+        """
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        super().__init__(language)
+        self.tessdata_path = tessdata_path
+        self._local = threading.local()
+        self._apis: List["tesserocr.PyTessBaseAPI"] = []
+        self._lock = threading.Lock()
+        self._get_api()  # Fail fast if the language data is missing
+
+    def _get_api(self) -> "tesserocr.PyTessBaseAPI":
+        """Get the calling thread's API handle, creating it on first use."""
+        api = getattr(self._local, "api", None)
+        if api is None:
+            kwargs = {"lang": self.language}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            try:
+                api = tesserocr.PyTessBaseAPI(**kwargs)
+            except RuntimeError as e:
+                raise RuntimeError(
+                    f"Could not load Tesseract model '{self.language}': {e}"
+                ) from e
+            self._local.api = api
+            with self._lock:
+                self._apis.append(api)
+            logger.debug(f"Loaded Tesseract model '{self.language}' for {threading.current_thread().name}")
+        return api
+
+    def recognize(self, image: Image.Image, timeout: Optional[float] = None) -> OCRResult:
+        api = self._get_api()
+        try:
+            api.SetImage(image)
+            return OCRResult.from_data(parse_tsv(api.GetTSVText(0)))
+        finally:
+            api.Clear()
+
+    def detect_orientation(self, image: Image.Image, timeout: Optional[float] = None) -> Dict[str, Any]:
+        api = self._get_osd_api()
+        try:
+            api.SetImage(image)
+            osd = api.DetectOrientationScript()
+        finally:
+            api.Clear()
+        if not osd:
+            raise RuntimeError("Orientation and script detection failed")
+        return {
+            # orient_deg is how far the image was turned clockwise
+            "rotate": (360 - osd["orient_deg"]) % 360,
+            "orientation_conf": osd["orient_conf"],
+            "script": osd["script_name"],
+            "script_conf": osd["script_conf"],
+        }
+
+    def _get_osd_api(self) -> "tesserocr.PyTessBaseAPI":
+        """Get the calling thread's OSD-only API handle, creating it on first use."""
+        api = getattr(self._local, "osd_api", None)
+        if api is None:
+            kwargs = {"lang": "osd", "psm": tesserocr.PSM.OSD_ONLY}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            try:
+                api = tesserocr.PyTessBaseAPI(**kwargs)
+            except RuntimeError as e:
+                raise RuntimeError(f"Could not load Tesseract OSD model: {e}") from e
+            self._local.osd_api = api
+            with self._lock:
+                self._apis.append(api)
+        return api
+
+    def close(self) -> None:
+        """End every API handle created by this engine."""
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis.clear()
+        self._local = threading.local()
+
+
+def create_ocr_engine(
+    engine: str = ENGINE_AUTO,
+    language: str = "eng",
+    tesseract_cmd: Optional[str] = None,
+    tessdata_path: Optional[str] = None,
+) -> OCREngine:
+    """
+    Create an OCR engine.
+
+    Args:
+        engine: "tesserocr", "pytesseract", or "auto" (tesserocr when it is
+            installed and can load the model, otherwise pytesseract)
+        language: Tesseract language code(s)
+        tesseract_cmd: Path to the tesseract binary (pytesseract only)
+        tessdata_path: Directory containing .traineddata files (tesserocr only)
+
+    Returns:
+        OCREngine instance
+
+    Raises:
+        ValueError: If engine is not a known engine name
+        RuntimeError: If "tesserocr" was requested but can't be used
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown OCR engine: {engine}. Expected one of: {', '.join(ENGINES)}")
+
+    if engine in (ENGINE_AUTO, ENGINE_TESSEROCR):
+        try:
+            return TesserocrEngine(language, tessdata_path)
+        except RuntimeError as e:
+            if engine == ENGINE_TESSEROCR:
+                raise
+            logger.info(f"In-process OCR unavailable ({e}); using pytesseract")
+
+    return PytesseractEngine(language, tesseract_cmd)
@@ -0,0 +1,260 @@
+"""
+Structured OCR output for one page.
+
+OCRResult keeps every recognized word with its bounding box, block /
+paragraph / line ids and confidence, stored column-wise: word text is one
+string plus an offsets array, and the numeric columns are small NumPy
+arrays, so a page of thousands of words costs a few dozen bytes per word
+instead of a dictionary per word. Plain text is rebuilt from the columns on
+demand.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# image_to_data() level of a word row (1 page, 2 block, 3 paragraph, 4 line, 5 word)
+WORD_LEVEL = 5
+
+# Columns of Tesseract's TSV output, in order
+TSV_COLUMNS = (
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text",
+)
+
+
+def parse_tsv(tsv: str) -> Dict[str, List[Any]]:
+    """
+    Parse Tesseract TSV output into columns, like image_to_data(output_type=DICT).
+
+    Args:
+        tsv: TSV text, with or without the header row
+
+    Returns:
+        Dictionary mapping column name -> list of values
+    """
+    data: Dict[str, List[Any]] = {column: [] for column in TSV_COLUMNS}
+    for row in tsv.splitlines():
+        fields = row.split("\t", len(TSV_COLUMNS) - 1)
+        if len(fields) < len(TSV_COLUMNS) - 1 or fields[0] == "level":
+            continue
+        fields += [""] * (len(TSV_COLUMNS) - len(fields))
+        for column, value in zip(TSV_COLUMNS[:-2], fields):
+            data[column].append(int(value))
+        data["conf"].append(float(fields[-2]))
+        data["text"].append(fields[-1])
+    return data
+
+
+class OCRResult:
+    """
+    Words recognized on a page, with positions and confidences.
+
+    Attributes:
+        boxes: (n, 4) int32 array of left, top, width, height in pixels
+        blocks: int32 array of block ids
+        paragraphs: int32 array of paragraph ids (within a block)
+        lines: int32 array of line ids (within a paragraph)
+        confidences: float32 array of word confidences from 0.0 to 1.0
+            (NaN where Tesseract reported none)
+    """
+
+    __slots__ = ("_chars", "_offsets", "boxes", "blocks", "paragraphs", "lines", "confidences")
+
+    def __init__(
+        self,
+        words: Sequence[str],
+        boxes: Any,
+        blocks: Any,
+        paragraphs: Any,
+        lines: Any,
+        confidences: Any,
+    ):
+        """
+        Initialize OCRResult from per-word columns.
+
+        Args:
+            words: Word texts
+            boxes: (left, top, width, height) per word
+            blocks: Block id per word
+            paragraphs: Paragraph id per word
+            lines: Line id per word
+            confidences: Confidence per word, from 0.0 to 1.0 (NaN if unknown)
+        """
+        self._chars = "".join(words)
+        self._offsets = np.zeros(len(words) + 1, dtype=np.int32)
+        np.cumsum([len(word) for word in words], out=self._offsets[1:])
+        self.boxes = np.asarray(boxes, dtype=np.int32).reshape(len(words), 4)
+        self.blocks = np.asarray(blocks, dtype=np.int32)
+        self.paragraphs = np.asarray(paragraphs, dtype=np.int32)
+        self.lines = np.asarray(lines, dtype=np.int32)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+
+    @classmethod
+    def empty(cls) -> "OCRResult":
+        """Create a result without any words."""
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_data(cls, data: Dict[str, List[Any]]) -> "OCRResult":
+        """
+        Build a result from image_to_data() output.
+
+        Only word rows with non-blank text are kept.
+
+        Args:
+            data: pytesseract.image_to_data(output_type=Output.DICT) output,
+                or parse_tsv() output
+
+        Returns:
+            OCRResult instance
+        """
+        levels = data.get("level")
+        rows = [
+            index for index, word in enumerate(data["text"])
+            if str(word).strip() and (levels is None or int(levels[index]) == WORD_LEVEL)
+        ]
+        confidences = [float(data["conf"][index]) for index in rows]
+        return cls(
+            words=[str(data["text"][index]).strip() for index in rows],
+            boxes=[
+                (data["left"][index], data["top"][index], data["width"][index], data["height"][index])
+                for index in rows
+            ],
+            blocks=[data["block_num"][index] for index in rows],
+            paragraphs=[data["par_num"][index] for index in rows],
+            lines=[data["line_num"][index] for index in rows],
+            confidences=[conf / 100 if conf >= 0 else math.nan for conf in confidences],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OCRResult":
+        """
+        Rebuild a result saved with to_dict().
+
+        Args:
+            data: Dictionary produced by to_dict()
+
+        Returns:
+            OCRResult instance
+        """
+        return cls(
+            words=data["words"],
+            boxes=data["boxes"],
+            blocks=data["blocks"],
+            paragraphs=data["paragraphs"],
+            lines=data["lines"],
+            confidences=[math.nan if conf is None else conf for conf in data["confidences"]],
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence[Tuple["OCRResult", int, int]]) -> "OCRResult":
+        """
+        Combine results OCR'd from crops of one page.
+
+        Boxes are shifted by each crop's origin and block ids are renumbered
+        so blocks from different crops stay separate.
+
+        Args:
+            parts: (result, left, top) per crop, in reading order
+
+        Returns:
+            OCRResult in page coordinates
+        """
+        parts = [(result, left, top) for result, left, top in parts if len(result)]
+        if not parts:
+            return cls.empty()
+
+        blocks = []
+        block_offset = 0
+        for result, _, _ in parts:
+            blocks.append(result.blocks + block_offset)
+            block_offset = int(blocks[-1].max()) + 1
+        return cls(
+            words=[word for result, _, _ in parts for word in result.words],
+            boxes=np.concatenate([
+                result.boxes + np.array([left, top, 0, 0], dtype=np.int32)
+                for result, left, top in parts
+            ]),
+            blocks=np.concatenate(blocks),
+            paragraphs=np.concatenate([result.paragraphs for result, _, _ in parts]),
+            lines=np.concatenate([result.lines for result, _, _ in parts]),
+            confidences=np.concatenate([result.confidences for result, _, _ in parts]),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the result to JSON-serializable lists.
+
+        Returns:
+            Dictionary containing words, boxes, blocks, paragraphs, lines and
+            confidences (None where unknown)
+        """
+        return {
+            "words": self.words,
+            "boxes": self.boxes.tolist(),
+            "blocks": self.blocks.tolist(),
+            "paragraphs": self.paragraphs.tolist(),
+            "lines": self.lines.tolist(),
+            "confidences": [
+                None if math.isnan(conf) else round(conf, 4) for conf in self.confidences.tolist()
+            ],
+        }
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __repr__(self) -> str:
+        return f"OCRResult({len(self)} words, mean confidence {self.mean_confidence})"
+
+    def word(self, index: int) -> str:
+        """Get the text of one word."""
+        return self._chars[self._offsets[index]:self._offsets[index + 1]]
+
+    @property
+    def words(self) -> List[str]:
+        """Text of every word, in reading order."""
+        offsets = self._offsets.tolist()
+        return [self._chars[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    @property
+    def text(self) -> str:
+        """
+        Page text laid out as image_to_string() does.
+
+        Words are joined with spaces, lines with newlines and paragraphs with
+        a blank line.
+        """
+        if len(self) == 0:
+            return ""
+        words = self.words
+        new_paragraph = (np.diff(self.blocks) != 0) | (np.diff(self.paragraphs) != 0)
+        new_line = new_paragraph | (np.diff(self.lines) != 0)
+
+        text = [words[0]]
+        for index in range(1, len(words)):
+            if new_paragraph[index - 1]:
+                text.append("\n\n")
+            elif new_line[index - 1]:
+                text.append("\n")
+            else:
+                text.append(" ")
+            text.append(words[index])
+        return "".join(text)
+
+    @property
+    def mean_confidence(self) -> Optional[float]:
+        """Mean word confidence from 0.0 to 1.0, or None if no word has one."""
+        known = self.confidences[~np.isnan(self.confidences)]
+        if known.size == 0:
+            return None
+        return round(float(known.mean()), 4)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the result."""
+        return len(self._chars) + sum(
+            column.nbytes
+            for column in (self._offsets, self.boxes, self.blocks, self.paragraphs, self.lines, self.confidences)
+        )
@@ -0,0 +1,66 @@
+"""
+Page fingerprints for skipping OCR of blank and repeated pages.
+
+A fingerprint is computed from the rendered page before any preprocessing:
+- a difference hash (dHash): the page shrunk to hash_size x (hash_size + 1)
+  cells, one bit per pair of horizontally adjacent cells (is the right one
+  brighter?)
+- the page size in pixels
+- the exact number of ink pixels
+
+The hash alone is perceptual, so two pages with the same layout but a
+different price could share it; the ink count tells them apart. Re-renders of
+the same page (the same dessert page in every location's PDF) match exactly.
+The ink density also identifies blank separator pages, which are not OCR'd
+at all.
+"""
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Default page skip options (ocr.page_skip in savvi_config.yaml)
+DEFAULT_PAGE_SKIP: Dict[str, Any] = {
+    "enabled": True,
+    "hash_size": 16,
+    "blank_ink_density": 0.001,
+}
+
+# Pixel values below this count as ink
+INK_LEVEL = 128
+
+
+def dhash(image: Image.Image, hash_size: int = 16) -> str:
+    """
+    Compute the difference hash of a page.
+
+    Args:
+        image: Grayscale ("L") page
+        hash_size: Rows of the hash grid; the hash has hash_size ** 2 bits
+
+    Returns:
+        Hash as a hex string
+    """
+    small = image.resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+    cells = np.asarray(small, dtype=np.int16)
+    return np.packbits(cells[:, 1:] > cells[:, :-1]).tobytes().hex()
+
+
+def fingerprint_page(image: Image.Image, hash_size: int = 16) -> Tuple[str, float]:
+    """
+    Fingerprint a rendered page.
+
+    Args:
+        image: Rendered page
+        hash_size: Rows of the dHash grid
+
+    Returns:
+        Tuple of (fingerprint, ink density), where ink density is the share
+        of pixels darker than INK_LEVEL
+    """
+    if image.mode != "L":
+        image = image.convert("L")
+    ink_pixels = sum(image.histogram()[:INK_LEVEL])
+    fingerprint = f"{dhash(image, hash_size)}-{image.width}x{image.height}-{ink_pixels}"
+    return fingerprint, ink_pixels / (image.width * image.height or 1)
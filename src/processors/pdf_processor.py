@@ -2,23 +2,212 @@
 PDF processing module for handling both text-based and scanned PDFs.
 
 This module provides OCR capabilities for scanned menu PDFs and integrates
-with the MenuParser for text-based PDFs.
+with the MenuParser for text-based PDFs. Coroutine variants of the public
+methods (aprocess(), aconvert_to_images(), aocr_image(), ...) serve callers
+running inside an event loop.
 """
 
+import asyncio
 import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 from PIL import Image
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import convert_from_bytes, convert_from_path
 from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError
+from pdf2image.parsers import parse_buffer_to_pgm
 
-from src.core.menu_parser import MenuParser
+from src.core.menu_parser import (
+    PAGE_EMPTY,
+    PAGE_IMAGE,
+    PAGE_TEXT,
+    MenuParser,
+    group_page_runs,
+    resolve_page_selection,
+)
+from src.core.pdf_source import PDFInput, PDFSource
+from src.processors.ocr_engine import ENGINE_PYTESSERACT, OCREngine, create_ocr_engine
+from src.processors.ocr_result import OCRResult
+from src.processors.page_fingerprint import fingerprint_page
+from src.processors.preprocessing import preprocess_page
+from src.processors.recognition import (
+    LazyOCREngine,
+    find_regions,
+    more_confident,
+    page_rotation,
+    recognize_page,
+    tesseract_not_found_error,
+)
+from src.processors.script_detection import (
+    DEFAULT_LANGUAGE_DETECTION,
+    LATIN,
+    choose_languages,
+    needs_rotation_check,
+    osd_rotation,
+    rotate_upright,
+    score_languages,
+    script_languages,
+)
+from src.processors.time_budget import TimeBudget
 from src.utils.logger import get_logger
-from src.utils.config import get_config
+from src.utils.async_subprocess import run_process
+from src.utils.config import ExtractionCacheConfig, OCRConfig, get_config
+from src.utils.extraction_cache import ExtractionCache, get_configured_extraction_cache
+from src.utils.image_cache import PageImageCache, get_page_image_cache
+from src.utils.memory_budget import DEFAULT_MEMORY_BUDGET, MemoryBudget, estimate_job_bytes, get_memory_budget
+from src.utils.shared_images import SharedImagePool, SharedImageRef, attach_image
 
 logger = get_logger(__name__)
 
+# Fallbacks for settings missing from get_pdf_settings(), so that a partial
+# settings dictionary behaves like the configuration file's defaults
+_OCR_DEFAULTS = OCRConfig()
+_CACHE_DEFAULTS = ExtractionCacheConfig()
+
+# Bump whenever _preprocess_image changes the pixels sent to Tesseract
+PREPROCESSING_VERSION = "2"
+
+# How a page's text was obtained
+METHOD_TEXT = "text"
+METHOD_OCR = "ocr"
+METHOD_OCR_ERROR = "ocr_error"
+METHOD_BLANK = "blank"
+METHOD_TIMEOUT = "timeout"
+
+# Pages are rendered by poppler as 8-bit grayscale PGM on stdout, which
+# pdf2image parses in memory: no PNG encode/decode and no RGB -> L conversion
+RENDER_FORMAT = "ppm"
+RENDER_MODE = "L"
+
+# Maximum seconds Tesseract may spend on one page
+OCR_TIMEOUT = 30
+
+# Cheaper settings for OCR under a deadline, by quality level:
+# (share of the usual DPI, whether pages are preprocessed)
+BUDGET_LEVELS = ((1.0, True), (0.67, True), (0.67, False))
+
+# Pages are never rendered below this resolution to save time
+MIN_BUDGET_DPI = 72
+
+# Marks the end of the page stream between OCR pipeline stages
+_END_OF_PAGES = object()
+
+# How often blocked pipeline stages check whether they were cancelled
+PIPELINE_POLL_SECONDS = 0.1
+
+# Longest the OCR pipeline waits for the next result before giving up on
+# the page it is waiting for: one OCR timeout, and as long again to render it
+PIPELINE_STALL_SECONDS = 2 * OCR_TIMEOUT
+
+# Share of the time left before a deadline that language detection may use
+LANGUAGE_SAMPLE_SHARE = 0.25
+
+# Languages detected in this process, by document hash and detection
+# settings, so that later processors for a document skip sampling even
+# without the extraction cache (least recently used dropped first)
+DETECTED_LANGUAGES_MAX = 256
+_detected_languages: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_detected_languages_lock = threading.Lock()
+
+# OCR engine, preprocessing, region and rotation options owned by an OCR worker process
+_worker_engine: Optional[OCREngine] = None
+_worker_preprocessing: Optional[Dict[str, Any]] = None
+_worker_regions: Optional[Dict[str, Any]] = None
+_worker_orientation: Optional[Dict[str, Any]] = None
+
+
+def _init_ocr_worker(
+    language: str,
+    tesseract_cmd: Optional[str] = None,
+    engine: str = ENGINE_PYTESSERACT,
+    tessdata_path: Optional[str] = None,
+    preprocessing: Optional[Dict[str, Any]] = None,
+    regions: Optional[Dict[str, Any]] = None,
+    orientation: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Create the worker's OCR engine once, when an OCR worker process starts.
+    
+    Args:
+        language: Tesseract language code(s)
+        tesseract_cmd: Path to the tesseract binary, if configured
+        engine: OCR engine name (see create_ocr_engine)
+        tessdata_path: Directory containing .traineddata files, if configured
+        preprocessing: Preprocessing options (see preprocess_page)
+        regions: Text region detection options (see text_regions.py)
+        orientation: Language detection options, for fixing rotated pages
+            (see script_detection.py)
+    """
+    global _worker_engine, _worker_preprocessing, _worker_regions, _worker_orientation
+    # Pages already run in parallel; Tesseract's own threads would oversubscribe the CPUs
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _worker_engine = create_ocr_engine(engine, language, tesseract_cmd, tessdata_path)
+    _worker_preprocessing = preprocessing
+    _worker_regions = regions
+    _worker_orientation = orientation
+
+
+def _ocr_page_worker(
+    page_num: int, image: Any
+) -> Tuple[int, Optional[OCRResult], Optional[str]]:
+    """
+    Preprocess and OCR one page image in a worker process.
+    
+    Args:
+        page_num: 1-based page number
+        image: Rendered page, or its grayscale pixels (see preprocess_page)
+        
+    Returns:
+        Tuple of (page_num, result, error); result is None on failure and
+        error is None on success
+    """
+    try:
+        image = PDFProcessor._preprocess_image(image, _worker_preprocessing)
+        result = recognize_page(
+            _worker_engine, image, _worker_regions, OCR_TIMEOUT, _worker_orientation
+        )
+        return page_num, result, None
+    except Exception as e:
+        return page_num, None, str(e) or type(e).__name__
+
+
+def _ocr_shared_page_worker(
+    page_num: int, ref: SharedImageRef
+) -> Tuple[int, Optional[OCRResult], Optional[str]]:
+    """
+    Preprocess and OCR one page image held in shared memory, in a worker process.
+    
+    The worker reads the pixels in place and closes its mapping when done;
+    the parent process owns the block and unlinks it.
+    
+    Args:
+        page_num: 1-based page number
+        ref: Reference to the rendered page (see SharedImagePool.put)
+        
+    Returns:
+        Tuple of (page_num, result, error), as _ocr_page_worker()
+    """
+    try:
+        block, pixels = attach_image(ref)
+    except Exception as e:
+        return page_num, None, str(e) or type(e).__name__
+    try:
+        return _ocr_page_worker(page_num, pixels)
+    finally:
+        # The view must go before the mapping can be closed
+        pixels = None
+        try:
+            block.close()
+        except BufferError:
+            logger.debug(f"Page {page_num} image still referenced; left mapped until exit")
+
 
 class PDFProcessor:
     """
@@ -32,53 +221,113 @@ class PDFProcessor:
     - Intelligent fallback between text extraction and OCR
     """
     
-    def __init__(self, pdf_path: str, config: Optional[Any] = None):
+    def __init__(self, pdf_path: PDFInput, config: Optional[Any] = None):
         """
-        Initialize PDFProcessor with a PDF file path.
+        Initialize PDFProcessor with a PDF file path or in-memory PDF.
         
         Args:
-            pdf_path: Path to the PDF file to process
+            pdf_path: Path to the PDF file to process, or the PDF itself as
+                bytes, memoryview or a seekable binary stream
             config: Optional Config instance (uses get_config() if not provided)
             
         Raises:
             FileNotFoundError: If PDF file doesn't exist
             ValueError: If PDF file is invalid
+            TypeError: If pdf_path is not a supported input type
         """
-        self.pdf_path = Path(pdf_path)
         self.config = config or get_config()
         
         # Get PDF and OCR settings from config
         pdf_settings = self.config.get_pdf_settings()
-        self.ocr_enabled = pdf_settings.get("ocr_enabled", True)
+        
+        if isinstance(pdf_path, PDFSource):
+            self.source = pdf_path
+        else:
+            self.source = PDFSource(pdf_path, use_mmap=pdf_settings.get("use_mmap", False))
+        self.pdf_path: Optional[Path] = self.source.path
+        self.ocr_enabled = pdf_settings.get("ocr_enabled", _OCR_DEFAULTS.enabled)
         self.tesseract_path = pdf_settings.get("tesseract_path")
-        self.ocr_language = pdf_settings.get("ocr_language", "eng")
-        self.ocr_quality_threshold = pdf_settings.get("ocr_quality_threshold", 0.75)
+        self.ocr_language = pdf_settings.get("ocr_language", _OCR_DEFAULTS.language)
+        self.ocr_quality_threshold = pdf_settings.get("ocr_quality_threshold", _OCR_DEFAULTS.quality_threshold)
+        self.ocr_dpi = pdf_settings.get("ocr_dpi", _OCR_DEFAULTS.dpi)
+        
+        # Adaptive DPI: OCR at low_dpi, redo pages below the quality threshold at high_dpi
+        self.ocr_adaptive_dpi = pdf_settings.get("ocr_adaptive_dpi", _OCR_DEFAULTS.adaptive_dpi)
+        self.ocr_low_dpi = pdf_settings.get("ocr_low_dpi", _OCR_DEFAULTS.low_dpi)
+        self.ocr_high_dpi = pdf_settings.get("ocr_high_dpi", _OCR_DEFAULTS.high_dpi)
+        self.min_chars_per_page = pdf_settings.get("ocr_min_chars_per_page", _OCR_DEFAULTS.min_chars_per_page)
+        
+        # Time allowed for process() (None means no limit)
+        self.ocr_deadline: Optional[float] = pdf_settings.get("ocr_deadline_seconds")
+        
+        # Image preprocessing steps (None means the defaults in preprocessing.py)
+        self.preprocessing: Optional[Dict[str, Any]] = pdf_settings.get("ocr_preprocessing")
+        
+        # Text region detection (None means the whole page is OCR'd)
+        self.text_regions: Optional[Dict[str, Any]] = pdf_settings.get("ocr_regions")
+        
+        # Blank and repeated page skipping (None means every page is OCR'd)
+        self.page_skip: Optional[Dict[str, Any]] = pdf_settings.get("ocr_page_skip")
+        
+        # Per-document language choice and rotation fixing (None means ocr_language for every page)
+        self.language_detection: Optional[Dict[str, Any]] = pdf_settings.get("ocr_language_detection")
+        self._configured_language = self.ocr_language
+        self._language_detected = False
+        
+        # Parallel OCR settings (workers == 0 means one per CPU core)
+        self.ocr_workers = pdf_settings.get("ocr_workers", _OCR_DEFAULTS.workers) or os.cpu_count() or 1
+        
+        # Streaming render -> preprocess -> OCR pipeline
+        self.ocr_pipeline = pdf_settings.get("ocr_pipeline", _OCR_DEFAULTS.pipeline)
+        self.ocr_queue_depth = max(1, pdf_settings.get("ocr_queue_depth", _OCR_DEFAULTS.queue_depth))
+        
+        # OCR engine, created on first use
+        self.ocr_engine_name = pdf_settings.get("ocr_engine", _OCR_DEFAULTS.engine)
+        self.tessdata_path = pdf_settings.get("ocr_tessdata_path")
+        self._ocr_engine = LazyOCREngine(self.ocr_engine_name, self.tesseract_path, self.tessdata_path)
         
         # Set Tesseract path if configured
         if self.tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
         
+        # Persistent extraction cache shared across runs (None when disabled)
+        self._extraction_cache: Optional[ExtractionCache] = get_configured_extraction_cache(pdf_settings)
+        
         # Initialize MenuParser for text extraction
         self._menu_parser: Optional[MenuParser] = None
         
-        # Cache for processed images
-        self._cached_images: Optional[List[Image.Image]] = None
+        # Rendered pages, shared with other processors in this process
+        self._image_cache: Optional[PageImageCache] = None
+        image_cache_mb = pdf_settings.get("image_cache_max_size_mb", _CACHE_DEFAULTS.image_max_size_mb)
+        if image_cache_mb:
+            self._image_cache = get_page_image_cache(image_cache_mb)
+        
+        # Admission control shared with other processors in this process (None means none)
+        self._memory_budget: Optional[MemoryBudget] = None
+        memory_budget = {**DEFAULT_MEMORY_BUDGET, **(pdf_settings.get("memory_budget") or {})}
+        self.memory_min_dpi = memory_budget["min_dpi"]
+        if memory_budget["enabled"]:
+            self._memory_budget = get_memory_budget(memory_budget["max_size_mb"], memory_budget["max_wait_seconds"])
         
-        logger.info(f"Initialized PDFProcessor for: {self.pdf_path}")
+        logger.info(f"Initialized PDFProcessor for: {self.source}")
     
     def _get_menu_parser(self) -> MenuParser:
         """Get or create MenuParser instance."""
         if self._menu_parser is None:
-            self._menu_parser = MenuParser(str(self.pdf_path))
+            self._menu_parser = MenuParser(
+                self.source, config=self.config, extraction_cache=self._extraction_cache
+            )
         return self._menu_parser
     
     def is_scanned_menu(self) -> bool:
         """
         Detect if PDF is image-based (scanned) vs text-based.
         
-        Compares text extraction results with expected page size.
-        If text extraction yields <50 characters per page on average,
-        considers it a scanned PDF.
+        Pages are first classified structurally (fonts, content stream size,
+        full-page images) without extracting any text; the PDF is scanned if
+        image pages outnumber text pages. If the structure can't be read, falls
+        back to text extraction: <50 characters per page on average means
+        scanned.
         
         Returns:
             True if PDF appears to be scanned/image-based, False if text-based
@@ -86,11 +335,24 @@ class PDFProcessor:
         try:
             parser = self._get_menu_parser()
             
+            page_kinds = parser.classify_pages()
+            if self._is_complete_classification(page_kinds):
+                kinds = list(page_kinds.values())
+                text_pages = kinds.count(PAGE_TEXT)
+                image_pages = kinds.count(PAGE_IMAGE)
+                is_scanned = image_pages > text_pages or text_pages == 0
+                logger.debug(
+                    f"PDF scan detection: {text_pages} text / {image_pages} image pages -> "
+                    f"{'scanned' if is_scanned else 'text-based'}"
+                )
+                return is_scanned
+            
             # Check if it's text-based using MenuParser's method
             if parser.is_text_based():
                 return False
             
             # Additional check: extract text and check character count
+            # (the parser caches page text, so process() won't re-extract it)
             page_texts = parser.extract_by_page()
             if not page_texts:
                 return True  # No text found, likely scanned
@@ -99,7 +361,7 @@ class PDFProcessor:
             total_chars = sum(len(text.strip()) for text in page_texts.values())
             avg_chars_per_page = total_chars / len(page_texts) if page_texts else 0
             
-            is_scanned = avg_chars_per_page < 50
+            is_scanned = avg_chars_per_page < self.min_chars_per_page
             logger.debug(
                 f"PDF scan detection: {avg_chars_per_page:.1f} chars/page -> "
                 f"{'scanned' if is_scanned else 'text-based'}"
@@ -111,40 +373,182 @@ class PDFProcessor:
             # Default to assuming it's scanned if we can't determine
             return True
     
-    def convert_to_images(self, dpi: int = 150) -> List[Image.Image]:
+    def _resolve_pages(
+        self,
+        pages: Optional[Iterable[int]],
+        first_page: Optional[int],
+        last_page: Optional[int],
+    ) -> Optional[List[int]]:
+        """
+        Resolve a page selection against the document's page count.
+        
+        Returns:
+            Sorted page numbers, or None when no selection was given (whole document)
+            
+        Raises:
+            ValueError: If any requested page is outside the document
+        """
+        if pages is None and first_page is None and last_page is None:
+            return None
+        page_count = self._get_menu_parser().get_page_count()
+        return resolve_page_selection(page_count, pages, first_page, last_page)
+    
+    def _render(self, dpi: int, **page_bounds: int) -> List[Image.Image]:
+        """
+        Rasterize the PDF (or an inclusive page range of it) with pdf2image.
+        
+        Pages come back as grayscale ("L") images ready for preprocessing.
+        
+        Args:
+            dpi: Resolution for image conversion
+            **page_bounds: Optional first_page/last_page passed to pdf2image
+            
+        Returns:
+            List of PIL Image objects, one per rendered page
+        """
+        if self.source.is_path:
+            return convert_from_path(
+                str(self.pdf_path), dpi=dpi, fmt=RENDER_FORMAT, grayscale=True, **page_bounds
+            )
+        return convert_from_bytes(
+            self.source.read_bytes(), dpi=dpi, fmt=RENDER_FORMAT, grayscale=True, **page_bounds
+        )
+    
+    @staticmethod
+    def _is_complete_classification(page_kinds: Any) -> bool:
+        """Whether classify_pages() returned a usable kind for every page."""
+        return (
+            isinstance(page_kinds, dict)
+            and len(page_kinds) > 0
+            and all(kind in (PAGE_TEXT, PAGE_IMAGE, PAGE_EMPTY) for kind in page_kinds.values())
+        )
+    
+    def convert_to_images(
+        self,
+        dpi: int = 150,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+    ) -> List[Image.Image]:
         """
         Convert PDF pages to images.
         
-        Uses pdf2image to convert each page of the PDF to a PIL Image.
-        Caches results to avoid re-conversion.
+        Uses pdf2image to convert each page of the PDF to a grayscale PIL
+        Image. In-memory PDFs are passed to pdf2image as bytes. Rendered pages are
+        kept in the process-wide page image cache, keyed by document, page,
+        DPI and colour mode, to avoid re-conversion. When a page selection is
+        given only those pages are rendered, one pdf2image call per
+        contiguous run of uncached pages.
         
         Args:
             dpi: Resolution for image conversion (default: 150)
+            pages: Explicit 1-based page numbers to convert
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
             
         Returns:
-            List of PIL Image objects, one per page
+            List of PIL Image objects, one per selected page, in page order
             
         Raises:
-            ValueError: If PDF cannot be converted
+            ValueError: If PDF cannot be converted or pages are out of range
             PDFInfoNotInstalledError: If poppler is not installed
         """
-        if self._cached_images is not None:
-            logger.debug(f"Using cached images ({len(self._cached_images)} pages)")
-            return self._cached_images
+        selected = self._resolve_pages(pages, first_page, last_page)
+        
+        if selected is None:
+            cached = self._get_cached_document(dpi)
+            if cached is not None:
+                return cached
         
         try:
-            logger.info(f"Converting PDF to images at {dpi} DPI")
-            images = convert_from_path(
-                str(self.pdf_path),
-                dpi=dpi,
-                fmt='png'
-            )
+            if selected is None:
+                logger.info(f"Converting PDF to images at {dpi} DPI")
+                images = self._render(dpi)
+                self._put_cached_document(dpi, images)
+                logger.info(f"Converted {len(images)} pages to images")
+                return images
+            
+            images_by_page, missing = self._get_cached_selection(selected, dpi)
+            for run_first, run_last in group_page_runs(missing):
+                images = self._render(dpi, first_page=run_first, last_page=run_last)
+                for page_num, image in zip(range(run_first, run_last + 1), images):
+                    images_by_page[page_num] = image
+                    self._put_cached_image(page_num, dpi, image)
+            
+            return [images_by_page[page_num] for page_num in selected]
+            
+        except PDFInfoNotInstalledError as e:
+            raise self._conversion_error(e) from None
+        except Exception as e:
+            raise self._conversion_error(e) from e
+    
+    def _get_cached_document(self, dpi: int) -> Optional[List[Image.Image]]:
+        """Get every page of the document from the page image cache, if all are there."""
+        if self._image_cache is None:
+            return None
+        page_count = self._image_cache.get_page_count(self.source.doc_id)
+        if page_count is None:
+            return None
+        cached = [self._get_cached_image(page_num, dpi) for page_num in range(1, page_count + 1)]
+        if not all(image is not None for image in cached):
+            return None
+        logger.debug(f"Using cached images ({page_count} pages at {dpi} DPI)")
+        return cached
+    
+    def _put_cached_document(self, dpi: int, images: List[Image.Image]) -> None:
+        """Store every rendered page of the document in the page image cache."""
+        if self._image_cache is not None:
+            self._image_cache.set_page_count(self.source.doc_id, len(images))
+        for page_num, image in enumerate(images, start=1):
+            self._put_cached_image(page_num, dpi, image)
+    
+    def _get_cached_selection(
+        self, selected: List[int], dpi: int
+    ) -> Tuple[Dict[int, Image.Image], List[int]]:
+        """
+        Look up selected pages in the page image cache.
+        
+        Args:
+            selected: Sorted page numbers
+            dpi: Render resolution
             
-            self._cached_images = images
-            logger.info(f"Converted {len(images)} pages to images")
-            return images
+        Returns:
+            Tuple of (cached images by page number, page numbers still to render)
+        """
+        images_by_page = {}
+        for page_num in selected:
+            image = self._get_cached_image(page_num, dpi)
+            if image is not None:
+                images_by_page[page_num] = image
+        
+        missing = [page_num for page_num in selected if page_num not in images_by_page]
+        if missing:
+            logger.info(f"Converting {len(missing)} PDF pages to images at {dpi} DPI")
+        return images_by_page, missing
+    
+    def _get_cached_image(self, page_num: int, dpi: int) -> Optional[Image.Image]:
+        """Look up a rendered page in the shared page image cache."""
+        if self._image_cache is None:
+            return None
+        return self._image_cache.get(self.source.doc_id, page_num, dpi, RENDER_MODE)
+    
+    def _put_cached_image(self, page_num: int, dpi: int, image: Image.Image) -> None:
+        """Store a rendered page in the shared page image cache."""
+        if self._image_cache is not None:
+            self._image_cache.put(self.source.doc_id, page_num, dpi, RENDER_MODE, image)
+    
+    @staticmethod
+    def _conversion_error(error: Exception) -> ValueError:
+        """
+        Log a pdf2image failure and turn it into the ValueError callers expect.
+        
+        Args:
+            error: Exception raised while rendering
             
-        except PDFInfoNotInstalledError:
+        Returns:
+            ValueError to raise
+        """
+        if isinstance(error, PDFInfoNotInstalledError):
             error_msg = (
                 "poppler-utils not installed. Install it with:\n"
                 "  Windows: choco install poppler\n"
@@ -152,57 +556,256 @@ class PDFProcessor:
                 "  Linux: apt-get install poppler-utils"
             )
             logger.error(error_msg)
-            raise ValueError(error_msg) from None
-        except PDFPageCountError as e:
-            logger.error(f"Error reading PDF page count: {e}")
-            raise ValueError(f"Cannot read PDF: {e}") from e
-        except Exception as e:
-            logger.error(f"Error converting PDF to images: {e}", exc_info=True)
-            raise ValueError(f"Error converting PDF to images: {e}") from e
+            return ValueError(error_msg)
+        if isinstance(error, PDFPageCountError):
+            logger.error(f"Error reading PDF page count: {error}")
+            return ValueError(f"Cannot read PDF: {error}")
+        logger.error(f"Error converting PDF to images: {error}", exc_info=error)
+        return ValueError(f"Error converting PDF to images: {error}")
     
-    def _preprocess_image(self, image: Image.Image) -> Image.Image:
+    @staticmethod
+    def _preprocess_image(
+        image: Image.Image, options: Optional[Dict[str, Any]] = None
+    ) -> Image.Image:
         """
         Preprocess image for better OCR accuracy.
         
-        Applies:
+        Applies the steps enabled in ``ocr.preprocessing`` (see
+        preprocessing.py):
         - Grayscale conversion
-        - Contrast enhancement
-        - Noise reduction (basic)
+        - Otsu or adaptive thresholding
+        - Median denoise
+        - Deskew
+        - Margin crop
         
         Args:
             image: PIL Image to preprocess
+            options: Preprocessing options (default: all steps with their defaults)
             
         Returns:
             Preprocessed PIL Image
         """
-        # Convert to grayscale if not already
-        if image.mode != 'L':
-            image = image.convert('L')
+        return preprocess_page(image, options)
+    
+    def _get_ocr_engine(self) -> OCREngine:
+        """Get or create the OCR engine (shared by pipeline threads)."""
+        return self._ocr_engine.get(self.ocr_language)
+    
+    def _detects_language(self) -> bool:
+        """Whether the OCR language is chosen per document (``ocr.language_detection``)."""
+        return bool(self.language_detection) and self.language_detection.get("enabled", True)
+    
+    def _language_detection_options(self) -> Dict[str, Any]:
+        """Get the language detection settings, with defaults for those not configured."""
+        return {**DEFAULT_LANGUAGE_DETECTION, **(self.language_detection or {})}
+    
+    def _detect_language(self, selected: Optional[List[int]] = None, expires_at: Optional[float] = None) -> None:
+        """
+        Choose the OCR language for this document, once, before its first OCR.
+        
+        The choice is kept for the rest of the process and in the extraction
+        cache next to the document's results, so the document is only
+        sampled once. If detection fails or matches no configured language,
+        ``ocr.language`` is used. With a deadline, sampling may use
+        LANGUAGE_SAMPLE_SHARE of the time left; if it runs out, this call
+        uses ``ocr.language`` and a later one without a deadline tries again.
+        
+        Args:
+            selected: Pages about to be OCR'd; the sample is taken from them
+                (default: the whole document)
+            expires_at: Deadline as a time.monotonic() value (None: no limit)
+        """
+        if self._language_detected or not self._detects_language():
+            return
+        self._language_detected = True
+        
+        params = {**self._cache_params(), "stage": "language"}
+        key = (self.source.sha256(), ExtractionCache.params_key(params))
+        with _detected_languages_lock:
+            language = _detected_languages.get(key)
+            if language is not None:
+                _detected_languages.move_to_end(key)
+        if language is None and self._extraction_cache is not None:
+            try:
+                language = self._extraction_cache.get_language(self.source.sha256(), params)
+            except Exception as e:
+                logger.warning(f"Could not read extraction cache: {e}")
+        
+        if language is None:
+            budget = None
+            if expires_at is not None:
+                share = max(0.0, expires_at - time.monotonic()) * LANGUAGE_SAMPLE_SHARE
+                budget = TimeBudget(time.monotonic() + share, 1)
+            try:
+                language = self._sample_language(selected, budget)
+            except TimeoutError as e:
+                logger.warning(f"Language detection cut short, using {self.ocr_language}: {e}")
+                self._language_detected = False
+                return
+            except Exception as e:
+                logger.warning(f"Language detection failed, using {self.ocr_language}: {e}")
+                return
+            if language is None:
+                logger.info(f"No configured language matched the document, using {self.ocr_language}")
+                return
+            if self._extraction_cache is not None:
+                try:
+                    self._extraction_cache.put_language(self.source.sha256(), params, language)
+                except Exception as e:
+                    logger.warning(f"Could not write extraction cache: {e}")
+        
+        with _detected_languages_lock:
+            _detected_languages[key] = language
+            _detected_languages.move_to_end(key)
+            while len(_detected_languages) > DETECTED_LANGUAGES_MAX:
+                _detected_languages.popitem(last=False)
+        
+        logger.info(f"OCR language for this document: {language}")
+        self.ocr_language = language  # The engine is recreated for it on next use
+    
+    @staticmethod
+    def _sample_timeout(budget: Optional[TimeBudget]) -> float:
+        """
+        Get the timeout for one language detection call.
+        
+        Raises:
+            TimeoutError: If the budget for detection has run out
+        """
+        if budget is None:
+            return OCR_TIMEOUT
+        if budget.expired():
+            raise TimeoutError("no time left for language detection")
+        return budget.timeout(OCR_TIMEOUT)
+    
+    def _sample_language(
+        self, selected: Optional[List[int]], budget: Optional[TimeBudget] = None
+    ) -> Optional[str]:
+        """
+        Detect the languages of the first pages with OSD and, for Latin text, common words.
+        
+        Args:
+            selected: Pages to sample from (default: the whole document)
+            budget: Time allowed for sampling (None: OCR_TIMEOUT per call)
+        
+        Returns:
+            Tesseract language code(s), e.g. "spa" or "chi_sim+eng", or None
+            if no configured language matched
+        
+        Raises:
+            TimeoutError: If the budget ran out before the sample was read
+        """
+        options = self._language_detection_options()
+        if selected is None:
+            selected = list(range(1, self._get_menu_parser().get_page_count() + 1))
+        sample = list(selected)[:max(1, options["sample_pages"])]
+        self._sample_timeout(budget)
+        images = self.convert_to_images(dpi=options["dpi"], pages=sample)
+        engine = self._get_ocr_engine()
         
-        # Enhance contrast using point transform
-        from PIL import ImageEnhance
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.5)  # Increase contrast by 50%
+        scripts: Dict[str, float] = {}
+        latin_pages = []
+        for page_num, image in zip(sample, images):
+            try:
+                osd = engine.detect_orientation(image, timeout=self._sample_timeout(budget))
+            except TimeoutError:
+                raise
+            except Exception as e:
+                logger.warning(f"Script detection failed for page {page_num}: {e}")
+                continue
+            logger.debug(
+                f"Page {page_num}: {osd['script']} script ({osd['script_conf']:.1f}), "
+                f"rotated {osd['rotate']} degrees ({osd['orientation_conf']:.1f})"
+            )
+            if osd["script_conf"] < options["min_script_confidence"]:
+                continue
+            scripts[osd["script"]] = scripts.get(osd["script"], 0.0) + osd["script_conf"]
+            if osd["script"] == LATIN:
+                rotate = osd_rotation(osd, options["min_orientation_confidence"])
+                latin_pages.append(rotate_upright(image, rotate))
+        
+        latin = script_languages(LATIN, options["languages"])
+        latin_scores: Dict[str, int] = {}
+        if latin_pages and len(latin) > 1:
+            latin_scores = self._score_latin_sample(latin_pages, latin, budget)
+        if budget is not None and budget.expired():
+            raise TimeoutError("language detection did not finish in time")
+        
+        languages = choose_languages(scripts, latin_scores, options["languages"], options["min_language_share"])
+        return "+".join(languages) or None
+    
+    def _score_latin_sample(
+        self, images: List[Image.Image], languages: List[str], budget: Optional[TimeBudget] = None
+    ) -> Dict[str, int]:
+        """
+        OCR sample pages once with every Latin candidate and score each language's common words.
         
-        # Enhance sharpness
-        enhancer = ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(1.2)  # Increase sharpness by 20%
+        Args:
+            images: Upright sample pages
+            languages: Latin candidate languages
+            budget: Time allowed for sampling (None: OCR_TIMEOUT per call)
         
-        return image
+        Returns:
+            Dictionary mapping language -> common word count (see score_languages())
+        """
+        engine = create_ocr_engine(
+            self.ocr_engine_name, "+".join(languages), self.tesseract_path, self.tessdata_path
+        )
+        try:
+            text = " ".join(
+                engine.recognize(
+                    self._preprocess_image(image, self.preprocessing), timeout=self._sample_timeout(budget)
+                ).text
+                for image in images
+            )
+        finally:
+            engine.close()
+        scores = score_languages(text, languages)
+        logger.debug(f"Common words by language: {scores}")
+        return scores
     
-    def ocr_image(self, image: Image.Image, timeout: int = 30) -> str:
+    def ocr_image(
+        self, image: Image.Image, timeout: int = OCR_TIMEOUT, preprocess: bool = True
+    ) -> str:
         """
         Apply Tesseract OCR to a single image.
         
-        Includes image preprocessing for better accuracy.
+        Includes image preprocessing for better accuracy. This is the text of
+        recognize_image(); use that for word boxes and confidences.
         
         Args:
             image: PIL Image to process
             timeout: Maximum seconds to wait for OCR (default: 30)
+            preprocess: Whether to preprocess the image first (False when the
+                caller already did)
             
         Returns:
             Extracted text string
             
+        Raises:
+            RuntimeError: If Tesseract is not available or OCR fails
+        """
+        return self.recognize_image(image, timeout, preprocess).text
+    
+    def recognize_image(
+        self, image: Image.Image, timeout: int = OCR_TIMEOUT, preprocess: bool = True
+    ) -> OCRResult:
+        """
+        Apply Tesseract OCR to a single image, keeping every word's details.
+        
+        With ``ocr.regions`` enabled, text blocks are detected on a thumbnail
+        of the preprocessed page and only those crops are OCR'd; margins,
+        photos and blank areas never reach Tesseract.
+        
+        Args:
+            image: PIL Image to process
+            timeout: Maximum seconds to wait for OCR (default: 30)
+            preprocess: Whether to preprocess the image first (False when the
+                caller already did)
+            
+        Returns:
+            OCRResult with word text, bounding boxes (in pixels of the
+            preprocessed image), block/paragraph/line ids and confidences
+            
         Raises:
             RuntimeError: If Tesseract is not available or OCR fails
         """
@@ -211,123 +814,1536 @@ class PDFProcessor:
         
         try:
             # Preprocess image
-            processed_image = self._preprocess_image(image)
+            processed_image = self._preprocess_image(image, self.preprocessing) if preprocess else image
             
             logger.debug(f"Running OCR on image ({image.size[0]}x{image.size[1]})")
             
-            # Run OCR with configured language
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang=self.ocr_language,
-                timeout=timeout
+            # Run OCR with configured language, on the text regions only if enabled
+            result = recognize_page(
+                self._get_ocr_engine(), processed_image, self.text_regions, timeout, self.language_detection
             )
             
-            logger.debug(f"OCR extracted {len(text)} characters")
-            return text
+            logger.debug(f"OCR extracted {len(result)} words")
+            return result
             
         except pytesseract.TesseractNotFoundError:
-            error_msg = (
-                "Tesseract OCR not found. Install it with:\n"
-                "  Windows: choco install tesseract\n"
-                "  Mac: brew install tesseract\n"
-                "  Linux: apt-get install tesseract-ocr\n"
-                f"Or set TESSERACT_PATH in .env to: {self.tesseract_path}"
-            )
-            logger.error(error_msg)
-            raise RuntimeError(error_msg) from None
+            raise tesseract_not_found_error(self.tesseract_path) from None
         except Exception as e:
             logger.error(f"OCR error: {e}", exc_info=True)
             raise RuntimeError(f"OCR processing failed: {e}") from e
     
-    def process(self) -> str:
+    def _cache_params(self) -> Dict[str, Any]:
+        """
+        Get the parameters that identify process() results in the extraction cache.
+        
+        Returns:
+            Dictionary of settings that change the extracted text
+        """
+        params = {
+            "stage": "process",
+            "ocr_language": self._configured_language,
+            "dpi": self.ocr_dpi,
+            "preprocessing": PREPROCESSING_VERSION,
+            "preprocessing_options": self.preprocessing,
+            "text_regions": self.text_regions,
+            "page_skip": self.page_skip,
+        }
+        if self.ocr_adaptive_dpi:
+            params["dpi"] = [self.ocr_low_dpi, self.ocr_high_dpi]
+            params["quality_threshold"] = self.ocr_quality_threshold
+        if self._detects_language():
+            # The language is chosen per document from the candidates, so
+            # results depend on every detection setting, defaults included
+            params["language_detection"] = self._language_detection_options()
+        return params
+    
+    def _load_cached_pages(
+        self, selected: Optional[List[int]] = None
+    ) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Look up complete process() results in the persistent extraction cache.
+        
+        Args:
+            selected: Page numbers to look up (default: the whole document)
+        
+        Returns:
+            Per-page results if every requested page is cached, else None
+        """
+        if self._extraction_cache is None:
+            return None
+        
+        try:
+            entry = self._extraction_cache.get_entry(self.source.sha256(), self._cache_params())
+        except Exception as e:
+            logger.warning(f"Could not read extraction cache: {e}")
+            return None
+        
+        if not entry or not entry.get("page_count"):
+            return None
+        if selected is None:
+            selected = range(1, entry["page_count"] + 1)
+        if not set(selected) <= set(entry["pages"]):
+            return None
+        
+        cached = {page_num: self._load_page(entry["pages"][page_num]) for page_num in selected}
+        logger.info(f"Using cached extraction results ({len(cached)} pages)")
+        return cached
+    
+    def _store_cached_pages(
+        self, pages: Dict[int, Dict[str, Any]], page_count: Optional[int] = None
+    ) -> None:
+        """
+        Save successfully processed pages to the persistent extraction cache.
+        
+        Args:
+            pages: Per-page results
+            page_count: Total pages in the document (default: len(pages), i.e.
+                pages covers the whole document)
+        """
+        if self._extraction_cache is None:
+            return
+        
+        successful = {}
+        for page_num, page in pages.items():
+            # Failed, unfinished and degraded pages are worth another try next time
+            if page["method"] not in (METHOD_OCR_ERROR, METHOD_TIMEOUT) and not page.get("degraded"):
+                successful[page_num] = self._dump_page(page)
+        try:
+            self._extraction_cache.put_pages(
+                self.source.sha256(),
+                self._cache_params(),
+                successful,
+                page_count=page_count if page_count is not None else len(pages),
+            )
+        except Exception as e:
+            logger.warning(f"Could not write extraction cache: {e}")
+    
+    @staticmethod
+    def _dump_page(page: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a page result to JSON-serializable values for the extraction cache."""
+        if "words" in page:
+            return dict(page, words=page["words"].to_dict())
+        return page
+    
+    @staticmethod
+    def _load_page(page: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a page result saved with _dump_page()."""
+        page = dict(page)
+        if "words" in page:
+            page["words"] = OCRResult.from_dict(page["words"])
+        return page
+    
+    def _screen_page(
+        self, image: Image.Image, dpi: int
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Fingerprint a rendered page and look for a result that makes OCR unnecessary.
+        
+        Args:
+            image: Rendered page
+            dpi: Resolution the page was rendered at
+            
+        Returns:
+            Tuple of (fingerprint, result); the fingerprint is None when page
+            skipping is off, and the result is None unless the page is blank
+            or its fingerprint is in the extraction cache
+        """
+        if not self.page_skip or not self.page_skip.get("enabled", True):
+            return None, None
+        
+        fingerprint, ink_density = fingerprint_page(image, self.page_skip.get("hash_size", 16))
+        if ink_density < self.page_skip.get("blank_ink_density", 0.001):
+            return fingerprint, {"text": "", "method": METHOD_BLANK, "dpi": dpi}
+        
+        if self._extraction_cache is not None:
+            try:
+                cached = self._extraction_cache.get_page(fingerprint, self._cache_params())
+            except Exception as e:
+                logger.warning(f"Could not read extraction cache: {e}")
+                cached = None
+            if cached is not None:
+                return fingerprint, self._load_page(cached)
+        return fingerprint, None
+    
+    def _store_fingerprinted_page(self, fingerprint: Optional[str], page: Dict[str, Any]) -> None:
+        """Save a freshly OCR'd page under its fingerprint in the extraction cache."""
+        if fingerprint is None or self._extraction_cache is None or page["method"] != METHOD_OCR:
+            return
+        if page.get("degraded"):
+            return
+        try:
+            self._extraction_cache.put_page(fingerprint, self._cache_params(), self._dump_page(page))
+        except Exception as e:
+            logger.warning(f"Could not write extraction cache: {e}")
+    
+    @staticmethod
+    def _format_pages(pages: Dict[int, Dict[str, Any]]) -> str:
+        """
+        Join per-page results into the "--- Page N ---" text layout.
+        
+        Args:
+            pages: Dictionary mapping page_number -> {"text": str, "method": str}
+            
+        Returns:
+            Full text with page breaks marked
+        """
+        full_text = []
+        for page_num, page in sorted(pages.items()):
+            if page["method"] == METHOD_OCR_ERROR:
+                full_text.append(f"\n--- Page {page_num} (OCR error) ---\n")
+                continue
+            if page["method"] == METHOD_TIMEOUT:
+                full_text.append(f"\n--- Page {page_num} (not processed: deadline reached) ---\n")
+                continue
+            if page_num > 1:
+                full_text.append(f"\n--- Page {page_num} ---\n")
+            full_text.append(page["text"])
+        return "".join(full_text)
+    
+    def process(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
         """
-        Intelligently process PDF (text-based or scanned).
+        Intelligently process PDF (text-based, scanned or a mix of both).
         
-        Tries text extraction first. If that yields <50 characters per page,
-        falls back to OCR processing.
+        Each page is routed on its own: pages with enough extractable text
+        keep it, the rest are OCR'd (see process_pages()). With a page
+        selection only those pages are extracted, rasterized and OCR'd.
+        
+        Args:
+            pages: Explicit 1-based page numbers to process
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            deadline: Seconds allowed for the whole call (default:
+                ``ocr.deadline_seconds``); pages not done in time are marked
+                in the text instead of being waited for
         
         Returns:
             Full extracted text from PDF
             
+        Raises:
+            ValueError: If PDF cannot be processed or pages are out of range
+            RuntimeError: If OCR is required but not available
+        """
+        return self._format_pages(self.process_pages(pages, first_page, last_page, deadline))
+    
+    def process_pages(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Extract each page with text extraction or OCR, whichever it needs.
+        
+        Checks the persistent extraction cache first. Otherwise extracts text
+        and OCRs only the pages with fewer than ``ocr.min_chars_per_page``
+        characters (e.g. a scanned wine list inside a text menu).
+        
+        With a deadline, OCR spreads the time left over the pages (see
+        _ocr_pages_within()): it drops to a lower DPI, then skips
+        preprocessing, when pages are taking too long, and pages not started
+        before the deadline are returned as METHOD_TIMEOUT rather than
+        waited for. Language detection and waiting for memory are bounded
+        by the time left too.
+        
+        Args:
+            pages: Explicit 1-based page numbers to process
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            deadline: Seconds allowed for the whole call (default:
+                ``ocr.deadline_seconds``; None means no limit)
+        
+        Returns:
+            Dictionary mapping page_number -> {"text": str, "method": str},
+            where method is "text", "ocr", "ocr_error", "blank" or "timeout";
+            OCR'd pages also report their "confidence", render "dpi" and
+            "words" (see _ocr_pages()), and "degraded" if cheaper settings
+            were used to meet the deadline
+            
+        Raises:
+            ValueError: If PDF cannot be processed or pages are out of range
+            RuntimeError: If OCR is required but not available
+        """
+        if deadline is None:
+            deadline = self.ocr_deadline
+        expires_at = time.monotonic() + deadline if deadline is not None else None
+        selected = self._resolve_pages(pages, first_page, last_page)
+        
+        results = self._load_cached_pages(selected)
+        if results is None:
+            results = self._process_pages(selected, expires_at)
+            if selected is None:
+                self._store_cached_pages(results)
+            else:
+                self._store_cached_pages(results, self._get_menu_parser().get_page_count())
+        
+        return results
+    
+    def _process_pages(
+        self, selected: Optional[List[int]] = None, expires_at: Optional[float] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Extract pages with text extraction, OCRing the pages that lack text.
+        
+        Args:
+            selected: Page numbers to extract (default: every page)
+            expires_at: Deadline as a time.monotonic() value (None: no limit)
+        
+        Returns:
+            Dictionary mapping page_number -> {"text": str, "method": str}
+            
         Raises:
             ValueError: If PDF cannot be processed
             RuntimeError: If OCR is required but not available
         """
         try:
-            parser = self._get_menu_parser()
-            
             # Try text extraction first
-            logger.info("Attempting text extraction from PDF")
-            page_texts = parser.extract_by_page()
-            
-            if not page_texts:
-                logger.warning("No text extracted, treating as scanned PDF")
-                return self._process_with_ocr()
+            results, deficient = self._route_pages(self._extract_page_texts(selected))
+            if deficient is None:
+                return self._ocr_pages(selected, expires_at)
+            if not deficient:
+                return results
             
-            # Check if we have enough text
-            total_chars = sum(len(text.strip()) for text in page_texts.values())
-            avg_chars_per_page = total_chars / len(page_texts)
-            
-            if avg_chars_per_page >= 50:
-                # Good text extraction, use it
-                logger.info(
-                    f"Text extraction successful: {avg_chars_per_page:.1f} chars/page"
-                )
-                full_text = []
-                for page_num, text in sorted(page_texts.items()):
-                    if page_num > 1:
-                        full_text.append(f"\n--- Page {page_num} ---\n")
-                    full_text.append(text)
-                return "".join(full_text)
-            else:
-                # Low text count, likely scanned - use OCR
-                logger.info(
-                    f"Low text count ({avg_chars_per_page:.1f} chars/page), "
-                    "using OCR"
-                )
-                return self._process_with_ocr()
+            try:
+                ocr_results = self._ocr_pages(deficient, expires_at)
+            except Exception as e:
+                # The text pages are still good; don't throw them away
+                logger.warning(f"OCR of low-text pages failed, keeping extracted text: {e}")
+                return results
+            return self._merge_ocr_pages(results, ocr_results)
                 
         except Exception as e:
             logger.error(f"Error processing PDF: {e}", exc_info=True)
             # Try OCR as fallback
             logger.info("Attempting OCR as fallback")
             try:
-                return self._process_with_ocr()
+                return self._ocr_pages(selected, expires_at)
             except Exception as ocr_error:
                 raise ValueError(
                     f"Failed to process PDF with both text extraction and OCR: "
                     f"{ocr_error}"
                 ) from ocr_error
     
-    def _process_with_ocr(self) -> str:
+    def _extract_page_texts(self, selected: Optional[List[int]]) -> Dict[int, str]:
+        """Extract the text layer of the selected pages (default: every page)."""
+        parser = self._get_menu_parser()
+        logger.info("Attempting text extraction from PDF")
+        if selected is None:
+            return parser.extract_by_page()
+        return parser.extract_by_page(pages=selected)
+    
+    def _route_pages(
+        self, page_texts: Dict[int, str]
+    ) -> Tuple[Dict[int, Dict[str, Any]], Optional[List[int]]]:
         """
-        Process PDF using OCR.
+        Decide which pages keep their extracted text and which need OCR.
         
-        Returns:
-            Full extracted text from OCR
+        Args:
+            page_texts: Dictionary mapping page_number -> extracted text
             
-        Raises:
-            RuntimeError: If OCR is disabled but required
+        Returns:
+            Tuple of (text results, pages to OCR); pages to OCR is None when
+            the whole selection should be OCR'd (likely a scanned PDF) and
+            empty when no page needs OCR
         """
+        if not page_texts:
+            logger.warning("No text extracted, treating as scanned PDF")
+            return {}, None
+        
+        results = {
+            page_num: {"text": text, "method": METHOD_TEXT}
+            for page_num, text in page_texts.items()
+        }
+        deficient = sorted(
+            page_num for page_num, text in page_texts.items()
+            if len(text.strip()) < self.min_chars_per_page
+        )
+        
+        if not deficient:
+            logger.info(f"Text extraction successful for all {len(results)} pages")
+            return results, []
+        
+        if len(deficient) == len(page_texts):
+            # Every page needs OCR, likely scanned
+            logger.info("Low text count on every page, using OCR")
+            return results, None
+        
         if not self.ocr_enabled:
-            raise RuntimeError("OCR is disabled but required for this PDF")
+            logger.warning(
+                f"{len(deficient)} pages have little text but OCR is disabled; "
+                "keeping extracted text"
+            )
+            return results, []
         
-        logger.info("Processing PDF with OCR")
-        images = self.convert_to_images()
+        logger.info(
+            f"Text extraction successful for {len(results) - len(deficient)} pages, "
+            f"using OCR for {len(deficient)} pages"
+        )
+        return results, deficient
+    
+    @staticmethod
+    def _merge_ocr_pages(
+        results: Dict[int, Dict[str, Any]], ocr_results: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Replace low-text pages with their OCR results where OCR found more.
         
-        full_text = []
-        for page_num, image in enumerate(images, start=1):
+        Args:
+            results: Text extraction results, updated in place
+            ocr_results: OCR results for the low-text pages
+            
+        Returns:
+            results
+        """
+        for page_num, ocr_page in ocr_results.items():
+            extracted = results[page_num]["text"]
+            # Keep the text layer when OCR fails, runs out of time or finds less than it
+            if ocr_page["method"] in (METHOD_OCR_ERROR, METHOD_TIMEOUT) and extracted.strip():
+                continue
+            if len(ocr_page["text"].strip()) < len(extracted.strip()):
+                continue
+            results[page_num] = ocr_page
+        return results
+    
+    def _process_with_ocr(self) -> str:
+        """
+        Process PDF using OCR.
+        
+        Returns:
+            Full extracted text from OCR
+            
+        Raises:
+            RuntimeError: If OCR is disabled but required
+        """
+        result = self._format_pages(self._ocr_pages())
+        logger.info(f"OCR processing complete: {len(result)} characters extracted")
+        return result
+    
+    def _ocr_pages(
+        self, selected: Optional[List[int]] = None, expires_at: Optional[float] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        OCR pages of the PDF.
+        
+        With ``ocr.adaptive_dpi`` every page is first OCR'd at
+        ``ocr.low_dpi``; only pages whose mean word confidence is below
+        ``ocr.quality_threshold`` (or where no words were found) are rendered
+        again at ``ocr.high_dpi`` and OCR'd a second time, keeping whichever
+        pass was more confident. Otherwise pages are OCR'd once at ``ocr.dpi``.
+        With a deadline, pages are OCR'd once by _ocr_pages_within().
+        
+        Args:
+            selected: Page numbers to OCR (default: every page)
+            expires_at: Deadline as a time.monotonic() value (None: no limit)
+        
+        Returns:
+            Dictionary mapping page_number -> {"text": str, "method": str,
+            "confidence": float or None, "dpi": int, "words": OCRResult};
+            pages that fail are marked with METHOD_OCR_ERROR, blank pages
+            skipped by ``ocr.page_skip`` with METHOD_BLANK and pages not done
+            before the deadline with METHOD_TIMEOUT
+            
+        Raises:
+            RuntimeError: If OCR is disabled but required
+        """
+        if not self.ocr_enabled:
+            raise RuntimeError("OCR is disabled but required for this PDF")
+        
+        self._detect_language(selected, expires_at)
+        if expires_at is not None:
+            return self._ocr_pages_within(selected, expires_at)
+        if not self.ocr_adaptive_dpi:
+            return self._ocr_pass(selected, self.ocr_dpi)
+        
+        pages = self._ocr_pass(selected, self.ocr_low_dpi)
+        retry = self._low_confidence_pages(pages)
+        if not retry:
+            return pages
+        
+        try:
+            retried = self._ocr_pass(retry, self.ocr_high_dpi)
+        except Exception as e:
+            logger.warning(f"High-DPI OCR pass failed, keeping low-DPI results: {e}")
+            return pages
+        return self._keep_better_pages(pages, retried)
+    
+    def _low_confidence_pages(self, pages: Dict[int, Dict[str, Any]]) -> List[int]:
+        """Find the pages of a low-DPI pass that adaptive DPI should OCR again."""
+        retry = [
+            page_num for page_num, page in pages.items()
+            if page["method"] == METHOD_OCR
+            and (page["confidence"] is None or page["confidence"] < self.ocr_quality_threshold)
+        ]
+        if retry:
+            logger.info(
+                f"{len(retry)} of {len(pages)} pages below OCR confidence "
+                f"{self.ocr_quality_threshold:.2f} at {self.ocr_low_dpi} DPI, "
+                f"retrying at {self.ocr_high_dpi} DPI"
+            )
+        return retry
+    
+    @staticmethod
+    def _keep_better_pages(
+        pages: Dict[int, Dict[str, Any]], retried: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Replace low-DPI pages with their high-DPI results where those are at least as confident."""
+        for page_num, page in retried.items():
+            if page["method"] == METHOD_OCR_ERROR:
+                continue
+            if (page["confidence"] or 0.0) >= (pages[page_num]["confidence"] or 0.0):
+                pages[page_num] = page
+        return pages
+    
+    def _ocr_pages_within(
+        self, selected: Optional[List[int]], expires_at: float
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        OCR pages one at a time against a deadline, in ``ocr.workers`` threads.
+        
+        Each page is rendered and OCR'd at the quality level a TimeBudget
+        picks for it (see BUDGET_LEVELS): the usual DPI (``ocr.low_dpi``
+        with adaptive DPI, whose high-DPI retry is skipped), then a lower
+        DPI, then a lower DPI without preprocessing, as pages fall behind the
+        time left. Pages not started by the deadline are not rendered at all.
+        The pytesseract engine's calls are cut off at the deadline; the
+        in-process tesserocr engine can't be interrupted, so a page it has
+        started finishes past it. Waiting for memory is capped at the time
+        left (see _admit_memory()). Degraded results, including pages the
+        memory budget downscaled, are marked and are not written to the
+        extraction cache.
+        
+        Args:
+            selected: Page numbers to OCR (default: every page)
+            expires_at: Deadline as a time.monotonic() value
+        
+        Returns:
+            Per-page OCR results, as returned by _ocr_pages(), in page order
+        """
+        if selected is None:
+            selected = list(range(1, self._get_menu_parser().get_page_count() + 1))
+        workers = max(1, min(self.ocr_workers, len(selected)))
+        budget = TimeBudget(expires_at, len(selected), workers, len(BUDGET_LEVELS))
+        base_dpi = self.ocr_low_dpi if self.ocr_adaptive_dpi else self.ocr_dpi
+        logger.info(
+            f"OCR of {len(selected)} pages with {budget.remaining():.1f}s left "
+            f"({workers} threads, starting at {base_dpi} DPI)"
+        )
+        
+        first_pages: Dict[str, int] = {}
+        repeats: Dict[int, int] = {}
+        lock = threading.Lock()
+        
+        def ocr_page(page_num: int, base_dpi: int, downscaled: bool) -> Optional[Dict[str, Any]]:
+            # Returns None for a page identical to an earlier one (see repeats)
+            level = budget.start_page()
+            if level is None:
+                return {"text": "", "method": METHOD_TIMEOUT}
+            dpi, preprocess = self._budget_settings(base_dpi, level)
+            started = time.monotonic()
             try:
-                page_text = self.ocr_image(image)
-                if page_num > 1:
-                    full_text.append(f"\n--- Page {page_num} ---\n")
-                full_text.append(page_text)
+                image = self.convert_to_images(dpi=dpi, pages=[page_num])[0]
+                fingerprint, known = self._screen_page(image, dpi)
+                if known is not None:
+                    return known
+                with lock:
+                    original = first_pages.setdefault(fingerprint, page_num) if fingerprint else page_num
+                if original != page_num:
+                    repeats[page_num] = original
+                    return None
+                result = self.recognize_image(image, budget.timeout(OCR_TIMEOUT), preprocess)
+            except Exception as e:
+                if budget.expired():
+                    logger.warning(f"Deadline reached while processing page {page_num}: {e}")
+                    return {"text": "", "method": METHOD_TIMEOUT}
+                logger.error(f"OCR failed for page {page_num}: {e}")
+                return {"text": "", "method": METHOD_OCR_ERROR}
+            finally:
+                budget.finish_page(level, time.monotonic() - started)
+            
+            page = self._ocr_page(result, dpi)
+            if level > 0 or downscaled:
+                page["degraded"] = True
+            logger.debug(f"OCR completed for page {page_num} (quality level {level})")
+            return page
+        
+        with self._reserved_memory(selected, base_dpi, workers, budget.remaining()) as admitted_dpi, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-deadline") as executor:
+            pages = {
+                page_num: page
+                for page_num, page in zip(selected, executor.map(
+                    lambda page_num: ocr_page(page_num, admitted_dpi, admitted_dpi < base_dpi), selected
+                ))
+                if page is not None
+            }
+        
+        unfinished = sum(page["method"] == METHOD_TIMEOUT for page in pages.values())
+        if unfinished:
+            logger.warning(f"Deadline reached: {unfinished} of {len(selected)} pages not processed")
+        elif budget.level > 0:
+            logger.info(f"Met the deadline at quality level {budget.level}")
+        return self._finish_screened_pages(pages, first_pages, repeats)
+    
+    @staticmethod
+    def _budget_settings(base_dpi: int, level: int) -> Tuple[int, bool]:
+        """
+        Get the render DPI and whether to preprocess at a TimeBudget quality level.
+        
+        Args:
+            base_dpi: DPI at level 0
+            level: Index into BUDGET_LEVELS
+        
+        Returns:
+            Tuple of (DPI, never below MIN_BUDGET_DPI unless base_dpi is;
+            whether pages are preprocessed)
+        """
+        dpi_share, preprocess = BUDGET_LEVELS[level]
+        dpi = max(MIN_BUDGET_DPI, round(base_dpi * dpi_share)) if dpi_share < 1 else base_dpi
+        return dpi, preprocess
+    
+    def _admit_memory(
+        self,
+        selected: Optional[List[int]],
+        dpi: int,
+        resident_pages: Optional[int] = None,
+        max_wait: Optional[float] = None,
+    ) -> Tuple[Optional[int], int]:
+        """
+        Reserve the estimated memory of rendering and OCRing pages in the shared budget.
+        
+        Blocks while the budget is full, for at most max_wait seconds; the
+        job may be admitted at a lower DPI (see MemoryBudget.admit()).
+        
+        Args:
+            selected: Page numbers about to be rendered (default: every page)
+            dpi: Requested render resolution
+            resident_pages: Most rendered pages held at once (default: all of
+                them, twice with parallel OCR, which copies each page to
+                shared memory)
+            max_wait: Longest to wait for memory, e.g. the time left before a
+                deadline (None: the budget's ``max_wait_seconds``)
+        
+        Returns:
+            Tuple of (ticket for the budget's release(), or None without a
+            budget; DPI to render at)
+        """
+        if self._memory_budget is None:
+            return None, dpi
+        page_sizes = self._get_menu_parser().get_page_sizes(selected)
+        if resident_pages is None:
+            resident_pages = len(page_sizes) * (2 if self.ocr_workers > 1 else 1)
+        job_bytes = estimate_job_bytes(page_sizes.values(), dpi, resident_pages, self.ocr_workers)
+        return self._memory_budget.admit(
+            job_bytes, dpi, self.memory_min_dpi, name=f"OCR of {self.source}", max_wait=max_wait
+        )
+    
+    def _release_memory(self, ticket: Optional[int]) -> None:
+        """Give back a reservation made by _admit_memory()."""
+        if ticket is not None:
+            self._memory_budget.release(ticket)
+    
+    @contextmanager
+    def _reserved_memory(
+        self,
+        selected: Optional[List[int]],
+        dpi: int,
+        resident_pages: Optional[int] = None,
+        max_wait: Optional[float] = None,
+    ) -> Iterator[int]:
+        """Hold a memory reservation (see _admit_memory()) for a with block, yielding the DPI to use."""
+        ticket, admitted_dpi = self._admit_memory(selected, dpi, resident_pages, max_wait)
+        try:
+            yield admitted_dpi
+        finally:
+            self._release_memory(ticket)
+    
+    @staticmethod
+    def _mark_downscaled(pages: Dict[int, Dict[str, Any]], admitted_dpi: int, dpi: int) -> Dict[int, Dict[str, Any]]:
+        """Mark OCR results of a pass the memory budget downscaled, so they are not cached."""
+        if admitted_dpi < dpi:
+            for page in pages.values():
+                if page["method"] == METHOD_OCR:
+                    page["degraded"] = True
+        return pages
+    
+    def _ocr_pass(self, selected: Optional[List[int]], dpi: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Render pages at one resolution and OCR them.
+        
+        Args:
+            selected: Page numbers to OCR (default: every page)
+            dpi: Render resolution
+        
+        Returns:
+            Per-page OCR results, as returned by _ocr_pages()
+        """
+        if self.ocr_pipeline:
+            return dict(self.iter_ocr_pages(pages=selected, dpi=dpi))
+        
+        with self._reserved_memory(selected, dpi) as admitted_dpi:
+            logger.info(f"Processing PDF with OCR at {admitted_dpi} DPI")
+            if selected is None:
+                images = self.convert_to_images(dpi=admitted_dpi)
+                page_numbers = range(1, len(images) + 1)
+            else:
+                images = self.convert_to_images(dpi=admitted_dpi, pages=selected)
+                page_numbers = selected
+            
+            pages = self._ocr_images(dict(zip(page_numbers, images)), admitted_dpi)
+        return self._mark_downscaled(pages, admitted_dpi, dpi)
+    
+    @staticmethod
+    def _ocr_page(result: OCRResult, dpi: int) -> Dict[str, Any]:
+        """Build the result entry for a successfully OCR'd page."""
+        return {
+            "text": result.text,
+            "method": METHOD_OCR,
+            "confidence": result.mean_confidence,
+            "dpi": dpi,
+            "words": result,
+        }
+    
+    def _ocr_images(
+        self, images: Dict[int, Image.Image], dpi: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        OCR rendered pages, in parallel when ``ocr.workers`` > 1.
+        
+        With ``ocr.page_skip`` enabled, blank pages are not OCR'd, pages
+        identical to an earlier page reuse its result, and pages whose
+        fingerprint is in the extraction cache reuse the cached result.
+        
+        Args:
+            images: Dictionary mapping page_number -> rendered page
+            dpi: Resolution the pages were rendered at (default: ``ocr.dpi``)
+            
+        Returns:
+            Per-page OCR results, as returned by _ocr_pages(), in page order;
+            pages that fail are marked with METHOD_OCR_ERROR
+        """
+        dpi = dpi or self.ocr_dpi
+        pages, pending, first_pages, repeats = self._screen_pages(images, dpi)
+        
+        workers = min(self.ocr_workers, len(pending))
+        if workers >= 2:
+            self._ocr_images_parallel(pending, workers, pages, dpi)
+        
+        for page_num, image in pending.items():
+            if page_num in pages:
+                continue
+            try:
+                pages[page_num] = self._ocr_page(self.recognize_image(image), dpi)
                 logger.debug(f"OCR completed for page {page_num}")
             except Exception as e:
                 logger.error(f"OCR failed for page {page_num}: {e}")
-                full_text.append(f"\n--- Page {page_num} (OCR error) ---\n")
+                pages[page_num] = {"text": "", "method": METHOD_OCR_ERROR}
         
-        result = "".join(full_text)
-        logger.info(f"OCR processing complete: {len(result)} characters extracted")
-        return result
-
+        return self._finish_screened_pages(pages, first_pages, repeats)
+    
+    def _screen_pages(
+        self, images: Dict[int, Image.Image], dpi: int
+    ) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, Image.Image], Dict[str, int], Dict[int, int]]:
+        """
+        Sort rendered pages into those that need OCR and those that don't.
+        
+        Args:
+            images: Dictionary mapping page_number -> rendered page
+            dpi: Resolution the pages were rendered at
+            
+        Returns:
+            Tuple of (results of blank and cached pages, pages to OCR,
+            fingerprint -> first page with it, repeated page -> identical
+            earlier page)
+        """
+        pages: Dict[int, Dict[str, Any]] = {}
+        first_pages: Dict[str, int] = {}
+        repeats: Dict[int, int] = {}
+        pending: Dict[int, Image.Image] = {}
+        for page_num, image in images.items():
+            fingerprint, known = self._screen_page(image, dpi)
+            if known is not None:
+                pages[page_num] = known
+            elif fingerprint in first_pages:
+                repeats[page_num] = first_pages[fingerprint]
+            else:
+                if fingerprint is not None:
+                    first_pages[fingerprint] = page_num
+                pending[page_num] = image
+        if len(pending) < len(images):
+            logger.info(
+                f"Skipping OCR for {len(images) - len(pending)} of {len(images)} pages "
+                f"({len(repeats)} repeated, {len(pages)} blank or cached)"
+            )
+        return pages, pending, first_pages, repeats
+    
+    def _finish_screened_pages(
+        self,
+        pages: Dict[int, Dict[str, Any]],
+        first_pages: Dict[str, int],
+        repeats: Dict[int, int],
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Cache new OCR results by fingerprint and fill in repeated pages.
+        
+        Args:
+            pages: Per-page results, updated in place
+            first_pages: Fingerprint -> first page with it (from _screen_pages())
+            repeats: Repeated page -> identical earlier page (from _screen_pages())
+            
+        Returns:
+            Per-page results in page order
+        """
+        for fingerprint, page_num in first_pages.items():
+            self._store_fingerprinted_page(fingerprint, pages[page_num])
+        for page_num, original in repeats.items():
+            pages[page_num] = dict(pages[original])
+        return dict(sorted(pages.items()))
+    
+    def _ocr_images_parallel(
+        self,
+        images: Dict[int, Image.Image],
+        workers: int,
+        pages: Dict[int, Dict[str, Any]],
+        dpi: int,
+    ) -> None:
+        """
+        OCR pages with a process pool, one task per page.
+        
+        Pages reach the workers through shared memory rather than being
+        pickled: each page is copied once into a block that the workers read
+        in place, and the block is unlinked as soon as its page is done (or
+        when the pool fails). Pages are only copied in as workers free up,
+        so the pool holds at most one page per worker. Fills ``pages`` as results arrive. If the pool
+        itself fails, the pages it did not finish are left for the caller to
+        OCR serially.
+        
+        Args:
+            images: Dictionary mapping page_number -> rendered page
+            workers: Number of worker processes
+            pages: Results dictionary to fill
+            dpi: Resolution the pages were rendered at
+        """
+        logger.info(f"Running OCR on {len(images)} pages with {workers} workers")
+        try:
+            with SharedImagePool() as shared, ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_ocr_worker,
+                initargs=(
+                    self.ocr_language,
+                    self.tesseract_path,
+                    self.ocr_engine_name,
+                    self.tessdata_path,
+                    self.preprocessing,
+                    self.text_regions,
+                    self.language_detection,
+                ),
+            ) as executor:
+                queued = iter(images.items())
+                running: Dict[Future, SharedImageRef] = {}
+                while True:
+                    # Copy a page into shared memory only when a worker is
+                    # free to take it, so at most one page per worker is held
+                    while len(running) < workers:
+                        page_num, image = next(queued, (None, None))
+                        if image is None:
+                            break
+                        ref = shared.put(image)
+                        running[executor.submit(_ocr_shared_page_worker, page_num, ref)] = ref
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shared.release(running.pop(future))
+                        page_num, result, error = future.result()
+                        if error is None:
+                            pages[page_num] = self._ocr_page(result, dpi)
+                            logger.debug(f"OCR completed for page {page_num}")
+                        else:
+                            logger.error(f"OCR failed for page {page_num}: {error}")
+                            pages[page_num] = {"text": "", "method": METHOD_OCR_ERROR}
+        except Exception as e:
+            logger.warning(f"Parallel OCR failed, continuing serially: {e}")
+    
+    def iter_ocr_pages(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        dpi: Optional[int] = None,
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        OCR pages through a streaming render -> preprocess -> OCR pipeline.
+        
+        Each stage runs in its own thread (OCR in ``ocr.workers`` threads
+        sharing the processor's OCR engine: pytesseract starts a Tesseract
+        process per page, tesserocr gives each thread its own in-process
+        API) and stages are connected by queues of ``ocr.queue_depth`` pages. Pages are rendered one at a time and
+        dropped as soon as their text is produced, so peak memory depends on
+        the queue depth rather than the page count, and the first page is
+        available after a single render. Pages already in the page image
+        cache are reused, but new renders are not added to it. Blank and
+        repeated pages are skipped as in _ocr_images().
+        
+        Args:
+            pages: Explicit 1-based page numbers to OCR
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            dpi: Render resolution (default: ``ocr.dpi``)
+            
+        Returns:
+            Iterator of (page_number, result) in page order, with results as
+            returned by _ocr_pages(); pages that fail, or whose result takes
+            longer than PIPELINE_STALL_SECONDS to arrive, are marked with
+            METHOD_OCR_ERROR. Closing the iterator early stops the pipeline.
+            
+        Raises:
+            RuntimeError: If OCR is disabled
+            ValueError: If pages are out of range or poppler is missing
+        """
+        if not self.ocr_enabled:
+            raise RuntimeError("OCR is disabled but required for this PDF")
+        
+        selected = self._resolve_pages(pages, first_page, last_page)
+        if selected is None:
+            selected = list(range(1, self._get_menu_parser().get_page_count() + 1))
+        
+        self._detect_language(selected)
+        return self._admitted_ocr_pipeline(selected, dpi or self.ocr_dpi)
+    
+    def _admitted_ocr_pipeline(
+        self, selected: List[int], dpi: int
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Run the OCR pipeline once the memory budget admits it.
+        
+        The reservation covers the pages the pipeline's queues and stage
+        threads can hold, not the whole document, and is held until the
+        iterator is exhausted or closed.
+        
+        Args:
+            selected: Sorted page numbers to OCR
+            dpi: Requested render resolution
+            
+        Yields:
+            Tuples of (page_number, result), as returned by iter_ocr_pages()
+        """
+        # Rendered and preprocessed queues, plus the page each of those stages works on
+        resident_pages = 2 * (self.ocr_queue_depth + 1)
+        with self._reserved_memory(selected, dpi, resident_pages) as admitted_dpi:
+            pages = self._run_ocr_pipeline(selected, admitted_dpi)
+            try:
+                for page_num, page in pages:
+                    self._mark_downscaled({page_num: page}, admitted_dpi, dpi)
+                    yield page_num, page
+            finally:
+                pages.close()
+    
+    def _run_ocr_pipeline(
+        self, selected: List[int], dpi: int
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Run the OCR pipeline threads and yield their results in page order.
+        
+        Args:
+            selected: Sorted page numbers to OCR
+            dpi: Render resolution
+            
+        Yields:
+            Tuples of (page_number, result), as returned by iter_ocr_pages()
+        """
+        ocr_threads = max(1, min(self.ocr_workers, len(selected)))
+        rendered: queue.Queue = queue.Queue(maxsize=self.ocr_queue_depth)
+        preprocessed: queue.Queue = queue.Queue(maxsize=self.ocr_queue_depth)
+        results: queue.Queue = queue.Queue(maxsize=self.ocr_queue_depth + ocr_threads)
+        stop = threading.Event()
+        
+        def put(target: queue.Queue, item: Any) -> bool:
+            # Returns False once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=PIPELINE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def get(source: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=PIPELINE_POLL_SECONDS)
+                except queue.Empty:
+                    pass
+            return _END_OF_PAGES
+        
+        def render_stage() -> None:
+            for page_num in selected:
+                try:
+                    image = self._get_cached_image(page_num, dpi)
+                    if image is None:
+                        image = self._render(dpi, first_page=page_num, last_page=page_num)[0]
+                    item = (page_num, image, None)
+                except Exception as e:
+                    item = (page_num, None, e)
+                if not put(rendered, item):
+                    return
+            put(rendered, _END_OF_PAGES)
+        
+        def preprocess_stage() -> None:
+            first_pages: Dict[str, int] = {}
+            while True:
+                item = get(rendered)
+                if item is _END_OF_PAGES:
+                    break
+                page_num, image, error = item
+                fingerprint = None
+                if error is None:
+                    try:
+                        fingerprint, known = self._screen_page(image, dpi)
+                        if known is None and fingerprint in first_pages:
+                            known = first_pages[fingerprint]
+                        if known is not None:
+                            # Blank, cached or repeated: no OCR needed
+                            if not put(results, (page_num, known, None)):
+                                return
+                            continue
+                        if fingerprint is not None:
+                            first_pages[fingerprint] = page_num
+                        image = self._preprocess_image(image, self.preprocessing)
+                    except Exception as e:
+                        image, error = None, e
+                if not put(preprocessed, (page_num, image, error, fingerprint)):
+                    return
+            for _ in range(ocr_threads):
+                put(preprocessed, _END_OF_PAGES)
+        
+        def ocr_stage() -> None:
+            while True:
+                item = get(preprocessed)
+                if item is _END_OF_PAGES:
+                    break
+                page_num, image, error, fingerprint = item
+                result = None
+                if error is None:
+                    try:
+                        result = self.recognize_image(image, preprocess=False)
+                        self._store_fingerprinted_page(fingerprint, self._ocr_page(result, dpi))
+                    except Exception as e:
+                        error = e
+                del item, image  # Release the page before waiting for the next one
+                if not put(results, (page_num, result, error)):
+                    return
+        
+        threads = [
+            threading.Thread(target=render_stage, name="ocr-render", daemon=True),
+            threading.Thread(target=preprocess_stage, name="ocr-preprocess", daemon=True),
+        ] + [
+            threading.Thread(target=ocr_stage, name=f"ocr-{index}", daemon=True)
+            for index in range(ocr_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        logger.info(
+            f"Streaming OCR for {len(selected)} pages at {dpi} DPI "
+            f"(queue depth {self.ocr_queue_depth}, {ocr_threads} OCR threads)"
+        )
+        # A result is an OCRResult, a page result that needed no OCR, or
+        # the number of an identical earlier page
+        finished: Dict[int, Tuple[Any, Optional[Exception]]] = {}
+        # Yielded pages, kept while repeats of them may still come
+        done: Dict[int, Dict[str, Any]] = {}
+        try:
+            for page_num in selected:
+                while page_num not in finished:
+                    try:
+                        done_page, result, error = results.get(timeout=PIPELINE_STALL_SECONDS)
+                    except queue.Empty:
+                        # A wedged render or OCR call: give up on this page
+                        done_page, result = page_num, None
+                        error = TimeoutError(f"no result after {PIPELINE_STALL_SECONDS} seconds")
+                    finished[done_page] = (result, error)
+                result, error = finished.pop(page_num)
+                
+                if isinstance(error, (PDFInfoNotInstalledError, PDFPageCountError)):
+                    raise self._conversion_error(error) from error
+                if error is not None:
+                    logger.error(f"OCR failed for page {page_num}: {error}")
+                    page = {"text": "", "method": METHOD_OCR_ERROR}
+                elif isinstance(result, int):
+                    logger.debug(f"Page {page_num} repeats page {result}, reusing its text")
+                    page = dict(done[result])
+                elif isinstance(result, dict):
+                    page = result
+                else:
+                    logger.debug(f"OCR completed for page {page_num}")
+                    page = self._ocr_page(result, dpi)
+                if self.page_skip:
+                    done[page_num] = page
+                yield page_num, page
+        finally:
+            stop.set()
+            join_until = time.monotonic() + PIPELINE_STALL_SECONDS
+            for thread in threads:
+                thread.join(max(0.0, join_until - time.monotonic()))
+            stuck = [thread.name for thread in threads if thread.is_alive()]
+            if stuck:
+                logger.warning(f"OCR pipeline threads still busy, leaving them to finish: {', '.join(stuck)}")
+    
+    async def aprocess(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """
+        Coroutine version of process(), for use inside an event loop.
+        
+        Args:
+            pages: Explicit 1-based page numbers to process
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            deadline: Seconds allowed for the whole call (default:
+                ``ocr.deadline_seconds``); pages not done in time are marked
+                in the text instead of being waited for
+        
+        Returns:
+            Full extracted text from PDF
+            
+        Raises:
+            ValueError: If PDF cannot be processed or pages are out of range
+            RuntimeError: If OCR is required but not available
+        """
+        return self._format_pages(await self.aprocess_pages(pages, first_page, last_page, deadline))
+    
+    async def aprocess_pages(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Coroutine version of process_pages().
+        
+        Text extraction, preprocessing and cache access run in the event
+        loop's default executor; poppler and tesseract run as asyncio
+        subprocesses, up to ``ocr.workers`` OCR processes at a time. Cancelling
+        the call kills the renders and OCR processes it started (the
+        in-process tesserocr engine can't be interrupted; its current page
+        finishes in the background). A deadline degrades and cuts off OCR as
+        in process_pages() (see _aocr_pages_within()).
+        
+        Args:
+            pages: Explicit 1-based page numbers to process
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            deadline: Seconds allowed for the whole call (default:
+                ``ocr.deadline_seconds``; None means no limit)
+        
+        Returns:
+            Per-page results, as returned by process_pages()
+            
+        Raises:
+            ValueError: If PDF cannot be processed or pages are out of range
+            RuntimeError: If OCR is required but not available
+        """
+        if deadline is None:
+            deadline = self.ocr_deadline
+        expires_at = time.monotonic() + deadline if deadline is not None else None
+        selected = await asyncio.to_thread(self._resolve_pages, pages, first_page, last_page)
+        
+        results = await asyncio.to_thread(self._load_cached_pages, selected)
+        if results is None:
+            results = await self._aprocess_pages(selected, expires_at)
+            page_count = None
+            if selected is not None:
+                page_count = await asyncio.to_thread(self._get_menu_parser().get_page_count)
+            await asyncio.to_thread(self._store_cached_pages, results, page_count)
+        
+        return results
+    
+    async def _aprocess_pages(
+        self, selected: Optional[List[int]] = None, expires_at: Optional[float] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Coroutine version of _process_pages()."""
+        try:
+            # Try text extraction first
+            page_texts = await asyncio.to_thread(self._extract_page_texts, selected)
+            results, deficient = self._route_pages(page_texts)
+            if deficient is None:
+                return await self._aocr_pages(selected, expires_at)
+            if not deficient:
+                return results
+            
+            try:
+                ocr_results = await self._aocr_pages(deficient, expires_at)
+            except Exception as e:
+                logger.warning(f"OCR of low-text pages failed, keeping extracted text: {e}")
+                return results
+            return self._merge_ocr_pages(results, ocr_results)
+                
+        except Exception as e:
+            logger.error(f"Error processing PDF: {e}", exc_info=True)
+            logger.info("Attempting OCR as fallback")
+            try:
+                return await self._aocr_pages(selected, expires_at)
+            except Exception as ocr_error:
+                raise ValueError(
+                    f"Failed to process PDF with both text extraction and OCR: "
+                    f"{ocr_error}"
+                ) from ocr_error
+    
+    async def _aocr_pages(
+        self, selected: Optional[List[int]] = None, expires_at: Optional[float] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Coroutine version of _ocr_pages()."""
+        if not self.ocr_enabled:
+            raise RuntimeError("OCR is disabled but required for this PDF")
+        
+        await asyncio.to_thread(self._detect_language, selected, expires_at)
+        if expires_at is not None:
+            return await self._aocr_pages_within(selected, expires_at)
+        if not self.ocr_adaptive_dpi:
+            return await self._aocr_pass(selected, self.ocr_dpi)
+        
+        pages = await self._aocr_pass(selected, self.ocr_low_dpi)
+        retry = self._low_confidence_pages(pages)
+        if not retry:
+            return pages
+        
+        try:
+            retried = await self._aocr_pass(retry, self.ocr_high_dpi)
+        except Exception as e:
+            logger.warning(f"High-DPI OCR pass failed, keeping low-DPI results: {e}")
+            return pages
+        return self._keep_better_pages(pages, retried)
+    
+    async def _aocr_pages_within(
+        self, selected: Optional[List[int]], expires_at: float
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Coroutine version of _ocr_pages_within(), OCRing ``ocr.workers`` pages at a time.
+        
+        Cancelling the call kills the renders and pytesseract processes it
+        started; as in _ocr_pages_within(), a page the tesserocr engine has
+        started finishes in the background, past the deadline.
+        
+        Args:
+            selected: Page numbers to OCR (default: every page)
+            expires_at: Deadline as a time.monotonic() value
+        
+        Returns:
+            Per-page OCR results, as returned by _ocr_pages(), in page order
+        """
+        if selected is None:
+            selected = list(range(1, await asyncio.to_thread(self._get_menu_parser().get_page_count) + 1))
+        workers = max(1, min(self.ocr_workers, len(selected)))
+        budget = TimeBudget(expires_at, len(selected), workers, len(BUDGET_LEVELS))
+        base_dpi = self.ocr_low_dpi if self.ocr_adaptive_dpi else self.ocr_dpi
+        logger.info(
+            f"OCR of {len(selected)} pages with {budget.remaining():.1f}s left "
+            f"({workers} tasks, starting at {base_dpi} DPI)"
+        )
+        
+        pages: Dict[int, Dict[str, Any]] = {}
+        first_pages: Dict[str, int] = {}
+        repeats: Dict[int, int] = {}
+        slots = asyncio.Semaphore(workers)
+        
+        async def ocr_page(page_num: int, base_dpi: int, downscaled: bool) -> None:
+            async with slots:
+                level = budget.start_page()
+                if level is None:
+                    pages[page_num] = {"text": "", "method": METHOD_TIMEOUT}
+                    return
+                dpi, preprocess = self._budget_settings(base_dpi, level)
+                started = time.monotonic()
+                try:
+                    image = (await self.aconvert_to_images(dpi=dpi, pages=[page_num]))[0]
+                    fingerprint, known = await asyncio.to_thread(self._screen_page, image, dpi)
+                    if known is not None:
+                        pages[page_num] = known
+                        return
+                    original = first_pages.setdefault(fingerprint, page_num) if fingerprint else page_num
+                    if original != page_num:
+                        repeats[page_num] = original
+                        return
+                    result = await self.arecognize_image(image, budget.timeout(OCR_TIMEOUT), preprocess)
+                except Exception as e:
+                    if budget.expired():
+                        logger.warning(f"Deadline reached while processing page {page_num}: {e}")
+                        pages[page_num] = {"text": "", "method": METHOD_TIMEOUT}
+                    else:
+                        logger.error(f"OCR failed for page {page_num}: {e}")
+                        pages[page_num] = {"text": "", "method": METHOD_OCR_ERROR}
+                    return
+                finally:
+                    budget.finish_page(level, time.monotonic() - started)
+                
+                page = self._ocr_page(result, dpi)
+                if level > 0 or downscaled:
+                    page["degraded"] = True
+                pages[page_num] = page
+                logger.debug(f"OCR completed for page {page_num} (quality level {level})")
+        
+        ticket, admitted_dpi = await self._aadmit_memory(selected, base_dpi, workers, budget.remaining())
+        try:
+            await asyncio.gather(*(
+                ocr_page(page_num, admitted_dpi, admitted_dpi < base_dpi) for page_num in selected
+            ))
+        finally:
+            self._release_memory(ticket)
+        
+        pages = {page_num: pages[page_num] for page_num in selected if page_num in pages}
+        unfinished = sum(page["method"] == METHOD_TIMEOUT for page in pages.values())
+        if unfinished:
+            logger.warning(f"Deadline reached: {unfinished} of {len(selected)} pages not processed")
+        elif budget.level > 0:
+            logger.info(f"Met the deadline at quality level {budget.level}")
+        return await asyncio.to_thread(self._finish_screened_pages, pages, first_pages, repeats)
+    
+    async def _aocr_pass(self, selected: Optional[List[int]], dpi: int) -> Dict[int, Dict[str, Any]]:
+        """Coroutine version of _ocr_pass() (``ocr.pipeline`` does not apply)."""
+        ticket, admitted_dpi = await self._aadmit_memory(selected, dpi)
+        try:
+            logger.info(f"Processing PDF with OCR at {admitted_dpi} DPI")
+            images = await self.aconvert_to_images(dpi=admitted_dpi, pages=selected)
+            page_numbers = range(1, len(images) + 1) if selected is None else selected
+            pages = await self._aocr_images(dict(zip(page_numbers, images)), admitted_dpi)
+        finally:
+            self._release_memory(ticket)
+        return self._mark_downscaled(pages, admitted_dpi, dpi)
+    
+    async def _aadmit_memory(
+        self,
+        selected: Optional[List[int]],
+        dpi: int,
+        resident_pages: Optional[int] = None,
+        max_wait: Optional[float] = None,
+    ) -> Tuple[Optional[int], int]:
+        """
+        Coroutine version of _admit_memory(); waiting for memory does not block the event loop.
+        
+        If the caller is cancelled while queued, the reservation is given
+        back as soon as it is granted.
+        """
+        admission = asyncio.ensure_future(
+            asyncio.to_thread(self._admit_memory, selected, dpi, resident_pages, max_wait)
+        )
+        try:
+            return await asyncio.shield(admission)
+        except asyncio.CancelledError:
+            admission.add_done_callback(
+                lambda done: done.cancelled() or done.exception() or self._release_memory(done.result()[0])
+            )
+            raise
+    
+    async def _aocr_images(
+        self, images: Dict[int, Image.Image], dpi: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Coroutine version of _ocr_images(): OCR up to ``ocr.workers`` pages at a time.
+        
+        Args:
+            images: Dictionary mapping page_number -> rendered page
+            dpi: Resolution the pages were rendered at
+            
+        Returns:
+            Per-page OCR results, as returned by _ocr_pages(), in page order
+        """
+        pages, pending, first_pages, repeats = await asyncio.to_thread(self._screen_pages, images, dpi)
+        slots = asyncio.Semaphore(max(1, self.ocr_workers))
+        
+        async def ocr_page(page_num: int, image: Image.Image) -> None:
+            async with slots:
+                try:
+                    pages[page_num] = self._ocr_page(await self.arecognize_image(image), dpi)
+                    logger.debug(f"OCR completed for page {page_num}")
+                except Exception as e:
+                    logger.error(f"OCR failed for page {page_num}: {e}")
+                    pages[page_num] = {"text": "", "method": METHOD_OCR_ERROR}
+        
+        await asyncio.gather(*(ocr_page(page_num, image) for page_num, image in pending.items()))
+        return await asyncio.to_thread(self._finish_screened_pages, pages, first_pages, repeats)
+    
+    async def aconvert_to_images(
+        self,
+        dpi: int = 150,
+        pages: Optional[Iterable[int]] = None,
+        first_page: Optional[int] = None,
+        last_page: Optional[int] = None,
+    ) -> List[Image.Image]:
+        """
+        Coroutine version of convert_to_images().
+        
+        Runs pdftoppm as an asyncio subprocess (killed if the call is
+        cancelled) and shares the page image cache with convert_to_images().
+        
+        Args:
+            dpi: Resolution for image conversion (default: 150)
+            pages: Explicit 1-based page numbers to convert
+            first_page: First page of an inclusive range (default: 1)
+            last_page: Last page of an inclusive range (default: last page)
+            
+        Returns:
+            List of PIL Image objects, one per selected page, in page order
+            
+        Raises:
+            ValueError: If PDF cannot be converted, pages are out of range or
+                poppler is not installed
+        """
+        selected = await asyncio.to_thread(self._resolve_pages, pages, first_page, last_page)
+        
+        if selected is None:
+            cached = self._get_cached_document(dpi)
+            if cached is not None:
+                return cached
+        
+        try:
+            if selected is None:
+                logger.info(f"Converting PDF to images at {dpi} DPI")
+                images = await self._arender(dpi)
+                self._put_cached_document(dpi, images)
+                logger.info(f"Converted {len(images)} pages to images")
+                return images
+            
+            images_by_page, missing = self._get_cached_selection(selected, dpi)
+            for run_first, run_last in group_page_runs(missing):
+                images = await self._arender(dpi, first_page=run_first, last_page=run_last)
+                for page_num, image in zip(range(run_first, run_last + 1), images):
+                    images_by_page[page_num] = image
+                    self._put_cached_image(page_num, dpi, image)
+            
+            return [images_by_page[page_num] for page_num in selected]
+            
+        except PDFInfoNotInstalledError as e:
+            raise self._conversion_error(e) from None
+        except Exception as e:
+            raise self._conversion_error(e) from e
+    
+    async def _arender(self, dpi: int, **page_bounds: int) -> List[Image.Image]:
+        """
+        Rasterize the PDF (or an inclusive page range of it) with an asyncio pdftoppm process.
+        
+        Produces the same grayscale PGM output as _render(); in-memory PDFs
+        are piped to pdftoppm's stdin instead of a temporary file.
+        
+        Args:
+            dpi: Resolution for image conversion
+            **page_bounds: Optional first_page/last_page
+            
+        Returns:
+            List of PIL Image objects, one per rendered page
+            
+        Raises:
+            PDFInfoNotInstalledError: If pdftoppm is not installed
+            RuntimeError: If pdftoppm fails
+        """
+        args = ["pdftoppm", "-r", str(dpi)]
+        if page_bounds.get("first_page"):
+            args += ["-f", str(page_bounds["first_page"])]
+        if page_bounds.get("last_page"):
+            args += ["-l", str(page_bounds["last_page"])]
+        args.append("-gray")
+        
+        if self.source.is_path:
+            args.append(str(self.pdf_path))
+            pdf_bytes = None
+        else:
+            args.append("-")
+            pdf_bytes = await asyncio.to_thread(self.source.read_bytes)
+        
+        try:
+            returncode, stdout, stderr = await run_process(args, pdf_bytes)
+        except FileNotFoundError as e:
+            raise PDFInfoNotInstalledError("Unable to run pdftoppm. Is poppler installed and in PATH?") from e
+        if returncode != 0:
+            raise RuntimeError(
+                f"pdftoppm exited with status {returncode}: {stderr.decode('utf-8', 'replace').strip()}"
+            )
+        return await asyncio.to_thread(parse_buffer_to_pgm, stdout)
+    
+    async def aocr_image(
+        self, image: Image.Image, timeout: int = OCR_TIMEOUT, preprocess: bool = True
+    ) -> str:
+        """
+        Coroutine version of ocr_image().
+        
+        Args:
+            image: PIL Image to process
+            timeout: Maximum seconds to wait for OCR (default: 30)
+            preprocess: Whether to preprocess the image first
+            
+        Returns:
+            Extracted text string
+            
+        Raises:
+            RuntimeError: If Tesseract is not available or OCR fails
+        """
+        return (await self.arecognize_image(image, timeout, preprocess)).text
+    
+    async def arecognize_image(
+        self, image: Image.Image, timeout: int = OCR_TIMEOUT, preprocess: bool = True
+    ) -> OCRResult:
+        """
+        Coroutine version of recognize_image().
+        
+        Preprocessing and region detection run in the event loop's default
+        executor; OCR runs through the engine's arecognize(), so pytesseract's
+        tesseract process is killed if the call is cancelled.
+        
+        Args:
+            image: PIL Image to process
+            timeout: Maximum seconds to wait for OCR (default: 30)
+            preprocess: Whether to preprocess the image first
+            
+        Returns:
+            OCRResult, as returned by recognize_image()
+            
+        Raises:
+            RuntimeError: If Tesseract is not available or OCR fails
+        """
+        if not self.ocr_enabled:
+            raise RuntimeError("OCR is disabled in configuration")
+        
+        def prepare() -> Tuple[Image.Image, Optional[List[Tuple[int, int, int, int]]]]:
+            processed = self._preprocess_image(image, self.preprocessing) if preprocess else image
+            return processed, find_regions(processed, self.text_regions)
+        
+        try:
+            engine = await asyncio.to_thread(self._get_ocr_engine)
+            processed_image, boxes = await asyncio.to_thread(prepare)
+            
+            logger.debug(f"Running OCR on image ({image.size[0]}x{image.size[1]})")
+            if boxes is None:
+                result = await engine.arecognize(processed_image, timeout=timeout)
+            else:
+                result = await engine.arecognize_regions(processed_image, boxes, timeout=timeout)
+            
+            if needs_rotation_check(result.mean_confidence, self.language_detection):
+                rotate = await asyncio.to_thread(
+                    page_rotation, engine, processed_image, self.language_detection, timeout
+                )
+                if rotate:
+                    upright_image = rotate_upright(processed_image, rotate)
+                    upright_boxes = await asyncio.to_thread(find_regions, upright_image, self.text_regions)
+                    if upright_boxes is None:
+                        upright = await engine.arecognize(upright_image, timeout=timeout)
+                    else:
+                        upright = await engine.arecognize_regions(upright_image, upright_boxes, timeout=timeout)
+                    result = more_confident(result, upright, rotate)
+            
+            logger.debug(f"OCR extracted {len(result)} words")
+            return result
+            
+        except pytesseract.TesseractNotFoundError:
+            raise tesseract_not_found_error(self.tesseract_path) from None
+        except Exception as e:
+            logger.error(f"OCR error: {e}", exc_info=True)
+            raise RuntimeError(f"OCR processing failed: {e}") from e
@@ -0,0 +1,274 @@
+"""
+Page image preprocessing for OCR.
+
+Rendered pages are converted to an 8-bit grayscale NumPy array once and
+every step then works on that array (or views of it):
+- threshold: binarize with a global Otsu threshold or a local mean
+  (adaptive) threshold, so Tesseract gets clean black-on-white text
+- denoise: 3x3 median filter (a majority vote once the page is binary),
+  removing scanner speckle
+- deskew: estimate the text angle from projection profiles of the ink and
+  rotate it level
+- crop_margins: drop blank borders so Tesseract has fewer pixels to scan
+
+Each step can be switched on or off under ocr.preprocessing in
+savvi_config.yaml.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+# Default preprocessing options (ocr.preprocessing in savvi_config.yaml)
+DEFAULT_PREPROCESSING: Dict[str, Any] = {
+    "contrast": False,
+    "threshold": "otsu",
+    "adaptive_block_size": 31,
+    "adaptive_offset": 10,
+    "denoise": True,
+    "deskew": True,
+    "max_skew_degrees": 5.0,
+    "crop_margins": True,
+    "margin_padding": 16,
+}
+
+THRESHOLD_OTSU = "otsu"
+THRESHOLD_ADAPTIVE = "adaptive"
+THRESHOLD_NONE = "none"
+THRESHOLD_METHODS = (THRESHOLD_OTSU, THRESHOLD_ADAPTIVE, THRESHOLD_NONE)
+
+# Skews smaller than this are left alone; rotating costs more than it gains
+MIN_SKEW_DEGREES = 0.2
+
+# Ink pixels sampled when estimating skew
+SKEW_SAMPLE_POINTS = 20000
+
+# Pixel values below this count as ink when cropping margins
+INK_LEVEL = 128
+
+
+def otsu_threshold(histogram: Sequence[int]) -> int:
+    """
+    Find the global threshold that best separates ink from paper (Otsu's method).
+
+    Args:
+        histogram: 256-bin histogram of an 8-bit grayscale page (Image.histogram())
+
+    Returns:
+        Threshold; pixels at or below it are ink
+    """
+    histogram = np.asarray(histogram, dtype=np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    weight = np.cumsum(histogram)
+    mass = np.cumsum(histogram * levels)
+    total, total_mass = weight[-1], mass[-1]
+
+    between = weight * (total - weight)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.where(
+            between > 0, (total_mass * weight - mass * total) ** 2 / between, 0.0
+        )
+    return int(np.argmax(variance))
+
+
+def _box_sum(values: np.ndarray, size: int) -> np.ndarray:
+    """
+    Sum every size x size neighbourhood using an integral image.
+
+    Args:
+        values: 2-D array
+        size: Odd window size
+
+    Returns:
+        int32 array of window sums, the same shape as values (edges are replicated)
+    """
+    radius = size // 2
+    # One extra zero row and column in front, so each window sum is a
+    # difference of two running sums; the box is summed along rows, then columns
+    padded = np.pad(values, ((radius + 1, radius), (radius + 1, radius)), mode="edge")
+    padded[0, :] = 0
+    padded[:, 0] = 0
+    running = np.cumsum(padded, axis=1, dtype=np.int32)
+    running = np.cumsum(running[:, size:] - running[:, :-size], axis=0, dtype=np.int32)
+    return running[size:] - running[:-size]
+
+
+def adaptive_threshold(pixels: np.ndarray, block_size: int = 31, offset: int = 10) -> np.ndarray:
+    """
+    Binarize against the mean of each pixel's neighbourhood.
+
+    Copes with uneven lighting (shadows, folds) that defeats a global threshold.
+
+    Args:
+        pixels: 8-bit grayscale array
+        block_size: Odd neighbourhood size in pixels
+        offset: How much darker than the local mean a pixel must be to be ink
+
+    Returns:
+        Boolean ink mask
+    """
+    local_mean = _box_sum(pixels, block_size) / (block_size * block_size)
+    return pixels < local_mean - offset
+
+
+def despeckle(ink: np.ndarray) -> np.ndarray:
+    """
+    Apply a 3x3 median filter to a binary ink mask (a majority vote).
+
+    Args:
+        ink: Boolean ink mask
+
+    Returns:
+        Filtered ink mask
+    """
+    height, width = ink.shape
+    padded = np.pad(ink.view(np.uint8), 1, mode="edge")
+    votes = np.zeros(ink.shape, dtype=np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            votes += padded[dy:dy + height, dx:dx + width]
+    return votes >= 5
+
+
+def estimate_skew(ink: np.ndarray, max_degrees: float = 5.0) -> float:
+    """
+    Estimate the angle of the text lines from horizontal projection profiles.
+
+    Ink pixels are projected onto the vertical axis at each candidate angle;
+    the angle whose profile is sharpest (text lines collapse into narrow,
+    dense rows) wins. A coarse 0.5 degree search is refined in 0.1 degree
+    steps.
+
+    Args:
+        ink: Boolean ink mask
+        max_degrees: Largest skew to look for, in either direction
+
+    Returns:
+        Skew in degrees; rotating the page by this angle (counter-clockwise)
+        levels the text
+    """
+    rows, cols = np.nonzero(ink)
+    if rows.size < 2:
+        return 0.0
+    step = max(1, rows.size // SKEW_SAMPLE_POINTS)
+    rows = rows[::step].astype(np.float64)
+    cols = cols[::step].astype(np.float64)
+
+    def sharpest(angles: np.ndarray) -> float:
+        radians = np.deg2rad(angles)[:, None]
+        projected = np.rint(rows * np.cos(radians) - cols * np.sin(radians)).astype(np.int64)
+        projected -= projected.min(axis=1, keepdims=True)
+        scores = [np.square(np.bincount(profile)).sum() for profile in projected]
+        return float(angles[int(np.argmax(scores))])
+
+    coarse = sharpest(np.arange(-max_degrees, max_degrees + 0.25, 0.5))
+    return sharpest(np.arange(coarse - 0.5, coarse + 0.55, 0.1))
+
+
+def ink_bounds(ink: np.ndarray, padding: int = 16) -> Tuple[slice, slice]:
+    """
+    Find the region of a page that contains ink.
+
+    Args:
+        ink: Boolean ink mask
+        padding: Blank pixels to keep around the ink
+
+    Returns:
+        (row slice, column slice) covering the ink plus padding, or the
+        whole page if it is blank
+    """
+    ink_rows = np.flatnonzero(ink.any(axis=1))
+    ink_cols = np.flatnonzero(ink.any(axis=0))
+    if ink_rows.size == 0:
+        return slice(None), slice(None)
+    return (
+        slice(max(0, ink_rows[0] - padding), min(ink.shape[0], ink_rows[-1] + padding + 1)),
+        slice(max(0, ink_cols[0] - padding), min(ink.shape[1], ink_cols[-1] + padding + 1)),
+    )
+
+
+def crop_margins(pixels: np.ndarray, padding: int = 16) -> np.ndarray:
+    """
+    Crop blank borders around the ink.
+
+    Args:
+        pixels: 8-bit grayscale array
+        padding: Blank pixels to keep around the ink
+
+    Returns:
+        View of pixels around the ink (all of pixels if the page is blank)
+    """
+    return pixels[ink_bounds(pixels < INK_LEVEL, padding)]
+
+
+def preprocess_page(
+    image: Union[Image.Image, np.ndarray], options: Optional[Dict[str, Any]] = None
+) -> Image.Image:
+    """
+    Prepare a rendered page for OCR.
+
+    Args:
+        image: Rendered page, or its 8-bit grayscale pixels as a (height, width)
+            array (e.g. a view of shared memory, which is read without copying)
+        options: Preprocessing options; missing keys use DEFAULT_PREPROCESSING
+
+    Returns:
+        Grayscale ("L") image, black text on white when thresholding is on
+
+    Raises:
+        ValueError: If options name an unknown threshold method
+    """
+    options = {**DEFAULT_PREPROCESSING, **(options or {})}
+    threshold = options["threshold"]
+    if threshold not in THRESHOLD_METHODS:
+        raise ValueError(
+            f"Unknown threshold method: {threshold}. Expected one of: {', '.join(THRESHOLD_METHODS)}"
+        )
+
+    pixels = source = None
+    if isinstance(image, np.ndarray):
+        pixels = source = image
+        image = Image.frombuffer("L", (pixels.shape[1], pixels.shape[0]), pixels, "raw", "L", 0, 1)
+    elif image.mode != "L":
+        image = image.convert("L")
+    if options["contrast"]:
+        image = ImageEnhance.Contrast(image).enhance(1.5)
+        image = ImageEnhance.Sharpness(image).enhance(1.2)
+        pixels = None
+    if options["denoise"] and threshold == THRESHOLD_NONE:
+        image = image.filter(ImageFilter.MedianFilter(3))
+        pixels = None
+
+    if pixels is None:
+        pixels = np.asarray(image)
+    if threshold == THRESHOLD_OTSU:
+        ink = pixels <= otsu_threshold(image.histogram())
+    elif threshold == THRESHOLD_ADAPTIVE:
+        ink = adaptive_threshold(pixels, options["adaptive_block_size"], options["adaptive_offset"])
+    else:
+        ink = pixels < INK_LEVEL
+    if threshold != THRESHOLD_NONE:
+        if options["denoise"]:
+            ink = despeckle(ink)
+        pixels = (~ink).view(np.uint8) * np.uint8(255)
+
+    # Crop before deskewing, so the skew search and rotation see fewer pixels
+    if options["crop_margins"]:
+        bounds = ink_bounds(ink, options["margin_padding"])
+        pixels, ink = pixels[bounds], ink[bounds]
+
+    if options["deskew"]:
+        angle = estimate_skew(ink, options["max_skew_degrees"])
+        if abs(angle) >= MIN_SKEW_DEGREES:
+            # Binary pages stay binary; grayscale pages are interpolated
+            resample = Image.Resampling.BILINEAR if threshold == THRESHOLD_NONE else Image.Resampling.NEAREST
+            rotated = Image.fromarray(pixels).rotate(angle, resample=resample, expand=True, fillcolor=255)
+            pixels = np.asarray(rotated)
+            if options["crop_margins"]:
+                pixels = crop_margins(pixels, options["margin_padding"])
+
+    if source is not None and np.may_share_memory(pixels, source):
+        # The page must not outlive the caller's buffer
+        pixels = pixels.copy()
+    return Image.fromarray(pixels)
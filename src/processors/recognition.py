@@ -0,0 +1,209 @@
+"""
+OCR of preprocessed pages, shared by PDFProcessor and ImageMenuProcessor.
+
+Both processors build their OCR engine through LazyOCREngine, OCR a
+preprocessed page with recognize_page() (text regions only, when region
+detection is on, and again upright if the page turns out to be rotated) and
+report a missing Tesseract install with tesseract_not_found_error(), so a
+PDF page and a photo go through exactly the same recognition.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.processors.ocr_engine import OCREngine, create_ocr_engine
+from src.processors.ocr_result import OCRResult
+from src.processors.script_detection import (
+    DEFAULT_LANGUAGE_DETECTION,
+    needs_rotation_check,
+    osd_rotation,
+    rotate_upright,
+)
+from src.processors.text_regions import detect_text_regions, region_pixels
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LazyOCREngine:
+    """
+    OCR engine created on first use and shared by a processor's threads.
+
+    The engine is created for the language asked for, and created again if
+    a later call asks for another language (after per-document language
+    detection, for instance).
+    """
+
+    def __init__(
+        self,
+        engine: str,
+        tesseract_cmd: Optional[str] = None,
+        tessdata_path: Optional[str] = None,
+    ):
+        """
+        Initialize LazyOCREngine.
+
+        Args:
+            engine: OCR engine name (see create_ocr_engine())
+            tesseract_cmd: Path to the tesseract binary, if configured
+            tessdata_path: Directory containing .traineddata files, if configured
+        """
+        self.engine_name = engine
+        self.tesseract_cmd = tesseract_cmd
+        self.tessdata_path = tessdata_path
+        self._engine: Optional[OCREngine] = None
+        self._language: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self, language: str) -> OCREngine:
+        """
+        Get the engine for a language, creating it if needed.
+
+        Args:
+            language: Tesseract language code(s)
+
+        Returns:
+            OCREngine instance
+
+        Raises:
+            ValueError: If the engine name is unknown
+            RuntimeError: If the engine can't be created
+        """
+        with self._lock:
+            if self._engine is not None and self._language != language:
+                self._engine.close()
+                self._engine = None
+            if self._engine is None:
+                self._engine = create_ocr_engine(
+                    self.engine_name, language, self.tesseract_cmd, self.tessdata_path
+                )
+                self._language = language
+                logger.info(f"Using OCR engine: {self._engine.name} ({language})")
+            return self._engine
+
+    def close(self) -> None:
+        """Release the engine; the next get() creates a new one."""
+        with self._lock:
+            if self._engine is not None:
+                self._engine.close()
+                self._engine = None
+
+
+def tesseract_not_found_error(tesseract_cmd: Optional[str] = None) -> RuntimeError:
+    """
+    Log a missing Tesseract install and build the RuntimeError callers expect.
+
+    Args:
+        tesseract_cmd: Configured path to the tesseract binary, if any
+
+    Returns:
+        RuntimeError with install instructions, for the caller to raise
+    """
+    error_msg = (
+        "Tesseract OCR not found. Install it with:\n"
+        "  Windows: choco install tesseract\n"
+        "  Mac: brew install tesseract\n"
+        "  Linux: apt-get install tesseract-ocr\n"
+        f"Or set TESSERACT_PATH in .env to: {tesseract_cmd}"
+    )
+    logger.error(error_msg)
+    return RuntimeError(error_msg)
+
+
+def recognize_page(
+    engine: OCREngine,
+    image: Image.Image,
+    regions: Optional[Dict[str, Any]],
+    timeout: Optional[float],
+    orientation: Optional[Dict[str, Any]] = None,
+) -> OCRResult:
+    """
+    OCR a preprocessed page, only its text regions when region detection is on.
+
+    A page that OCRs badly is checked for rotation when rotation fixing is
+    on, and OCR'd again upright if it was turned.
+
+    Args:
+        engine: OCR engine
+        image: Preprocessed page
+        regions: Text region detection options, or None to OCR the whole page
+        timeout: Maximum seconds per Tesseract call
+        orientation: Language detection options, or None to OCR the page as it is
+
+    Returns:
+        OCRResult with boxes in the preprocessed page's coordinates (of the
+        upright page, if it was rotated)
+    """
+    boxes = find_regions(image, regions)
+    if boxes is None:
+        result = engine.recognize(image, timeout=timeout)
+    else:
+        result = engine.recognize_regions(image, boxes, timeout=timeout)
+
+    if not needs_rotation_check(result.mean_confidence, orientation):
+        return result
+    rotate = page_rotation(engine, image, orientation, timeout)
+    if not rotate:
+        return result
+    upright = recognize_page(engine, rotate_upright(image, rotate), regions, timeout)
+    return more_confident(result, upright, rotate)
+
+
+def page_rotation(
+    engine: OCREngine, image: Image.Image, orientation: Dict[str, Any], timeout: Optional[float]
+) -> int:
+    """
+    Detect how far a page is rotated, 0 if unknown.
+
+    Args:
+        engine: OCR engine
+        image: Preprocessed page
+        orientation: Language detection options
+        timeout: Maximum seconds for the detection
+
+    Returns:
+        Clockwise degrees that make the page upright (see osd_rotation())
+    """
+    try:
+        osd = engine.detect_orientation(image, timeout=timeout)
+    except Exception as e:
+        logger.debug(f"Orientation detection failed: {e}")
+        return 0
+    return osd_rotation(
+        osd,
+        orientation.get("min_orientation_confidence", DEFAULT_LANGUAGE_DETECTION["min_orientation_confidence"]),
+    )
+
+
+def more_confident(result: OCRResult, upright: OCRResult, rotate: int) -> OCRResult:
+    """Keep the OCR of the upright page if it is more confident than the original."""
+    if (upright.mean_confidence or 0.0) <= (result.mean_confidence or 0.0):
+        return result
+    logger.info(f"Page was rotated; OCR'd it turned {rotate} degrees clockwise")
+    return upright
+
+
+def find_regions(
+    image: Image.Image, regions: Optional[Dict[str, Any]]
+) -> Optional[List[Tuple[int, int, int, int]]]:
+    """
+    Detect the text regions of a preprocessed page, if region detection is on.
+
+    Args:
+        image: Preprocessed page
+        regions: Text region detection options, or None
+
+    Returns:
+        Regions to OCR, or None to OCR the whole page
+    """
+    if not regions or not regions.get("enabled", True):
+        return None
+
+    boxes = detect_text_regions(image, regions)
+    logger.debug(
+        f"OCR on {len(boxes)} text regions, "
+        f"{region_pixels(boxes) / (image.width * image.height or 1):.0%} of the page"
+    )
+    return boxes
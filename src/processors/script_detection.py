@@ -0,0 +1,189 @@
+"""
+Script, language and orientation detection for OCR.
+
+Running every page with a combined model such as eng+spa+fra is several
+times slower than a single language, so the language set is chosen per
+document instead:
+- Tesseract's orientation and script detection (OSD) runs on low-resolution
+  renders of the first few pages and reports each page's script (Latin,
+  Han, Hangul, ...) and how far it is rotated.
+- Scripts other than Latin map directly to the configured languages that
+  use them (Han -> chi_sim).
+- Latin menus are told apart by OCRing the same sample once with every
+  configured Latin language and counting each language's common words
+  ("the", "con", "avec", ...).
+
+The smallest set of configured languages that covers the sample is used for
+the whole document. OSD also tells which way up a page is; pages that OCR
+badly are checked and, if rotated, turned upright and OCR'd again.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from PIL import Image
+
+# Default detection options (ocr.language_detection in savvi_config.yaml)
+DEFAULT_LANGUAGE_DETECTION: Dict[str, Any] = {
+    "enabled": True,
+    "sample_pages": 2,
+    "dpi": 100,
+    "languages": ["eng", "spa", "fra", "chi_sim", "jpn", "kor"],
+    "min_script_confidence": 1.0,
+    "min_language_share": 0.25,
+    "fix_rotation": True,
+    "rotation_check_confidence": 0.6,
+    "min_orientation_confidence": 2.0,
+}
+
+# Tesseract language codes by the script names OSD reports
+SCRIPT_LANGUAGES: Dict[str, tuple] = {
+    "Latin": ("eng", "spa", "fra", "deu", "ita", "por", "nld"),
+    "Han": ("chi_sim", "chi_tra"),
+    "Japanese": ("jpn",),
+    "Hangul": ("kor",),
+    "Cyrillic": ("rus", "ukr", "bul"),
+    "Greek": ("ell",),
+    "Arabic": ("ara", "fas"),
+    "Hebrew": ("heb",),
+    "Thai": ("tha",),
+    "Devanagari": ("hin",),
+}
+
+LATIN = "Latin"
+
+# Frequent short words of menus in each Latin language. Words shared by
+# several languages ("la", "de", "con") are kept: they count for each.
+COMMON_WORDS: Dict[str, frozenset] = {
+    "eng": frozenset("the and with of our served fresh or on in daily side choice".split()),
+    "spa": frozenset("el la los las con de del y al en para sin pollo queso salsa".split()),
+    "fra": frozenset("le la les de du des et avec au aux sur ou poulet fromage sauce".split()),
+    "deu": frozenset("der die das mit und von im auf oder vom dazu hausgemacht".split()),
+    "ita": frozenset("il la le con di del della e al alla ai allo pollo formaggio".split()),
+    "por": frozenset("o a os as com de do da e ao em frango queijo molho".split()),
+    "nld": frozenset("de het een met en van op of uit kaas kip saus".split()),
+}
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def script_languages(script: str, languages: Iterable[str]) -> List[str]:
+    """
+    Pick the configured languages written in a script.
+
+    Args:
+        script: Script name reported by OSD
+        languages: Configured candidate languages, in order of preference
+
+    Returns:
+        The candidates that use the script, in the given order
+    """
+    written = SCRIPT_LANGUAGES.get(script, ())
+    return [language for language in languages if language in written]
+
+
+def score_languages(text: str, languages: Iterable[str]) -> Dict[str, int]:
+    """
+    Count the common words of each Latin language in a text.
+
+    Args:
+        text: OCR'd sample text
+        languages: Latin languages to score
+
+    Returns:
+        Dictionary mapping language -> number of its common words in text
+    """
+    words = [word.lower() for word in _WORD.findall(text)]
+    return {
+        language: sum(word in COMMON_WORDS.get(language, ()) for word in words)
+        for language in languages
+    }
+
+
+def choose_languages(
+    scripts: Dict[str, float],
+    latin_scores: Dict[str, int],
+    languages: List[str],
+    min_share: float = 0.25,
+) -> List[str]:
+    """
+    Choose the smallest set of configured languages that covers a sample.
+
+    Args:
+        scripts: Script name -> summed OSD confidence over the sample pages
+        latin_scores: Latin language -> common word count (see score_languages())
+        languages: Configured candidate languages, in order of preference
+        min_share: Share of the strongest script (or Latin language) below
+            which a script (or language) is treated as noise
+
+    Returns:
+        Language codes, main script first; empty if nothing could be matched
+    """
+    chosen: List[str] = []
+    top_script = max(scripts.values(), default=0.0)
+    for script, weight in sorted(scripts.items(), key=lambda item: -item[1]):
+        if weight < min_share * top_script:
+            continue
+        candidates = script_languages(script, languages)
+        if script == LATIN and len(candidates) > 1:
+            top_score = max((latin_scores.get(language, 0) for language in candidates), default=0)
+            if top_score > 0:
+                candidates = [
+                    language for language in candidates
+                    if latin_scores.get(language, 0) >= max(1, min_share * top_score)
+                ]
+            else:
+                candidates = candidates[:1]
+        chosen.extend(language for language in candidates if language not in chosen)
+    return chosen
+
+
+def osd_rotation(osd: Dict[str, Any], min_confidence: float) -> int:
+    """
+    Get the clockwise rotation that makes a page upright, if OSD is sure of it.
+
+    Args:
+        osd: Result of OCREngine.detect_orientation()
+        min_confidence: Lowest orientation confidence to act on
+
+    Returns:
+        0, 90, 180 or 270
+    """
+    if osd.get("orientation_conf", 0.0) < min_confidence:
+        return 0
+    return int(osd.get("rotate", 0)) % 360
+
+
+def rotate_upright(image: Image.Image, rotate: int) -> Image.Image:
+    """
+    Turn a page upright.
+
+    Args:
+        image: Page image
+        rotate: Clockwise degrees from osd_rotation()
+
+    Returns:
+        Rotated image (image itself when rotate is 0)
+    """
+    if not rotate:
+        return image
+    # PIL rotates counter-clockwise; multiples of 90 degrees are exact transposes
+    return image.rotate(-rotate, expand=True)
+
+
+def needs_rotation_check(confidence: Optional[float], options: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether a page OCR'd this badly should be checked for rotation.
+
+    Args:
+        confidence: Mean word confidence of the page (None if no words)
+        options: Language detection options, or None when detection is off
+
+    Returns:
+        True if rotation fixing is on and the confidence is below
+        rotation_check_confidence
+    """
+    if not options or not options.get("enabled", True) or not options.get("fix_rotation", True):
+        return False
+    threshold = options.get("rotation_check_confidence", DEFAULT_LANGUAGE_DETECTION["rotation_check_confidence"])
+    return confidence is None or confidence < threshold
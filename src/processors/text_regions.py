@@ -0,0 +1,199 @@
+"""
+Text region detection for OCR.
+
+Menu scans are mostly margins, photos and decoration; Tesseract only needs
+the text blocks. Regions are found on a thumbnail of the preprocessed page
+(one cell per thumbnail_scale x thumbnail_scale pixels). Borders and rules
+(long, thin runs of ink) are erased first, since a frame around the menu
+would otherwise hold everything in one block. Then a recursive XY-cut
+splits the page wherever a horizontal or vertical band of empty
+cells is wide enough, until no block can be split further. Blocks whose ink
+density is too high to be text (photos, solid decoration) are dropped.
+Regions are returned in page pixel coordinates, in reading order.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Default region detection options (ocr.regions in savvi_config.yaml)
+DEFAULT_REGIONS: Dict[str, Any] = {
+    "enabled": True,
+    "thumbnail_scale": 4,
+    "line_gap": 6,
+    "column_gap": 8,
+    "padding": 8,
+    "rule_length": 50,
+    "max_ink_density": 0.45,
+    "max_regions": 16,
+}
+
+# Pixel values below this count as ink
+INK_LEVEL = 128
+
+# Blocks with fewer ink cells than this are specks, not text
+MIN_INK_CELLS = 3
+
+# Runs of ink at most this many cells thick can be rules; text lines are thicker
+RULE_THICKNESS_CELLS = 3
+
+# (left, top, right, bottom) in page pixels, as used by Image.crop()
+Region = Tuple[int, int, int, int]
+
+
+def _runs(occupied: np.ndarray, min_gap: int) -> List[Tuple[int, int]]:
+    """
+    Find runs of occupied cells, splitting only at gaps of min_gap empty cells or more.
+
+    Args:
+        occupied: 1-D boolean array
+        min_gap: Smallest gap that separates two runs
+
+    Returns:
+        List of (start, end) index pairs, end exclusive
+    """
+    indexes = np.flatnonzero(occupied)
+    if indexes.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indexes) > min_gap)
+    starts = np.concatenate(([indexes[0]], indexes[breaks + 1]))
+    ends = np.concatenate((indexes[breaks], [indexes[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _run_lengths(cells: np.ndarray) -> np.ndarray:
+    """
+    Measure the horizontal run of occupied cells each cell belongs to.
+
+    Args:
+        cells: 2-D boolean array
+
+    Returns:
+        int array of run lengths, 0 for empty cells
+    """
+    # An empty separator column keeps runs from wrapping onto the next row
+    padded = np.zeros((cells.shape[0], cells.shape[1] + 1), dtype=bool)
+    padded[:, :-1] = cells
+    flat = padded.ravel()
+    starts = flat & ~np.concatenate(([False], flat[:-1]))
+    run_ids = np.cumsum(starts) * flat
+    lengths = np.bincount(run_ids)
+    lengths[0] = 0
+    return lengths[run_ids].reshape(padded.shape)[:, :-1]
+
+
+def _erase_rules(cells: np.ndarray, rule_length: int) -> np.ndarray:
+    """
+    Clear cells that belong to long, thin horizontal or vertical lines.
+
+    Args:
+        cells: 2-D boolean array of thumbnail cells containing ink
+        rule_length: Shortest run, in cells, that counts as a line
+
+    Returns:
+        Cells with borders, rules and leader dots removed
+    """
+    across = _run_lengths(cells)
+    down = _run_lengths(cells.T).T
+    long_across = across >= rule_length
+    long_down = down >= rule_length
+    # Cells on both a long row and a long column are frame corners or solid fill
+    rules = (
+        (long_across & (down <= RULE_THICKNESS_CELLS))
+        | (long_down & (across <= RULE_THICKNESS_CELLS))
+        | (long_across & long_down)
+    )
+    return cells & ~rules
+
+
+def _xy_cut(cells: np.ndarray, line_gap: int, column_gap: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Split a thumbnail into blocks separated by empty bands.
+
+    Args:
+        cells: 2-D boolean array of thumbnail cells containing ink
+        line_gap: Empty rows needed to split blocks vertically
+        column_gap: Empty columns needed to split blocks horizontally
+
+    Returns:
+        List of (top, bottom, left, right) cell bounds, in reading order
+    """
+    blocks = []
+    pending = [(0, cells.shape[0], 0, cells.shape[1])]
+    while pending:
+        top, bottom, left, right = pending.pop()
+        row_runs = _runs(cells[top:bottom, left:right].any(axis=1), line_gap)
+        if len(row_runs) > 1:
+            pending.extend(
+                (top + start, top + end, left, right) for start, end in reversed(row_runs)
+            )
+            continue
+        if not row_runs:
+            continue
+        top, bottom = top + row_runs[0][0], top + row_runs[0][1]
+
+        column_runs = _runs(cells[top:bottom, left:right].any(axis=0), column_gap)
+        if len(column_runs) > 1:
+            pending.extend(
+                (top, bottom, left + start, left + end) for start, end in reversed(column_runs)
+            )
+            continue
+        blocks.append((top, bottom, left + column_runs[0][0], left + column_runs[0][1]))
+    return blocks
+
+
+def detect_text_regions(image: Image.Image, options: Optional[Dict[str, Any]] = None) -> List[Region]:
+    """
+    Find the blocks of a page that are worth OCRing.
+
+    Args:
+        image: Preprocessed grayscale page (dark text on a light background)
+        options: Region detection options; missing keys use DEFAULT_REGIONS
+
+    Returns:
+        Regions in page pixel coordinates, in reading order; empty if the
+        page has no text-like ink. If there are more than max_regions
+        blocks, a single region around all of them is returned instead.
+    """
+    options = {**DEFAULT_REGIONS, **(options or {})}
+    scale = max(1, int(options["thumbnail_scale"]))
+    padding = options["padding"]
+
+    ink = np.asarray(image.convert("L")) < INK_LEVEL
+    height, width = ink.shape
+    # Pad to whole cells, then count ink pixels per cell through a reshaped view
+    padded = np.pad(ink, ((0, -height % scale), (0, -width % scale)))
+    counts = padded.reshape(padded.shape[0] // scale, scale, padded.shape[1] // scale, scale).sum(
+        axis=(1, 3), dtype=np.int32
+    )
+
+    cells = _erase_rules(counts > 0, options["rule_length"])
+    regions = []
+    for top, bottom, left, right in _xy_cut(cells, options["line_gap"], options["column_gap"]):
+        block = counts[top:bottom, left:right]
+        if np.count_nonzero(block) < MIN_INK_CELLS:
+            continue
+        if block.sum() / (block.size * scale * scale) > options["max_ink_density"]:
+            continue
+        regions.append((
+            max(0, left * scale - padding),
+            max(0, top * scale - padding),
+            min(width, right * scale + padding),
+            min(height, bottom * scale + padding),
+        ))
+
+    if len(regions) > options["max_regions"]:
+        # Many small crops cost more in per-call OCR overhead than they save
+        regions = [(
+            min(region[0] for region in regions),
+            min(region[1] for region in regions),
+            max(region[2] for region in regions),
+            max(region[3] for region in regions),
+        )]
+    return regions
+
+
+def region_pixels(regions: List[Region]) -> int:
+    """Total number of pixels in a list of regions."""
+    return sum((right - left) * (bottom - top) for left, top, right, bottom in regions)
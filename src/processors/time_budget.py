@@ -0,0 +1,112 @@
+"""
+Time budgets for OCRing a document before a deadline.
+
+A TimeBudget spreads the time left before a deadline over the pages still to
+OCR. Pages are OCR'd at a quality level, 0 being the configured settings and
+higher levels cheaper ones (see PDFProcessor). The budget remembers how long
+pages took at each level and, when the pages left would not fit in the time
+left at the current level, moves to the next cheaper one. Levels only go
+down: a document that fell behind doesn't get more expensive again. Once
+the deadline has passed, no more pages are started.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Weight of the newest page in a level's running mean page time
+COST_SMOOTHING = 0.5
+
+
+class TimeBudget:
+    """
+    Deadline and quality level for the pages of one OCR run.
+
+    Thread-safe: pages may be started and finished from worker threads.
+    """
+
+    def __init__(
+        self,
+        expires_at: float,
+        pages: int,
+        workers: int = 1,
+        levels: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize a TimeBudget.
+
+        Args:
+            expires_at: Deadline, as a clock() value
+            pages: Number of pages to OCR
+            workers: Pages OCR'd at the same time
+            levels: Number of quality levels (0 to levels - 1)
+            clock: Time source, in seconds (default: time.monotonic)
+        """
+        self.expires_at = expires_at
+        self.pages_left = pages
+        self.workers = max(1, workers)
+        self.levels = max(1, levels)
+        self.level = 0
+        self._clock = clock
+        self._costs: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (negative once it has passed)."""
+        return self.expires_at - self._clock()
+
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0
+
+    def timeout(self, limit: float) -> float:
+        """
+        Cap a per-call timeout at the time left.
+
+        Args:
+            limit: Usual timeout in seconds
+
+        Returns:
+            The smaller of limit and the seconds left (at least a small
+            positive value, as callers treat 0 as no timeout)
+        """
+        return max(0.001, min(limit, self.remaining()))
+
+    def start_page(self) -> Optional[int]:
+        """
+        Claim the next page and pick its quality level.
+
+        Returns:
+            Quality level for the page, or None if the deadline has passed
+            and the page should not be started
+        """
+        with self._lock:
+            remaining = self.remaining()
+            if remaining <= 0:
+                return None
+            # Pages still to start run workers at a time
+            rounds = self.pages_left / self.workers
+            while (
+                self.level < self.levels - 1
+                and self.level in self._costs
+                and self._costs[self.level] * rounds > remaining
+            ):
+                self.level += 1
+            self.pages_left = max(0, self.pages_left - 1)
+            return self.level
+
+    def finish_page(self, level: int, seconds: float) -> None:
+        """
+        Record how long a page took.
+
+        Args:
+            level: Quality level the page was OCR'd at
+            seconds: Time the page took
+        """
+        with self._lock:
+            previous = self._costs.get(level)
+            if previous is None:
+                self._costs[level] = seconds
+            else:
+                self._costs[level] = COST_SMOOTHING * seconds + (1 - COST_SMOOTHING) * previous
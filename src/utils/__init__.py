@@ -3,9 +3,15 @@ Utility modules for SAVVI application.
 """
 
 from src.utils.config import Config, get_config
+from src.utils.extraction_cache import ExtractionCache, get_configured_extraction_cache, get_extraction_cache
+from src.utils.image_cache import PageImageCache, get_page_image_cache
+from src.utils.memory_budget import MemoryBudget, get_memory_budget
 from src.utils.logger import get_logger, setup_root_logger, logger
 from src.utils.validators import (
     validate_pdf_file,
+    validate_pdf_data,
+    validate_image_file,
+    validate_image_data,
     validate_dietary_prefs,
     validate_allergen_list,
     validate_file_path,
@@ -15,10 +21,20 @@ from src.utils.validators import (
 __all__ = [
     "Config",
     "get_config",
+    "ExtractionCache",
+    "get_extraction_cache",
+    "get_configured_extraction_cache",
+    "PageImageCache",
+    "get_page_image_cache",
+    "MemoryBudget",
+    "get_memory_budget",
     "get_logger",
     "setup_root_logger",
     "logger",
     "validate_pdf_file",
+    "validate_pdf_data",
+    "validate_image_file",
+    "validate_image_data",
     "validate_dietary_prefs",
     "validate_allergen_list",
     "validate_file_path",
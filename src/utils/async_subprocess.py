@@ -0,0 +1,53 @@
+"""
+Child processes for asyncio code.
+
+run_process() is the event-loop counterpart of subprocess.run(): poppler and
+tesseract run as asyncio subprocesses, so waiting for them never blocks the
+loop. A child is killed (and reaped) when the awaiting task is cancelled or
+times out, so abandoned requests don't leave renders and OCR running.
+"""
+
+import asyncio
+from typing import Optional, Sequence, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def run_process(
+    args: Sequence[str],
+    input: Optional[bytes] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[int, bytes, bytes]:
+    """
+    Run a command and collect its output without blocking the event loop.
+
+    Args:
+        args: Command and arguments
+        input: Bytes written to the command's stdin (None: no stdin)
+        timeout: Maximum seconds to wait for the command (None: no limit)
+
+    Returns:
+        Tuple of (return code, stdout, stderr)
+
+    Raises:
+        FileNotFoundError: If the command does not exist
+        asyncio.TimeoutError: If the command ran longer than timeout (it is killed)
+        asyncio.CancelledError: If the awaiting task was cancelled (the command is killed)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout)
+    except BaseException:
+        if process.returncode is None:
+            logger.debug(f"Killing {args[0]} (pid {process.pid})")
+            process.kill()
+            await process.wait()
+        raise
+    return process.returncode, stdout, stderr
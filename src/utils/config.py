@@ -20,18 +20,109 @@ class ApplicationConfig(BaseModel):
     environment: str = "development"
 
 
+class PreprocessingConfig(BaseModel):
+    """OCR image preprocessing steps."""
+    contrast: bool = False
+    threshold: str = "otsu"
+    adaptive_block_size: int = 31
+    adaptive_offset: int = 10
+    denoise: bool = True
+    deskew: bool = True
+    max_skew_degrees: float = 5.0
+    crop_margins: bool = True
+    margin_padding: int = 16
+
+
+class TextRegionConfig(BaseModel):
+    """Text region detection before OCR."""
+    enabled: bool = True
+    thumbnail_scale: int = 4
+    line_gap: int = 6
+    column_gap: int = 8
+    padding: int = 8
+    rule_length: int = 50
+    max_ink_density: float = 0.45
+    max_regions: int = 16
+
+
+class PageSkipConfig(BaseModel):
+    """Blank and repeated page skipping before OCR."""
+    enabled: bool = True
+    hash_size: int = 16
+    blank_ink_density: float = 0.001
+
+
+class LanguageDetectionConfig(BaseModel):
+    """Per-document OCR language choice and rotation fixing."""
+    enabled: bool = True
+    sample_pages: int = 2
+    dpi: int = 100
+    languages: List[str] = Field(default_factory=lambda: ["eng", "spa", "fra", "chi_sim", "jpn", "kor"])
+    min_script_confidence: float = 1.0
+    min_language_share: float = 0.25
+    fix_rotation: bool = True
+    rotation_check_confidence: float = 0.6
+    min_orientation_confidence: float = 2.0
+
+
+DEFAULT_OUTPUT_DIR = "data/processed_menus"
+DEFAULT_EXTRACTION_CACHE_DIR = str(Path(DEFAULT_OUTPUT_DIR) / "extraction_cache")
+
+
 class OCRConfig(BaseModel):
     """OCR processing configuration."""
     enabled: bool = True
     language: str = "eng"
     quality_threshold: float = 0.75
+    dpi: int = 150
+    adaptive_dpi: bool = True
+    low_dpi: int = 100
+    high_dpi: int = 300
+    min_chars_per_page: int = 50
+    deadline_seconds: Optional[float] = None
+    workers: int = 1
+    pipeline: bool = False
+    queue_depth: int = 2
+    engine: str = "auto"
+    tessdata_path: Optional[str] = None
+    preprocessing: PreprocessingConfig = Field(default_factory=PreprocessingConfig)
+    regions: TextRegionConfig = Field(default_factory=TextRegionConfig)
+    page_skip: PageSkipConfig = Field(default_factory=PageSkipConfig)
+    language_detection: LanguageDetectionConfig = Field(default_factory=LanguageDetectionConfig)
+
+
+class TextExtractionConfig(BaseModel):
+    """Native PDF text extraction configuration."""
+    workers: int = 1
+    min_pages_per_worker: int = 8
+    use_mmap: bool = False
+    skip_textless_pages: bool = True
+
+
+class ExtractionCacheConfig(BaseModel):
+    """Persistent extraction cache configuration."""
+    enabled: bool = True
+    max_size_mb: int = 512
+    directory: Optional[str] = None
+    image_max_size_mb: int = 256
+
+
+class MemoryBudgetConfig(BaseModel):
+    """Process-wide memory budget for rendering and OCR."""
+    enabled: bool = True
+    max_size_mb: int = 2048
+    max_wait_seconds: Optional[float] = 10.0
+    min_dpi: int = 100
 
 
 class PDFProcessingConfig(BaseModel):
     """PDF processing configuration."""
     max_file_size_mb: int = 50
     supported_formats: List[str] = Field(default_factory=lambda: ["pdf", "image"])
+    text_extraction: TextExtractionConfig = Field(default_factory=TextExtractionConfig)
     ocr: OCRConfig = Field(default_factory=OCRConfig)
+    cache: ExtractionCacheConfig = Field(default_factory=ExtractionCacheConfig)
+    memory_budget: MemoryBudgetConfig = Field(default_factory=MemoryBudgetConfig)
 
 
 class RecipeSearchConfig(BaseModel):
@@ -90,7 +181,7 @@ class EnvironmentSettings(BaseSettings):
     
     # File Storage
     upload_dir: str = Field(default="data/uploaded_menus", alias="UPLOAD_DIR")
-    output_dir: str = Field(default="data/processed_menus", alias="OUTPUT_DIR")
+    output_dir: str = Field(default=DEFAULT_OUTPUT_DIR, alias="OUTPUT_DIR")
     log_dir: str = Field(default="logs", alias="LOG_DIR")
     
     class Config:
@@ -190,6 +281,68 @@ class Config:
                 print("ERROR: PDF_MAX_SIZE_MB must be greater than 0")
                 return False
             
+            # Validate text extraction settings
+            if self._yaml_config.pdf_processing.text_extraction.workers < 0:
+                print("ERROR: text_extraction.workers must be 0 (auto) or greater")
+                return False
+            if self._yaml_config.pdf_processing.ocr.workers < 0:
+                print("ERROR: ocr.workers must be 0 (auto) or greater")
+                return False
+            if self._yaml_config.pdf_processing.ocr.queue_depth < 1:
+                print("ERROR: ocr.queue_depth must be at least 1")
+                return False
+            deadline_seconds = self._yaml_config.pdf_processing.ocr.deadline_seconds
+            if deadline_seconds is not None and deadline_seconds <= 0:
+                print("ERROR: ocr.deadline_seconds must be greater than 0 (or null for no limit)")
+                return False
+            if self._yaml_config.pdf_processing.ocr.low_dpi >= self._yaml_config.pdf_processing.ocr.high_dpi:
+                print("ERROR: ocr.low_dpi must be lower than ocr.high_dpi")
+                return False
+            preprocessing = self._yaml_config.pdf_processing.ocr.preprocessing
+            if preprocessing.threshold not in ("otsu", "adaptive", "none"):
+                print("ERROR: ocr.preprocessing.threshold must be one of: otsu, adaptive, none")
+                return False
+            if preprocessing.adaptive_block_size < 3 or preprocessing.adaptive_block_size % 2 == 0:
+                print("ERROR: ocr.preprocessing.adaptive_block_size must be an odd number of at least 3")
+                return False
+            regions = self._yaml_config.pdf_processing.ocr.regions
+            if regions.thumbnail_scale < 1:
+                print("ERROR: ocr.regions.thumbnail_scale must be at least 1")
+                return False
+            if not (0 < regions.max_ink_density <= 1):
+                print("ERROR: ocr.regions.max_ink_density must be between 0 and 1")
+                return False
+            page_skip = self._yaml_config.pdf_processing.ocr.page_skip
+            if page_skip.hash_size < 2:
+                print("ERROR: ocr.page_skip.hash_size must be at least 2")
+                return False
+            if not (0 <= page_skip.blank_ink_density < 1):
+                print("ERROR: ocr.page_skip.blank_ink_density must be between 0 and 1")
+                return False
+            language_detection = self._yaml_config.pdf_processing.ocr.language_detection
+            if language_detection.sample_pages < 1:
+                print("ERROR: ocr.language_detection.sample_pages must be at least 1")
+                return False
+            if language_detection.enabled and not language_detection.languages:
+                print("ERROR: ocr.language_detection.languages must list at least one language")
+                return False
+            if not (0 <= language_detection.min_language_share <= 1):
+                print("ERROR: ocr.language_detection.min_language_share must be between 0 and 1")
+                return False
+            if self._yaml_config.pdf_processing.ocr.engine not in ("auto", "tesserocr", "pytesseract"):
+                print("ERROR: ocr.engine must be one of: auto, tesserocr, pytesseract")
+                return False
+            memory_budget = self._yaml_config.pdf_processing.memory_budget
+            if memory_budget.enabled and memory_budget.max_size_mb <= 0:
+                print("ERROR: memory_budget.max_size_mb must be greater than 0")
+                return False
+            if memory_budget.max_wait_seconds is not None and memory_budget.max_wait_seconds < 0:
+                print("ERROR: memory_budget.max_wait_seconds must be 0 or greater (or null to always wait)")
+                return False
+            if memory_budget.min_dpi < 1:
+                print("ERROR: memory_budget.min_dpi must be at least 1")
+                return False
+            
             # Validate API settings
             if not (1 <= self.env_settings.api_port <= 65535):
                 print("ERROR: API_PORT must be between 1 and 65535")
@@ -230,6 +383,11 @@ class Config:
         Returns:
             Dictionary containing PDF processing configuration
         """
+        cache_config = self._yaml_config.pdf_processing.cache
+        cache_dir = cache_config.directory or str(
+            Path(self.env_settings.output_dir) / "extraction_cache"
+        )
+        
         return {
             "max_file_size_mb": self.env_settings.pdf_max_size_mb,
             "supported_formats": self._yaml_config.pdf_processing.supported_formats,
@@ -237,6 +395,30 @@ class Config:
             "tesseract_path": self.env_settings.tesseract_path,
             "ocr_language": self._yaml_config.pdf_processing.ocr.language,
             "ocr_quality_threshold": self._yaml_config.pdf_processing.ocr.quality_threshold,
+            "ocr_dpi": self._yaml_config.pdf_processing.ocr.dpi,
+            "ocr_min_chars_per_page": self._yaml_config.pdf_processing.ocr.min_chars_per_page,
+            "ocr_deadline_seconds": self._yaml_config.pdf_processing.ocr.deadline_seconds,
+            "ocr_adaptive_dpi": self._yaml_config.pdf_processing.ocr.adaptive_dpi,
+            "ocr_low_dpi": self._yaml_config.pdf_processing.ocr.low_dpi,
+            "ocr_high_dpi": self._yaml_config.pdf_processing.ocr.high_dpi,
+            "ocr_workers": self._yaml_config.pdf_processing.ocr.workers,
+            "ocr_pipeline": self._yaml_config.pdf_processing.ocr.pipeline,
+            "ocr_queue_depth": self._yaml_config.pdf_processing.ocr.queue_depth,
+            "ocr_engine": self._yaml_config.pdf_processing.ocr.engine,
+            "ocr_tessdata_path": self._yaml_config.pdf_processing.ocr.tessdata_path,
+            "ocr_preprocessing": self._yaml_config.pdf_processing.ocr.preprocessing.model_dump(),
+            "ocr_regions": self._yaml_config.pdf_processing.ocr.regions.model_dump(),
+            "ocr_page_skip": self._yaml_config.pdf_processing.ocr.page_skip.model_dump(),
+            "ocr_language_detection": self._yaml_config.pdf_processing.ocr.language_detection.model_dump(),
+            "text_workers": self._yaml_config.pdf_processing.text_extraction.workers,
+            "text_min_pages_per_worker": self._yaml_config.pdf_processing.text_extraction.min_pages_per_worker,
+            "use_mmap": self._yaml_config.pdf_processing.text_extraction.use_mmap,
+            "skip_textless_pages": self._yaml_config.pdf_processing.text_extraction.skip_textless_pages,
+            "cache_enabled": cache_config.enabled,
+            "cache_max_size_mb": cache_config.max_size_mb,
+            "cache_dir": cache_dir,
+            "image_cache_max_size_mb": cache_config.image_max_size_mb,
+            "memory_budget": self._yaml_config.pdf_processing.memory_budget.model_dump(),
         }
     
     def get_recipe_search_settings(self) -> Dict[str, Any]:
@@ -0,0 +1,460 @@
+"""
+Persistent, content-addressed cache for extracted menu text.
+
+Entries are keyed by the SHA-256 of the PDF bytes plus the parameters that
+affect extraction (OCR language, DPI, preprocessing version, ...), so
+re-uploads of the same menu reuse earlier text extraction and OCR results.
+Each entry stores per-page text and how it was obtained ("text" or "ocr").
+
+Next to a document's entries, the OCR language detected for it (see
+script_detection.py) is kept, so detection runs once per document.
+
+A second table maps page fingerprints (see page_fingerprint.py) to OCR
+results, so a page that appears in several documents is OCR'd once.
+
+Layout on disk:
+    <cache_dir>/v<pipeline_version>/<sha256[:2]>/<sha256>/<params_hash>.json
+    <cache_dir>/v<pipeline_version>/<sha256[:2]>/<sha256>/language-<params_hash>.json
+    <cache_dir>/v<pipeline_version>/pages/<key[:2]>/<key>.json
+
+Bumping PIPELINE_VERSION invalidates every existing entry; stale version
+directories are removed when a cache is opened. The total size is capped and
+least-recently-used entries (by file modification time) are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.utils.config import DEFAULT_EXTRACTION_CACHE_DIR, ExtractionCacheConfig
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump whenever text extraction or OCR output changes for the same input
+PIPELINE_VERSION = "1"
+
+
+class ExtractionCache:
+    """
+    Disk cache of per-page extraction results with a size cap and LRU eviction.
+
+    Safe to share between threads; concurrent processes may share the same
+    directory since every write is an atomic file replace.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_size_mb: float = 512,
+        pipeline_version: str = PIPELINE_VERSION,
+    ):
+        """
+        Initialize ExtractionCache and drop entries from other pipeline versions.
+
+        Args:
+            cache_dir: Root directory for cache entries
+            max_size_mb: Maximum total size of cache entries in MB
+            pipeline_version: Version tag entries are stored under
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.pipeline_version = pipeline_version
+        self.version_dir = self.cache_dir / f"v{pipeline_version}"
+
+        self._lock = threading.Lock()
+        self._approx_size: Optional[int] = None  # Unknown until the first scan
+        self.hits = 0
+        self.misses = 0
+
+        self.version_dir.mkdir(parents=True, exist_ok=True)
+        self.purge_stale()
+
+    @staticmethod
+    def params_key(params: Dict[str, Any]) -> str:
+        """
+        Hash extraction parameters into a stable key.
+
+        Args:
+            params: JSON-serialisable extraction parameters
+
+        Returns:
+            Hex digest of the canonical JSON encoding of params
+        """
+        encoded = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:32]
+
+    def _entry_path(self, digest: str, params: Dict[str, Any]) -> Path:
+        """Get the file path of the entry for a document and parameter set."""
+        return self.version_dir / digest[:2] / digest / f"{self.params_key(params)}.json"
+
+    def _language_path(self, digest: str, params: Dict[str, Any]) -> Path:
+        """Get the file path of the detected OCR language for a document and detection settings."""
+        return self.version_dir / digest[:2] / digest / f"language-{self.params_key(params)}.json"
+
+    def _page_path(self, fingerprint: str, params: Dict[str, Any]) -> Path:
+        """Get the file path of the OCR result for a page fingerprint and parameter set."""
+        key = self.params_key({"fingerprint": fingerprint, "params": params})
+        return self.version_dir / "pages" / key[:2] / f"{key}.json"
+
+    def _read_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read an entry file, discarding it if it is corrupted.
+
+        Args:
+            path: Entry file path
+
+        Returns:
+            Entry dictionary with integer page numbers, or None if missing
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        entry["pages"] = {int(page_num): page for page_num, page in entry.get("pages", {}).items()}
+        return entry
+
+    def get_entry(self, digest: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Load a cache entry and mark it as recently used.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+            params: Extraction parameters the entry was stored with
+
+        Returns:
+            Entry dictionary with "pages" (page_number -> {"text", "method"})
+            and "page_count", or None on a miss
+        """
+        path = self._entry_path(digest, params)
+        entry = self._read_entry(path)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # LRU: modification time is the last access
+        except OSError:
+            pass
+        self.hits += 1
+        logger.debug(f"Extraction cache hit: {digest[:12]} ({len(entry['pages'])} pages)")
+        return entry
+
+    def get_pages(self, digest: str, params: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get cached pages for a document and parameter set.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+            params: Extraction parameters
+
+        Returns:
+            Dictionary mapping page_number -> {"text": str, "method": str};
+            empty on a miss
+        """
+        entry = self.get_entry(digest, params)
+        return entry["pages"] if entry else {}
+
+    def put_pages(
+        self,
+        digest: str,
+        params: Dict[str, Any],
+        pages: Dict[int, Dict[str, Any]],
+        page_count: Optional[int] = None,
+    ) -> None:
+        """
+        Store pages, merging them with pages already cached for the entry.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+            params: Extraction parameters
+            pages: Dictionary mapping page_number -> {"text": str, "method": str}
+            page_count: Total number of pages in the document, if known
+        """
+        if not pages:
+            return
+
+        path = self._entry_path(digest, params)
+        with self._lock:
+            existing = self._read_entry(path) or {}
+            merged = dict(existing.get("pages", {}))
+            merged.update(pages)
+            entry = {
+                "pipeline_version": self.pipeline_version,
+                "sha256": digest,
+                "params": params,
+                "page_count": page_count if page_count is not None else existing.get("page_count"),
+                "pages": {str(page_num): page for page_num, page in sorted(merged.items())},
+            }
+            written = self._write_entry(path, entry)
+            if written is not None:
+                logger.debug(f"Cached {len(pages)} pages for {digest[:12]} ({written} bytes)")
+
+    def get_page(self, fingerprint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the OCR result of a page by its fingerprint.
+
+        Args:
+            fingerprint: Page fingerprint (see fingerprint_page())
+            params: Extraction parameters the result was stored with
+
+        Returns:
+            Page result ({"text": str, "method": str, ...}), or None on a miss
+        """
+        path = self._page_path(fingerprint, params)
+        entry = self._read_entry(path)
+        if entry is None or "page" not in entry:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        logger.debug(f"Page fingerprint cache hit: {fingerprint[:12]}")
+        return entry["page"]
+
+    def put_page(self, fingerprint: str, params: Dict[str, Any], page: Dict[str, Any]) -> None:
+        """
+        Store the OCR result of a page under its fingerprint.
+
+        Args:
+            fingerprint: Page fingerprint (see fingerprint_page())
+            params: Extraction parameters
+            page: Page result ({"text": str, "method": str, ...})
+        """
+        entry = {
+            "pipeline_version": self.pipeline_version,
+            "fingerprint": fingerprint,
+            "params": params,
+            "page": page,
+        }
+        with self._lock:
+            self._write_entry(self._page_path(fingerprint, params), entry)
+
+    def get_language(self, digest: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Look up the OCR language detected for a document.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+            params: Detection settings the language was stored with
+
+        Returns:
+            Tesseract language code(s), e.g. "spa" or "eng+fra", or None on a miss
+        """
+        path = self._language_path(digest, params)
+        entry = self._read_entry(path)
+        if entry is None or "language" not in entry:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["language"]
+
+    def put_language(self, digest: str, params: Dict[str, Any], language: str) -> None:
+        """
+        Store the OCR language detected for a document.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+            params: Detection settings
+            language: Tesseract language code(s)
+        """
+        entry = {
+            "pipeline_version": self.pipeline_version,
+            "sha256": digest,
+            "params": params,
+            "language": language,
+        }
+        with self._lock:
+            self._write_entry(self._language_path(digest, params), entry)
+
+    def _write_entry(self, path: Path, entry: Dict[str, Any]) -> Optional[int]:
+        """
+        Atomically write an entry file, evicting old entries if the cache is full.
+
+        Must be called with the lock held.
+
+        Args:
+            path: Entry file path
+            entry: JSON-serialisable entry
+
+        Returns:
+            Bytes written, or None if the entry could not be written
+        """
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_name, path)
+            tmp_name = None
+        except OSError as e:
+            logger.warning(f"Could not write extraction cache entry {path}: {e}")
+            return None
+        finally:
+            # Don't leave the temporary file behind if the entry failed to
+            # serialise or could not be moved into place
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+        written = path.stat().st_size
+        if self._approx_size is not None:
+            self._approx_size += written - replaced
+        if self._approx_size is None or self._approx_size > self.max_size_bytes:
+            self._evict()
+        return written
+
+    def _evict(self) -> int:
+        """
+        Remove least-recently-used entries until the cache fits its size cap.
+
+        Must be called with the lock held.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for path in self.version_dir.glob("*/*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            try:
+                path.parent.rmdir()  # Only succeeds once the document has no entries left
+            except OSError:
+                pass
+            total -= size
+            removed += 1
+
+        self._approx_size = total
+        if removed:
+            logger.info(f"Evicted {removed} extraction cache entries ({total} bytes remain)")
+        return removed
+
+    def invalidate(self, digest: str) -> None:
+        """
+        Remove all entries for one document.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+        """
+        with self._lock:
+            shutil.rmtree(self.version_dir / digest[:2] / digest, ignore_errors=True)
+            self._approx_size = None
+
+    def purge_stale(self) -> int:
+        """
+        Remove entries written by other pipeline versions.
+
+        Returns:
+            Number of version directories removed
+        """
+        removed = 0
+        for path in self.cache_dir.glob("v*"):
+            if path.is_dir() and path != self.version_dir:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} stale extraction cache version(s)")
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry for the current pipeline version."""
+        with self._lock:
+            shutil.rmtree(self.version_dir, ignore_errors=True)
+            self.version_dir.mkdir(parents=True, exist_ok=True)
+            self._approx_size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dictionary containing entries, size_bytes, max_size_bytes, hits, misses
+        """
+        sizes = [path.stat().st_size for path in self.version_dir.glob("*/*/*.json")]
+        return {
+            "entries": len(sizes),
+            "size_bytes": sum(sizes),
+            "max_size_bytes": self.max_size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared cache instances, one per directory
+_cache_instances: Dict[Path, ExtractionCache] = {}
+_cache_instances_lock = threading.Lock()
+
+
+def get_extraction_cache(cache_dir: Union[str, Path], max_size_mb: float = 512) -> ExtractionCache:
+    """
+    Get the shared ExtractionCache for a directory.
+
+    Args:
+        cache_dir: Root directory for cache entries
+        max_size_mb: Maximum total size in MB (applied when first created)
+
+    Returns:
+        ExtractionCache instance (one per directory per process)
+    """
+    key = Path(cache_dir).resolve()
+    with _cache_instances_lock:
+        if key not in _cache_instances:
+            _cache_instances[key] = ExtractionCache(key, max_size_mb=max_size_mb)
+        return _cache_instances[key]
+
+
+def get_configured_extraction_cache(pdf_settings: Dict[str, Any]) -> Optional[ExtractionCache]:
+    """
+    Get the shared ExtractionCache that PDF settings ask for.
+
+    Args:
+        pdf_settings: Settings from Config.get_pdf_settings(); missing keys
+            take the configuration's defaults, so the cache is enabled and
+            kept under the default output directory
+
+    Returns:
+        ExtractionCache instance, or None if ``cache_enabled`` is off
+    """
+    defaults = ExtractionCacheConfig()
+    if not pdf_settings.get("cache_enabled", defaults.enabled):
+        return None
+    return get_extraction_cache(
+        pdf_settings.get("cache_dir") or DEFAULT_EXTRACTION_CACHE_DIR,
+        pdf_settings.get("cache_max_size_mb", defaults.max_size_mb),
+    )
@@ -0,0 +1,174 @@
+"""
+In-memory cache of rendered PDF pages.
+
+Rendered pages are keyed by (document id, page number, DPI, colour mode), so
+renders at different resolutions never shadow each other. The cache holds at
+most a configured number of bytes of pixel data and evicts the least
+recently used pages first. One instance is shared by every PDFProcessor in
+the process, so previews and OCR re-runs reuse earlier renders.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (doc_id, page_number, dpi, mode)
+PageKey = Tuple[str, int, int, str]
+
+
+def image_size_bytes(image: Image.Image) -> int:
+    """
+    Estimate the memory held by an image's pixel data.
+
+    Args:
+        image: PIL Image
+
+    Returns:
+        Approximate size in bytes
+    """
+    return image.width * image.height * len(image.getbands())
+
+
+class PageImageCache:
+    """
+    Thread-safe, byte-bounded LRU cache of rendered pages.
+
+    Cached images are shared between callers and must not be modified in
+    place.
+    """
+
+    def __init__(self, max_size_mb: float = 256):
+        """
+        Initialize PageImageCache.
+
+        Args:
+            max_size_mb: Maximum total size of cached pixel data in MB
+                (0 disables caching)
+        """
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._images: "OrderedDict[PageKey, Image.Image]" = OrderedDict()
+        self._sizes: Dict[PageKey, int] = {}
+        self._page_counts: Dict[str, int] = {}
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, doc_id: str, page_num: int, dpi: int, mode: str) -> Optional[Image.Image]:
+        """
+        Get a rendered page and mark it as recently used.
+
+        Args:
+            doc_id: Document identifier (see PDFSource.doc_id)
+            page_num: 1-based page number
+            dpi: Render resolution
+            mode: Colour mode of the render (e.g. "RGB", "L")
+
+        Returns:
+            Cached image, or None on a miss
+        """
+        key = (doc_id, page_num, dpi, mode)
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, doc_id: str, page_num: int, dpi: int, mode: str, image: Image.Image) -> None:
+        """
+        Store a rendered page, evicting least-recently-used pages to make room.
+
+        Pages larger than the whole budget are not cached.
+
+        Args:
+            doc_id: Document identifier
+            page_num: 1-based page number
+            dpi: Render resolution
+            mode: Colour mode of the render
+            image: Rendered page
+        """
+        key = (doc_id, page_num, dpi, mode)
+        size = image_size_bytes(image)
+        if size > self.max_size_bytes:
+            return
+
+        with self._lock:
+            if key in self._images:
+                self._size_bytes -= self._sizes[key]
+            self._images[key] = image
+            self._images.move_to_end(key)
+            self._sizes[key] = size
+            self._size_bytes += size
+
+            evicted = 0
+            while self._size_bytes > self.max_size_bytes:
+                old_key, _ = self._images.popitem(last=False)
+                self._size_bytes -= self._sizes.pop(old_key)
+                evicted += 1
+            if evicted:
+                logger.debug(f"Evicted {evicted} cached page images ({self._size_bytes} bytes remain)")
+
+    def get_page_count(self, doc_id: str) -> Optional[int]:
+        """Get the page count recorded for a document by set_page_count()."""
+        with self._lock:
+            return self._page_counts.get(doc_id)
+
+    def set_page_count(self, doc_id: str, page_count: int) -> None:
+        """Record a document's page count, so whole-document renders can be served from the cache."""
+        with self._lock:
+            self._page_counts[doc_id] = page_count
+
+    def clear(self) -> None:
+        """Remove every cached page."""
+        with self._lock:
+            self._images.clear()
+            self._sizes.clear()
+            self._page_counts.clear()
+            self._size_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dictionary containing pages, size_bytes, max_size_bytes, hits, misses
+        """
+        with self._lock:
+            return {
+                "pages": len(self._images),
+                "size_bytes": self._size_bytes,
+                "max_size_bytes": self.max_size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared cache instance for this process
+_shared_cache: Optional[PageImageCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_page_image_cache(max_size_mb: float = 256) -> PageImageCache:
+    """
+    Get the page image cache shared by every PDFProcessor in this process.
+
+    Args:
+        max_size_mb: Maximum total size in MB (applied when first created)
+
+    Returns:
+        PageImageCache instance (one per process)
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PageImageCache(max_size_mb)
+        return _shared_cache
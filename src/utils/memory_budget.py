@@ -0,0 +1,323 @@
+"""
+Process-wide memory budget for rendering and OCR.
+
+Each PDFProcessor renders and OCRs pages on its own, so a few large scans
+processed at the same time can hold more page images than the node has
+memory. Before rendering, a job estimates its footprint from the page
+sizes, the DPI and how many pages it holds at once, and asks the shared
+MemoryBudget for it:
+- jobs that fit in what is free are admitted straight away;
+- jobs that do not fit are queued until running jobs release memory;
+- jobs queued longer than max_wait_seconds, or too large for the whole
+  budget, are downscaled: rendered at the highest DPI (down to min_dpi)
+  whose footprint fits. A page's pixel count grows with the square of the
+  DPI, so halving the DPI quarters the footprint.
+
+A job too large for the budget even at min_dpi runs alone. A job with a
+deadline can also cap its wait: once that has passed it is admitted at the
+DPI that fits what is free, or at min_dpi even if that overcommits the
+budget. Estimates are reservations, not measurements; get_stats() reports
+them next to the process's actual resident set size.
+"""
+
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+POINTS_PER_INCH = 72
+
+# Page images per OCR worker held besides the rendered pages (preprocessing
+# arrays, thresholded copy, the image handed to Tesseract)
+WORKING_COPIES_PER_WORKER = 3
+
+# Default memory budget options (pdf_processing.memory_budget in savvi_config.yaml)
+DEFAULT_MEMORY_BUDGET: Dict[str, Any] = {
+    "enabled": True,
+    "max_size_mb": 2048,
+    "max_wait_seconds": 10.0,
+    "min_dpi": 100,
+}
+
+
+def page_image_bytes(page_size: Tuple[float, float], dpi: int, bands: int = 1) -> int:
+    """
+    Estimate the pixel data of a page rendered at a DPI.
+
+    Args:
+        page_size: (width, height) of the page in PDF points
+        dpi: Render resolution
+        bands: Bytes per pixel (1 for the grayscale renders OCR uses)
+
+    Returns:
+        Size in bytes
+    """
+    width, height = page_size
+    return math.ceil(width * dpi / POINTS_PER_INCH) * math.ceil(height * dpi / POINTS_PER_INCH) * bands
+
+
+def estimate_job_bytes(
+    page_sizes: Iterable[Tuple[float, float]], dpi: int, resident_pages: int, workers: int = 1
+) -> int:
+    """
+    Estimate the peak memory of rendering and OCRing pages.
+
+    Args:
+        page_sizes: (width, height) in points of each page of the job
+        dpi: Render resolution
+        resident_pages: Most rendered pages held at once (the whole job for
+            batch rendering, the queue depth for the pipeline)
+        workers: OCR workers, each holding working copies of its page
+
+    Returns:
+        Estimated peak size in bytes, assuming the largest pages are the
+        ones held together
+    """
+    sizes = sorted((page_image_bytes(size, dpi) for size in page_sizes), reverse=True)
+    if not sizes:
+        return 0
+    workers = max(1, min(workers, len(sizes)))
+    return sum(sizes[:max(1, resident_pages)]) + WORKING_COPIES_PER_WORKER * workers * sizes[0]
+
+
+def scaled_bytes(job_bytes: int, dpi: int, new_dpi: int) -> int:
+    """Scale a footprint estimated at dpi to new_dpi."""
+    return math.ceil(job_bytes * (new_dpi / dpi) ** 2)
+
+
+def fit_dpi(job_bytes: int, dpi: int, limit: int, min_dpi: int) -> Optional[int]:
+    """
+    Find the highest DPI, at most dpi, at which a job fits in limit bytes.
+
+    Args:
+        job_bytes: Footprint at dpi
+        dpi: Requested resolution
+        limit: Bytes available
+        min_dpi: Lowest acceptable resolution
+
+    Returns:
+        The DPI, or None if the job does not fit even at min_dpi
+    """
+    if job_bytes <= limit:
+        return dpi
+    if limit <= 0:
+        return None
+    fitted = int(dpi * math.sqrt(limit / job_bytes))
+    while fitted >= min_dpi and scaled_bytes(job_bytes, dpi, fitted) > limit:
+        fitted -= 1
+    return fitted if fitted >= min_dpi else None
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    Get the resident set size of this process.
+
+    Returns:
+        RSS in bytes, or None where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryBudget:
+    """
+    Thread-safe admission control for memory-hungry jobs.
+
+    Jobs reserve their estimated footprint with admit() (or the reserve()
+    context manager) and give it back with release().
+    """
+
+    def __init__(self, max_size_mb: float = 2048, max_wait_seconds: Optional[float] = 10.0):
+        """
+        Initialize MemoryBudget.
+
+        Args:
+            max_size_mb: Total memory jobs may reserve at once, in MB
+            max_wait_seconds: How long a job waits for memory before it is
+                downscaled to fit what is free (None: wait for as long as it
+                takes)
+        """
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_wait_seconds = max_wait_seconds
+        self._reservations: Dict[int, int] = {}
+        self._reserved_bytes = 0
+        self._waiting = 0
+        self._tickets = itertools.count(1)
+        self._condition = threading.Condition()
+        self.admitted = 0
+        self.queued = 0
+        self.downscaled = 0
+
+    def admit(
+        self,
+        job_bytes: int,
+        dpi: int,
+        min_dpi: int,
+        name: str = "job",
+        max_wait: Optional[float] = None,
+    ) -> Tuple[int, int]:
+        """
+        Reserve memory for a job, waiting or downscaling it as needed.
+
+        Args:
+            job_bytes: Estimated footprint at dpi
+            dpi: Requested resolution
+            min_dpi: Lowest resolution the job may be downscaled to
+            name: Job description for logging
+            max_wait: Longest this job may wait at all, in seconds (e.g. the
+                time left before its deadline); once it has passed the job
+                is admitted at min_dpi if nothing higher fits, even over the
+                budget (None: no limit besides max_wait_seconds)
+
+        Returns:
+            Tuple of (ticket for release(), DPI the job may use)
+        """
+        min_dpi = min(min_dpi, dpi)
+        admitted_dpi = fit_dpi(job_bytes, dpi, self.max_size_bytes, min_dpi) or min_dpi
+        started = time.monotonic()
+        wait_limit = self.max_wait_seconds
+        if max_wait is not None:
+            max_wait = max(0.0, max_wait)
+            wait_limit = max_wait if wait_limit is None else min(wait_limit, max_wait)
+
+        with self._condition:
+            queued = False
+            while True:
+                needed = scaled_bytes(job_bytes, dpi, admitted_dpi)
+                available = self.max_size_bytes - self._reserved_bytes
+                if needed <= available or not self._reservations:
+                    break
+                waited = time.monotonic() - started
+                if wait_limit is not None and waited >= wait_limit:
+                    fitted = fit_dpi(job_bytes, dpi, available, min_dpi)
+                    if fitted is not None:
+                        admitted_dpi = fitted
+                        break
+                    if max_wait is not None and waited >= max_wait:
+                        admitted_dpi = min_dpi
+                        logger.warning(f"{name} cannot wait any longer for memory; overcommitting the budget")
+                        break
+                if not queued:
+                    queued = True
+                    self.queued += 1
+                    self._waiting += 1
+                    logger.info(
+                        f"Queued {name}: needs {needed / 2**20:.0f} MB, "
+                        f"{available / 2**20:.0f} MB of the memory budget free"
+                    )
+                if wait_limit is None:
+                    self._condition.wait()
+                elif waited < wait_limit:
+                    self._condition.wait(wait_limit - waited)
+                elif max_wait is not None:
+                    self._condition.wait(max_wait - waited)
+                else:
+                    self._condition.wait()
+
+            if queued:
+                self._waiting -= 1
+            needed = scaled_bytes(job_bytes, dpi, admitted_dpi)
+            ticket = next(self._tickets)
+            self._reservations[ticket] = needed
+            self._reserved_bytes += needed
+            self.admitted += 1
+            if admitted_dpi < dpi:
+                self.downscaled += 1
+                logger.warning(f"Downscaled {name} from {dpi} to {admitted_dpi} DPI to fit the memory budget")
+            if needed > self.max_size_bytes:
+                logger.warning(f"{name} exceeds the memory budget even at {admitted_dpi} DPI; running it alone")
+            logger.debug(
+                f"Admitted {name} at {admitted_dpi} DPI ({needed / 2**20:.0f} MB, "
+                f"{self._reserved_bytes / 2**20:.0f} MB reserved)"
+            )
+        return ticket, admitted_dpi
+
+    def release(self, ticket: int) -> None:
+        """
+        Give back a job's reservation and wake queued jobs.
+
+        Args:
+            ticket: Ticket returned by admit()
+        """
+        with self._condition:
+            size = self._reservations.pop(ticket, None)
+            if size is None:
+                return
+            self._reserved_bytes -= size
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(
+        self,
+        job_bytes: int,
+        dpi: int,
+        min_dpi: int,
+        name: str = "job",
+        max_wait: Optional[float] = None,
+    ) -> Iterator[int]:
+        """
+        Hold a reservation for the duration of a with block (see admit()).
+
+        Yields:
+            DPI the job may use
+        """
+        ticket, admitted_dpi = self.admit(job_bytes, dpi, min_dpi, name, max_wait)
+        try:
+            yield admitted_dpi
+        finally:
+            self.release(ticket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get current usage.
+
+        Returns:
+            Dictionary containing jobs, waiting, reserved_bytes, max_size_bytes,
+            admitted, queued, downscaled and rss_bytes (None if unknown)
+        """
+        with self._condition:
+            stats = {
+                "jobs": len(self._reservations),
+                "waiting": self._waiting,
+                "reserved_bytes": self._reserved_bytes,
+                "max_size_bytes": self.max_size_bytes,
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "downscaled": self.downscaled,
+            }
+        stats["rss_bytes"] = process_rss_bytes()
+        return stats
+
+
+# Shared budget instance for this process
+_shared_budget: Optional[MemoryBudget] = None
+_shared_budget_lock = threading.Lock()
+
+
+def get_memory_budget(max_size_mb: float = 2048, max_wait_seconds: Optional[float] = 10.0) -> MemoryBudget:
+    """
+    Get the memory budget shared by every PDFProcessor in this process.
+
+    Args:
+        max_size_mb: Total memory jobs may reserve at once, in MB (applied
+            when first created)
+        max_wait_seconds: Wait before downscaling (applied when first created)
+
+    Returns:
+        MemoryBudget instance (one per process)
+    """
+    global _shared_budget
+    with _shared_budget_lock:
+        if _shared_budget is None:
+            _shared_budget = MemoryBudget(max_size_mb, max_wait_seconds)
+        return _shared_budget
@@ -0,0 +1,169 @@
+"""
+Page images in shared memory, for handing pages to OCR worker processes.
+
+Submitting a PIL image to a process pool pickles it: the pixels are copied
+into a pickle, through a pipe and out again in the worker, several MB per
+150 DPI page. SharedImagePool instead copies each page once, straight into a
+multiprocessing.shared_memory block and hands the worker a small picklable
+reference; the worker maps the block and reads the pixels through a NumPy
+view, without copying them.
+
+The pool that creates blocks owns them: it unlinks each block when the
+caller releases it, and every remaining block when the pool is closed (also
+on errors, via the context manager). Workers only attach and close.
+"""
+
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Picklable reference to an image in shared memory: (block name, width, height)
+SharedImageRef = Tuple[str, int, int]
+
+# Rows copied into a block at a time; bounds the temporary copy PIL makes
+# when exporting pixels to a strip of the page rather than the whole page
+COPY_STRIP_ROWS = 256
+
+# Serialises the resource tracker patch in attach_block() (Python < 3.13)
+_attach_lock = threading.Lock()
+
+
+class SharedImagePool:
+    """
+    Shared memory blocks holding 8-bit grayscale page images.
+
+    Use as a context manager so blocks are unlinked even if OCR fails.
+    """
+
+    def __init__(self):
+        """Initialize an empty SharedImagePool."""
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.size_bytes = 0
+
+    def put(self, image: Image.Image) -> SharedImageRef:
+        """
+        Copy an image into a new shared memory block.
+
+        Args:
+            image: Page image (converted to grayscale "L" if it isn't already)
+
+        Returns:
+            Reference to pass to a worker process (see attach_image())
+        """
+        if image.mode != "L":
+            image = image.convert("L")
+        width, height = image.size
+        block = shared_memory.SharedMemory(create=True, size=max(1, width * height))
+        pixels = np.ndarray((height, width), dtype=np.uint8, buffer=block.buf)
+        try:
+            for top in range(0, height, COPY_STRIP_ROWS):
+                bottom = min(top + COPY_STRIP_ROWS, height)
+                pixels[top:bottom] = np.asarray(image.crop((0, top, width, bottom)))
+        except BaseException:
+            pixels = None
+            block.close()
+            block.unlink()
+            raise
+        pixels = None  # Release the view so the pool can close the block
+        self._blocks[block.name] = block
+        self.size_bytes += block.size
+        return block.name, width, height
+
+    def release(self, ref: SharedImageRef) -> None:
+        """
+        Unlink one image's block once no worker needs it any more.
+
+        Args:
+            ref: Reference returned by put()
+        """
+        block = self._blocks.pop(ref[0], None)
+        if block is not None:
+            self.size_bytes -= block.size
+            block.close()
+            block.unlink()
+
+    def close(self) -> None:
+        """Unlink every block still held by the pool."""
+        if self._blocks:
+            logger.debug(f"Releasing {len(self._blocks)} shared page images ({self.size_bytes} bytes)")
+        for name in list(self._blocks):
+            self.release((name, 0, 0))
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __enter__(self) -> "SharedImagePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a block created by another process, without taking ownership.
+
+    Before Python 3.13, attaching registers the block with the resource
+    tracker as if this process had created it, and the tracker would then
+    unlink it (or warn about a leak) when this process exits; the owner
+    alone is responsible for unlinking. Python 3.13 added track=False for
+    this; on older versions registration is suppressed by briefly replacing
+    resource_tracker.register, under a lock since the patch is process-wide.
+
+    Args:
+        name: Block name from a SharedImageRef
+
+    Returns:
+        Attached SharedMemory; close() it when done, never unlink() it
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def image_view(block: shared_memory.SharedMemory, ref: SharedImageRef) -> np.ndarray:
+    """
+    View a shared image's pixels as a (height, width) uint8 array, without copying.
+
+    The view must be dropped before the block is closed.
+
+    Args:
+        block: Block attached with attach_block()
+        ref: Reference returned by SharedImagePool.put()
+
+    Returns:
+        Read-only array backed by the shared memory
+    """
+    _, width, height = ref
+    view = np.ndarray((height, width), dtype=np.uint8, buffer=block.buf)
+    view.flags.writeable = False
+    return view
+
+
+def attach_image(ref: SharedImageRef) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Attach to a shared image and view its pixels.
+
+    Args:
+        ref: Reference returned by SharedImagePool.put()
+
+    Returns:
+        Tuple of (block, pixel view); drop the view, then close the block
+    """
+    block = attach_block(ref[0])
+    return block, image_view(block, ref)
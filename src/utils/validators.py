@@ -3,14 +3,19 @@ Input validation utilities for SAVVI application.
 
 This module provides validation functions for user inputs including:
 - PDF file validation (format, size, existence)
+- In-memory PDF validation (magic bytes, size)
+- Image file validation (magic bytes, size, readable header)
+- In-memory image validation (magic bytes, size, readable header)
 - Dietary preference validation
 - Allergen list validation
 - Configuration validation
 """
 
+import io
 import os
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import BinaryIO, Tuple, List, Optional, Union
+from PIL import Image
 from .config import get_config
 from .logger import get_logger
 
@@ -88,6 +93,275 @@ def validate_pdf_file(file_path: str, max_size_mb: Optional[int] = None) -> Tupl
         return False, f"Unexpected error validating file: {str(e)}"
 
 
+# PDF files must start with this marker within the first 1024 bytes
+PDF_MAGIC = b"%PDF-"
+
+
+def validate_pdf_data(
+    data: Union[bytes, bytearray, memoryview, BinaryIO],
+    max_size_mb: Optional[int] = None,
+) -> Tuple[bool, str]:
+    """
+    Validate an in-memory PDF buffer or seekable binary stream.
+    
+    Checks:
+    - Input is bytes-like or a seekable binary stream
+    - Data is not empty
+    - Data size is within limits (default: 50MB from config)
+    - PDF header (%PDF-) is present in the first 1024 bytes
+    
+    Streams are read from the start and their position is restored.
+    
+    Args:
+        data: PDF contents as bytes, bytearray, memoryview or binary stream
+        max_size_mb: Maximum size in MB (defaults to config value)
+    
+    Returns:
+        Tuple of (is_valid: bool, error_message: str)
+        If valid, error_message will be empty string
+    """
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            buffer = memoryview(data).cast("B")
+            size = len(buffer)
+            header = bytes(buffer[:1024])
+        elif hasattr(data, "read") and hasattr(data, "seek"):
+            position = data.tell()
+            try:
+                size = data.seek(0, io.SEEK_END)
+                data.seek(0)
+                header = data.read(1024)
+            finally:
+                data.seek(position)
+            if not isinstance(header, bytes):
+                return False, "PDF stream must be opened in binary mode"
+        else:
+            return False, (
+                "PDF data must be bytes, memoryview or a seekable binary stream. "
+                f"Found: {type(data).__name__}"
+            )
+        
+        if size == 0:
+            return False, "PDF data is empty"
+        
+        if max_size_mb is None:
+            config = get_config()
+            pdf_settings = config.get_pdf_settings()
+            max_size_mb = pdf_settings.get('max_file_size_mb', 50)
+        
+        size_mb = size / (1024 * 1024)
+        if size_mb > max_size_mb:
+            return False, (
+                f"PDF size ({size_mb:.2f} MB) exceeds maximum allowed size "
+                f"({max_size_mb} MB)"
+            )
+        
+        if PDF_MAGIC not in header:
+            return False, "Data is not a PDF (missing %PDF- header)"
+        
+        logger.debug(f"PDF data validation passed ({size_mb:.2f} MB)")
+        return True, ""
+    
+    except OSError as e:
+        return False, f"OS error reading PDF stream: {str(e)}"
+    except Exception as e:
+        logger.error(f"Unexpected error validating PDF data: {e}", exc_info=True)
+        return False, f"Unexpected error validating PDF data: {str(e)}"
+
+
+# Image formats accepted for photographed menus, by their leading bytes
+IMAGE_MAGIC = (
+    ("jpeg", b"\xff\xd8\xff"),
+    ("png", b"\x89PNG\r\n\x1a\n"),
+    ("tiff", b"II*\x00"),
+    ("tiff", b"MM\x00*"),
+)
+
+
+def detect_image_format(header: bytes) -> Optional[str]:
+    """
+    Identify a supported image format from the first bytes of a file.
+    
+    Args:
+        header: At least the first 12 bytes of the file
+    
+    Returns:
+        "jpeg", "png", "webp" or "tiff", or None if not a supported image
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    for image_format, magic in IMAGE_MAGIC:
+        if header.startswith(magic):
+            return image_format
+    return None
+
+
+def validate_image_file(file_path: str, max_size_mb: Optional[int] = None) -> Tuple[bool, str]:
+    """
+    Validate that a file path points to a supported menu photo.
+    
+    Checks:
+    - File exists and is a regular, non-empty file
+    - File starts with a JPEG, PNG, WebP or TIFF signature (the extension
+      is not trusted)
+    - File size is within limits (default: 50MB from config)
+    - The image header can be read (no pixels are decoded)
+    
+    Args:
+        file_path: Path to the file to validate
+        max_size_mb: Maximum file size in MB (defaults to config value)
+    
+    Returns:
+        Tuple of (is_valid: bool, error_message: str)
+        If valid, error_message will be empty string
+    """
+    try:
+        if not file_path or not isinstance(file_path, str):
+            return False, "File path must be a non-empty string"
+        
+        path = Path(file_path)
+        
+        if not path.exists():
+            return False, f"File does not exist: {file_path}"
+        
+        if not path.is_file():
+            return False, f"Path is not a file: {file_path}"
+        
+        if not os.access(path, os.R_OK):
+            return False, f"File is not readable: {file_path}"
+        
+        size = path.stat().st_size
+        if size == 0:
+            return False, "File is empty"
+        
+        if max_size_mb is None:
+            config = get_config()
+            pdf_settings = config.get_pdf_settings()
+            max_size_mb = pdf_settings.get('max_file_size_mb', 50)
+        
+        file_size_mb = size / (1024 * 1024)
+        if file_size_mb > max_size_mb:
+            return False, (
+                f"File size ({file_size_mb:.2f} MB) exceeds maximum allowed size "
+                f"({max_size_mb} MB)"
+            )
+        
+        with open(path, "rb") as f:
+            image_format = detect_image_format(f.read(16))
+        if image_format is None:
+            return False, "File is not a JPEG, PNG, WebP or TIFF image"
+        
+        try:
+            with Image.open(path) as image:
+                width, height = image.size
+        except (Image.UnidentifiedImageError, Image.DecompressionBombError) as e:
+            return False, f"Cannot read {image_format} image: {str(e)}"
+        
+        logger.debug(
+            f"Image file validation passed: {file_path} ({image_format}, {width}x{height}, {file_size_mb:.2f} MB)"
+        )
+        return True, ""
+    
+    except PermissionError:
+        return False, f"Permission denied accessing file: {file_path}"
+    except OSError as e:
+        return False, f"OS error accessing file: {file_path} - {str(e)}"
+    except Exception as e:
+        logger.error(f"Unexpected error validating image file: {e}", exc_info=True)
+        return False, f"Unexpected error validating file: {str(e)}"
+
+
+def validate_image_data(
+    data: Union[bytes, bytearray, memoryview, BinaryIO],
+    max_size_mb: Optional[int] = None,
+) -> Tuple[bool, str]:
+    """
+    Validate an in-memory menu photo or seekable binary stream.
+    
+    Checks:
+    - Input is bytes-like or a seekable binary stream
+    - Data is not empty
+    - Data size is within limits (default: 50MB from config)
+    - Data starts with a JPEG, PNG, WebP or TIFF signature
+    - The image header can be read and its pixel count is not a
+      decompression bomb (no pixels are decoded)
+    
+    Streams are read from the start and their position is restored.
+    
+    Args:
+        data: Photo contents as bytes, bytearray, memoryview or binary stream
+        max_size_mb: Maximum size in MB (defaults to config value)
+    
+    Returns:
+        Tuple of (is_valid: bool, error_message: str)
+        If valid, error_message will be empty string
+    """
+    # Imported here: src.core imports this module
+    from src.core.pdf_source import BufferReader
+    
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            buffer = memoryview(data).cast("B")
+            size = len(buffer)
+            header = bytes(buffer[:16])
+            stream = io.BufferedReader(BufferReader(buffer))
+            position = None
+        elif hasattr(data, "read") and hasattr(data, "seek"):
+            stream = data
+            position = data.tell()
+            try:
+                size = data.seek(0, io.SEEK_END)
+                data.seek(0)
+                header = data.read(16)
+            finally:
+                data.seek(position)
+            if not isinstance(header, bytes):
+                return False, "Image stream must be opened in binary mode"
+        else:
+            return False, (
+                "Image data must be bytes, memoryview or a seekable binary stream. "
+                f"Found: {type(data).__name__}"
+            )
+        
+        if size == 0:
+            return False, "Image data is empty"
+        
+        if max_size_mb is None:
+            config = get_config()
+            pdf_settings = config.get_pdf_settings()
+            max_size_mb = pdf_settings.get('max_file_size_mb', 50)
+        
+        size_mb = size / (1024 * 1024)
+        if size_mb > max_size_mb:
+            return False, (
+                f"Image size ({size_mb:.2f} MB) exceeds maximum allowed size "
+                f"({max_size_mb} MB)"
+            )
+        
+        image_format = detect_image_format(header)
+        if image_format is None:
+            return False, "Data is not a JPEG, PNG, WebP or TIFF image"
+        
+        try:
+            stream.seek(0)
+            with Image.open(stream) as image:
+                width, height = image.size
+        except (Image.UnidentifiedImageError, Image.DecompressionBombError) as e:
+            return False, f"Cannot read {image_format} image: {str(e)}"
+        finally:
+            if position is not None:
+                stream.seek(position)
+        
+        logger.debug(f"Image data validation passed ({image_format}, {width}x{height}, {size_mb:.2f} MB)")
+        return True, ""
+    
+    except OSError as e:
+        return False, f"OS error reading image stream: {str(e)}"
+    except Exception as e:
+        logger.error(f"Unexpected error validating image data: {e}", exc_info=True)
+        return False, f"Unexpected error validating image data: {str(e)}"
+
+
 def validate_dietary_prefs(prefs: List[str]) -> Tuple[bool, str]:
     """
     Validate a list of dietary preferences against configured options.
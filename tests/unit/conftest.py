@@ -0,0 +1,247 @@
+"""
+Shared fixtures for unit tests.
+"""
+
+import os
+import sys
+import zlib
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def build_pdf(page_texts: List[Optional[str]], image_pages: Optional[List[int]] = None) -> bytes:
+    """
+    Build a small but real PDF document.
+
+    Args:
+        page_texts: Text for each page (None for a page without text/fonts)
+        image_pages: 0-based indexes of pages that get a full-page image XObject
+
+    Returns:
+        PDF file contents as bytes
+    """
+    image_pages = set(image_pages or [])
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # Filled in once the page tree exists
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    image_data = zlib.compress(bytes([200]) * (85 * 110))
+    image_id = add(
+        b"<< /Type /XObject /Subtype /Image /Width 85 /Height 110 "
+        b"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode "
+        b"/Length " + str(len(image_data)).encode() + b" >>\nstream\n"
+        + image_data + b"\nendstream"
+    )
+
+    page_ids = []
+    for index, text in enumerate(page_texts):
+        ops = []
+        resources = []
+        if index in image_pages:
+            ops.append(b"q 612 0 0 792 0 0 cm /Im1 Do Q")
+            resources.append(b"/XObject << /Im1 %d 0 R >>" % image_id)
+        if text is not None:
+            lines = [b"BT /F1 12 Tf 72 720 Td 14 TL"]
+            for line in text.split("\n"):
+                escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                lines.append(b"(" + escaped.encode("latin-1") + b") Tj T*")
+            lines.append(b"ET")
+            ops.append(b"\n".join(lines))
+            resources.append(b"/Font << /F1 %d 0 R >>" % font_id)
+        content = b"\n".join(ops)
+        content_id = add(
+            b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n"
+            + content + b"\nendstream"
+        )
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << " % pages_id + b" ".join(resources)
+            + b" >> /Contents %d 0 R >>" % content_id
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += (
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog_id, xref_offset)
+    )
+    return bytes(output)
+
+
+def build_tesseract_data(text: str, conf: float = 90) -> Dict[str, List[Any]]:
+    """
+    Build pytesseract.image_to_data() output (Output.DICT) that reads as text.
+
+    Args:
+        text: Page text; lines are split on newlines and paragraphs on blank lines
+        conf: Confidence (0-100) given to every word
+
+    Returns:
+        Dictionary of word-level columns
+    """
+    columns = ("level", "block_num", "par_num", "line_num", "left", "top", "width", "height", "conf", "text")
+    data: Dict[str, List[Any]] = {column: [] for column in columns}
+    for paragraph, paragraph_text in enumerate(text.split("\n\n"), start=1):
+        for line, line_text in enumerate(paragraph_text.split("\n"), start=1):
+            for index, word in enumerate(line_text.split()):
+                row = (5, 1, paragraph, line, index * 50, line * 20, 40, 12, conf, word)
+                for column, value in zip(columns, row):
+                    data[column].append(value)
+    return data
+
+
+@pytest.fixture
+def tesseract_data():
+    """Factory fixture returning build_tesseract_data()."""
+    return build_tesseract_data
+
+
+@pytest.fixture(autouse=True)
+def clear_page_image_cache():
+    """Keep renders cached by one test from leaking into the next."""
+    yield
+    from src.utils.image_cache import get_page_image_cache
+    get_page_image_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def isolate_extraction_cache(tmp_path, monkeypatch):
+    """Keep extraction caches in relative directories (the configured default) under tmp_path."""
+    from pathlib import Path
+    from src.utils import extraction_cache
+
+    get_extraction_cache = extraction_cache.get_extraction_cache
+
+    def get_test_cache(cache_dir, max_size_mb=512):
+        if not Path(cache_dir).is_absolute():
+            cache_dir = tmp_path / cache_dir
+        return get_extraction_cache(cache_dir, max_size_mb)
+
+    monkeypatch.setattr(extraction_cache, "get_extraction_cache", get_test_cache)
+
+
+@pytest.fixture(autouse=True)
+def clear_detected_languages():
+    """Keep languages detected by one test from leaking into the next."""
+    yield
+    from src.processors import pdf_processor
+    with pdf_processor._detected_languages_lock:
+        pdf_processor._detected_languages.clear()
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Factory fixture that writes a real PDF built by build_pdf() to tmp_path."""
+    def _make_pdf(page_texts, image_pages=None, name="menu.pdf"):
+        pdf_file = tmp_path / name
+        pdf_file.write_bytes(build_pdf(page_texts, image_pages))
+        return pdf_file
+
+    return _make_pdf
+
+
+@pytest.fixture
+def pdf_config():
+    """
+    Factory fixture returning a mock Config for PDFProcessor.
+    
+    Its get_pdf_settings() returns OCR enabled with adaptive DPI, the
+    extraction cache and the memory budget switched off (they default on),
+    then the given settings dictionaries merged in order, then the keyword
+    settings. Tests of those features switch them on explicitly.
+    """
+    def _pdf_config(*defaults: Dict[str, Any], **settings):
+        config = MagicMock()
+        merged: Dict[str, Any] = {
+            "ocr_enabled": True,
+            "ocr_adaptive_dpi": False,
+            "cache_enabled": False,
+            "memory_budget": {"enabled": False},
+        }
+        for base in defaults:
+            merged.update(base)
+        config.get_pdf_settings.return_value = {**merged, **settings}
+        return config
+
+    return _pdf_config
+
+
+@pytest.fixture
+def make_processor(pdf_config):
+    """Factory fixture creating a PDFProcessor for a path or buffer with pdf_config() settings."""
+    from src.processors.pdf_processor import PDFProcessor
+
+    def _make_processor(pdf, *defaults: Dict[str, Any], **settings):
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(*defaults, **settings)):
+            return PDFProcessor(pdf)
+
+    return _make_processor
+
+
+# Stand-in for `tesseract stdin stdout -l LANG tsv`: reads a PGM from stdin and
+# prints one word, "w<width>", so tests can tell pages apart. FAKE_TESSERACT_PID_FILE
+# makes it record its pid and hang until killed.
+FAKE_TESSERACT = """
+import os, sys, time
+header = sys.stdin.buffer.read().split(b"\\n")
+width = int(header[1].split()[0])
+pid_file = os.environ.get("FAKE_TESSERACT_PID_FILE")
+if pid_file:
+    open(pid_file, "w").write(str(os.getpid()))
+    time.sleep(60)
+print("level\\tpage_num\\tblock_num\\tpar_num\\tline_num\\tword_num\\tleft\\ttop\\twidth\\theight\\tconf\\ttext")
+print(f"5\\t1\\t1\\t1\\t1\\t1\\t0\\t0\\t10\\t10\\t91.5\\tw{width}")
+"""
+
+# Stand-in for `pdftoppm -r DPI [-f N] [-l N] -gray PDF`: prints a 10 px tall
+# PGM per page whose width is 10 x page number; PDFs on stdin ("-") have 3 pages.
+FAKE_PDFTOPPM = """
+import sys
+args = sys.argv[1:]
+pdf = args[-1]
+if pdf == "-":
+    sys.stdin.buffer.read()
+    page_count = 3
+else:
+    page_count = open(pdf, "rb").read().count(b"/Type /Page ")
+first = int(args[args.index("-f") + 1]) if "-f" in args else 1
+last = int(args[args.index("-l") + 1]) if "-l" in args else page_count
+for page in range(first, last + 1):
+    sys.stdout.buffer.write(b"P5\\n%d 10\\n255\\n" % (10 * page) + bytes([255]) * (100 * page))
+"""
+
+
+@pytest.fixture
+def fake_ocr_tools(tmp_path, monkeypatch):
+    """Put fake tesseract and pdftoppm commands first on PATH."""
+    import pytesseract
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, source in (("tesseract", FAKE_TESSERACT), ("pdftoppm", FAKE_PDFTOPPM)):
+        command = bin_dir / name
+        command.write_text(f"#!{sys.executable}\n{source}")
+        command.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", "tesseract")
+    return bin_dir
@@ -0,0 +1,78 @@
+"""
+Unit tests for async_subprocess module.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from src.utils.async_subprocess import run_process
+
+
+def sleeper_args(pid_file):
+    """Command that records its pid, then sleeps far longer than any test."""
+    return [
+        sys.executable, "-c",
+        f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(60)",
+    ]
+
+
+def is_running(pid):
+    """Whether a process with this pid still exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def wait_for_file(path):
+    """Wait until a child process has written path."""
+    while not path.exists() or not path.read_text():
+        await asyncio.sleep(0.01)
+
+
+class TestRunProcess:
+    """Tests for run_process function."""
+    
+    def test_collects_output(self):
+        """Test that stdin is fed and stdout, stderr and the exit code come back."""
+        args = [sys.executable, "-c", "import sys; data = sys.stdin.read(); print(data.upper()); sys.exit(3)"]
+        
+        returncode, stdout, stderr = asyncio.run(run_process(args, b"menu"))
+        
+        assert (returncode, stdout.strip(), stderr) == (3, b"MENU", b"")
+    
+    def test_missing_command(self):
+        """Test that a missing command raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(run_process(["savvi-no-such-command"]))
+    
+    def test_cancel_kills_process(self, tmp_path):
+        """Test that cancelling the awaiting task kills the child process."""
+        pid_file = tmp_path / "pid"
+        
+        async def cancel_run():
+            task = asyncio.create_task(run_process(sleeper_args(pid_file)))
+            await wait_for_file(pid_file)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        start = time.monotonic()
+        asyncio.run(cancel_run())
+        
+        assert time.monotonic() - start < 10
+        assert not is_running(int(pid_file.read_text()))
+    
+    def test_timeout_kills_process(self, tmp_path):
+        """Test that a command running past its timeout is killed."""
+        pid_file = tmp_path / "pid"
+        
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run_process(sleeper_args(pid_file), timeout=2))
+        
+        assert not is_running(int(pid_file.read_text()))
@@ -0,0 +1,166 @@
+"""
+Unit tests for extraction_cache module.
+"""
+
+import os
+import time
+
+import pytest
+
+from src.utils.extraction_cache import ExtractionCache, get_extraction_cache
+
+
+DIGEST_A = "a" * 64
+DIGEST_B = "b" * 64
+PARAMS = {"stage": "process", "ocr_language": "eng", "dpi": 150, "preprocessing": "1"}
+
+
+class TestExtractionCache:
+    """Tests for ExtractionCache class."""
+    
+    def test_miss_returns_empty(self, tmp_path):
+        """Test that an unknown document is a miss."""
+        cache = ExtractionCache(tmp_path)
+        
+        assert cache.get_pages(DIGEST_A, PARAMS) == {}
+        assert cache.get_entry(DIGEST_A, PARAMS) is None
+        assert cache.misses == 2
+    
+    def test_put_and_get_pages(self, tmp_path):
+        """Test round-tripping per-page text and method."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_pages(
+            DIGEST_A,
+            PARAMS,
+            {1: {"text": "Soup", "method": "text"}, 2: {"text": "Wine", "method": "ocr"}},
+            page_count=2,
+        )
+        
+        entry = cache.get_entry(DIGEST_A, PARAMS)
+        
+        assert entry["page_count"] == 2
+        assert entry["pages"][1] == {"text": "Soup", "method": "text"}
+        assert entry["pages"][2]["method"] == "ocr"
+        assert cache.hits == 1
+    
+    def test_params_are_part_of_the_key(self, tmp_path):
+        """Test that different extraction parameters don't share entries."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "Soup", "method": "ocr"}})
+        
+        other_params = dict(PARAMS, dpi=300)
+        
+        assert cache.get_pages(DIGEST_A, other_params) == {}
+        assert cache.get_pages(DIGEST_B, PARAMS) == {}
+    
+    def test_put_merges_pages(self, tmp_path):
+        """Test that later puts add pages to an existing entry."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "Soup", "method": "text"}}, page_count=2)
+        cache.put_pages(DIGEST_A, PARAMS, {2: {"text": "Wine", "method": "ocr"}})
+        
+        entry = cache.get_entry(DIGEST_A, PARAMS)
+        
+        assert set(entry["pages"]) == {1, 2}
+        assert entry["page_count"] == 2
+    
+    def test_put_and_get_page_by_fingerprint(self, tmp_path):
+        """Test the page fingerprint table, shared by every document."""
+        cache = ExtractionCache(tmp_path)
+        page = {"text": "Tiramisu", "method": "ocr", "confidence": 0.9}
+        cache.put_page("f00d-200x200-840", PARAMS, page)
+        
+        assert cache.get_page("f00d-200x200-840", PARAMS) == page
+        assert cache.get_page("f00d-200x200-841", PARAMS) is None
+        assert cache.get_page("f00d-200x200-840", dict(PARAMS, dpi=300)) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.get_stats()["entries"] == 1
+    
+    def test_put_and_get_document_language(self, tmp_path):
+        """Test that a document's detected language is kept with its entries."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_language(DIGEST_A, PARAMS, "spa+eng")
+        
+        assert cache.get_language(DIGEST_A, PARAMS) == "spa+eng"
+        assert cache.get_language(DIGEST_B, PARAMS) is None
+        
+        cache.invalidate(DIGEST_A)
+        assert cache.get_language(DIGEST_A, PARAMS) is None
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entry is evicted over the cap."""
+        cache = ExtractionCache(tmp_path, max_size_mb=0.004)  # ~4 KB
+        big_page = {1: {"text": "x" * 1500, "method": "ocr"}}
+        
+        cache.put_pages(DIGEST_A, PARAMS, big_page)
+        cache.put_pages(DIGEST_B, PARAMS, big_page)
+        
+        # Make A older than B, then touch A so B becomes least recently used
+        path_a = cache._entry_path(DIGEST_A, PARAMS)
+        path_b = cache._entry_path(DIGEST_B, PARAMS)
+        now = time.time()
+        os.utime(path_a, (now - 20, now - 20))
+        os.utime(path_b, (now - 10, now - 10))
+        assert cache.get_pages(DIGEST_A, PARAMS)
+        
+        cache.put_pages("c" * 64, PARAMS, big_page)
+        
+        assert path_a.exists()
+        assert not path_b.exists()
+        assert cache.get_stats()["size_bytes"] <= cache.max_size_bytes
+    
+    def test_overwriting_an_entry_replaces_its_size(self, tmp_path):
+        """Test that rewriting an entry doesn't count the old file towards the cap."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "x" * 1500, "method": "ocr"}})
+        
+        for _ in range(5):
+            cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "y" * 1500, "method": "ocr"}})
+        
+        assert cache._approx_size == cache._entry_path(DIGEST_A, PARAMS).stat().st_size
+    
+    def test_unserialisable_entry_leaves_no_temp_file(self, tmp_path):
+        """Test that a failed write removes its temporary file."""
+        cache = ExtractionCache(tmp_path)
+        
+        with pytest.raises(TypeError):
+            cache.put_pages(DIGEST_A, PARAMS, {1: {"text": object(), "method": "ocr"}})
+        
+        assert list(tmp_path.rglob("*.tmp")) == []
+        assert cache.get_pages(DIGEST_A, PARAMS) == {}
+    
+    def test_pipeline_version_change_purges_entries(self, tmp_path):
+        """Test that opening a cache with a new pipeline version drops old entries."""
+        old_cache = ExtractionCache(tmp_path, pipeline_version="1")
+        old_cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "Soup", "method": "text"}})
+        
+        new_cache = ExtractionCache(tmp_path, pipeline_version="2")
+        
+        assert new_cache.get_pages(DIGEST_A, PARAMS) == {}
+        assert not (tmp_path / "v1").exists()
+    
+    def test_invalidate_document(self, tmp_path):
+        """Test removing all entries for one document."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "Soup", "method": "text"}})
+        cache.put_pages(DIGEST_A, dict(PARAMS, dpi=300), {1: {"text": "Soup", "method": "ocr"}})
+        cache.put_pages(DIGEST_B, PARAMS, {1: {"text": "Wine", "method": "text"}})
+        
+        cache.invalidate(DIGEST_A)
+        
+        assert cache.get_pages(DIGEST_A, PARAMS) == {}
+        assert cache.get_pages(DIGEST_B, PARAMS) != {}
+    
+    def test_corrupted_entry_is_discarded(self, tmp_path):
+        """Test that an unreadable entry counts as a miss and is removed."""
+        cache = ExtractionCache(tmp_path)
+        cache.put_pages(DIGEST_A, PARAMS, {1: {"text": "Soup", "method": "text"}})
+        path = cache._entry_path(DIGEST_A, PARAMS)
+        path.write_text("{not json")
+        
+        assert cache.get_pages(DIGEST_A, PARAMS) == {}
+        assert not path.exists()
+    
+    def test_get_extraction_cache_is_shared(self, tmp_path):
+        """Test that one instance is shared per directory."""
+        assert get_extraction_cache(tmp_path) is get_extraction_cache(str(tmp_path))
@@ -0,0 +1,66 @@
+"""
+Unit tests for image_cache module.
+"""
+
+from PIL import Image
+
+from src.utils.image_cache import PageImageCache, get_page_image_cache, image_size_bytes
+
+
+def _page(side: int, mode: str = "L") -> Image.Image:
+    return Image.new(mode, (side, side), color=255)
+
+
+class TestPageImageCache:
+    """Tests for PageImageCache class."""
+    
+    def test_key_includes_dpi_and_mode(self):
+        """Test that renders at other resolutions or colour modes are separate entries."""
+        cache = PageImageCache(max_size_mb=1)
+        gray, color = _page(10), _page(10, "RGB")
+        
+        cache.put("doc", 1, 150, "L", gray)
+        cache.put("doc", 1, 150, "RGB", color)
+        
+        assert cache.get("doc", 1, 150, "L") is gray
+        assert cache.get("doc", 1, 150, "RGB") is color
+        assert cache.get("doc", 1, 300, "L") is None
+        assert cache.get("other", 1, 150, "L") is None
+        assert cache.get_stats()["hits"] == 2
+        assert cache.get_stats()["misses"] == 2
+    
+    def test_lru_eviction_by_bytes(self):
+        """Test that least-recently-used pages are evicted to stay within budget."""
+        page_bytes = image_size_bytes(_page(100))  # 10000 bytes
+        cache = PageImageCache(max_size_mb=2.5 * page_bytes / (1024 * 1024))
+        
+        cache.put("doc", 1, 150, "L", _page(100))
+        cache.put("doc", 2, 150, "L", _page(100))
+        cache.get("doc", 1, 150, "L")  # Page 2 is now least recently used
+        cache.put("doc", 3, 150, "L", _page(100))
+        
+        assert cache.get("doc", 2, 150, "L") is None
+        assert cache.get("doc", 1, 150, "L") is not None
+        assert cache.get_stats()["size_bytes"] == 2 * page_bytes
+    
+    def test_oversized_page_not_cached(self):
+        """Test that a page larger than the whole budget is skipped."""
+        cache = PageImageCache(max_size_mb=0.001)
+        cache.put("doc", 1, 150, "L", _page(100))
+        
+        assert cache.get_stats()["pages"] == 0
+    
+    def test_page_count_and_clear(self):
+        """Test recording page counts and clearing everything."""
+        cache = PageImageCache()
+        cache.set_page_count("doc", 3)
+        cache.put("doc", 1, 150, "L", _page(10))
+        
+        assert cache.get_page_count("doc") == 3
+        cache.clear()
+        assert cache.get_page_count("doc") is None
+        assert cache.get_stats()["pages"] == 0
+    
+    def test_shared_instance(self):
+        """Test that get_page_image_cache() returns one instance per process."""
+        assert get_page_image_cache() is get_page_image_cache(64)
@@ -0,0 +1,227 @@
+"""
+Unit tests for image_processor module.
+"""
+
+import io
+
+import pytest
+from unittest.mock import patch, MagicMock
+from PIL import Image, ImageDraw
+
+from src.processors.image_processor import (
+    ImageMenuProcessor,
+    create_menu_processor,
+    decode_photo,
+    effective_dpi,
+    target_size,
+)
+from src.processors.pdf_processor import PDFProcessor
+
+
+def photo_bytes(image_format="JPEG", size=(4000, 3000), orientation=None):
+    """Encode a white photo with a black bar in its top-left corner."""
+    photo = Image.new("RGB", size, color="white")
+    ImageDraw.Draw(photo).rectangle((0, 0, size[0] // 8, size[1] // 30), fill="black")
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    photo.save(buffer, image_format, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def make_config(**settings):
+    """Build a mock Config whose get_pdf_settings() returns the given settings."""
+    config = MagicMock()
+    config.get_pdf_settings.return_value = {
+        "max_file_size_mb": 50,
+        "supported_formats": ["pdf", "image"],
+        "ocr_enabled": True,
+        "ocr_dpi": 150,
+        "image_cache_max_size_mb": 0,
+        "ocr_adaptive_dpi": False,
+        "cache_enabled": False,
+        "memory_budget": {"enabled": False},
+        **settings,
+    }
+    return config
+
+
+class TestDecodePhoto:
+    """Tests for reduced-resolution photo decoding."""
+    
+    def test_target_size_only_scales_down(self):
+        """Test that the long side maps to a letter page at the OCR DPI."""
+        assert target_size((4000, 3000), 150) == (1650, 1238)
+        assert target_size((800, 600), 150) == (800, 600)
+    
+    def test_effective_dpi(self):
+        """Test that the reported resolution is the decoded long side over the page's."""
+        assert effective_dpi((1500, 1650)) == 150
+        assert effective_dpi((800, 600)) == 73
+    
+    def test_jpeg_uses_draft_mode(self):
+        """Test that a 12 MP JPEG is decoded at half scale, straight to grayscale."""
+        with patch.object(Image.Image, "reduce", autospec=True, side_effect=Image.Image.reduce) as mock_reduce:
+            image = decode_photo(io.BytesIO(photo_bytes("JPEG")), dpi=150)
+        
+        assert image.mode == "L"
+        assert image.size == (2000, 1500)
+        mock_reduce.assert_not_called()
+    
+    @pytest.mark.parametrize("image_format", ["PNG", "WEBP"])
+    def test_other_formats_are_reduced(self, image_format):
+        """Test that formats without draft mode are reduced by a whole factor."""
+        image = decode_photo(io.BytesIO(photo_bytes(image_format)), dpi=150)
+        
+        assert image.mode == "L"
+        assert image.size == (2000, 1500)
+    
+    def test_exif_orientation_is_applied(self):
+        """Test that a photo stored sideways comes out upright."""
+        image = decode_photo(io.BytesIO(photo_bytes("JPEG", orientation=6)), dpi=150)
+        
+        assert image.size == (1500, 2000)
+        assert image.getpixel((image.width - 5, 5)) < 64  # The bar is now top-right
+    
+    @pytest.mark.parametrize("mode, image_format, options", [
+        ("P", "PNG", {}),
+        ("1", "TIFF", {"compression": "group4"}),
+        ("I;16", "PNG", {}),
+    ])
+    def test_modes_reduce_cannot_take_are_converted(self, mode, image_format, options):
+        """Test that palette, bilevel and 16-bit photos decode to grayscale instead of failing in reduce()."""
+        buffer = io.BytesIO()
+        Image.open(io.BytesIO(photo_bytes("PNG"))).convert(mode).save(buffer, image_format, **options)
+        
+        image = ImageMenuProcessor(buffer.getvalue(), make_config()).load_image()
+        
+        assert image.mode == "L"
+        assert image.size == (2000, 1500)
+        assert image.getpixel((5, 5)) < 64 and image.getpixel((image.width - 5, image.height - 5)) > 0
+
+
+class TestImageMenuProcessor:
+    """Tests for ImageMenuProcessor class."""
+    
+    def test_rejects_files_by_content(self, tmp_path):
+        """Test that the magic bytes, not the extension, decide what is a photo."""
+        fake = tmp_path / "menu.jpg"
+        fake.write_bytes(b"%PDF-1.4\n" * 10)
+        
+        with pytest.raises(ValueError, match="not a JPEG, PNG, WebP or TIFF"):
+            ImageMenuProcessor(str(fake), make_config())
+        
+        with pytest.raises(ValueError, match="not a JPEG, PNG, WebP or TIFF"):
+            ImageMenuProcessor(b"GIF89a" * 10, make_config())
+    
+    def test_missing_settings_fall_back_to_config_defaults(self):
+        """Test that settings left out of get_pdf_settings() take the configuration file's defaults."""
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {}
+        
+        processor = ImageMenuProcessor(photo_bytes("PNG"), config)
+        
+        assert processor.ocr_enabled is True
+        assert (processor.ocr_language, processor.ocr_dpi, processor.ocr_engine_name) == ("eng", 150, "auto")
+    
+    def test_uploads_in_memory_are_validated(self):
+        """Test that buffers and streams get the size limit and bomb check paths get."""
+        with pytest.raises(ValueError, match="exceeds maximum"):
+            ImageMenuProcessor(photo_bytes("PNG"), make_config(max_file_size_mb=0.001))
+        
+        with patch.object(Image, "MAX_IMAGE_PIXELS", 1000), \
+             pytest.raises(ValueError, match="Cannot read jpeg"):
+            ImageMenuProcessor(io.BytesIO(photo_bytes("JPEG")), make_config())
+    
+    def test_process_pages_ocrs_the_decoded_photo(self, tmp_path, tesseract_data):
+        """Test that a photo goes through preprocessing and OCR without a PDF round trip."""
+        photo = tmp_path / "menu.png"
+        photo.write_bytes(photo_bytes("PNG"))
+        
+        with patch('src.processors.pdf_processor.pytesseract.image_to_data',
+                   return_value=tesseract_data("Margherita 12")) as mock_ocr, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.image_processor.preprocess_page', side_effect=lambda image, options: image):
+            
+            processor = ImageMenuProcessor(str(photo), make_config(ocr_language="ita"))
+            pages = processor.process_pages()
+        
+        assert pages[1]["text"] == "Margherita 12"
+        assert pages[1]["method"] == "ocr"
+        assert pages[1]["dpi"] == 182  # Decoded at half scale, above the 150 asked for
+        assert mock_ocr.call_args.args[0].size == (2000, 1500)
+        assert mock_ocr.call_args.kwargs["lang"] == "ita"
+        mock_convert.assert_not_called()
+    
+    def test_small_photo_reports_its_own_resolution(self, tesseract_data):
+        """Test that a photo smaller than the target isn't reported at the OCR DPI."""
+        with patch('src.processors.pdf_processor.pytesseract.image_to_data',
+                   return_value=tesseract_data("Menu")):
+            pages = ImageMenuProcessor(photo_bytes("PNG", size=(800, 600)), make_config()).process_pages()
+        
+        assert pages[1]["dpi"] == 73
+    
+    def test_in_memory_photo(self, tesseract_data):
+        """Test that uploads held in memory are decoded without being written to disk."""
+        with patch('src.processors.pdf_processor.pytesseract.image_to_data',
+                   return_value=tesseract_data("Menu")):
+            processor = ImageMenuProcessor(memoryview(photo_bytes("WEBP")), make_config())
+            
+            assert processor.image_format == "webp"
+            assert processor.process() == "Menu"
+    
+    def test_tesseract_missing_is_reported_like_pdfs(self):
+        """Test that a missing Tesseract install gets the same error as PDFProcessor."""
+        import pytesseract
+        
+        with patch.object(pytesseract.pytesseract, 'tesseract_cmd', 'tesseract'), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data',
+                   side_effect=pytesseract.TesseractNotFoundError()):
+            processor = ImageMenuProcessor(photo_bytes("PNG"), make_config(tesseract_path="/opt/tesseract"))
+            
+            with pytest.raises(RuntimeError, match="Tesseract OCR not found. Install it with") as error:
+                processor.process()
+        assert "/opt/tesseract" in str(error.value)
+    
+    def test_ocr_disabled(self):
+        """Test that OCR disabled in configuration is reported."""
+        processor = ImageMenuProcessor(photo_bytes("JPEG"), make_config(ocr_enabled=False))
+        
+        with pytest.raises(RuntimeError, match="disabled"):
+            processor.process()
+
+
+class TestCreateMenuProcessor:
+    """Tests for create_menu_processor function."""
+    
+    def test_picks_processor_by_content(self, make_pdf):
+        """Test that PDFs and photos get their own processor."""
+        pdf_file = make_pdf(["Menu"], name="menu.jpg")
+        
+        assert isinstance(create_menu_processor(str(pdf_file), make_config()), PDFProcessor)
+        assert isinstance(create_menu_processor(photo_bytes("PNG"), make_config()), ImageMenuProcessor)
+    
+    def test_respects_supported_formats(self):
+        """Test that photos are refused when images are not an enabled format."""
+        with pytest.raises(ValueError, match="not enabled"):
+            create_menu_processor(photo_bytes("JPEG"), make_config(supported_formats=["pdf"]))
+    
+    def test_missing_or_unreadable_path(self, tmp_path):
+        """Test that bad paths are reported as ValueError, like other invalid uploads."""
+        with pytest.raises(ValueError, match="does not exist"):
+            create_menu_processor(str(tmp_path / "missing.jpg"), make_config())
+        
+        with pytest.raises(ValueError, match="not a file"):
+            create_menu_processor(tmp_path, make_config())
+        
+        photo = tmp_path / "menu.jpg"
+        photo.write_bytes(photo_bytes("JPEG"))
+        with patch('builtins.open', side_effect=PermissionError("Permission denied")), \
+             pytest.raises(ValueError, match="Cannot read menu file"):
+            create_menu_processor(photo, make_config())
+    
+    def test_unknown_upload(self):
+        """Test that uploads that are neither a PDF nor a photo are rejected."""
+        with pytest.raises(ValueError, match="must be a PDF or"):
+            create_menu_processor(io.BytesIO(b"<html></html>"), make_config())
@@ -0,0 +1,122 @@
+"""
+Unit tests for memory_budget module.
+"""
+
+import threading
+import time
+
+from src.utils.memory_budget import (
+    MemoryBudget,
+    estimate_job_bytes,
+    fit_dpi,
+    page_image_bytes,
+)
+
+LETTER = (612.0, 792.0)
+MB = 1024 * 1024
+
+
+class TestEstimates:
+    """Tests for footprint estimates."""
+    
+    def test_page_image_bytes(self):
+        """Test that a letter page at 300 DPI is 2550x3300 grayscale pixels."""
+        assert page_image_bytes(LETTER, 300) == 2550 * 3300
+        assert page_image_bytes(LETTER, 150) * 4 == page_image_bytes(LETTER, 300)
+    
+    def test_estimate_counts_resident_pages_and_workers(self):
+        """Test that only pages held at once and per-worker copies count."""
+        page = page_image_bytes(LETTER, 150)
+        
+        assert estimate_job_bytes([LETTER] * 10, 150, resident_pages=10) == 13 * page
+        assert estimate_job_bytes([LETTER] * 10, 150, resident_pages=2, workers=2) == 8 * page
+        assert estimate_job_bytes([], 150, resident_pages=4) == 0
+    
+    def test_fit_dpi(self):
+        """Test that the DPI is lowered until the footprint fits, but not below the minimum."""
+        job = page_image_bytes(LETTER, 300)
+        
+        assert fit_dpi(job, 300, job, 100) == 300
+        assert page_image_bytes(LETTER, fit_dpi(job, 300, job // 4, 100)) <= job // 4
+        assert fit_dpi(job, 300, job // 4, 100) >= 149
+        assert fit_dpi(job, 300, job // 100, 100) is None
+
+
+class TestMemoryBudget:
+    """Tests for MemoryBudget class."""
+    
+    def test_admits_jobs_that_fit(self):
+        """Test that jobs within the budget run together at their DPI."""
+        budget = MemoryBudget(max_size_mb=10)
+        
+        first, first_dpi = budget.admit(4 * MB, 300, 100)
+        second, second_dpi = budget.admit(4 * MB, 300, 100)
+        
+        assert (first_dpi, second_dpi) == (300, 300)
+        assert budget.get_stats()["reserved_bytes"] == 8 * MB
+        
+        budget.release(first)
+        budget.release(second)
+        budget.release(second)  # Releasing twice is harmless
+        assert budget.get_stats()["reserved_bytes"] == 0
+    
+    def test_queues_until_memory_is_released(self):
+        """Test that a job that does not fit waits for a running job to finish."""
+        budget = MemoryBudget(max_size_mb=10, max_wait_seconds=None)
+        running, _ = budget.admit(8 * MB, 300, 100)
+        admitted = []
+        
+        waiter = threading.Thread(target=lambda: admitted.append(budget.admit(8 * MB, 300, 100)))
+        waiter.start()
+        time.sleep(0.1)
+        
+        assert admitted == []
+        assert budget.get_stats()["waiting"] == 1
+        
+        budget.release(running)
+        waiter.join(timeout=5)
+        
+        assert admitted[0][1] == 300
+        stats = budget.get_stats()
+        assert (stats["jobs"], stats["waiting"], stats["queued"]) == (1, 0, 1)
+    
+    def test_downscales_after_waiting(self):
+        """Test that a job queued too long is downscaled to fit the free memory."""
+        budget = MemoryBudget(max_size_mb=10, max_wait_seconds=0)
+        budget.admit(6 * MB, 300, 100)
+        
+        _, dpi = budget.admit(8 * MB, 300, 100)
+        
+        assert 100 <= dpi < 300
+        stats = budget.get_stats()
+        assert stats["reserved_bytes"] <= stats["max_size_bytes"]
+        assert stats["downscaled"] == 1
+    
+    def test_max_wait_caps_the_queue(self):
+        """Test that a job with a wait limit is downscaled, or overcommits, instead of queueing on."""
+        budget = MemoryBudget(max_size_mb=10, max_wait_seconds=None)
+        budget.admit(6 * MB, 300, 100)
+        
+        started = time.monotonic()
+        _, dpi = budget.admit(8 * MB, 300, 100, max_wait=0.1)
+        assert 100 <= dpi < 300
+        
+        _, dpi = budget.admit(8 * MB, 300, 200, max_wait=0.1)
+        assert dpi == 200
+        assert time.monotonic() - started < 2
+        assert budget.get_stats()["reserved_bytes"] > budget.get_stats()["max_size_bytes"]
+    
+    def test_oversized_job(self):
+        """Test that a job larger than the whole budget is downscaled, and runs alone at the minimum DPI."""
+        budget = MemoryBudget(max_size_mb=10)
+        
+        ticket, dpi = budget.admit(40 * MB, 300, 100)
+        assert dpi == 150
+        budget.release(ticket)
+        
+        ticket, dpi = budget.admit(400 * MB, 300, 100)
+        assert dpi == 100
+        assert budget.get_stats()["jobs"] == 1
+        
+        stats = budget.get_stats()
+        assert stats["rss_bytes"] is None or stats["rss_bytes"] > 0
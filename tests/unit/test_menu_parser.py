@@ -285,3 +285,412 @@ class TestMenuParser:
             # Should only call PdfReader once (during _get_reader)
             assert mock_reader_class.call_count == 1
 
+    
+    def test_page_text_cache_extracts_each_page_once(self, tmp_path):
+        """Test that repeated extraction calls reuse the per-page cache."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n%fake pdf content" * 100)
+        
+        with patch('src.core.menu_parser.PdfReader') as mock_reader_class:
+            mock_pages = []
+            for i in range(3):
+                mock_page = MagicMock()
+                mock_page.extract_text.return_value = f"Page {i + 1} " + "A" * 60
+                mock_pages.append(mock_page)
+            
+            mock_reader = MagicMock()
+            mock_reader.pages = mock_pages
+            mock_reader.metadata = {}
+            mock_reader_class.return_value = mock_reader
+            
+            parser = MenuParser(str(pdf_file))
+            parser.is_text_based()
+            parser.extract_by_page()
+            parser.extract_text()
+            parser.extract_by_page()
+            
+            for mock_page in mock_pages:
+                assert mock_page.extract_text.call_count == 1
+            
+            stats = parser.get_extraction_stats()
+            assert stats["pages_extracted"] == 3
+            assert stats["extraction_counts"] == {1: 1, 2: 1, 3: 1}
+            assert stats["cache_hits"] == 7
+    
+    def test_page_text_cache_remembers_failed_pages(self, tmp_path):
+        """Test that failed pages are cached and still marked as errors."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n%fake pdf content" * 100)
+        
+        with patch('src.core.menu_parser.PdfReader') as mock_reader_class:
+            mock_page1 = MagicMock()
+            mock_page1.extract_text.return_value = "Page 1"
+            
+            mock_page2 = MagicMock()
+            mock_page2.extract_text.side_effect = Exception("Page error")
+            
+            mock_reader = MagicMock()
+            mock_reader.pages = [mock_page1, mock_page2]
+            mock_reader.metadata = {}
+            mock_reader_class.return_value = mock_reader
+            
+            parser = MenuParser(str(pdf_file))
+            assert parser.extract_by_page()[2] == ""
+            text = parser.extract_text()
+            
+            assert "extraction error" in text
+            assert mock_page2.extract_text.call_count == 1
+    
+    def test_iter_pages_is_lazy(self, tmp_path):
+        """Test that iter_pages only extracts a page when it is consumed."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n%fake pdf content" * 100)
+        
+        with patch('src.core.menu_parser.PdfReader') as mock_reader_class:
+            mock_page1 = MagicMock()
+            mock_page1.extract_text.return_value = "Page 1"
+            
+            mock_page2 = MagicMock()
+            mock_page2.extract_text.return_value = "Page 2"
+            
+            mock_reader = MagicMock()
+            mock_reader.pages = [mock_page1, mock_page2]
+            mock_reader.metadata = {}
+            mock_reader_class.return_value = mock_reader
+            
+            parser = MenuParser(str(pdf_file))
+            pages = parser.iter_pages()
+            
+            assert next(pages) == (1, "Page 1")
+            assert mock_page2.extract_text.call_count == 0
+            assert next(pages) == (2, "Page 2")
+            assert list(pages) == []
+    
+    def test_iter_pages_range(self, make_pdf):
+        """Test that iter_pages honours start and inclusive stop."""
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 6)])
+        
+        parser = MenuParser(str(pdf_file))
+        pages = list(parser.iter_pages(start=2, stop=4))
+        
+        assert [page_num for page_num, _ in pages] == [2, 3, 4]
+        assert "Dish 3" in pages[1][1]
+        assert parser.get_extraction_stats()["extraction_counts"] == {2: 1, 3: 1, 4: 1}
+    
+    def test_iter_pages_invalid_start(self, make_pdf):
+        """Test that a start page below 1 is rejected."""
+        parser = MenuParser(str(make_pdf(["Dish"])))
+        
+        with pytest.raises(ValueError, match="Page numbers start at 1"):
+            list(parser.iter_pages(start=0))
+    
+    def test_iter_pages_without_cache_keeps_memory_flat(self, make_pdf):
+        """Test that streaming releases per-page PyPDF2 objects and text."""
+        pdf_file = make_pdf([f"Dish {i}\nPrice {i}" for i in range(1, 41)])
+        
+        parser = MenuParser(str(pdf_file))
+        reader = parser._get_reader()
+        resolved_sizes = []
+        for page_num, text in parser.iter_pages(cache=False):
+            assert f"Dish {page_num}" in text
+            resolved_sizes.append(len(reader.resolved_objects))
+        
+        assert max(resolved_sizes) == min(resolved_sizes)
+        assert parser._page_texts == {}
+    
+    def test_extract_page_range_worker(self, make_pdf):
+        """Test the worker function extracts a page range in order."""
+        from src.core.menu_parser import _extract_page_range, _init_extraction_worker
+        
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 6)])
+        _init_extraction_worker(str(pdf_file))
+        results = _extract_page_range(2, 4)
+        
+        assert [page_num for page_num, _, _ in results] == [2, 3, 4]
+        assert "Dish 2" in results[0][1]
+        assert not any(failed for _, _, failed in results)
+    
+    def test_extract_page_range_worker_page_error(self, tmp_path):
+        """Test that a failed page in a worker yields an empty string."""
+        from src.core.menu_parser import _extract_page_range, _init_extraction_worker
+        
+        with patch('src.core.menu_parser.PdfReader') as mock_reader_class:
+            mock_page1 = MagicMock()
+            mock_page1.extract_text.side_effect = Exception("Page error")
+            mock_page2 = MagicMock()
+            mock_page2.extract_text.return_value = "Page 2"
+            
+            mock_reader = MagicMock()
+            mock_reader.pages = [mock_page1, mock_page2]
+            mock_reader_class.return_value = mock_reader
+            
+            _init_extraction_worker(str(tmp_path / "test.pdf"))
+            results = _extract_page_range(1, 2)
+        
+        assert results == [(1, "", True), (2, "Page 2", False)]
+    
+    def test_parallel_extract_by_page(self, make_pdf):
+        """Test parallel extraction returns the same pages in page order."""
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 13)])
+        
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {
+            "text_workers": 3,
+            "text_min_pages_per_worker": 2,
+        }
+        
+        parallel = MenuParser(str(pdf_file), config=config).extract_by_page()
+        serial = MenuParser(str(pdf_file)).extract_by_page()
+        
+        assert list(parallel) == list(range(1, 13))
+        assert parallel == serial
+    
+    def test_parallel_extraction_skipped_for_small_documents(self, make_pdf):
+        """Test that documents below the per-worker minimum stay serial."""
+        pdf_file = make_pdf(["Dish 1", "Dish 2", "Dish 3"])
+        
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {
+            "text_workers": 4,
+            "text_min_pages_per_worker": 8,
+        }
+        
+        with patch('src.core.menu_parser.ProcessPoolExecutor') as mock_pool:
+            parser = MenuParser(str(pdf_file), config=config)
+            parser.extract_by_page()
+        
+        mock_pool.assert_not_called()
+    
+    def test_init_from_bytes(self, make_pdf):
+        """Test parsing a PDF held in memory as bytes."""
+        pdf_bytes = make_pdf(["Dish 1", "Dish 2"]).read_bytes()
+        
+        parser = MenuParser(pdf_bytes)
+        
+        assert parser.pdf_path is None
+        assert "Dish 2" in parser.extract_by_page()[2]
+        assert parser.extract_metadata()["file_size"] == len(pdf_bytes)
+    
+    def test_init_from_memoryview_and_stream(self, make_pdf):
+        """Test parsing a PDF from a memoryview and a binary stream."""
+        import io
+        
+        pdf_bytes = make_pdf(["Dish 1"]).read_bytes()
+        
+        from_view = MenuParser(memoryview(bytearray(pdf_bytes)))
+        from_stream = MenuParser(io.BytesIO(pdf_bytes))
+        
+        assert "Dish 1" in from_view.extract_text()
+        assert "Dish 1" in from_stream.extract_text()
+    
+    def test_init_invalid_bytes(self):
+        """Test that non-PDF bytes are rejected without touching disk."""
+        with pytest.raises(ValueError, match="Invalid PDF file.*%PDF-"):
+            MenuParser(b"not a pdf at all")
+    
+    def test_init_unsupported_type(self):
+        """Test that unsupported input types raise TypeError."""
+        with pytest.raises(TypeError, match="PDF source must be"):
+            MenuParser(12345)
+    
+    def test_save_to_writes_in_memory_pdf(self, make_pdf, tmp_path):
+        """Test that an in-memory PDF is only written when asked."""
+        pdf_bytes = make_pdf(["Dish 1"]).read_bytes()
+        parser = MenuParser(pdf_bytes)
+        
+        saved = parser.save_to(str(tmp_path / "uploads" / "menu.pdf"))
+        
+        assert saved.read_bytes() == pdf_bytes
+    
+    def test_parallel_extract_from_bytes(self, make_pdf):
+        """Test parallel extraction sends in-memory PDFs to the workers."""
+        pdf_bytes = make_pdf([f"Dish {i}" for i in range(1, 9)]).read_bytes()
+        
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {
+            "text_workers": 2,
+            "text_min_pages_per_worker": 2,
+        }
+        
+        page_texts = MenuParser(pdf_bytes, config=config).extract_by_page()
+        
+        assert "Dish 8" in page_texts[8]
+    
+    def test_mmap_mode(self, make_pdf):
+        """Test that use_mmap reads the PDF through a shared file mapping."""
+        from src.core.pdf_source import BufferReader
+        
+        pdf_file = make_pdf(["Dish 1", "Dish 2"])
+        
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {"use_mmap": True}
+        
+        parser = MenuParser(str(pdf_file), config=config)
+        
+        assert parser.source.use_mmap is True
+        assert isinstance(parser.source.open(), BufferReader)
+        assert "Dish 2" in parser.extract_by_page()[2]
+        assert parser.source._mmap is not None
+    
+    def test_mmap_mode_parallel(self, make_pdf):
+        """Test that parallel workers can memory-map the file themselves."""
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 9)])
+        
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {
+            "use_mmap": True,
+            "text_workers": 2,
+            "text_min_pages_per_worker": 2,
+        }
+        
+        page_texts = MenuParser(str(pdf_file), config=config).extract_by_page()
+        
+        assert "Dish 8" in page_texts[8]
+        assert len(page_texts) == 8
+    
+    def test_persistent_cache_reused_across_parsers(self, make_pdf, tmp_path):
+        """Test that a second parser for the same bytes skips extraction."""
+        from src.utils.extraction_cache import ExtractionCache
+        
+        cache = ExtractionCache(tmp_path / "cache")
+        pdf_file = make_pdf(["Dish 1", "Dish 2"])
+        
+        first = MenuParser(str(pdf_file), extraction_cache=cache)
+        first_pages = first.extract_by_page()
+        
+        # Same contents under a different name still hits the cache
+        copy_file = tmp_path / "copy.pdf"
+        copy_file.write_bytes(pdf_file.read_bytes())
+        second = MenuParser(str(copy_file), extraction_cache=cache)
+        
+        assert second.extract_by_page() == first_pages
+        assert second.get_extraction_stats()["pages_extracted"] == 0
+    
+    def test_configured_cache_used_without_one_passed(self, make_pdf, tmp_path):
+        """Test that a standalone parser builds the extraction cache the configuration enables."""
+        pdf_file = make_pdf(["Dish 1", "Dish 2"])
+        
+        def make_config(enabled):
+            config = MagicMock()
+            config.get_pdf_settings.return_value = {
+                "cache_enabled": enabled,
+                "cache_dir": str(tmp_path / "cache"),
+            }
+            return config
+        
+        assert MenuParser(str(pdf_file), config=make_config(False)).extraction_cache is None
+        
+        first = MenuParser(str(pdf_file), config=make_config(True))
+        first_pages = first.extract_by_page()
+        second = MenuParser(str(pdf_file), config=make_config(True))
+        
+        assert second.extraction_cache is first.extraction_cache
+        assert second.extract_by_page() == first_pages
+        assert second.get_extraction_stats()["pages_extracted"] == 0
+    
+    def test_extract_by_page_range_only_reads_selection(self, make_pdf):
+        """Test that a page range extracts only the requested pages."""
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 11)])
+        parser = MenuParser(str(pdf_file))
+        
+        page_texts = parser.extract_by_page(first_page=3, last_page=4)
+        
+        assert list(page_texts) == [3, 4]
+        assert "Dish 3" in page_texts[3]
+        assert set(parser.get_extraction_stats()["extraction_counts"]) == {3, 4}
+    
+    def test_extract_text_explicit_pages(self, make_pdf):
+        """Test extract_text() with an explicit page list."""
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 6)])
+        
+        text = MenuParser(str(pdf_file)).extract_text(pages=[5, 2])
+        
+        assert "Dish 2" in text and "Dish 5" in text
+        assert "Dish 3" not in text
+        assert text.index("Dish 2") < text.index("Dish 5")
+    
+    def test_page_selection_out_of_range(self, make_pdf):
+        """Test that pages outside the document are rejected."""
+        parser = MenuParser(str(make_pdf(["Dish 1", "Dish 2"])))
+        
+        with pytest.raises(ValueError, match="out of range"):
+            parser.extract_by_page(pages=[2, 3])
+        with pytest.raises(ValueError, match="after last_page"):
+            parser.extract_text(first_page=2, last_page=1)
+
+
+class TestPageSelection:
+    """Tests for page selection helpers."""
+    
+    def test_resolve_page_selection(self):
+        """Test explicit pages, ranges and defaults."""
+        from src.core.menu_parser import resolve_page_selection
+        
+        assert resolve_page_selection(5) == [1, 2, 3, 4, 5]
+        assert resolve_page_selection(5, first_page=4) == [4, 5]
+        assert resolve_page_selection(5, last_page=2) == [1, 2]
+        assert resolve_page_selection(5, pages=[3, 1, 3]) == [1, 3]
+        with pytest.raises(ValueError, match="out of range"):
+            resolve_page_selection(5, pages=[0])
+    
+    def test_group_page_runs(self):
+        """Test grouping pages into contiguous runs."""
+        from src.core.menu_parser import group_page_runs
+        
+        assert group_page_runs([1, 2, 3, 7, 9, 10]) == [(1, 3), (7, 7), (9, 10)]
+        assert group_page_runs([]) == []
+
+
+class TestPageClassification:
+    """Tests for structural page classification."""
+    
+    def test_classify_pages(self, make_pdf):
+        """Test text, scanned, scanned-with-text-layer and blank pages."""
+        pdf_file = make_pdf(
+            ["Dish 1", None, "Dish 3 with a searchable text layer", None],
+            image_pages=[1, 2],
+        )
+        
+        kinds = MenuParser(str(pdf_file)).classify_pages()
+        
+        assert kinds == {1: "text", 2: "image", 3: "text", 4: "empty"}
+    
+    def test_get_page_sizes(self, make_pdf):
+        """Test that page sizes come from the MediaBox, in points."""
+        pdf_file = make_pdf(["Dish 1", None], image_pages=[1])
+        
+        assert MenuParser(str(pdf_file)).get_page_sizes() == {1: (612.0, 792.0), 2: (612.0, 792.0)}
+        assert MenuParser(str(pdf_file)).get_page_sizes([2]) == {2: (612.0, 792.0)}
+    
+    def test_classify_pages_unreadable_structure(self, tmp_path):
+        """Test that pages that aren't PyPDF2 dictionaries are 'unknown'."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.core.menu_parser.PdfReader') as mock_reader_class:
+            mock_reader = MagicMock()
+            mock_reader.pages = [MagicMock()]
+            mock_reader_class.return_value = mock_reader
+            
+            assert MenuParser(str(pdf_file)).classify_pages() == {1: "unknown"}
+    
+    def test_textless_pages_skip_extraction(self, make_pdf):
+        """Test that text extraction only runs on pages classified as text."""
+        pdf_file = make_pdf(["Dish 1", None, "Dish 3", None], image_pages=[1])
+        parser = MenuParser(str(pdf_file))
+        
+        page_texts = parser.extract_by_page()
+        
+        assert page_texts[2] == "" and page_texts[4] == ""
+        assert set(parser.get_extraction_stats()["extraction_counts"]) == {1, 3}
+    
+    def test_textless_pages_extracted_when_disabled(self, make_pdf):
+        """Test that skip_textless_pages: false extracts every page."""
+        pdf_file = make_pdf(["Dish 1", None], image_pages=[1])
+        config = MagicMock()
+        config.get_pdf_settings.return_value = {"skip_textless_pages": False}
+        parser = MenuParser(str(pdf_file), config=config)
+        
+        parser.extract_by_page()
+        
+        assert set(parser.get_extraction_stats()["extraction_counts"]) == {1, 2}
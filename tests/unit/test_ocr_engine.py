@@ -0,0 +1,188 @@
+"""
+Unit tests for ocr_engine module.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import patch, MagicMock
+from PIL import Image
+
+from src.processors.ocr_engine import (
+    OCREngine,
+    PytesseractEngine,
+    TesserocrEngine,
+    create_ocr_engine,
+)
+
+
+@pytest.fixture
+def mock_tesserocr():
+    """Replace the tesserocr module with a mock creating a new API per call."""
+    module = MagicMock()
+    module.PyTessBaseAPI.side_effect = lambda **kwargs: MagicMock(name="api")
+    with patch('src.processors.ocr_engine.tesserocr', module):
+        yield module
+
+
+class TestCreateOCREngine:
+    """Tests for create_ocr_engine function."""
+    
+    def test_unknown_engine(self):
+        """Test that unknown engine names are rejected."""
+        with pytest.raises(ValueError, match="Unknown OCR engine"):
+            create_ocr_engine("easyocr")
+    
+    def test_auto_prefers_tesserocr(self, mock_tesserocr):
+        """Test that auto uses tesserocr when it can load the model."""
+        engine = create_ocr_engine("auto", language="fra")
+        
+        assert isinstance(engine, TesserocrEngine)
+        mock_tesserocr.PyTessBaseAPI.assert_called_once_with(lang="fra")
+    
+    def test_auto_falls_back_without_tesserocr(self):
+        """Test that auto uses pytesseract when tesserocr isn't installed."""
+        with patch('src.processors.ocr_engine.tesserocr', None):
+            assert isinstance(create_ocr_engine("auto"), PytesseractEngine)
+            with pytest.raises(RuntimeError, match="not installed"):
+                create_ocr_engine("tesserocr")
+    
+    def test_auto_falls_back_when_model_missing(self, mock_tesserocr):
+        """Test that auto uses pytesseract when the language data can't be loaded."""
+        mock_tesserocr.PyTessBaseAPI.side_effect = RuntimeError("Failed to init API")
+        
+        assert isinstance(create_ocr_engine("auto"), PytesseractEngine)
+        with pytest.raises(RuntimeError, match="Could not load Tesseract model"):
+            create_ocr_engine("tesserocr")
+    
+    def test_incomplete_engine_cannot_be_created(self):
+        """Test that an engine missing recognize() fails at construction, not mid-OCR."""
+        class PartialEngine(OCREngine):
+            def detect_orientation(self, image, timeout=None):
+                return {}
+        
+        with pytest.raises(TypeError, match="recognize"):
+            PartialEngine()
+
+
+class TestTesserocrEngine:
+    """Tests for TesserocrEngine class."""
+    
+    def test_model_loaded_once_per_thread(self, mock_tesserocr):
+        """Test that API handles persist across pages and aren't shared between threads."""
+        engine = TesserocrEngine("eng", tessdata_path="/data/tessdata")
+        image = Image.new('L', (10, 10), color=255)
+        
+        engine.image_to_string(image)
+        engine.image_to_string(image)
+        assert mock_tesserocr.PyTessBaseAPI.call_count == 1
+        assert mock_tesserocr.PyTessBaseAPI.call_args.kwargs["path"] == "/data/tessdata"
+        
+        thread = threading.Thread(target=engine.image_to_string, args=(image,))
+        thread.start()
+        thread.join()
+        assert mock_tesserocr.PyTessBaseAPI.call_count == 2
+        
+        apis = list(engine._apis)
+        engine.close()
+        for api in apis:
+            api.End.assert_called_once()
+    
+    def test_recognize(self, mock_tesserocr):
+        """Test that words come from the TSV output and the handle is cleared afterwards."""
+        engine = TesserocrEngine("eng")
+        api = engine._get_api()
+        api.GetTSVText.return_value = (
+            "1\t1\t0\t0\t0\t0\t0\t0\t10\t10\t-1\t\n"
+            "5\t1\t1\t1\t1\t1\t1\t2\t3\t4\t96.5\tSoup\n"
+            "5\t1\t1\t1\t1\t2\t5\t2\t3\t4\t91.5\tdu\n"
+            "5\t1\t1\t1\t1\t3\t9\t2\t3\t4\t88\tjour\n"
+        )
+        image = Image.new('L', (10, 10), color=255)
+        
+        result = engine.recognize(image)
+        
+        assert engine.image_to_string(image) == "Soup du jour"
+        assert result.words == ["Soup", "du", "jour"]
+        assert result.boxes[1].tolist() == [5, 2, 3, 4]
+        assert result.mean_confidence == pytest.approx(0.92)
+        api.SetImage.assert_called_with(image)
+        assert api.Clear.call_count == 2
+    
+    def test_detect_orientation_uses_osd_handle(self, mock_tesserocr):
+        """Test that OSD runs on a separate OSD-only handle and reports the correcting rotation."""
+        engine = TesserocrEngine("eng")
+        osd_api = engine._get_osd_api()
+        osd_api.DetectOrientationScript.return_value = {
+            "orient_deg": 90, "orient_conf": 4.5, "script_name": "Han", "script_conf": 2.0,
+        }
+        
+        osd = engine.detect_orientation(Image.new('L', (10, 10)))
+        
+        assert osd == {"rotate": 270, "orientation_conf": 4.5, "script": "Han", "script_conf": 2.0}
+        assert mock_tesserocr.PyTessBaseAPI.call_args.kwargs["lang"] == "osd"
+        assert osd_api is not engine._get_api()
+        osd_api.Clear.assert_called_once()
+
+
+class TestPytesseractEngine:
+    """Tests for PytesseractEngine class."""
+    
+    def test_image_to_string(self, tesseract_data):
+        """Test that language and timeout are passed to pytesseract."""
+        with patch('src.processors.ocr_engine.pytesseract.image_to_data') as mock_ocr:
+            mock_ocr.return_value = tesseract_data("Soup of the day")
+            engine = PytesseractEngine("deu")
+            
+            assert engine.image_to_string(Image.new('L', (10, 10)), timeout=30) == "Soup of the day"
+            assert mock_ocr.call_args.kwargs["lang"] == "deu"
+            assert mock_ocr.call_args.kwargs["timeout"] == 30
+    
+    def test_detect_orientation(self):
+        """Test that OSD output is reduced to rotation and script."""
+        with patch('src.processors.ocr_engine.pytesseract.image_to_osd') as mock_osd:
+            mock_osd.return_value = {
+                "page_num": 0, "orientation": 270, "rotate": 90, "orientation_conf": 6.2,
+                "script": "Latin", "script_conf": 3.1,
+            }
+            
+            osd = PytesseractEngine().detect_orientation(Image.new('L', (10, 10)), timeout=5)
+            
+            assert osd == {"rotate": 90, "orientation_conf": 6.2, "script": "Latin", "script_conf": 3.1}
+            assert mock_osd.call_args.kwargs["timeout"] == 5
+    
+    def test_recognize_regions(self, tesseract_data):
+        """Test that each region is OCR'd as a crop and mapped back to the image."""
+        image = Image.new('L', (400, 300), color=255)
+        with patch('src.processors.ocr_engine.pytesseract.image_to_data') as mock_ocr:
+            mock_ocr.side_effect = [tesseract_data("Starters"), tesseract_data("Desserts")]
+            engine = PytesseractEngine()
+            
+            result = engine.recognize_regions(image, [(10, 20, 110, 60), (200, 150, 390, 290)])
+            
+            assert [call.args[0].size for call in mock_ocr.call_args_list] == [(100, 40), (190, 140)]
+            assert result.text == "Starters\n\nDesserts"
+            assert result.boxes[:, :2].tolist() == [[10, 40], [200, 170]]
+    
+    def test_arecognize_regions_runs_tesseract_subprocess(self, fake_ocr_tools):
+        """Test that arecognize() pipes each image to a tesseract process and parses its TSV."""
+        import asyncio
+        
+        image = Image.new('L', (400, 300), color=255)
+        engine = PytesseractEngine("deu")
+        
+        result = asyncio.run(engine.arecognize_regions(image, [(10, 20, 110, 60), (200, 150, 390, 290)]))
+        
+        assert result.words == ["w100", "w190"]
+        assert result.boxes[:, :2].tolist() == [[10, 20], [200, 150]]
+        assert result.mean_confidence == 0.915
+    
+    def test_arecognize_missing_tesseract(self, tmp_path, monkeypatch):
+        """Test that a missing tesseract binary raises TesseractNotFoundError."""
+        import asyncio
+        import pytesseract
+        
+        monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(tmp_path / "tesseract"))
+        
+        with pytest.raises(pytesseract.TesseractNotFoundError):
+            asyncio.run(PytesseractEngine().arecognize(Image.new('L', (10, 10))))
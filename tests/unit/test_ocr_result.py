@@ -0,0 +1,124 @@
+"""
+Unit tests for ocr_result module.
+"""
+
+import math
+
+import pytest
+
+from src.processors.ocr_result import OCRResult, parse_tsv
+
+
+@pytest.fixture
+def menu_data():
+    """image_to_data() output with a page row, two paragraphs and a blank word."""
+    return {
+        "level": [1, 5, 5, 5, 5, 5],
+        "block_num": [0, 1, 1, 1, 1, 2],
+        "par_num": [0, 1, 1, 1, 1, 1],
+        "line_num": [0, 1, 1, 2, 2, 1],
+        "left": [0, 10, 60, 10, 70, 10],
+        "top": [0, 20, 20, 40, 40, 90],
+        "width": [500, 45, 40, 50, 10, 40],
+        "height": [700, 12, 12, 12, 12, 12],
+        "text": ["", "Soup", "8.50", "Salad", " ", "Wine"],
+        "conf": [-1, 90, 80, 70, -1, 60],
+    }
+
+
+class TestOCRResult:
+    """Tests for OCRResult class."""
+    
+    def test_from_data(self, menu_data):
+        """Test that only non-blank word rows become words, with their columns."""
+        result = OCRResult.from_data(menu_data)
+        
+        assert len(result) == 4
+        assert result.words == ["Soup", "8.50", "Salad", "Wine"]
+        assert result.word(2) == "Salad"
+        assert result.boxes.tolist()[1] == [60, 20, 40, 12]
+        assert result.lines.tolist() == [1, 1, 2, 1]
+        assert result.confidences.dtype.name == "float32"
+    
+    def test_text_layout(self, menu_data):
+        """Test words, lines and paragraphs are laid out like image_to_string()."""
+        assert OCRResult.from_data(menu_data).text == "Soup 8.50\nSalad\n\nWine"
+    
+    def test_mean_confidence(self, menu_data):
+        """Test mean confidence on a 0-1 scale, ignoring words without one."""
+        menu_data["conf"][5] = -1
+        result = OCRResult.from_data(menu_data)
+        
+        assert math.isnan(result.confidences[3])
+        assert result.mean_confidence == pytest.approx(0.8)
+    
+    def test_empty(self):
+        """Test a page without words."""
+        result = OCRResult.empty()
+        
+        assert len(result) == 0
+        assert result.text == ""
+        assert result.mean_confidence is None
+    
+    def test_dict_round_trip(self, menu_data):
+        """Test that to_dict() is JSON-friendly and from_dict() restores the result."""
+        menu_data["conf"][5] = -1
+        result = OCRResult.from_data(menu_data)
+        
+        data = result.to_dict()
+        restored = OCRResult.from_dict(data)
+        
+        assert data["confidences"][3] is None
+        assert restored.words == result.words
+        assert restored.boxes.tolist() == result.boxes.tolist()
+        assert restored.text == result.text
+        assert restored.mean_confidence == result.mean_confidence
+    
+    def test_concat_shifts_boxes_and_separates_blocks(self, menu_data):
+        """Test that crop results are combined in page coordinates."""
+        crop = OCRResult.from_data(menu_data)
+        
+        combined = OCRResult.concat([(crop, 0, 0), (OCRResult.empty(), 5, 5), (crop, 100, 400)])
+        
+        assert len(combined) == 8
+        assert combined.boxes.tolist()[4] == [110, 420, 45, 12]
+        assert combined.blocks.tolist() == [1, 1, 1, 2, 4, 4, 4, 5]
+        assert combined.text == "Soup 8.50\nSalad\n\nWine\n\nSoup 8.50\nSalad\n\nWine"
+        assert len(OCRResult.concat([])) == 0
+    
+    def test_compact_storage(self):
+        """Test that thousands of words stay within a few dozen bytes each."""
+        words = 5000
+        data = {
+            "block_num": [1] * words,
+            "par_num": [1] * words,
+            "line_num": [index // 10 for index in range(words)],
+            "left": list(range(words)),
+            "top": list(range(words)),
+            "width": [30] * words,
+            "height": [12] * words,
+            "text": ["Tiramisu"] * words,
+            "conf": [95] * words,
+        }
+        
+        assert OCRResult.from_data(data).nbytes < words * 48
+
+
+class TestParseTSV:
+    """Tests for parse_tsv function."""
+    
+    def test_parse_tsv(self):
+        """Test header skipping, typed columns and empty text."""
+        tsv = (
+            "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t"
+            "left\ttop\twidth\theight\tconf\ttext\n"
+            "4\t1\t1\t1\t1\t0\t10\t20\t100\t12\t-1\t\n"
+            "5\t1\t1\t1\t1\t1\t10\t20\t45\t12\t91.25\tGnocchi\n"
+        )
+        
+        data = parse_tsv(tsv)
+        
+        assert data["level"] == [4, 5]
+        assert data["conf"] == [-1.0, 91.25]
+        assert data["text"] == ["", "Gnocchi"]
+        assert OCRResult.from_data(data).words == ["Gnocchi"]
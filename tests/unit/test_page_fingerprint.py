@@ -0,0 +1,55 @@
+"""
+Unit tests for page_fingerprint module.
+"""
+
+from PIL import Image, ImageDraw
+
+from src.processors.page_fingerprint import dhash, fingerprint_page
+
+
+def draw_menu(price="8.50"):
+    """Draw a small menu page with a dish name and a price."""
+    image = Image.new('L', (300, 200), color=255)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 180, 30), fill=0)
+    draw.text((220, 20), price, fill=0)
+    return image
+
+
+class TestFingerprintPage:
+    """Tests for fingerprint_page function."""
+    
+    def test_identical_pages_match(self):
+        """Test that re-renders of the same page have the same fingerprint."""
+        first, first_density = fingerprint_page(draw_menu())
+        second, second_density = fingerprint_page(draw_menu().convert('RGB'))
+        
+        assert first == second
+        assert first_density == second_density > 0
+    
+    def test_small_change_differs(self):
+        """Test that a changed price changes the fingerprint even if the hash doesn't."""
+        assert fingerprint_page(draw_menu("8.50"))[0] != fingerprint_page(draw_menu("9.75"))[0]
+    
+    def test_blank_page_density(self):
+        """Test that a blank page has no ink."""
+        fingerprint, density = fingerprint_page(Image.new('L', (300, 200), color=255))
+        
+        assert density == 0.0
+        assert fingerprint.endswith("-300x200-0")
+
+
+class TestDhash:
+    """Tests for dhash function."""
+    
+    def test_hash_length(self):
+        """Test that the hash has hash_size squared bits."""
+        assert len(dhash(draw_menu(), 16)) == 64
+        assert len(dhash(draw_menu(), 8)) == 16
+    
+    def test_perceptual(self):
+        """Test that light noise leaves the hash unchanged."""
+        noisy = draw_menu()
+        noisy.putpixel((250, 150), 200)
+        
+        assert dhash(noisy, 8) == dhash(draw_menu(), 8)
@@ -2,6 +2,7 @@
 Unit tests for pdf_processor module.
 """
 
+import numpy as np
 import pytest
 import tempfile
 from pathlib import Path
@@ -9,7 +10,9 @@ from unittest.mock import patch, MagicMock, Mock
 from PIL import Image
 import pytesseract
 
+from src.processors.ocr_result import OCRResult
 from src.processors.pdf_processor import PDFProcessor
+from src.utils.config import DEFAULT_EXTRACTION_CACHE_DIR
 from src.core.menu_parser import MenuParser
 
 
@@ -54,6 +57,24 @@ class TestPDFProcessor:
             processor = PDFProcessor(str(pdf_file))
             assert processor.tesseract_path == "C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
     
+    def test_missing_settings_fall_back_to_config_defaults(self, tmp_path):
+        """Test that settings left out of get_pdf_settings() take the configuration file's defaults."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.utils.extraction_cache.get_extraction_cache') as mock_cache, \
+             patch('src.processors.pdf_processor.get_memory_budget') as mock_budget:
+            mock_config.return_value.get_pdf_settings.return_value = {}
+            
+            processor = PDFProcessor(str(pdf_file))
+        
+        assert processor.ocr_adaptive_dpi is True
+        assert processor.ocr_engine_name == "auto"
+        mock_cache.assert_called_once_with(DEFAULT_EXTRACTION_CACHE_DIR, 512)
+        mock_budget.assert_called_once_with(2048, 10.0)
+        assert processor._memory_budget is mock_budget.return_value
+    
     def test_is_scanned_menu_text_based(self, tmp_path):
         """Test is_scanned_menu returns False for text-based PDF."""
         pdf_file = tmp_path / "test.pdf"
@@ -135,7 +156,8 @@ class TestPDFProcessor:
             mock_convert.assert_called_once_with(
                 str(pdf_file),
                 dpi=150,
-                fmt='png'
+                fmt='ppm',
+                grayscale=True
             )
     
     def test_convert_to_images_caching(self, tmp_path):
@@ -219,13 +241,13 @@ class TestPDFProcessor:
             # Should be grayscale after preprocessing
             assert processed.mode == 'L'
     
-    def test_ocr_image_success(self, tmp_path):
+    def test_ocr_image_success(self, tmp_path, tesseract_data):
         """Test successful OCR processing."""
         pdf_file = tmp_path / "test.pdf"
         pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
         
         with patch('src.processors.pdf_processor.get_config') as mock_config, \
-             patch('src.processors.pdf_processor.pytesseract.image_to_string') as mock_ocr:
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
             
             mock_config_instance = MagicMock()
             mock_config_instance.get_pdf_settings.return_value = {
@@ -236,7 +258,7 @@ class TestPDFProcessor:
             }
             mock_config.return_value = mock_config_instance
             
-            mock_ocr.return_value = "Extracted text from menu"
+            mock_ocr.return_value = tesseract_data("Extracted text from menu")
             
             test_image = Image.new('RGB', (100, 100), color='white')
             processor = PDFProcessor(str(pdf_file))
@@ -255,7 +277,7 @@ class TestPDFProcessor:
         pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
         
         with patch('src.processors.pdf_processor.get_config') as mock_config, \
-             patch('src.processors.pdf_processor.pytesseract.image_to_string') as mock_ocr:
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
             
             mock_config_instance = MagicMock()
             mock_config_instance.get_pdf_settings.return_value = {
@@ -327,7 +349,7 @@ class TestPDFProcessor:
             # Should not call OCR
             assert not hasattr(processor, '_cached_images') or processor._cached_images is None
     
-    def test_process_scanned_pdf(self, tmp_path):
+    def test_process_scanned_pdf(self, tmp_path, tesseract_data):
         """Test processing scanned PDF (uses OCR)."""
         pdf_file = tmp_path / "test.pdf"
         pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
@@ -335,7 +357,7 @@ class TestPDFProcessor:
         with patch('src.processors.pdf_processor.get_config') as mock_config, \
              patch('src.processors.pdf_processor.MenuParser') as mock_parser_class, \
              patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
-             patch('src.processors.pdf_processor.pytesseract.image_to_string') as mock_ocr:
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
             
             mock_config_instance = MagicMock()
             mock_config_instance.get_pdf_settings.return_value = {
@@ -354,7 +376,7 @@ class TestPDFProcessor:
             # Mock OCR - use actual PIL Image
             mock_image = Image.new('RGB', (100, 100), color='white')
             mock_convert.return_value = [mock_image]
-            mock_ocr.return_value = "OCR extracted text"
+            mock_ocr.return_value = tesseract_data("OCR extracted text")
             
             processor = PDFProcessor(str(pdf_file))
             text = processor.process()
@@ -362,7 +384,7 @@ class TestPDFProcessor:
             assert "OCR extracted text" in text
             mock_ocr.assert_called()
     
-    def test_process_with_ocr_fallback(self, tmp_path):
+    def test_process_with_ocr_fallback(self, tmp_path, tesseract_data):
         """Test that OCR is used as fallback if text extraction fails."""
         pdf_file = tmp_path / "test.pdf"
         pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
@@ -370,7 +392,7 @@ class TestPDFProcessor:
         with patch('src.processors.pdf_processor.get_config') as mock_config, \
              patch('src.processors.pdf_processor.MenuParser') as mock_parser_class, \
              patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
-             patch('src.processors.pdf_processor.pytesseract.image_to_string') as mock_ocr:
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
             
             mock_config_instance = MagicMock()
             mock_config_instance.get_pdf_settings.return_value = {
@@ -389,7 +411,7 @@ class TestPDFProcessor:
             # OCR should be used as fallback
             mock_image = Image.new('RGB', (100, 100), color='white')
             mock_convert.return_value = [mock_image]
-            mock_ocr.return_value = "Fallback OCR text"
+            mock_ocr.return_value = tesseract_data("Fallback OCR text")
             
             processor = PDFProcessor(str(pdf_file))
             text = processor.process()
@@ -424,3 +446,1110 @@ class TestPDFProcessor:
             with pytest.raises(ValueError, match="Failed to process PDF.*OCR"):
                 processor.process()
 
+    
+    def test_scan_detection_and_process_share_page_cache(self, tmp_path):
+        """Test that is_scanned_menu() and process() extract each page once."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.core.menu_parser.PdfReader') as mock_reader_class:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "tesseract_path": None,
+                "ocr_language": "eng",
+                "ocr_quality_threshold": 0.75,
+            }
+            mock_config.return_value = mock_config_instance
+            
+            # First page is short so is_scanned_menu() falls through to a full pass
+            mock_pages = [MagicMock() for _ in range(20)]
+            mock_pages[0].extract_text.return_value = "Cover"
+            for mock_page in mock_pages[1:]:
+                mock_page.extract_text.return_value = "Menu item " * 10
+            
+            mock_reader = MagicMock()
+            mock_reader.pages = mock_pages
+            mock_reader.metadata = {}
+            mock_reader_class.return_value = mock_reader
+            
+            processor = PDFProcessor(str(pdf_file))
+            assert processor.is_scanned_menu() is False
+            text = processor.process()
+            
+            assert "--- Page 20 ---" in text
+            stats = processor._get_menu_parser().get_extraction_stats()
+            assert stats["pages_extracted"] == 20
+            assert all(count == 1 for count in stats["extraction_counts"].values())
+    
+    def test_init_from_bytes_uses_convert_from_bytes(self):
+        """Test that in-memory PDFs are rasterized without a path."""
+        pdf_bytes = b"%PDF-1.4\n" * 100
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert_path, \
+             patch('src.processors.pdf_processor.convert_from_bytes') as mock_convert_bytes:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "tesseract_path": None,
+                "ocr_language": "eng",
+                "ocr_quality_threshold": 0.75,
+            }
+            mock_config.return_value = mock_config_instance
+            
+            mock_image = Image.new('RGB', (100, 100), color='white')
+            mock_convert_bytes.return_value = [mock_image]
+            
+            processor = PDFProcessor(pdf_bytes)
+            images = processor.convert_to_images(dpi=150)
+            
+            assert processor.pdf_path is None
+            assert images == [mock_image]
+            mock_convert_path.assert_not_called()
+            assert mock_convert_bytes.call_args[0][0] is pdf_bytes
+    
+    def test_process_uses_persistent_cache(self, tmp_path, tesseract_data):
+        """Test that process() results are reused for identical PDF bytes."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.MenuParser') as mock_parser_class, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "tesseract_path": None,
+                "ocr_language": "eng",
+                "ocr_quality_threshold": 0.75,
+                "cache_enabled": True,
+                "cache_dir": str(tmp_path / "cache"),
+            }
+            mock_config.return_value = mock_config_instance
+            
+            mock_parser = MagicMock()
+            mock_parser.extract_by_page.return_value = {1: "  "}  # <50 chars
+            mock_parser_class.return_value = mock_parser
+            
+            mock_convert.return_value = [Image.new('RGB', (100, 100), color='white')]
+            mock_ocr.return_value = tesseract_data("OCR extracted text")
+            
+            first = PDFProcessor(str(pdf_file)).process()
+            second = PDFProcessor(pdf_file.read_bytes()).process()
+            
+            assert first == second == "OCR extracted text"
+            assert mock_ocr.call_count == 1
+            assert mock_parser.extract_by_page.call_count == 1
+    
+    def test_convert_to_images_page_selection(self, make_pdf):
+        """Test that only selected pages are rendered, one call per contiguous run."""
+        pdf_file = make_pdf([f"Dish {i}" for i in range(1, 11)])
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {"ocr_enabled": True}
+            mock_config.return_value = mock_config_instance
+            
+            mock_convert.side_effect = lambda path, dpi, fmt, grayscale, first_page, last_page: [
+                Image.new('L', (10, 10), color=page) for page in range(first_page, last_page + 1)
+            ]
+            
+            processor = PDFProcessor(str(pdf_file))
+            images = processor.convert_to_images(pages=[2, 3, 7])
+            
+            assert [image.getpixel((0, 0)) for image in images] == [2, 3, 7]
+            assert [call.kwargs["first_page"] for call in mock_convert.call_args_list] == [2, 7]
+            assert [call.kwargs["last_page"] for call in mock_convert.call_args_list] == [3, 7]
+            
+            # Already rendered pages are reused
+            processor.convert_to_images(first_page=3, last_page=4)
+            assert mock_convert.call_args.kwargs["first_page"] == 4
+            assert mock_convert.call_count == 3
+    
+    def test_process_page_range_ocrs_only_selection(self, make_pdf, tesseract_data):
+        """Test that process() with a page range OCRs only those pages."""
+        pdf_file = make_pdf([None] * 6, image_pages=range(6))
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {"ocr_enabled": True}
+            mock_config.return_value = mock_config_instance
+            
+            mock_convert.side_effect = lambda path, dpi, fmt, grayscale, first_page, last_page: [
+                Image.new('RGB', (10, 10), color='white') for _ in range(first_page, last_page + 1)
+            ]
+            mock_ocr.return_value = tesseract_data("Scanned dish")
+            
+            processor = PDFProcessor(str(pdf_file))
+            text = processor.process(first_page=5, last_page=6)
+            
+            assert mock_ocr.call_count == 2
+            assert "--- Page 5 ---" in text and "--- Page 6 ---" in text
+            assert "Page 4" not in text
+            mock_convert.assert_called_once()
+            
+            with pytest.raises(ValueError, match="out of range"):
+                processor.process(pages=[7])
+    
+    def test_is_scanned_menu_structural(self, make_pdf):
+        """Test that scan detection classifies pages without extracting text."""
+        scanned_pdf = make_pdf([None, None, "Wine list"], image_pages=[0, 1], name="scanned.pdf")
+        text_pdf = make_pdf(["Starters", "Mains", None], image_pages=[2], name="text.pdf")
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config:
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {"ocr_enabled": True}
+            mock_config.return_value = mock_config_instance
+            
+            scanned = PDFProcessor(str(scanned_pdf))
+            text_based = PDFProcessor(str(text_pdf))
+            
+            assert scanned.is_scanned_menu() is True
+            assert text_based.is_scanned_menu() is False
+            for processor in (scanned, text_based):
+                stats = processor._get_menu_parser().get_extraction_stats()
+                assert stats["extraction_counts"] == {}
+    
+    def test_process_mixed_menu_ocrs_only_deficient_pages(self, make_pdf, tesseract_data):
+        """Test that only pages without enough text are OCR'd and merged back in order."""
+        dishes = "Grilled salmon with lemon butter and seasonal vegetables"
+        pdf_file = make_pdf([dishes, dishes, None, dishes], image_pages=[2])
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {"ocr_enabled": True}
+            mock_config.return_value = mock_config_instance
+            
+            mock_convert.return_value = [Image.new('RGB', (10, 10), color='white')]
+            mock_ocr.return_value = tesseract_data("House red 8 / glass")
+            
+            processor = PDFProcessor(str(pdf_file))
+            pages = processor.process_pages()
+            text = processor._format_pages(pages)
+            
+            assert [page["method"] for page in pages.values()] == ["text", "text", "ocr", "text"]
+            assert mock_ocr.call_count == 1
+            assert mock_convert.call_args.kwargs["first_page"] == 3
+            assert mock_convert.call_args.kwargs["last_page"] == 3
+            assert text.index("--- Page 3 ---\nHouse red") < text.index("--- Page 4 ---")
+    
+    def test_process_mixed_menu_ocr_disabled_keeps_text(self, make_pdf):
+        """Test that a mixed menu with OCR disabled returns its text pages."""
+        dishes = "Grilled salmon with lemon butter and seasonal vegetables"
+        pdf_file = make_pdf([dishes, None], image_pages=[1])
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config:
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {"ocr_enabled": False}
+            mock_config.return_value = mock_config_instance
+            
+            pages = PDFProcessor(str(pdf_file)).process_pages()
+            
+            assert pages[1]["text"].startswith("Grilled salmon")
+            assert pages[2] == {"text": "", "method": "text"}
+
+
+class TestParallelOCR:
+    """Tests for OCR across a process pool."""
+    
+    def test_ocr_page_worker(self, tesseract_data):
+        """Test the worker initializer and per-page OCR task."""
+        from src.processors.pdf_processor import _init_ocr_worker, _ocr_page_worker
+        
+        image = Image.new('RGB', (10, 10), color='white')
+        with patch.dict('os.environ'), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            import os
+            
+            _init_ocr_worker("deu")
+            assert os.environ["OMP_THREAD_LIMIT"] == "1"
+            
+            mock_ocr.return_value = tesseract_data("Schnitzel")
+            page_num, result, error = _ocr_page_worker(3, image)
+            assert (page_num, result.text, error) == (3, "Schnitzel", None)
+            assert mock_ocr.call_args.kwargs["lang"] == "deu"
+            
+            mock_ocr.side_effect = RuntimeError("tesseract crashed")
+            assert _ocr_page_worker(4, image) == (4, None, "tesseract crashed")
+            
+            _init_ocr_worker("eng")
+    
+    def test_parallel_ocr_preserves_order_and_errors(self, tmp_path, tesseract_data):
+        """Test that parallel OCR returns pages in order with per-page error markers."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        def fake_ocr(image, lang, timeout, output_type):
+            shade = image.getpixel((0, 0))
+            if shade == 3:
+                raise RuntimeError("unreadable")
+            return tesseract_data(f"Page text {shade}")
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.ProcessPoolExecutor', ThreadPoolExecutor), \
+             patch('src.processors.pdf_processor.PDFProcessor._preprocess_image', side_effect=lambda pixels, options=None: Image.fromarray(np.array(pixels))), \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', side_effect=fake_ocr):
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_workers": 3,
+                "ocr_adaptive_dpi": False,
+                "memory_budget": {"enabled": False},
+            }
+            mock_config.return_value = mock_config_instance
+            mock_convert.return_value = [Image.new('L', (10, 10), color=shade) for shade in range(1, 6)]
+            
+            processor = PDFProcessor(str(pdf_file))
+            pages = processor._ocr_pages()
+            
+            assert list(pages) == [1, 2, 3, 4, 5]
+            assert pages[5]["text"] == "Page text 5"
+            assert (pages[5]["method"], pages[5]["confidence"], pages[5]["dpi"]) == ("ocr", 0.9, 150)
+            assert pages[3]["method"] == "ocr_error"
+            assert "--- Page 3 (OCR error) ---" in processor._process_with_ocr()
+    
+    def test_parallel_ocr_holds_one_shared_page_per_worker(self, tmp_path, tesseract_data):
+        """Test that pages are copied into shared memory only as workers free up."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.utils.shared_images import SharedImagePool
+        
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        held = []
+        put = SharedImagePool.put
+        
+        def counting_put(shared, image):
+            ref = put(shared, image)
+            held.append(len(shared))
+            return ref
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.ProcessPoolExecutor', ThreadPoolExecutor), \
+             patch.object(SharedImagePool, 'put', counting_put), \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Menu")):
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_workers": 2,
+                "ocr_adaptive_dpi": False,
+                "memory_budget": {"enabled": False},
+            }
+            mock_config.return_value = mock_config_instance
+            mock_convert.return_value = [Image.new('L', (10, 10), color=shade) for shade in range(1, 7)]
+            
+            pages = PDFProcessor(str(pdf_file))._ocr_pages()
+        
+        assert [page["text"] for page in pages.values()] == ["Menu"] * 6
+        assert len(held) == 6
+        assert max(held) <= 2
+    
+    def test_shared_page_worker_reads_shared_memory(self, tesseract_data):
+        """Test that the worker OCRs the page in shared memory and leaves the block to its owner."""
+        from src.processors.pdf_processor import _init_ocr_worker, _ocr_shared_page_worker
+        from src.utils.shared_images import SharedImagePool, attach_block
+        
+        with SharedImagePool() as shared, patch.dict('os.environ'), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            ref = shared.put(Image.new('L', (40, 20), color=7))
+            mock_ocr.return_value = tesseract_data("Risotto")
+            _init_ocr_worker("eng", preprocessing={"threshold": "none", "crop_margins": False, "deskew": False})
+            
+            page_num, result, error = _ocr_shared_page_worker(2, ref)
+            
+            assert (page_num, result.text, error) == (2, "Risotto", None)
+            ocr_image = mock_ocr.call_args.args[0]
+            assert ocr_image.size == (40, 20) and ocr_image.getpixel((0, 0)) == 7
+            block = attach_block(ref[0])  # Still there for the owner to unlink
+            block.close()
+            
+            _init_ocr_worker("eng")
+        
+        # The pool unlinked the block on exit
+        page_num, result, error = _ocr_shared_page_worker(5, ref)
+        assert result is None and error
+
+
+class TestOCRPipeline:
+    """Tests for the streaming render -> preprocess -> OCR pipeline."""
+    
+    SETTINGS = {"ocr_pipeline": True}
+    
+    def test_pipeline_yields_pages_in_order(self, make_pdf, tesseract_data, make_processor):
+        """Test page order, error placeholders and that renders are not kept."""
+        pdf_file = make_pdf([None] * 6, image_pages=range(6))
+        processor = make_processor(pdf_file, self.SETTINGS, ocr_workers=3)
+        
+        def fake_ocr(image, lang, timeout, output_type):
+            if image.size[0] == 4:
+                raise RuntimeError("unreadable")
+            return tesseract_data(f"Text {image.size[0]}")
+        
+        with patch.object(processor, '_render', side_effect=lambda dpi, first_page, last_page: [
+                 Image.new('RGB', (first_page, 10), color='white')
+             ]), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', side_effect=fake_ocr):
+            
+            pages = list(processor.iter_ocr_pages())
+            
+            assert [page_num for page_num, _ in pages] == [1, 2, 3, 4, 5, 6]
+            assert pages[0][1]["text"] == "Text 1"
+            assert pages[0][1]["words"].words == ["Text", "1"]
+            assert pages[3][1]["method"] == "ocr_error"
+            assert processor._image_cache.get_stats()["pages"] == 0
+            
+            # process() routes OCR through the pipeline when it is enabled
+            assert "--- Page 6 ---\nText 6" in processor.process()
+    
+    def test_pipeline_memory_bounded_by_queue_depth(self, make_pdf, tesseract_data, make_processor):
+        """Test that rendering stays a bounded number of pages ahead of the consumer."""
+        pdf_file = make_pdf([None] * 30, image_pages=range(30))
+        processor = make_processor(pdf_file, self.SETTINGS, ocr_queue_depth=1)
+        rendered = []
+        
+        def fake_render(dpi, first_page, last_page):
+            rendered.append(first_page)
+            return [Image.new('RGB', (10, 10), color='white')]
+        
+        with patch.object(processor, '_render', side_effect=fake_render), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("text")):
+            
+            import time
+            pages = processor.iter_ocr_pages()
+            assert next(pages)[0] == 1
+            time.sleep(0.3)  # Let the stages fill their queues
+            
+            # Consumed page + results queue (2) + one page per stage (3) + two page queues
+            assert len(rendered) <= 8
+            pages.close()
+            assert len(rendered) <= 9
+    
+    def test_pipeline_poppler_missing(self, make_pdf, make_processor):
+        """Test that a missing poppler install is reported like convert_to_images()."""
+        from pdf2image.exceptions import PDFInfoNotInstalledError
+        
+        processor = make_processor(make_pdf([None, None], image_pages=[0, 1]), self.SETTINGS)
+        
+        with patch.object(processor, '_render', side_effect=PDFInfoNotInstalledError()):
+            with pytest.raises(ValueError, match="poppler-utils not installed"):
+                list(processor.iter_ocr_pages())
+    
+    def test_pipeline_gives_up_on_wedged_page(self, make_pdf, tesseract_data, make_processor):
+        """Test that a page whose OCR never returns is marked as an error instead of hanging."""
+        import threading
+        
+        processor = make_processor(make_pdf([None] * 3, image_pages=range(3)), self.SETTINGS, ocr_workers=2)
+        release = threading.Event()
+        
+        def fake_ocr(image, lang, timeout, output_type):
+            if image.size[0] == 2:
+                release.wait(10)
+            return tesseract_data(f"Text {image.size[0]}")
+        
+        with patch.object(processor, '_render', side_effect=lambda dpi, first_page, last_page: [
+                 Image.new('RGB', (first_page, 10), color='white')
+             ]), \
+             patch('src.processors.pdf_processor.PIPELINE_STALL_SECONDS', 0.5), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', side_effect=fake_ocr):
+            
+            try:
+                pages = dict(processor.iter_ocr_pages())
+            finally:
+                release.set()
+        
+        assert pages[1]["text"] == "Text 1"
+        assert pages[2]["method"] == "ocr_error"
+        assert pages[3]["text"] == "Text 3"
+
+    
+    def test_convert_to_images_cache_is_dpi_aware(self, tmp_path):
+        """Test that a render at another DPI is not served from the cache."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {"ocr_enabled": True}
+            mock_config.return_value = mock_config_instance
+            mock_convert.side_effect = lambda path, dpi, fmt, grayscale: [
+                Image.new('RGB', (dpi // 10, dpi // 10), color='white')
+            ]
+            
+            processor = PDFProcessor(str(pdf_file))
+            low = processor.convert_to_images(dpi=150)
+            high = processor.convert_to_images(dpi=300)
+            
+            assert low[0].size == (15, 15)
+            assert high[0].size == (30, 30)
+            
+            # Another processor for the same file reuses both renders
+            other = PDFProcessor(str(pdf_file))
+            assert other.convert_to_images(dpi=300)[0] is high[0]
+            assert other.convert_to_images(dpi=150)[0] is low[0]
+            assert mock_convert.call_count == 2
+    
+    def test_ocr_engine_created_once(self, tmp_path, tesseract_data):
+        """Test that ocr_image() reuses one configured OCR engine."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.recognition.create_ocr_engine') as mock_create:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_language": "ita",
+                "ocr_engine": "tesserocr",
+            }
+            mock_config.return_value = mock_config_instance
+            mock_create.return_value.recognize.return_value = OCRResult.from_data(tesseract_data("Antipasti"))
+            
+            processor = PDFProcessor(str(pdf_file))
+            image = Image.new('L', (10, 10), color=255)
+            
+            assert processor.ocr_image(image) == "Antipasti"
+            assert processor.ocr_image(image) == "Antipasti"
+            mock_create.assert_called_once_with("tesserocr", "ita", None, None)
+    
+    def test_adaptive_dpi_retries_low_confidence_pages(self, make_pdf, tesseract_data):
+        """Test that only low-confidence pages are re-OCR'd at high DPI."""
+        pdf_file = make_pdf([None] * 3, image_pages=range(3))
+        # Confidence by (page, dpi); page 3 is no better at high DPI
+        confidences = {(1, 100): 0.92, (2, 100): 0.40, (2, 300): 0.88, (3, 100): 0.50, (3, 300): 0.30}
+        
+        def fake_render(dpi, first_page=1, last_page=3):
+            return [Image.new('L', (page_num, dpi), color=255) for page_num in range(first_page, last_page + 1)]
+        
+        def fake_recognize(image, timeout):
+            page_num, dpi = image.size
+            return OCRResult.from_data(
+                tesseract_data(f"Page {page_num} at {dpi}", conf=confidences[(page_num, dpi)] * 100)
+            )
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.recognition.create_ocr_engine') as mock_create:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_adaptive_dpi": True,
+                "ocr_low_dpi": 100,
+                "ocr_high_dpi": 300,
+                "ocr_quality_threshold": 0.75,
+            }
+            mock_config.return_value = mock_config_instance
+            mock_create.return_value.recognize.side_effect = fake_recognize
+            
+            processor = PDFProcessor(str(pdf_file))
+            with patch.object(processor, '_render', side_effect=fake_render) as mock_render:
+                pages = processor._ocr_pages()
+            
+            assert (pages[1]["text"], pages[1]["confidence"], pages[1]["dpi"]) == ("Page 1 at 100", 0.92, 100)
+            assert (pages[2]["text"], pages[2]["confidence"], pages[2]["dpi"]) == ("Page 2 at 300", 0.88, 300)
+            assert pages[3]["dpi"] == 100
+            assert [c.args[0] for c in mock_render.call_args_list] == [100, 300]
+            assert mock_render.call_args.kwargs == {"first_page": 2, "last_page": 3}
+    
+    def test_recognize_image_ocrs_only_text_regions(self, tmp_path, tesseract_data):
+        """Test that only detected text blocks are sent to Tesseract, mapped back to the page."""
+        from PIL import ImageDraw
+        
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_engine": "pytesseract",
+                "ocr_preprocessing": {"deskew": False, "crop_margins": False},
+                "ocr_regions": {"enabled": True, "padding": 0},
+            }
+            mock_config.return_value = mock_config_instance
+            mock_ocr.return_value = tesseract_data("Dessert")
+            
+            processor = PDFProcessor(str(pdf_file))
+            image = Image.new('L', (800, 1000), color=255)
+            assert processor.recognize_image(image).text == ""
+            mock_ocr.assert_not_called()
+            
+            for line in range(3):
+                for word in range(4):
+                    x = 400 + word * 50
+                    ImageDraw.Draw(image).rectangle((x, 600 + line * 20, x + 40, 603 + line * 20), fill=0)
+            result = processor.recognize_image(image)
+            
+            crop = mock_ocr.call_args.args[0]
+            assert crop.width * crop.height < 0.1 * 800 * 1000
+            assert result.text == "Dessert"
+            assert result.boxes[0, 0] >= 400 and result.boxes[0, 1] >= 600
+
+
+class TestPageSkip:
+    """Tests for skipping blank and repeated pages before OCR."""
+    
+    @staticmethod
+    def _menu_page(offset):
+        """Draw a page with a few word-sized strokes, shifted by offset pixels."""
+        from PIL import ImageDraw
+        
+        image = Image.new('L', (200, 200), color=255)
+        draw = ImageDraw.Draw(image)
+        for line in range(4):
+            draw.rectangle((20 + offset, 30 + line * 30, 120 + offset, 36 + line * 30), fill=0)
+        return image
+    
+    SETTINGS = {"ocr_page_skip": {"enabled": True}}
+    
+    def test_blank_and_repeated_pages_not_ocrd(self, tmp_path, tesseract_data, pdf_config):
+        """Test that blank pages are skipped and identical pages are OCR'd once."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        blank = Image.new('L', (200, 200), color=255)
+        blank.putpixel((5, 5), 0)  # Scanner speck
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.PDFProcessor._preprocess_image', side_effect=lambda image, options=None: image), \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config.return_value = pdf_config(self.SETTINGS)
+            mock_convert.return_value = [self._menu_page(0), blank, self._menu_page(0), self._menu_page(40)]
+            mock_ocr.side_effect = [tesseract_data("Tiramisu"), tesseract_data("Espresso")]
+            
+            pages = PDFProcessor(str(pdf_file))._ocr_pages()
+            
+            assert mock_ocr.call_count == 2
+            assert pages[2] == {"text": "", "method": "blank", "dpi": 150}
+            assert pages[3]["text"] == pages[1]["text"] == "Tiramisu"
+            assert pages[4]["text"] == "Espresso"
+    
+    def test_repeated_pages_reuse_cache_across_documents(self, tmp_path, tesseract_data, pdf_config):
+        """Test that a page OCR'd in one document is not OCR'd again in another."""
+        first_pdf = tmp_path / "downtown.pdf"
+        first_pdf.write_bytes(b"%PDF-1.4\n" * 100)
+        second_pdf = tmp_path / "uptown.pdf"
+        second_pdf.write_bytes(b"%PDF-1.4\n" * 101)
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config.return_value = pdf_config(
+                self.SETTINGS, cache_enabled=True, cache_dir=str(tmp_path / "cache"), image_cache_max_size_mb=0
+            )
+            mock_convert.return_value = [self._menu_page(0)]
+            mock_ocr.return_value = tesseract_data("Dessert menu")
+            
+            first = PDFProcessor(str(first_pdf))._ocr_pages()
+            second = PDFProcessor(str(second_pdf))._ocr_pages()
+            
+            assert mock_ocr.call_count == 1
+            assert second[1]["text"] == "Dessert menu"
+            assert second[1]["words"].words == first[1]["words"].words
+    
+    def test_pipeline_skips_blank_and_repeated_pages(self, make_pdf, tesseract_data, pdf_config):
+        """Test that the streaming pipeline reuses text for repeats and skips blanks."""
+        pdf_file = make_pdf([None] * 4, image_pages=range(4))
+        pages_by_number = {
+            1: self._menu_page(0),
+            2: self._menu_page(0),
+            3: Image.new('L', (200, 200), color=255),
+            4: self._menu_page(0),
+        }
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config:
+            mock_config.return_value = pdf_config(self.SETTINGS, ocr_pipeline=True, ocr_workers=2)
+            processor = PDFProcessor(str(pdf_file))
+        
+        with patch.object(processor, '_render', side_effect=lambda dpi, first_page, last_page: [
+                 pages_by_number[first_page]
+             ]), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Gelato")) as mock_ocr:
+            
+            pages = dict(processor.iter_ocr_pages())
+            
+            assert mock_ocr.call_count == 1
+            assert [pages[page_num]["text"] for page_num in (1, 2, 4)] == ["Gelato"] * 3
+            assert pages[3]["method"] == "blank"
+
+
+class TestDeadline:
+    """Tests for time-budgeted processing."""
+    
+    SETTINGS = {"ocr_dpi": 150, "image_cache_max_size_mb": 0}
+    
+    def test_expired_deadline_marks_pages(self, make_pdf, pdf_config):
+        """Test that pages not started before the deadline are marked, not OCR'd."""
+        pdf_file = make_pdf([None] * 2, image_pages=range(2))
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr:
+            
+            mock_config.return_value = pdf_config(self.SETTINGS, ocr_deadline_seconds=0)
+            processor = PDFProcessor(str(pdf_file))
+            
+            pages = processor.process_pages()
+            text = processor.process()
+            
+            assert pages == {1: {"text": "", "method": "timeout"}, 2: {"text": "", "method": "timeout"}}
+            assert "--- Page 2 (not processed: deadline reached) ---" in text
+            mock_convert.assert_not_called()
+            mock_ocr.assert_not_called()
+    
+    def test_degrades_settings_as_deadline_nears(self, make_pdf, tesseract_data, pdf_config):
+        """Test that later pages use a lower DPI, then skip preprocessing, then time out."""
+        from src.processors.time_budget import TimeBudget
+        
+        pdf_file = make_pdf([None] * 3, image_pages=range(3))
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.PDFProcessor._preprocess_image', side_effect=lambda image, options=None: image) as mock_preprocess, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data') as mock_ocr, \
+             patch.object(TimeBudget, 'start_page', side_effect=[0, 2, None]):
+            
+            mock_config.return_value = pdf_config(self.SETTINGS)
+            mock_convert.side_effect = lambda path, dpi, **kwargs: [Image.new('L', (dpi, dpi), color=255)]
+            mock_ocr.side_effect = [tesseract_data("Starters"), tesseract_data("Mains")]
+            
+            pages = PDFProcessor(str(pdf_file)).process_pages(deadline=60)
+            
+            assert [call.kwargs["dpi"] for call in mock_convert.call_args_list] == [150, 100]
+            assert mock_preprocess.call_count == 1
+            assert (pages[1]["text"], pages[1]["dpi"], "degraded" in pages[1]) == ("Starters", 150, False)
+            assert (pages[2]["text"], pages[2]["dpi"], pages[2]["degraded"]) == ("Mains", 100, True)
+            assert pages[3] == {"text": "", "method": "timeout"}
+            assert mock_ocr.call_args_list[1].kwargs["timeout"] <= 30
+    
+    def test_timed_out_ocr_keeps_text_layer(self):
+        """Test that a page OCR could not finish keeps its extracted text."""
+        results = {1: {"text": "Soup of the day", "method": "text"}}
+        
+        merged = PDFProcessor._merge_ocr_pages(results, {1: {"text": "", "method": "timeout"}})
+        
+        assert merged[1]["method"] == "text"
+
+
+class TestLanguageDetection:
+    """Tests for per-document language detection and rotation fixing."""
+    
+    LATIN_OSD = {"rotate": 0, "orientation_conf": 5.0, "script": "Latin", "script_conf": 3.0}
+    
+    def test_detects_language_once_per_document(self, make_pdf, tmp_path, tesseract_data):
+        """Test that a Spanish menu is OCR'd with Spanish alone and the choice is cached."""
+        pdf_file = make_pdf([None] * 3, image_pages=range(3))
+        
+        def fake_ocr(image, lang, timeout, output_type):
+            if lang == "eng+spa+fra":
+                return tesseract_data("Pollo asado con queso y salsa del chef")
+            return tesseract_data(f"Paella ({lang})")
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.ocr_engine.PytesseractEngine.detect_orientation', return_value=self.LATIN_OSD) as mock_osd, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', side_effect=fake_ocr):
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_dpi": 150,
+                "ocr_language": "eng",
+                "ocr_language_detection": {"enabled": True, "languages": ["eng", "spa", "fra"]},
+                "cache_enabled": True,
+                "cache_dir": str(tmp_path / "cache"),
+                "image_cache_max_size_mb": 0,
+            }
+            mock_config.return_value = mock_config_instance
+            mock_convert.side_effect = lambda path, dpi, **kwargs: [
+                Image.new('L', (dpi, dpi), color=255)
+                for _ in range(kwargs.get("last_page", 3) - kwargs.get("first_page", 1) + 1)
+            ]
+            
+            processor = PDFProcessor(str(pdf_file))
+            pages = processor._ocr_pages()
+            
+            assert processor.ocr_language == "spa"
+            assert [call.kwargs["dpi"] for call in mock_convert.call_args_list][0] == 100
+            assert mock_osd.call_count == 2  # sample_pages
+            assert {page["text"] for page in pages.values()} == {"Paella (spa)"}
+            
+            again = PDFProcessor(str(pdf_file))
+            again._ocr_pages(selected=[2])
+            
+            assert again.ocr_language == "spa"
+            assert mock_osd.call_count == 2
+    
+    def test_detected_language_is_kept_without_the_cache(self, make_pdf, tesseract_data, pdf_config):
+        """Test that a document's language is detected once per process even with the extraction cache off."""
+        pdf_file = make_pdf([None] * 2, image_pages=range(2))
+        settings = {"ocr_language_detection": {"enabled": True, "languages": ["eng", "jpn"]}, "image_cache_max_size_mb": 0}
+        japanese = {"rotate": 0, "orientation_conf": 5.0, "script": "Japanese", "script_conf": 3.0}
+        
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(settings)), \
+             patch('src.processors.pdf_processor.convert_from_path', side_effect=lambda path, dpi, **kwargs: [Image.new('L', (50, 50), color=255)] * 2), \
+             patch('src.processors.ocr_engine.PytesseractEngine.detect_orientation', return_value=japanese) as mock_osd, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Ramen")):
+            
+            first = PDFProcessor(str(pdf_file))
+            first._ocr_pages()
+            first._ocr_pages()
+            again = PDFProcessor(str(pdf_file))
+            again._ocr_pages()
+            
+            assert first.ocr_language == again.ocr_language == "jpn"
+            assert mock_osd.call_count == 2
+    
+    def test_deadline_bounds_language_detection(self, make_pdf, tesseract_data, pdf_config):
+        """Test that detection under a deadline gets a share of the time and gives up when it runs out."""
+        import time
+        
+        pdf_file = make_pdf([None] * 2, image_pages=range(2))
+        settings = {"ocr_language_detection": {"enabled": True}, "ocr_dpi": 150, "image_cache_max_size_mb": 0}
+        timeouts = []
+        
+        def slow_osd(image, timeout):
+            timeouts.append(timeout)
+            time.sleep(0.3)
+            return self.LATIN_OSD
+        
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(settings, ocr_language="fra")), \
+             patch('src.processors.pdf_processor.convert_from_path', side_effect=lambda path, dpi, **kwargs: [Image.new('L', (50, 50), color=255)] * (kwargs.get("last_page", 2) - kwargs.get("first_page", 1) + 1)), \
+             patch('src.processors.ocr_engine.PytesseractEngine.detect_orientation', side_effect=slow_osd), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Menu")):
+            
+            processor = PDFProcessor(str(pdf_file))
+            pages = processor.process_pages(deadline=1)
+            
+            assert timeouts and all(timeout <= 0.25 for timeout in timeouts)
+            assert len(timeouts) == 1
+            assert processor.ocr_language == "fra"
+            assert processor._language_detected is False
+            assert [page["text"] for page in pages.values()] == ["Menu", "Menu"]
+    
+    def test_detection_settings_key_the_cache(self, tmp_path):
+        """Test that changing the candidate languages doesn't reuse cached results."""
+        pdf_file = tmp_path / "menu.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\n" * 100)
+        
+        def cache_params(detection):
+            with patch('src.processors.pdf_processor.get_config') as mock_config:
+                mock_config.return_value.get_pdf_settings.return_value = {
+                    "ocr_enabled": True,
+                    "ocr_language_detection": detection,
+                    "image_cache_max_size_mb": 0,
+                }
+                return PDFProcessor(str(pdf_file))._cache_params()
+        
+        defaults = cache_params({"enabled": True})
+        
+        assert defaults == cache_params({"enabled": True, "languages": ["eng", "spa", "fra", "chi_sim", "jpn", "kor"]})
+        assert defaults != cache_params({"enabled": True, "languages": ["eng", "deu"]})
+        assert "language_detection" not in cache_params({"enabled": False})
+    
+    def test_detection_failure_keeps_configured_language(self, make_pdf, tesseract_data):
+        """Test that OCR still runs with ocr.language when OSD is unavailable."""
+        pdf_file = make_pdf([None], image_pages=[0])
+        
+        with patch('src.processors.pdf_processor.get_config') as mock_config, \
+             patch('src.processors.pdf_processor.convert_from_path', return_value=[Image.new('L', (50, 50), color=255)]), \
+             patch('src.processors.ocr_engine.PytesseractEngine.detect_orientation', side_effect=RuntimeError("no osd data")), \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Menu")):
+            
+            mock_config_instance = MagicMock()
+            mock_config_instance.get_pdf_settings.return_value = {
+                "ocr_enabled": True,
+                "ocr_language": "fra",
+                "ocr_language_detection": {"enabled": True, "fix_rotation": False},
+                "image_cache_max_size_mb": 0,
+            }
+            mock_config.return_value = mock_config_instance
+            
+            processor = PDFProcessor(str(pdf_file))
+            
+            assert processor._ocr_pages()[1]["text"] == "Menu"
+            assert processor.ocr_language == "fra"
+    
+    def test_rotated_page_is_ocrd_upright(self, tesseract_data):
+        """Test that a page that OCRs badly is turned by the OSD rotation and OCR'd again."""
+        from src.processors.recognition import recognize_page
+        
+        engine = MagicMock()
+        engine.recognize.side_effect = [
+            OCRResult.from_data(tesseract_data("~ ,. ;", conf=20)),
+            OCRResult.from_data(tesseract_data("Grilled salmon", conf=92)),
+        ]
+        engine.detect_orientation.return_value = {
+            "rotate": 90, "orientation_conf": 6.0, "script": "Latin", "script_conf": 3.0,
+        }
+        options = {"enabled": True, "fix_rotation": True}
+        
+        result = recognize_page(engine, Image.new('L', (300, 200), color=255), None, 30, options)
+        
+        assert result.text == "Grilled salmon"
+        assert engine.recognize.call_args_list[1].args[0].size == (200, 300)
+        
+        engine.recognize.side_effect = [OCRResult.from_data(tesseract_data("Grilled salmon", conf=92))]
+        assert recognize_page(engine, Image.new('L', (300, 200)), None, 30, options).text == "Grilled salmon"
+        assert engine.detect_orientation.call_count == 1
+
+
+class TestMemoryBudget:
+    """Tests for admission control against the process-wide memory budget."""
+    
+    SETTINGS = {"ocr_dpi": 300, "image_cache_max_size_mb": 0, "memory_budget": {"enabled": True, "min_dpi": 100}}
+    
+    def test_large_job_is_downscaled(self, make_pdf, tesseract_data, pdf_config):
+        """Test that a job too large for the budget is rendered at a DPI that fits and not cached."""
+        from src.utils.memory_budget import MemoryBudget, estimate_job_bytes
+        
+        pdf_file = make_pdf([None] * 4, image_pages=range(4))
+        # Room for the job at roughly 150 DPI only
+        budget = MemoryBudget(max_size_mb=estimate_job_bytes([(612, 792)] * 4, 150, 4) / 2**20)
+        
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(self.SETTINGS)), \
+             patch('src.processors.pdf_processor.get_memory_budget', return_value=budget), \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Soup")):
+            
+            mock_convert.side_effect = lambda path, dpi, **kwargs: [Image.new('L', (50, 50), color=255)] * 4
+            processor = PDFProcessor(str(pdf_file))
+            pages = processor._ocr_pages()
+            
+            dpi = mock_convert.call_args.kwargs["dpi"]
+            assert 100 <= dpi <= 150
+            assert all(page["dpi"] == dpi and page["degraded"] for page in pages.values())
+            assert budget.get_stats()["jobs"] == 0
+            assert budget.get_stats()["downscaled"] == 1
+    
+    def test_pipeline_reserves_its_queue_only(self, make_pdf, tesseract_data, pdf_config):
+        """Test that the streaming pipeline is admitted for the pages it holds, not the whole document."""
+        from src.utils.memory_budget import MemoryBudget, estimate_job_bytes
+        
+        pdf_file = make_pdf([None] * 20, image_pages=range(20))
+        budget = MemoryBudget(max_size_mb=estimate_job_bytes([(612, 792)] * 20, 300, 4) / 2**20)
+        
+        with patch('src.processors.pdf_processor.get_config',
+                   return_value=pdf_config(self.SETTINGS, ocr_pipeline=True, ocr_queue_depth=1)), \
+             patch('src.processors.pdf_processor.get_memory_budget', return_value=budget), \
+             patch('src.processors.pdf_processor.convert_from_path',
+                   side_effect=lambda path, dpi, **kwargs: [Image.new('L', (50, 50), color=255)]) as mock_convert, \
+             patch('src.processors.pdf_processor.pytesseract.image_to_data', return_value=tesseract_data("Soup")):
+            
+            processor = PDFProcessor(str(pdf_file))
+            pages = processor.iter_ocr_pages()
+            
+            assert next(pages)[1]["dpi"] == 300
+            assert budget.get_stats()["jobs"] == 1
+            pages.close()
+            
+            assert budget.get_stats()["jobs"] == 0
+            assert {call.kwargs["dpi"] for call in mock_convert.call_args_list} == {300}
+    
+    def test_deadline_limits_the_wait_for_memory(self, make_pdf, pdf_config):
+        """Test that a job with a deadline stops queueing for memory when its time is up."""
+        import time
+        from src.utils.memory_budget import MemoryBudget
+        
+        pdf_file = make_pdf([None] * 2, image_pages=range(2))
+        budget = MemoryBudget(max_size_mb=1, max_wait_seconds=None)
+        running, _ = budget.admit(budget.max_size_bytes, 300, 300)
+        
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(self.SETTINGS)), \
+             patch('src.processors.pdf_processor.get_memory_budget', return_value=budget), \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert:
+            
+            started = time.monotonic()
+            pages = PDFProcessor(str(pdf_file)).process_pages(deadline=0.3)
+            
+            assert time.monotonic() - started < 5
+            assert [page["method"] for page in pages.values()] == ["timeout", "timeout"]
+            assert budget.get_stats()["jobs"] == 1
+            mock_convert.assert_not_called()
+        budget.release(running)
+    
+    def test_async_deadline_limits_the_wait_for_memory(self, make_pdf, pdf_config):
+        """Test that aprocess_pages() stops queueing for memory when its deadline is up."""
+        import asyncio
+        import time
+        from src.utils.memory_budget import MemoryBudget
+        
+        pdf_file = make_pdf([None] * 2, image_pages=range(2))
+        budget = MemoryBudget(max_size_mb=1, max_wait_seconds=None)
+        running, _ = budget.admit(budget.max_size_bytes, 300, 300)
+        
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(self.SETTINGS)), \
+             patch('src.processors.pdf_processor.get_memory_budget', return_value=budget), \
+             patch('src.processors.pdf_processor.run_process') as mock_run:
+            
+            started = time.monotonic()
+            pages = asyncio.run(PDFProcessor(str(pdf_file)).aprocess_pages(deadline=0.3))
+            
+            assert time.monotonic() - started < 5
+            assert [page["method"] for page in pages.values()] == ["timeout", "timeout"]
+            assert budget.get_stats()["jobs"] == 1
+            mock_run.assert_not_called()
+        budget.release(running)
+    
+    def test_cancelled_async_job_gives_back_its_reservation(self, make_pdf, pdf_config):
+        """Test that a coroutine cancelled while queued for memory does not leak its reservation."""
+        import asyncio
+        from src.utils.memory_budget import MemoryBudget
+        
+        pdf_file = make_pdf([None], image_pages=[0])
+        budget = MemoryBudget(max_size_mb=1, max_wait_seconds=None)
+        running, _ = budget.admit(budget.max_size_bytes, 300, 300)
+        
+        with patch('src.processors.pdf_processor.get_config', return_value=pdf_config(self.SETTINGS, ocr_dpi=72)), \
+             patch('src.processors.pdf_processor.get_memory_budget', return_value=budget), \
+             patch('src.processors.pdf_processor.convert_from_path') as mock_convert:
+            
+            processor = PDFProcessor(str(pdf_file))
+            
+            async def cancel_while_queued():
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(processor._aocr_pass(None, 72), timeout=0.2)
+                assert budget.get_stats()["waiting"] == 1
+                budget.release(running)
+                for _ in range(50):
+                    if budget.get_stats()["admitted"] == 2:
+                        break
+                    await asyncio.sleep(0.05)
+            
+            asyncio.run(cancel_while_queued())
+            
+            assert budget.get_stats()["admitted"] == 2
+            assert budget.get_stats()["jobs"] == 0
+            mock_convert.assert_not_called()
+
+
+class TestAsyncAPI:
+    """Tests for the coroutine API (fake pdftoppm and tesseract commands)."""
+    
+    SETTINGS = {"ocr_engine": "pytesseract"}
+    
+    def test_aprocess_scanned_pdf(self, make_pdf, fake_ocr_tools, make_processor):
+        """Test that aprocess() renders and OCRs every page through subprocesses."""
+        import asyncio
+        
+        processor = make_processor(str(make_pdf([None] * 3, image_pages=range(3))), self.SETTINGS, ocr_workers=2)
+        
+        pages = asyncio.run(processor.aprocess_pages())
+        
+        assert [page["text"] for page in pages.values()] == ["w10", "w20", "w30"]
+        assert (pages[1]["method"], pages[1]["confidence"]) == ("ocr", 0.915)
+        assert asyncio.run(processor.aprocess()) == processor._format_pages(pages)
+    
+    def test_aconvert_to_images_in_memory_selection(self, fake_ocr_tools, make_processor):
+        """Test that in-memory PDFs are piped to pdftoppm and renders are cached."""
+        import asyncio
+        
+        processor = make_processor(b"%PDF-1.4\n" * 100, self.SETTINGS)
+        processor._get_menu_parser = MagicMock()
+        processor._get_menu_parser.return_value.get_page_count.return_value = 3
+        
+        images = asyncio.run(processor.aconvert_to_images(pages=[2, 3]))
+        
+        assert [image.size for image in images] == [(20, 10), (30, 10)]
+        assert processor.convert_to_images(pages=[3])[0] is images[1]
+    
+    def test_aconvert_to_images_poppler_missing(self, make_pdf, tmp_path, monkeypatch, make_processor):
+        """Test that a missing pdftoppm is reported like convert_to_images()."""
+        import asyncio
+        
+        processor = make_processor(str(make_pdf([None])), self.SETTINGS)
+        monkeypatch.setenv("PATH", str(tmp_path))
+        
+        with pytest.raises(ValueError, match="poppler-utils not installed"):
+            asyncio.run(processor.aconvert_to_images())
+    
+    def test_cancelled_aocr_image_kills_tesseract(self, make_pdf, fake_ocr_tools, tmp_path, monkeypatch, make_processor):
+        """Test that cancelling aocr_image() kills the tesseract process."""
+        import asyncio
+        import os
+        
+        pid_file = tmp_path / "tesseract.pid"
+        monkeypatch.setenv("FAKE_TESSERACT_PID_FILE", str(pid_file))
+        processor = make_processor(str(make_pdf([None])), self.SETTINGS)
+        
+        async def cancel_ocr():
+            task = asyncio.create_task(processor.aocr_image(Image.new('L', (40, 40), color=255)))
+            while not pid_file.exists() or not pid_file.read_text():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        asyncio.run(cancel_ocr())
+        
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(pid_file.read_text()), 0)
+    
+    def test_aprocess_pages_degrades_as_deadline_nears(self, make_pdf, fake_ocr_tools, make_processor):
+        """Test that aprocess_pages() steps down the quality levels and times out like process_pages()."""
+        import asyncio
+        from src.processors.time_budget import TimeBudget
+        
+        processor = make_processor(str(make_pdf([None] * 3, image_pages=range(3))), self.SETTINGS, ocr_dpi=150)
+        
+        with patch('src.processors.pdf_processor.PDFProcessor._preprocess_image', side_effect=lambda image, options=None: image) as mock_preprocess, \
+             patch.object(TimeBudget, 'start_page', side_effect=[0, 2, None]):
+            pages = asyncio.run(processor.aprocess_pages(deadline=60))
+        
+        assert mock_preprocess.call_count == 1
+        assert (pages[1]["text"], pages[1]["dpi"], "degraded" in pages[1]) == ("w10", 150, False)
+        assert (pages[2]["text"], pages[2]["dpi"], pages[2]["degraded"]) == ("w20", 100, True)
+        assert pages[3] == {"text": "", "method": "timeout"}
+    
+    def test_aprocess_expired_deadline_marks_pages(self, make_pdf, make_processor):
+        """Test that aprocess() honours ``ocr.deadline_seconds`` and marks pages it did not start."""
+        import asyncio
+        
+        processor = make_processor(
+            str(make_pdf([None] * 2, image_pages=range(2))), self.SETTINGS, ocr_deadline_seconds=0
+        )
+        
+        with patch('src.processors.pdf_processor.run_process') as mock_run:
+            text = asyncio.run(processor.aprocess())
+        
+        assert "--- Page 1 (not processed: deadline reached) ---" in text
+        assert "--- Page 2 (not processed: deadline reached) ---" in text
+        mock_run.assert_not_called()
+    
+    def test_aocr_pages_within_deadline(self, make_pdf, fake_ocr_tools, make_processor):
+        """Test that _aocr_pages() OCRs the selected pages against a deadline."""
+        import asyncio
+        import time
+        
+        processor = make_processor(str(make_pdf([None] * 3, image_pages=range(3))), self.SETTINGS, ocr_workers=2)
+        
+        pages = asyncio.run(processor._aocr_pages([1, 3], time.monotonic() + 60))
+        
+        assert list(pages) == [1, 3]
+        assert [page["text"] for page in pages.values()] == ["w10", "w30"]
+        assert not any(page.get("degraded") for page in pages.values())
@@ -0,0 +1,125 @@
+"""
+Unit tests for preprocessing module.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from src.processors.preprocessing import (
+    adaptive_threshold,
+    crop_margins,
+    despeckle,
+    estimate_skew,
+    otsu_threshold,
+    preprocess_page,
+)
+
+
+@pytest.fixture
+def text_page():
+    """White page with ruled 'text lines' in the middle and wide blank margins."""
+    image = Image.new('L', (600, 800), color=235)
+    draw = ImageDraw.Draw(image)
+    for line in range(12):
+        y = 200 + line * 30
+        for word in range(6):
+            draw.rectangle((100 + word * 60, y, 140 + word * 60, y + 10), fill=30)
+    return image
+
+
+class TestThresholds:
+    """Tests for Otsu and adaptive thresholding."""
+    
+    def test_otsu_threshold_separates_ink_from_paper(self, text_page):
+        """Test that the threshold falls between the ink and paper levels."""
+        assert 30 <= otsu_threshold(text_page.histogram()) < 235
+    
+    def test_otsu_threshold_blank_page(self):
+        """Test a page with a single grey level."""
+        assert otsu_threshold(Image.new('L', (10, 10), color=255).histogram()) == 0
+    
+    def test_adaptive_threshold_handles_uneven_lighting(self):
+        """Test that faint text in a shadow is found next to bright paper."""
+        gradient = np.tile(np.linspace(250, 90, 200).astype(np.uint8), (60, 1))
+        gradient[28:32, 20:40] -= 60   # Text on bright paper
+        gradient[28:32, 160:180] -= 60  # Text in the shadow
+        
+        ink = adaptive_threshold(gradient, block_size=15, offset=10)
+        
+        assert ink[30, 30] and ink[30, 170]
+        assert not ink[10, 30] and not ink[10, 170]
+
+
+class TestCleanup:
+    """Tests for despeckling, deskewing and margin cropping."""
+    
+    def test_despeckle_removes_isolated_pixels(self):
+        """Test that lone specks go and solid strokes stay."""
+        ink = np.zeros((20, 20), dtype=bool)
+        ink[3, 3] = True
+        ink[10:15, 5:15] = True
+        
+        cleaned = despeckle(ink)
+        
+        assert not cleaned[3, 3]
+        assert cleaned[12, 10]
+    
+    @pytest.mark.parametrize("angle", [-3.0, 0.0, 2.0])
+    def test_estimate_skew(self, text_page, angle):
+        """Test that a rotated page's skew is measured within 0.2 degrees."""
+        rotated = text_page.rotate(angle, expand=True, fillcolor=235)
+        
+        assert estimate_skew(np.asarray(rotated) < 128) == pytest.approx(-angle, abs=0.2)
+    
+    def test_crop_margins(self, text_page):
+        """Test that blank borders are cropped to the padding."""
+        pixels = np.asarray(text_page)
+        
+        cropped = crop_margins(pixels, padding=10)
+        
+        assert cropped.shape == (340 + 1 + 20, 340 + 1 + 20)
+        assert cropped.base is not None  # A view, not a copy
+        assert crop_margins(np.full((5, 5), 255, dtype=np.uint8)).shape == (5, 5)
+
+
+class TestPreprocessPage:
+    """Tests for preprocess_page function."""
+    
+    def test_default_pipeline(self, text_page):
+        """Test that the page comes back binary, level and cropped."""
+        processed = preprocess_page(text_page.rotate(2.0, expand=True, fillcolor=235).convert('RGB'))
+        pixels = np.asarray(processed)
+        
+        assert processed.mode == 'L'
+        assert set(np.unique(pixels)) <= {0, 255}
+        assert processed.width < 450 and processed.height < 450
+        assert estimate_skew(pixels < 128) == pytest.approx(0.0, abs=0.2)
+    
+    def test_steps_can_be_switched_off(self, text_page):
+        """Test that disabling every step leaves the pixels alone."""
+        options = {
+            "threshold": "none",
+            "denoise": False,
+            "deskew": False,
+            "crop_margins": False,
+        }
+        
+        processed = preprocess_page(text_page, options)
+        
+        assert np.array_equal(np.asarray(processed), np.asarray(text_page))
+    
+    def test_array_input(self, text_page):
+        """Test that a grayscale array is processed like the image, and not aliased."""
+        pixels = np.array(text_page)
+        pixels.flags.writeable = False
+        
+        assert np.array_equal(np.asarray(preprocess_page(pixels)), np.asarray(preprocess_page(text_page)))
+        
+        unchanged = preprocess_page(pixels, {"threshold": "none", "denoise": False, "deskew": False})
+        assert not np.may_share_memory(np.asarray(unchanged), pixels)
+    
+    def test_unknown_threshold(self, text_page):
+        """Test that an unknown threshold method is rejected."""
+        with pytest.raises(ValueError, match="Unknown threshold method"):
+            preprocess_page(text_page, {"threshold": "sauvola"})
@@ -0,0 +1,45 @@
+"""
+Unit tests for recognition module.
+"""
+
+from unittest.mock import patch, MagicMock
+
+from src.processors.recognition import LazyOCREngine, tesseract_not_found_error
+
+
+class TestLazyOCREngine:
+    """Tests for LazyOCREngine class."""
+    
+    def test_engine_created_once_per_language(self):
+        """Test that the engine is reused, and replaced when the language changes."""
+        with patch('src.processors.recognition.create_ocr_engine',
+                   side_effect=lambda *args: MagicMock(name="engine")) as mock_create:
+            engines = LazyOCREngine("auto", "/usr/bin/tesseract")
+            
+            first = engines.get("eng")
+            assert engines.get("eng") is first
+            
+            second = engines.get("spa")
+            assert second is not first
+            first.close.assert_called_once()
+            assert [c.args for c in mock_create.call_args_list] == [
+                ("auto", "eng", "/usr/bin/tesseract", None),
+                ("auto", "spa", "/usr/bin/tesseract", None),
+            ]
+            
+            engines.close()
+            second.close.assert_called_once()
+            assert engines.get("spa") is not second
+
+
+class TestTesseractNotFoundError:
+    """Tests for tesseract_not_found_error function."""
+    
+    def test_message_names_install_and_configured_path(self):
+        """Test that the error explains how to install Tesseract or point to it."""
+        error = tesseract_not_found_error("/opt/tesseract")
+        
+        assert isinstance(error, RuntimeError)
+        assert "Tesseract OCR not found" in str(error)
+        assert "apt-get install tesseract-ocr" in str(error)
+        assert "/opt/tesseract" in str(error)
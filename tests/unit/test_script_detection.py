@@ -0,0 +1,79 @@
+"""
+Unit tests for script_detection module.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.processors.script_detection import (
+    choose_languages,
+    needs_rotation_check,
+    osd_rotation,
+    rotate_upright,
+    score_languages,
+    script_languages,
+)
+
+LANGUAGES = ["eng", "spa", "fra", "chi_sim", "jpn", "kor"]
+
+
+class TestChooseLanguages:
+    """Tests for choosing the document's language set."""
+    
+    def test_script_languages_keep_configured_order(self):
+        """Test that only configured languages of a script are candidates."""
+        assert script_languages("Latin", LANGUAGES) == ["eng", "spa", "fra"]
+        assert script_languages("Han", LANGUAGES) == ["chi_sim"]
+        assert script_languages("Cyrillic", LANGUAGES) == []
+    
+    def test_score_languages_counts_common_words(self):
+        """Test that menu words are counted per language."""
+        scores = score_languages("Pollo asado con papas y salsa de la casa", ["eng", "spa", "fra"])
+        
+        assert scores["spa"] > scores["fra"] > scores["eng"] == 0
+    
+    def test_single_latin_language(self):
+        """Test that a Spanish menu gets Spanish alone."""
+        scores = {"eng": 0, "spa": 9, "fra": 2}
+        
+        assert choose_languages({"Latin": 6.0}, scores, LANGUAGES) == ["spa"]
+    
+    def test_bilingual_menu(self):
+        """Test that a Chinese menu with English dish names gets both, main script first."""
+        scores = {"eng": 7, "spa": 0, "fra": 1}
+        
+        assert choose_languages({"Han": 8.0, "Latin": 3.0}, scores, LANGUAGES) == ["chi_sim", "eng"]
+    
+    def test_noise_and_unscored_latin(self):
+        """Test that weak scripts are dropped and unscored Latin falls back to the first candidate."""
+        assert choose_languages({"Latin": 8.0, "Hangul": 1.0}, {}, LANGUAGES) == ["eng"]
+        assert choose_languages({}, {}, LANGUAGES) == []
+
+
+class TestRotation:
+    """Tests for orientation handling."""
+    
+    def test_rotate_upright_undoes_osd_rotation(self):
+        """Test that the OSD rotation turns a page back upright."""
+        page = Image.new('L', (60, 40), color=255)
+        ImageDraw.Draw(page).rectangle((5, 5, 30, 10), fill=0)
+        turned = page.rotate(-90, expand=True)  # Scanned 90 degrees clockwise
+        
+        rotate = osd_rotation({"rotate": 270, "orientation_conf": 5.0}, min_confidence=2.0)
+        
+        assert np.array_equal(np.asarray(rotate_upright(turned, rotate)), np.asarray(page))
+        assert rotate_upright(page, 0) is page
+    
+    def test_unsure_orientation_is_ignored(self):
+        """Test that a low-confidence orientation is not acted on."""
+        assert osd_rotation({"rotate": 180, "orientation_conf": 0.4}, min_confidence=2.0) == 0
+    
+    def test_needs_rotation_check(self):
+        """Test that only badly recognized pages are checked, and only when enabled."""
+        options = {"enabled": True, "fix_rotation": True, "rotation_check_confidence": 0.6}
+        
+        assert needs_rotation_check(0.3, options)
+        assert needs_rotation_check(None, options)
+        assert not needs_rotation_check(0.9, options)
+        assert not needs_rotation_check(0.3, dict(options, fix_rotation=False))
+        assert not needs_rotation_check(0.3, None)
@@ -0,0 +1,101 @@
+"""
+Unit tests for shared_images module.
+"""
+
+import multiprocessing
+import threading
+from multiprocessing import resource_tracker
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.utils.shared_images import SharedImagePool, attach_block, attach_image
+
+
+def read_corner(ref):
+    """Read the first pixel of a shared image in another process."""
+    block, pixels = attach_image(ref)
+    try:
+        return int(pixels[0, 0]), pixels.shape
+    finally:
+        pixels = None
+        block.close()
+
+
+class TestSharedImagePool:
+    """Tests for SharedImagePool class."""
+    
+    def test_round_trip_without_copy(self):
+        """Test that a worker sees the page's pixels through a view of the block."""
+        image = Image.new('RGB', (30, 20), color=(90, 90, 90))
+        
+        with SharedImagePool() as shared:
+            ref = shared.put(image)
+            block, pixels = attach_image(ref)
+            
+            assert ref[1:] == (30, 20)
+            assert pixels.shape == (20, 30)
+            assert np.array_equal(pixels, np.asarray(image.convert('L')))
+            assert np.shares_memory(pixels, np.frombuffer(block.buf, dtype=np.uint8))
+            assert not pixels.flags.writeable
+            
+            pixels = None
+            block.close()
+    
+    def test_tall_page_is_copied_in_strips(self):
+        """Test that pages taller than one copy strip arrive intact."""
+        gradient = np.tile(np.arange(600, dtype=np.uint16) % 256, (7, 1)).T.astype(np.uint8)
+        
+        with SharedImagePool() as shared:
+            ref = shared.put(Image.fromarray(gradient))
+            block, pixels = attach_image(ref)
+            
+            assert np.array_equal(pixels, gradient)
+            
+            pixels = None
+            block.close()
+    
+    def test_release_unlinks_block(self):
+        """Test that released and leftover blocks are unlinked."""
+        shared = SharedImagePool()
+        first = shared.put(Image.new('L', (10, 10)))
+        second = shared.put(Image.new('L', (10, 10)))
+        assert len(shared) == 2
+        
+        shared.release(first)
+        assert len(shared) == 1
+        with pytest.raises(FileNotFoundError):
+            attach_block(first[0])
+        
+        shared.close()
+        assert len(shared) == 0 and shared.size_bytes == 0
+        with pytest.raises(FileNotFoundError):
+            attach_block(second[0])
+    
+    def test_worker_process_does_not_unlink(self):
+        """Test that a block outlives the worker processes that attached to it."""
+        context = multiprocessing.get_context("spawn")
+        
+        with SharedImagePool() as shared:
+            ref = shared.put(Image.new('L', (8, 4), color=200))
+            for _ in range(2):
+                with context.Pool(1) as pool:
+                    assert pool.apply(read_corner, (ref,)) == (200, (4, 8))
+            
+            block = attach_block(ref[0])
+            block.close()
+    
+    def test_concurrent_attach_restores_resource_tracker(self):
+        """Test that attaching from several threads at once leaves the tracker as it was."""
+        register = resource_tracker.register
+        
+        with SharedImagePool() as shared:
+            ref = shared.put(Image.new('L', (8, 8)))
+            threads = [threading.Thread(target=lambda: attach_block(ref[0]).close()) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert resource_tracker.register is register
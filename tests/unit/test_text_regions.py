@@ -0,0 +1,80 @@
+"""
+Unit tests for text_regions module.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.processors.text_regions import detect_text_regions, region_pixels
+
+
+def draw_text_block(draw, left, top, lines=5, words=4):
+    """Draw rows of thin word-sized strokes, about as dense as binarized text."""
+    for line in range(lines):
+        y = top + line * 20
+        for word in range(words):
+            x = left + word * 50
+            draw.rectangle((x, y, x + 40, y + 3), fill=0)
+
+
+class TestDetectTextRegions:
+    """Tests for detect_text_regions function."""
+    
+    def test_finds_columns_and_skips_photo(self):
+        """Test two text columns are found in reading order and a photo is dropped."""
+        image = Image.new('L', (1000, 800), color=255)
+        draw = ImageDraw.Draw(image)
+        draw_text_block(draw, 100, 100)
+        draw_text_block(draw, 600, 100)
+        draw.rectangle((300, 500, 700, 750), fill=0)  # Solid photo
+        
+        regions = detect_text_regions(image, {"padding": 4})
+        
+        assert len(regions) == 2
+        left_column, right_column = regions
+        assert left_column[0] <= 100 and left_column[2] >= 290 and left_column[2] < 600
+        assert right_column[0] >= 500 and right_column[1] <= 100 and right_column[3] >= 184
+        assert region_pixels(regions) < 0.2 * image.width * image.height
+    
+    def test_border_does_not_merge_blocks(self):
+        """Test that a frame around the page is ignored when splitting blocks."""
+        image = Image.new('L', (1000, 800), color=255)
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((20, 20, 980, 780), outline=0, width=4)
+        draw.line((100, 400, 900, 400), fill=0, width=2)  # Rule between sections
+        draw_text_block(draw, 100, 100)
+        draw_text_block(draw, 600, 500)
+        
+        regions = detect_text_regions(image, {"padding": 4})
+        
+        assert len(regions) == 2
+        assert regions[0][0] >= 90 and regions[0][2] < 600 and regions[0][3] < 400
+        assert regions[1][0] >= 590 and regions[1][1] > 400
+    
+    def test_blank_page(self):
+        """Test that a blank page has no regions."""
+        assert detect_text_regions(Image.new('L', (400, 400), color=255)) == []
+    
+    def test_regions_clipped_to_page(self):
+        """Test that padding never extends a region beyond the page."""
+        image = Image.new('L', (300, 200), color=255)
+        draw_text_block(ImageDraw.Draw(image), 0, 0, lines=3, words=3)
+        
+        (left, top, right, bottom), = detect_text_regions(image, {"padding": 20})
+        
+        assert (left, top) == (0, 0)
+        assert right <= 300 and bottom <= 200
+    
+    def test_too_many_regions_merged(self):
+        """Test that scattered blocks beyond max_regions become one region."""
+        image = Image.new('L', (1200, 1200), color=255)
+        draw = ImageDraw.Draw(image)
+        for row in range(4):
+            for column in range(4):
+                draw_text_block(draw, 50 + column * 300, 50 + row * 300, lines=2, words=2)
+        
+        assert len(detect_text_regions(image)) == 16
+        regions = detect_text_regions(image, {"max_regions": 4})
+        
+        assert len(regions) == 1
+        assert regions[0][0] <= 50 and regions[0][2] >= 1000
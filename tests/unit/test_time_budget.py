@@ -0,0 +1,74 @@
+"""
+Unit tests for time_budget module.
+"""
+
+import pytest
+
+from src.processors.time_budget import TimeBudget
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestTimeBudget:
+    """Tests for TimeBudget class."""
+    
+    def test_stays_at_full_quality_when_on_pace(self):
+        """Test that pages keep level 0 while they fit in the time left."""
+        clock = FakeClock()
+        budget = TimeBudget(clock.now + 100, pages=10, levels=3, clock=clock)
+        
+        for _ in range(10):
+            assert budget.start_page() == 0
+            clock.now += 5
+            budget.finish_page(0, 5)
+        
+        assert budget.remaining() == pytest.approx(50)
+    
+    def test_steps_down_one_level_at_a_time(self):
+        """Test that slow pages move to cheaper levels, one measured level at a time."""
+        clock = FakeClock()
+        budget = TimeBudget(clock.now + 60, pages=10, levels=3, clock=clock)
+        
+        assert budget.start_page() == 0
+        clock.now += 20
+        budget.finish_page(0, 20)  # 9 pages x 20s > 40s left
+        
+        assert budget.start_page() == 1
+        clock.now += 10
+        budget.finish_page(1, 10)  # 8 pages x 10s > 30s left
+        
+        assert budget.start_page() == 2
+        clock.now += 1
+        budget.finish_page(2, 1)
+        
+        assert budget.start_page() == 2  # Never goes back up
+    
+    def test_workers_share_the_pages(self):
+        """Test that parallel workers are counted when checking the pace."""
+        clock = FakeClock()
+        budget = TimeBudget(clock.now + 60, pages=9, workers=4, levels=2, clock=clock)
+        
+        budget.start_page()
+        budget.finish_page(0, 20)  # 8 pages / 4 workers x 20s = 40s <= 60s
+        
+        assert budget.start_page() == 0
+    
+    def test_expired_budget_starts_no_pages(self):
+        """Test that no page is started after the deadline, and timeouts are capped."""
+        clock = FakeClock()
+        budget = TimeBudget(clock.now + 10, pages=3, clock=clock)
+        
+        assert budget.timeout(30) == pytest.approx(10)
+        clock.now += 10
+        
+        assert budget.expired()
+        assert budget.start_page() is None
+        assert budget.timeout(30) > 0
@@ -10,6 +10,10 @@ from unittest.mock import patch, MagicMock
 
 from src.utils.validators import (
     validate_pdf_file,
+    validate_pdf_data,
+    validate_image_file,
+    validate_image_data,
+    detect_image_format,
     validate_dietary_prefs,
     validate_allergen_list,
     validate_file_path,
@@ -354,3 +358,152 @@ class TestEdgeCases:
             assert isinstance(is_valid, bool)
             assert isinstance(error, str)
 
+
+
+class TestValidatePDFData:
+    """Tests for validate_pdf_data function."""
+    
+    def test_valid_bytes(self):
+        """Test validation of in-memory PDF bytes."""
+        is_valid, error_msg = validate_pdf_data(b"%PDF-1.4\n" * 10, max_size_mb=1)
+        assert is_valid is True
+        assert error_msg == ""
+    
+    def test_valid_stream_position_restored(self):
+        """Test that validating a stream leaves its position unchanged."""
+        import io
+        stream = io.BytesIO(b"%PDF-1.4\n" * 10)
+        stream.seek(5)
+        
+        is_valid, _ = validate_pdf_data(stream, max_size_mb=1)
+        assert is_valid is True
+        assert stream.tell() == 5
+    
+    def test_missing_header(self):
+        """Test that data without a PDF header is rejected."""
+        is_valid, error_msg = validate_pdf_data(memoryview(b"GIF89a" * 10), max_size_mb=1)
+        assert is_valid is False
+        assert "%PDF-" in error_msg
+    
+    def test_empty_data(self):
+        """Test that empty data is rejected."""
+        is_valid, error_msg = validate_pdf_data(b"", max_size_mb=1)
+        assert is_valid is False
+        assert "empty" in error_msg
+    
+    def test_too_large(self):
+        """Test that oversized data is rejected."""
+        is_valid, error_msg = validate_pdf_data(b"%PDF-" + b"0" * (2 * 1024 * 1024), max_size_mb=1)
+        assert is_valid is False
+        assert "exceeds maximum" in error_msg
+    
+    def test_unsupported_type(self):
+        """Test that non-buffer input is rejected."""
+        is_valid, error_msg = validate_pdf_data("%PDF-1.4", max_size_mb=1)
+        assert is_valid is False
+        assert "must be bytes" in error_msg
+
+
+class TestValidateImageFile:
+    """Tests for validate_image_file and detect_image_format functions."""
+    
+    def test_detect_image_format(self):
+        """Test that supported formats are recognized by their magic bytes."""
+        assert detect_image_format(b"\xff\xd8\xff\xe0\x00\x10JFIF") == "jpeg"
+        assert detect_image_format(b"\x89PNG\r\n\x1a\n\x00\x00") == "png"
+        assert detect_image_format(b"RIFF\x24\x00\x00\x00WEBPVP8 ") == "webp"
+        assert detect_image_format(b"II*\x00\x08\x00") == "tiff"
+        assert detect_image_format(b"RIFF\x24\x00\x00\x00WAVEfmt ") is None
+        assert detect_image_format(b"%PDF-1.4") is None
+    
+    def test_valid_photo_any_extension(self, tmp_path):
+        """Test that a real photo passes whatever its extension."""
+        from PIL import Image
+        photo = tmp_path / "IMG_0001.jpeg.upload"
+        Image.new("RGB", (64, 48)).save(photo, "JPEG")
+        
+        is_valid, error = validate_image_file(str(photo), max_size_mb=1)
+        assert is_valid is True
+        assert error == ""
+    
+    def test_wrong_content(self, tmp_path):
+        """Test that a PDF renamed to .jpg is rejected."""
+        fake = tmp_path / "menu.jpg"
+        fake.write_bytes(b"%PDF-1.4\n" * 10)
+        
+        is_valid, error = validate_image_file(str(fake), max_size_mb=1)
+        assert is_valid is False
+        assert "not a jpeg" in error.lower()
+    
+    def test_truncated_header(self, tmp_path):
+        """Test that a file with a JPEG signature but no readable header is rejected."""
+        broken = tmp_path / "menu.jpg"
+        broken.write_bytes(b"\xff\xd8\xff" + b"\x00" * 100)
+        
+        is_valid, error = validate_image_file(str(broken), max_size_mb=1)
+        assert is_valid is False
+        assert "cannot read jpeg" in error.lower()
+    
+    def test_too_large(self, tmp_path):
+        """Test that photos over the size limit are rejected."""
+        photo = tmp_path / "menu.png"
+        photo.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * (2 * 1024 * 1024))
+        
+        is_valid, error = validate_image_file(str(photo), max_size_mb=1)
+        assert is_valid is False
+        assert "exceeds maximum" in error
+
+
+class TestValidateImageData:
+    """Tests for validate_image_data function."""
+    
+    @staticmethod
+    def _photo(size=(64, 48)):
+        import io
+        from PIL import Image
+        buffer = io.BytesIO()
+        Image.new("RGB", size).save(buffer, "PNG")
+        return buffer.getvalue()
+    
+    def test_valid_buffers(self):
+        """Test that a photo passes as bytes, bytearray or memoryview."""
+        photo = self._photo()
+        for data in (photo, bytearray(photo), memoryview(photo)):
+            assert validate_image_data(data, max_size_mb=1) == (True, "")
+    
+    def test_valid_stream_position_restored(self):
+        """Test that validating a stream leaves its position unchanged."""
+        import io
+        stream = io.BytesIO(self._photo())
+        stream.seek(5)
+        
+        is_valid, _ = validate_image_data(stream, max_size_mb=1)
+        assert is_valid is True
+        assert stream.tell() == 5
+    
+    def test_wrong_content(self):
+        """Test that a PDF uploaded as a photo is rejected."""
+        is_valid, error_msg = validate_image_data(b"%PDF-1.4\n" * 10, max_size_mb=1)
+        assert is_valid is False
+        assert "not a jpeg" in error_msg.lower()
+    
+    def test_too_large(self):
+        """Test that oversized data is rejected before it is parsed."""
+        is_valid, error_msg = validate_image_data(b"\x89PNG\r\n\x1a\n" + b"\x00" * (2 * 1024 * 1024), max_size_mb=1)
+        assert is_valid is False
+        assert "exceeds maximum" in error_msg
+    
+    def test_decompression_bomb(self):
+        """Test that a photo with too many pixels is rejected without decoding it."""
+        from PIL import Image
+        with patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+            is_valid, error_msg = validate_image_data(self._photo(), max_size_mb=1)
+        assert is_valid is False
+        assert "cannot read png" in error_msg.lower()
+    
+    def test_empty_and_unsupported(self):
+        """Test that empty data and non-buffer input are rejected."""
+        assert validate_image_data(b"", max_size_mb=1) == (False, "Image data is empty")
+        is_valid, error_msg = validate_image_data("IMG_0001.jpg", max_size_mb=1)
+        assert is_valid is False
+        assert "must be bytes" in error_msg